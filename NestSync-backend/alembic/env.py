@@ -18,6 +18,10 @@ from app.config.settings import settings
 
 # Import all models to ensure they're registered with metadata
 from app.models import User, Child, ConsentRecord, ConsentAuditLog
+from app.jobs.queue import BackgroundJob
+from app.jobs.scheduler import ScheduledJobRun
+from app.services.forecast_model_store import ForecastModelRecord
+from app.services.prediction_pipeline import PredictionRun
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,84 @@
+"""create_background_jobs_table
+
+Revision ID: 4f2a9c1d7e83
+Revises: cde91a672200
+Create Date: 2025-10-16 09:00:00.000000-04:00
+
+PIPEDA Compliance: This migration handles personal data according to Canadian privacy laws.
+Data Residency: All data operations occur within Canadian data centers.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2a9c1d7e83'
+down_revision = 'cde91a672200'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Apply migration changes: Create the background job queue table
+
+    PIPEDA Compliance Notes:
+    - Job payloads carry identifiers only, never personal data values
+    - Finished jobs can be purged under the standard retention policy
+    - Canadian timezone (America/Toronto) is used for all timestamps
+    """
+    op.create_table(
+        'background_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('kind', sa.String(100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('dedup_key', sa.String(255), nullable=True),
+
+        # Retry bookkeeping
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('run_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('locked_by', sa.String(255), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+
+        # Metadata
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Workers scan due pending jobs in run_at order
+    op.create_index(
+        'idx_background_jobs_claim', 'background_jobs', ['run_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    # Stale lease detection
+    op.create_index(
+        'idx_background_jobs_running', 'background_jobs', ['locked_at'],
+        postgresql_where=sa.text("status = 'running'")
+    )
+    # At most one pending job per dedup key
+    op.create_index(
+        'uq_background_jobs_pending_dedup', 'background_jobs', ['dedup_key'],
+        unique=True, postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    """
+    Reverse migration changes
+
+    PIPEDA Compliance Notes:
+    - Data rollback maintains compliance requirements
+    - Audit logs are preserved even during rollback
+    - No personal data is inadvertently exposed during downgrade
+    """
+    op.drop_index('uq_background_jobs_pending_dedup', table_name='background_jobs')
+    op.drop_index('idx_background_jobs_running', table_name='background_jobs')
+    op.drop_index('idx_background_jobs_claim', table_name='background_jobs')
+    op.drop_table('background_jobs')
@@ -0,0 +1,58 @@
+"""create_forecast_models_table
+
+Revision ID: 8b3e5d7a1c40
+Revises: 4f2a9c1d7e83
+Create Date: 2025-10-17 09:00:00.000000-04:00
+
+PIPEDA Compliance: This migration handles personal data according to Canadian privacy laws.
+Data Residency: All data operations occur within Canadian data centers.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3e5d7a1c40'
+down_revision = '4f2a9c1d7e83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Apply migration changes: Create the persisted forecast model store
+
+    PIPEDA Compliance Notes:
+    - Rows hold fitted model parameters and aggregate forecasts only
+    - Entries are removed with the child they belong to
+    - Canadian timezone (America/Toronto) is used for all timestamps
+    """
+    op.create_table(
+        'forecast_models',
+        sa.Column('child_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('model_version', sa.String(50), nullable=False),
+
+        # Cache key: the fit is reused while the usage history is unchanged
+        sa.Column('last_usage_date', sa.Date(), nullable=False),
+        sa.Column('history_digest', sa.String(64), nullable=False),
+
+        sa.Column('parameters', postgresql.JSONB(), nullable=True),
+        sa.Column('result', postgresql.JSONB(), nullable=False),
+        sa.Column('fitted_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+
+        sa.PrimaryKeyConstraint('child_id', 'model_version'),
+        sa.ForeignKeyConstraint(['child_id'], ['children.id'], ondelete='CASCADE')
+    )
+
+
+def downgrade() -> None:
+    """
+    Reverse migration changes
+
+    PIPEDA Compliance Notes:
+    - Data rollback maintains compliance requirements
+    - Audit logs are preserved even during rollback
+    - No personal data is inadvertently exposed during downgrade
+    """
+    op.drop_table('forecast_models')
@@ -0,0 +1,62 @@
+"""create_prediction_runs_table
+
+Revision ID: c71d2e9f4a05
+Revises: 8b3e5d7a1c40
+Create Date: 2025-10-17 10:00:00.000000-04:00
+
+PIPEDA Compliance: This migration handles personal data according to Canadian privacy laws.
+Data Residency: All data operations occur within Canadian data centers.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71d2e9f4a05'
+down_revision = '8b3e5d7a1c40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Apply migration changes: Create checkpoints for the nightly prediction pipeline
+
+    PIPEDA Compliance Notes:
+    - Rows hold run counters and a resume position only, no personal data
+    - Canadian timezone (America/Toronto) is used for all timestamps
+    """
+    op.create_table(
+        'prediction_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('run_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('last_child_id', postgresql.UUID(as_uuid=True), nullable=True),
+
+        # Run counters
+        sa.Column('children_processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('predictions_written', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('children_skipped', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('children_failed', sa.Integer(), nullable=False, server_default='0'),
+
+        # Metadata
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_date', name='uq_prediction_runs_run_date')
+    )
+
+
+def downgrade() -> None:
+    """
+    Reverse migration changes
+
+    PIPEDA Compliance Notes:
+    - Data rollback maintains compliance requirements
+    - Audit logs are preserved even during rollback
+    - No personal data is inadvertently exposed during downgrade
+    """
+    op.drop_table('prediction_runs')
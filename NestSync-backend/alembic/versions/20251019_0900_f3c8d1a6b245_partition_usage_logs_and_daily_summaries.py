@@ -0,0 +1,208 @@
+"""partition_usage_logs_and_daily_summaries
+
+Revision ID: f3c8d1a6b245
+Revises: e4a7b2c9d318
+Create Date: 2025-10-19 09:00:00.000000-04:00
+
+PIPEDA Compliance: This migration handles personal data according to Canadian privacy laws.
+Data Residency: All data operations occur within Canadian data centers.
+"""
+import logging
+import re
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8d1a6b245'
+down_revision = 'e4a7b2c9d318'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# (table, partition column, column is timestamptz); must match
+# app/services/partition_maintenance.py, which creates later partitions
+PARTITIONED_TABLES = [
+    ('usage_logs', 'logged_at', True),
+    ('analytics_daily_summaries', 'date', False),
+]
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """
+    Apply migration changes: Partition usage_logs and analytics_daily_summaries by month
+
+    Each table is rebuilt as a declaratively partitioned table with one
+    partition per month of existing data, MONTHS_AHEAD future months and a
+    default partition. The primary key becomes (id, time column), the
+    btree index on the time column alone becomes BRIN, and foreign keys,
+    remaining indexes, RLS policies and grants are carried over. The rows
+    are copied in this transaction, so writes to the tables wait for it.
+
+    PIPEDA Compliance Notes:
+    - Personal data is copied row for row; nothing is dropped or exposed
+    - RLS policies are recreated on the partitioned tables
+    - Canadian timezone (America/Toronto) is used for all timestamps
+    """
+    bind = op.get_bind()
+    for table, column, is_timestamp in PARTITIONED_TABLES:
+        definition = _capture_table(bind, table)
+        legacy = f'{table}_unpartitioned'
+
+        op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING COMMENTS INCLUDING STORAGE) PARTITION BY RANGE ({column})'
+        )
+        _create_month_partitions(bind, table, column, is_timestamp, legacy)
+        op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+        op.execute(f'DROP TABLE {legacy}')
+
+        _restore_table(table, column, definition, partitioned=True)
+        op.execute(f'CREATE INDEX brin_{table}_{column} ON {table} USING brin ({column})')
+        if not _has_child_time_index(definition, column):
+            op.execute(f'CREATE INDEX idx_{table}_child_{column} ON {table} (child_id, {column})')
+
+
+def downgrade() -> None:
+    """
+    Reverse migration changes
+
+    PIPEDA Compliance Notes:
+    - Data rollback maintains compliance requirements
+    - Audit logs are preserved even during rollback
+    - No personal data is inadvertently exposed during downgrade
+    """
+    bind = op.get_bind()
+    for table, column, _ in PARTITIONED_TABLES:
+        definition = _capture_table(bind, table)
+        partitioned = f'{table}_partitioned'
+
+        op.execute(f'ALTER TABLE {table} RENAME TO {partitioned}')
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+            f'INCLUDING COMMENTS INCLUDING STORAGE)'
+        )
+        op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+        op.execute(f'DROP TABLE {partitioned}')
+
+        _restore_table(table, column, definition, partitioned=False)
+        op.execute(f'CREATE INDEX ix_{table}_{column} ON {table} ({column})')
+
+
+# =============================================================================
+# Table Rebuild Helpers
+# =============================================================================
+
+def _capture_table(bind, table):
+    """Everything LIKE does not copy: keys, indexes, policies and grants"""
+    params = {'table': table}
+    return {
+        'constraints': bind.execute(sa.text("""
+            SELECT conname, contype, pg_get_constraintdef(oid) AS definition
+            FROM pg_constraint
+            WHERE conrelid = CAST(:table AS regclass) AND contype IN ('p', 'u', 'f')
+            ORDER BY contype DESC, conname
+        """), params).all(),
+        'indexes': bind.execute(sa.text("""
+            SELECT i.relname AS name, pg_get_indexdef(i.oid) AS definition
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = CAST(:table AS regclass)
+                AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        """), params).all(),
+        'policies': bind.execute(sa.text("""
+            SELECT policyname, permissive, roles, cmd, qual, with_check
+            FROM pg_policies
+            WHERE schemaname = 'public' AND tablename = :table
+        """), params).all(),
+        'security': bind.execute(sa.text("""
+            SELECT relrowsecurity, relforcerowsecurity FROM pg_class WHERE oid = CAST(:table AS regclass)
+        """), params).one(),
+        'grants': bind.execute(sa.text("""
+            SELECT grantee, string_agg(privilege_type, ', ') AS privileges
+            FROM information_schema.role_table_grants
+            WHERE table_schema = 'public' AND table_name = :table AND grantee <> current_user
+            GROUP BY grantee
+        """), params).all(),
+    }
+
+
+def _restore_table(table, column, definition, partitioned):
+    for name, kind, constraint in definition['constraints']:
+        if kind == 'p':
+            key = f'id, {column}' if partitioned else 'id'
+            constraint = f'PRIMARY KEY ({key})'
+        elif kind == 'u' and partitioned and not re.search(rf'\b{column}\b', constraint):
+            # Unique constraints on a partitioned table must include the partition key
+            logger.warning(f'Dropping unique constraint {name} on {table}: it omits {column}')
+            continue
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {constraint}')
+
+    for name, index in definition['indexes']:
+        index = index.replace(' ON ONLY ', ' ON ')
+        if partitioned and re.search(rf'USING btree \({column}\)$', index):
+            continue  # replaced by the BRIN index
+        if not partitioned and name == f'brin_{table}_{column}':
+            continue  # downgrade restores the original btree index
+        if partitioned and ' UNIQUE ' in index and not re.search(rf'\b{column}\b', index):
+            logger.warning(f'Dropping unique index {name} on {table}: it omits {column}')
+            continue
+        op.execute(index)
+
+    for name, permissive, roles, command, using, check in definition['policies']:
+        statement = f'CREATE POLICY {name} ON {table} AS {permissive} FOR {command} TO {", ".join(roles)}'
+        if using:
+            statement += f' USING ({using})'
+        if check:
+            statement += f' WITH CHECK ({check})'
+        op.execute(statement)
+
+    row_security, force_row_security = definition['security']
+    if row_security:
+        op.execute(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY')
+    if force_row_security:
+        op.execute(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY')
+
+    for grantee, privileges in definition['grants']:
+        grantee = 'PUBLIC' if grantee == 'PUBLIC' else f'"{grantee}"'
+        op.execute(f'GRANT {privileges} ON {table} TO {grantee}')
+
+
+def _has_child_time_index(definition, column):
+    definitions = [row.definition for row in definition['constraints']]
+    definitions += [row.definition for row in definition['indexes']]
+    return any(re.search(rf'\(child_id, {column}[,)]', text) for text in definitions)
+
+
+def _create_month_partitions(bind, table, column, is_timestamp, source):
+    first = bind.execute(sa.text(f'SELECT min({column}) FROM {source}')).scalar()
+    today = datetime.now(timezone.utc).date()
+    if first is None:
+        first = today
+    elif is_timestamp:
+        first = first.astimezone(timezone.utc).date()
+
+    month = first.replace(day=1)
+    last = _add_months(today.replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        start, end = month.isoformat(), following.isoformat()
+        if is_timestamp:
+            start, end = f'{start} 00:00:00+00', f'{end} 00:00:00+00'
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+        month = following
+
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
@@ -10,11 +10,14 @@ import logging
 
 from app.services.observability_service import get_observability_service
 from app.services.continuous_monitoring import continuous_monitoring
+from app.health.snapshot import health_snapshot
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/health", tags=["health", "monitoring"])
 
+OBSERVABILITY_INTERVAL_SECONDS = 300
+
 
 @router.get("/")
 async def basic_health_check() -> Dict[str, Any]:
@@ -200,64 +203,18 @@ async def disable_monitoring() -> Dict[str, str]:
 async def get_compliance_status() -> Dict[str, Any]:
     """
     Get Canadian compliance and PIPEDA status
+    Served from the background-refreshed health snapshot
     """
-    try:
-        observability = await get_observability_service()
-
-        # Run compliance checks
-        compliance_checks = await observability._check_canadian_compliance()
-
-        return {
-            "overall_status": "compliant" if all(check.status for check in compliance_checks) else "non_compliant",
-            "checks": [
-                {
-                    "check_name": check.check_name,
-                    "status": check.status,
-                    "error_message": check.error_message,
-                    "remediation_steps": check.remediation_steps
-                }
-                for check in compliance_checks
-            ],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to get compliance status: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get compliance status: {str(e)}")
+    return health_snapshot.result("compliance")
 
 
 @router.get("/performance")
 async def get_performance_metrics() -> Dict[str, Any]:
     """
     Get current performance metrics
+    Served from the background-refreshed health snapshot
     """
-    try:
-        observability = await get_observability_service()
-
-        # Run performance checks
-        performance_checks = await observability._check_performance_metrics()
-
-        metrics = []
-        for check in performance_checks:
-            for metric in check.metrics:
-                metrics.append({
-                    "name": metric.name,
-                    "value": metric.value,
-                    "unit": metric.unit,
-                    "healthy": metric.healthy,
-                    "threshold": metric.threshold,
-                    "measured_at": metric.measured_at.isoformat()
-                })
-
-        return {
-            "performance_status": "healthy" if all(check.status for check in performance_checks) else "degraded",
-            "metrics": metrics,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to get performance metrics: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get performance metrics: {str(e)}")
+    return health_snapshot.result("performance")
 
 
 @router.get("/dashboard")
@@ -269,8 +226,8 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
     try:
         observability = await get_observability_service()
 
-        # Run comprehensive health check
-        health_checks = await observability.run_comprehensive_health_check()
+        # Checks come from the snapshot; summary and alerts are in memory
+        recent = health_snapshot.result("observability")
         health_summary = observability.get_health_summary()
         active_alerts = observability.get_active_alerts()
 
@@ -285,18 +242,7 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
                 "monitoring_enabled": health_summary["monitoring_enabled"],
                 "last_check": health_summary.get("last_check")
             },
-            "recent_checks": [
-                {
-                    "check_id": check.check_id,
-                    "check_name": check.check_name,
-                    "category": check.category,
-                    "status": check.status,
-                    "error_message": check.error_message,
-                    "severity": check.severity.value,
-                    "checked_at": check.checked_at.isoformat()
-                }
-                for check in health_checks[-10:]  # Last 10 checks
-            ],
+            "recent_checks": recent.get("recent_checks", []),
             "active_alerts": [
                 {
                     "alert_id": alert.alert_id,
@@ -308,6 +254,7 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
                 }
                 for alert in active_alerts
             ],
+            "snapshot": recent["snapshot"],
             "timestamp": datetime.utcnow().isoformat()
         }
 
@@ -316,7 +263,94 @@ async def get_monitoring_dashboard() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to get dashboard: {str(e)}")
 
 
+# =============================================================================
+# Snapshot Checks
+# =============================================================================
+
+async def _compliance_snapshot() -> Dict[str, Any]:
+    observability = await get_observability_service()
+    compliance_checks = await observability._check_canadian_compliance()
+
+    return {
+        "status": "healthy" if all(check.status for check in compliance_checks) else "unhealthy",
+        "overall_status": "compliant" if all(check.status for check in compliance_checks) else "non_compliant",
+        "checks": [
+            {
+                "check_name": check.check_name,
+                "status": check.status,
+                "error_message": check.error_message,
+                "remediation_steps": check.remediation_steps
+            }
+            for check in compliance_checks
+        ],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _performance_snapshot() -> Dict[str, Any]:
+    observability = await get_observability_service()
+    performance_checks = await observability._check_performance_metrics()
+
+    metrics = []
+    for check in performance_checks:
+        for metric in check.metrics:
+            metrics.append({
+                "name": metric.name,
+                "value": metric.value,
+                "unit": metric.unit,
+                "healthy": metric.healthy,
+                "threshold": metric.threshold,
+                "measured_at": metric.measured_at.isoformat()
+            })
+
+    healthy = all(check.status for check in performance_checks)
+    return {
+        "status": "healthy" if healthy else "unhealthy",
+        "performance_status": "healthy" if healthy else "degraded",
+        "metrics": metrics,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _observability_snapshot() -> Dict[str, Any]:
+    observability = await get_observability_service()
+
+    # Continuous monitoring normally keeps the history fresh; only run when it has not
+    latest = observability.recent_checks(1)
+    if not latest or (datetime.utcnow() - latest[-1].checked_at).total_seconds() > OBSERVABILITY_INTERVAL_SECONDS:
+        await observability.run_comprehensive_health_check()
+
+    recent_checks = observability.recent_checks(10)
+    return {
+        "status": "healthy" if all(check.status for check in recent_checks) else "unhealthy",
+        "recent_checks": [
+            {
+                "check_id": check.check_id,
+                "check_name": check.check_name,
+                "category": check.category,
+                "status": check.status,
+                "error_message": check.error_message,
+                "severity": check.severity.value,
+                "checked_at": check.checked_at.isoformat()
+            }
+            for check in recent_checks
+        ],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def register_snapshot_checks() -> None:
+    """Observability checks behind /health/compliance, /performance and /dashboard"""
+    health_snapshot.register("compliance", _compliance_snapshot, interval_seconds=300, timeout_seconds=30.0)
+    health_snapshot.register("performance", _performance_snapshot, interval_seconds=60, timeout_seconds=30.0)
+    health_snapshot.register(
+        "observability", _observability_snapshot,
+        interval_seconds=OBSERVABILITY_INTERVAL_SECONDS, timeout_seconds=60.0
+    )
+
+
 # Add router to FastAPI app
 def include_health_routes(app):
     """Include health and monitoring routes in FastAPI app"""
+    register_snapshot_checks()
     app.include_router(router)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Prometheus Metrics Endpoint
+Serves the prometheus_client metrics, merged across worker processes, as text
+"""
+
+import asyncio
+import hmac
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge
+
+from app.config import database
+from app.config.settings import settings
+from app.services.metrics import render_latest
+
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(authorization: Optional[str] = Header(default=None)) -> PlainTextResponse:
+    """
+    Prometheus scrape endpoint
+
+    Requires `Authorization: Bearer <METRICS_BEARER_TOKEN>`. Without a token
+    configured it is open in development only; elsewhere it refuses every
+    scrape, since operation names and pool internals are not public.
+    """
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not settings.metrics_bearer_token:
+        if settings.environment != "development":
+            raise HTTPException(status_code=401, detail="Metrics token not configured")
+    elif not hmac.compare_digest(authorization or "", f"Bearer {settings.metrics_bearer_token}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    # Runtime gauges of the worker that answers are current; other workers'
+    # are at most METRICS_SAMPLE_INTERVAL_SECONDS old
+    sample_runtime_gauges()
+    # Merging reads every worker's files; keep that off the event loop
+    content = await asyncio.to_thread(render_latest)
+    return PlainTextResponse(content, media_type=CONTENT_TYPE_LATEST)
+
+
+# =============================================================================
+# Runtime Gauges
+# =============================================================================
+
+def _pool_in_use() -> Optional[float]:
+    engine = database.async_engine
+    return engine.pool.checkedout() if engine is not None else None
+
+
+def _pool_size() -> Optional[float]:
+    engine = database.async_engine
+    return engine.pool.size() if engine is not None else None
+
+
+def _analytics_cache_entries() -> Optional[float]:
+    from app.services.analytics_cache import AnalyticsCacheManager
+
+    return len(AnalyticsCacheManager.get_cache().cache)
+
+
+def _websocket_connections() -> Optional[float]:
+    from app.services.websocket_service import websocket_service
+
+    return len(websocket_service.connections)
+
+
+# Summed over live workers; Gauge.set_function() is not supported across processes
+RUNTIME_GAUGES: List[Tuple[Gauge, Callable[[], Optional[float]]]] = [
+    (Gauge("db_pool_connections_in_use", "Database connections checked out of the pool",
+           multiprocess_mode="livesum"), _pool_in_use),
+    (Gauge("db_pool_size", "Database connections held open by the pool",
+           multiprocess_mode="livesum"), _pool_size),
+    (Gauge("analytics_cache_entries", "Entries in the in-process analytics cache",
+           multiprocess_mode="livesum"), _analytics_cache_entries),
+    (Gauge("websocket_connections", "Open WebSocket connections",
+           multiprocess_mode="livesum"), _websocket_connections),
+]
+
+
+def sample_runtime_gauges() -> None:
+    """Set the runtime gauges from this worker's live objects"""
+    for gauge, read in RUNTIME_GAUGES:
+        try:
+            value = read()
+        except Exception as e:
+            logger.debug(f"Runtime gauge sample failed: {e}")
+            continue
+        if value is not None:
+            gauge.set(value)
+
+
+async def run_runtime_gauge_sampler() -> None:
+    """Sample the runtime gauges every METRICS_SAMPLE_INTERVAL_SECONDS until cancelled"""
+    while True:
+        sample_runtime_gauges()
+        await asyncio.sleep(settings.metrics_sample_interval_seconds)
+
+
+# Add router to FastAPI app
+def include_metrics_routes(app):
+    """Mount /metrics"""
+    app.include_router(router)
+    if settings.metrics_enabled and not settings.metrics_bearer_token and settings.environment != "development":
+        logger.warning("METRICS_BEARER_TOKEN is not set; /metrics will refuse every scrape")
+    logger.info("Metrics endpoint registered at /metrics")
@@ -12,6 +12,7 @@ from gotrue.errors import AuthError
 from jose import JWTError
 
 from app.config.settings import settings
+from app.auth.token_cache import decode_verified_token
 
 logger = logging.getLogger(__name__)
 
@@ -408,26 +409,9 @@ class SupabaseAuth:
             AuthenticationError: If token is expired or invalid
         """
         try:
-            # Verify token with Supabase JWT secret and signature verification
-            payload = jwt.decode(
-                token,
-                self.jwt_secret,
-                algorithms=["HS256"],
-                audience="authenticated",
-                options={"verify_signature": True}
-            )
-            
-            return {
-                "user_id": payload.get("sub"),
-                "email": payload.get("email"),
-                "role": payload.get("role", "authenticated"),
-                "aud": payload.get("aud"),
-                "iss": payload.get("iss"),
-                "exp": payload.get("exp"),
-                "iat": payload.get("iat"),
-                "user_metadata": payload.get("user_metadata", {}),
-                "app_metadata": payload.get("app_metadata", {})
-            }
+            # Verify token with Supabase JWT secret and signature verification;
+            # tokens verified before are served from the process-wide cache
+            return dict(decode_verified_token(token, self.jwt_secret))
             
         except jwt.ExpiredSignatureError as e:
             # Log security event for expired token
@@ -0,0 +1,113 @@
+"""
+Verified Token Cache for NestSync
+Process-wide LRU of Supabase JWTs that already passed signature verification
+
+Clients send the same access token on every request until it expires, so
+the HS256 decode and claim checks only need to run once per token. Entries
+are keyed by a digest of the token (the token itself is never stored) and
+are dropped at the token's exp claim.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def token_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The claims NestSync uses from a decoded Supabase JWT"""
+    return {
+        "user_id": payload.get("sub"),
+        "email": payload.get("email"),
+        "role": payload.get("role", "authenticated"),
+        "aud": payload.get("aud"),
+        "iss": payload.get("iss"),
+        "exp": payload.get("exp"),
+        "iat": payload.get("iat"),
+        "user_metadata": payload.get("user_metadata", {}),
+        "app_metadata": payload.get("app_metadata", {})
+    }
+
+
+class VerifiedTokenCache:
+    """LRU of token digest -> claims, each entry valid until its exp"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or settings.auth_token_cache_size
+        self.entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        key = _digest(token)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return  # Only tokens that expire are cached
+        key = _digest(token)
+        self.entries[key] = (float(expires_at), claims)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+# Global verified token cache instance
+verified_tokens = VerifiedTokenCache()
+
+
+def decode_verified_token(token: str, secret: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Claims of a valid Supabase access token, from the cache when possible
+
+    Raises jwt.InvalidTokenError (including ExpiredSignatureError) like
+    jwt.decode. The returned dict is shared with the cache; copy it before
+    modifying.
+    """
+    claims = verified_tokens.get(token)
+    if claims is not None:
+        return claims
+
+    payload = jwt.decode(
+        token,
+        secret or settings.supabase_jwt_secret,
+        algorithms=["HS256"],
+        audience="authenticated",
+        options={"verify_signature": True}
+    )
+    claims = token_claims(payload)
+    verified_tokens.put(token, claims)
+    return claims
+
+
+# =============================================================================
+# Export Token Cache Components
+# =============================================================================
+
+__all__ = [
+    "VerifiedTokenCache",
+    "verified_tokens",
+    "decode_verified_token",
+    "token_claims"
+]
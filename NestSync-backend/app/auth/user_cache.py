@@ -0,0 +1,213 @@
+"""
+Authenticated User Cache for NestSync
+Short-lived per-process cache of the users row behind a verified token
+
+Every GraphQL operation resolves its bearer token to a User. Between
+profile or status changes that row is the same on every request, so it is
+kept for AUTH_USER_CACHE_TTL_SECONDS keyed by Supabase user id. Entries hold
+column values only; each hit builds a fresh detached User, so a cache hit
+needs no database session.
+
+Commits that change or delete a User through the ORM invalidate its entry
+in this process and, with AUTH_USER_CACHE_SHARED_ENABLED, publish the
+invalidation on Redis so every other worker and replica drops it too.
+Changes the ORM does not see (raw SQL, the Supabase dashboard) or
+invalidations lost while Redis is unreachable are seen once the entry
+expires, so a user locked or suspended there keeps access for at most the
+TTL; keep it short.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.config.settings import settings
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_USERS = 10_000
+INVALIDATION_CHANNEL = "nestsync:auth:users:invalidate"
+LISTENER_RETRY_SECONDS = 30
+_PENDING_KEY = "nestsync_invalidated_users"
+_ALL_USERS = "*"
+
+
+class AuthenticatedUserCache:
+    """
+    Supabase user id -> User column values, expiring after ttl_seconds
+
+    generation counts invalidations. A lookup records it before querying and
+    passes it to put(), so a row read before a concurrent commit is never
+    cached after that commit invalidated it.
+
+    backend is a shared cache backend (see analytics_cache_backends) whose
+    pub/sub carries invalidations between processes; None keeps them local.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: int = MAX_CACHED_USERS, backend=None):
+        self.ttl_seconds = settings.auth_user_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self.max_entries = max_entries
+        self.backend = backend
+        self.entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.generation = 0
+        self._publishing: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, supabase_user_id: str) -> Optional[User]:
+        """A new detached User for a fresh entry, otherwise None"""
+        entry = self.entries.get(supabase_user_id)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self.entries[supabase_user_id]
+            return None
+        return _materialize(values)
+
+    def put(self, user: User, generation: int) -> None:
+        if not self.enabled or generation != self.generation:
+            return
+        state = inspect(user)
+        values = {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+        if len(values) != len(state.mapper.column_attrs):
+            return  # Partially loaded rows would lazy-load on a detached instance
+
+        key = str(user.supabase_user_id)
+        self.entries[key] = (time.monotonic() + self.ttl_seconds, values)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, supabase_user_id: Optional[str] = None) -> None:
+        """Drop one user, or every user when no id is given"""
+        self.generation += 1
+        if supabase_user_id is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(supabase_user_id, None)
+
+    def _invalidate_local(self, supabase_user_ids: Iterable[str]) -> None:
+        supabase_user_ids = set(supabase_user_ids)
+        if _ALL_USERS in supabase_user_ids:
+            self.invalidate()
+            return
+        for supabase_user_id in supabase_user_ids:
+            self.invalidate(supabase_user_id)
+
+    def invalidate_everywhere(self, supabase_user_ids: Iterable[str]) -> None:
+        """
+        Invalidate here now and publish to the other processes
+
+        Called from synchronous ORM hooks, so the publish runs as a task.
+        Without a running event loop only this process is invalidated.
+        """
+        supabase_user_ids = sorted(set(supabase_user_ids))
+        self._invalidate_local(supabase_user_ids)
+        if self.backend is None or not self.enabled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(orjson.dumps(supabase_user_ids)))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish(self, message: bytes) -> None:
+        try:
+            await self.backend.publish(message, INVALIDATION_CHANNEL)
+        except Exception as e:
+            logger.warning(f"Publishing user cache invalidation failed; other processes wait for the TTL: {e}")
+
+    async def listen_for_invalidations(self) -> None:
+        """Apply invalidations published by other processes; runs until cancelled"""
+        while True:
+            try:
+                async for message in self.backend.subscribe(INVALIDATION_CHANNEL):
+                    self._invalidate_local(orjson.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"User cache invalidation listener failed, retrying: {e}")
+                # Entries cached before the gap may have missed an invalidation
+                self.invalidate()
+                await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+    def start_invalidation_listener(self) -> Optional[asyncio.Task]:
+        """Start applying other processes' invalidations; None when not shared"""
+        if self.backend is None or not self.enabled:
+            return None
+        return asyncio.create_task(self.listen_for_invalidations(), name="auth-user-cache-invalidations")
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def _materialize(values: Dict[str, Any]) -> User:
+    user = User.__mapper__.class_manager.new_instance()
+    for key, value in values.items():
+        # JSON columns are mutable; callers must not change the cached copy
+        set_committed_value(user, key, copy.deepcopy(value) if isinstance(value, (dict, list)) else value)
+    make_transient_to_detached(user)
+    return user
+
+
+def _create_shared_backend():
+    if not settings.auth_user_cache_shared_enabled:
+        return None
+    from app.services.analytics_cache_backends import RedisCacheBackend
+    return RedisCacheBackend()
+
+
+# Global authenticated user cache instance
+authenticated_users = AuthenticatedUserCache(backend=_create_shared_backend())
+
+
+# =============================================================================
+# ORM Invalidation
+# =============================================================================
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    """Remember users updated or deleted by this flush until the commit"""
+    changed: Set[str] = session.info.setdefault(_PENDING_KEY, set())
+    for instance in (*session.dirty, *session.deleted):
+        if not isinstance(instance, User):
+            continue
+        supabase_user_id = inspect(instance).dict.get("supabase_user_id")
+        changed.add(str(supabase_user_id) if supabase_user_id is not None else _ALL_USERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        authenticated_users.invalidate_everywhere(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# =============================================================================
+# Export User Cache Components
+# =============================================================================
+
+__all__ = [
+    "AuthenticatedUserCache",
+    "authenticated_users"
+]
@@ -3,7 +3,11 @@ Database Configuration and Connection Management
 Supabase PostgreSQL with Canadian data residency
 """
 
+import asyncio
 import logging
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
 from typing import AsyncGenerator, Optional
 from sqlalchemy import create_engine, MetaData, event, text
 from sqlalchemy.ext.asyncio import (
@@ -17,6 +21,7 @@ from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, Session
 
 from .settings import settings
+from .query_instrumentation import instrument_engine
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -84,6 +89,7 @@ sync_engine = None
 
 # Session factories
 AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+RequestSessionLocal: Optional[async_sessionmaker["SerializedAsyncSession"]] = None
 SessionLocal: Optional[sessionmaker[Session]] = None
 
 
@@ -91,7 +97,7 @@ def create_database_engines():
     """
     Create database engines with proper configuration for Canadian compliance
     """
-    global async_engine, sync_engine, AsyncSessionLocal, SessionLocal
+    global async_engine, sync_engine, AsyncSessionLocal, RequestSessionLocal, SessionLocal
     
     # Async engine configuration  
     async_engine = create_async_engine(
@@ -136,6 +142,15 @@ def create_database_engines():
         autocommit=False
     )
     
+    # Request-scoped sessions are shared by concurrently resolving GraphQL fields
+    RequestSessionLocal = async_sessionmaker(
+        async_engine,
+        class_=SerializedAsyncSession,
+        expire_on_commit=False,
+        autoflush=True,
+        autocommit=False
+    )
+    
     SessionLocal = sessionmaker(
         sync_engine,
         autocommit=False,
@@ -145,6 +160,9 @@ def create_database_engines():
     # Add event listeners for security and compliance
     setup_database_events()
     
+    # Per-request query counts and fingerprints (see query_instrumentation)
+    instrument_engine(async_engine)
+    
     logger.info(f"Database engines configured for {settings.data_region}")
 
 
@@ -195,10 +213,330 @@ def setup_database_events():
             cursor.close()
 
 
+# =============================================================================
+# Request-Scoped Sessions
+# =============================================================================
+
+class _StreamLockRelease:
+    """Releases a session's operation lock once, however a streamed result ends"""
+
+    def __init__(self, lock: asyncio.Lock):
+        self._lock = lock
+        self._released = False
+
+    def __call__(self) -> None:
+        if not self._released:
+            self._released = True
+            self._lock.release()
+
+
+# Result methods that consume the rest of the result (or close it)
+_STREAM_CONSUMERS = frozenset({
+    "all", "fetchall", "first", "one", "one_or_none",
+    "scalar", "scalar_one", "scalar_one_or_none", "freeze", "close"
+})
+# Result methods that return a filtered result over the same cursor
+_STREAM_FILTERS = frozenset({"scalars", "mappings", "columns", "unique", "yield_per", "tuples"})
+
+
+class SerializedStreamResult:
+    """
+    Streamed result of a SerializedAsyncSession
+
+    Wraps AsyncResult (and the scalar, mapping and tuple results derived from
+    it) and releases the session's operation lock once the rows are
+    exhausted, a consuming method returns or the result is closed. Results
+    dropped without any of these release it when collected.
+    """
+
+    def __init__(self, result, release: _StreamLockRelease, parent: Optional["SerializedStreamResult"] = None):
+        self._result = result
+        self._release = release
+        # Derived results keep the root alive, so only the root needs a finalizer
+        self._parent = parent
+        if parent is None:
+            weakref.finalize(self, release)
+
+    def _derive(self, result) -> "SerializedStreamResult":
+        return self if result is self._result else SerializedStreamResult(result, self._release, self)
+
+    @property
+    def t(self) -> "SerializedStreamResult":
+        return self._derive(self._result.t)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._result, name)
+        if name in _STREAM_FILTERS:
+            return lambda *args, **kwargs: self._derive(attribute(*args, **kwargs))
+        if name in _STREAM_CONSUMERS:
+            async def consume(*args, **kwargs):
+                try:
+                    return await attribute(*args, **kwargs)
+                finally:
+                    self._release()
+            return consume
+        if name in ("fetchone", "fetchmany"):
+            async def fetch(*args, **kwargs):
+                try:
+                    rows = await attribute(*args, **kwargs)
+                except BaseException:
+                    self._release()
+                    raise
+                if not rows:
+                    self._release()
+                return rows
+            return fetch
+        if name == "partitions":
+            return self._partitions
+        return attribute
+
+    async def _partitions(self, *args, **kwargs):
+        try:
+            async for partition in self._result.partitions(*args, **kwargs):
+                yield partition
+        finally:
+            self._release()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        try:
+            async for row in self._result:
+                yield row
+        finally:
+            self._release()
+
+
+class SerializedAsyncSession(AsyncSession):
+    """
+    AsyncSession that can be shared by concurrently running coroutines
+
+    GraphQL resolvers for sibling fields run concurrently, and an AsyncSession
+    does not allow overlapping operations on its connection. Every awaitable
+    operation is serialized through a per-session lock so one request can
+    share a single session (and a single pool connection).
+    scalars() and stream_scalars() are not wrapped because they delegate to
+    execute() and stream().
+
+    A failed operation rolls back the whole transaction and marks the
+    session failed, so RequestSessionScope rolls back at the end and the
+    operation reports an error instead of claiming its writes were saved.
+    Only INSERT, UPDATE and DELETE statements run in a SAVEPOINT: resolvers
+    often catch a rejected write and return an error payload, and rolling
+    back to the savepoint discards just that statement. Reads go straight to
+    the connection, so the common path costs one round trip per statement.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._operation_lock = asyncio.Lock()
+        self.failed = False
+
+    async def _serialized(self, operation, *args, **kwargs):
+        async with self._operation_lock:
+            try:
+                return await operation(*args, **kwargs)
+            except Exception as e:
+                await self._fail(e)
+                raise
+
+    async def _serialized_write(self, operation, *args, **kwargs):
+        """Run a DML statement in a SAVEPOINT so a rejected write can be discarded alone"""
+        async with self._operation_lock:
+            try:
+                # Flushes changes pending from earlier calls before the SAVEPOINT exists
+                savepoint = await self.begin_nested()
+            except Exception as e:
+                await self._fail(e)
+                raise
+
+            try:
+                result = await operation(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"Request session write failed, rolling back to savepoint: {type(e).__name__}")
+                try:
+                    if savepoint.is_active:
+                        await savepoint.rollback()
+                except Exception as rollback_error:
+                    await self._fail(rollback_error)
+                raise
+
+            try:
+                if savepoint.is_active:
+                    await savepoint.commit()
+            except Exception as e:
+                await self._fail(e)
+                raise
+            return result
+
+    async def _fail(self, error: Exception) -> None:
+        """Roll back the whole transaction; callers hold the operation lock"""
+        logger.warning(f"Request session transaction failed, rolling back: {type(error).__name__}")
+        self.failed = True
+        await super().rollback()
+
+    async def execute(self, *args, **kwargs):
+        statement = args[0] if args else kwargs.get("statement")
+        if getattr(statement, "is_dml", False):
+            return await self._serialized_write(super().execute, *args, **kwargs)
+        return await self._serialized(super().execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await self._serialized(super().scalar, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._serialized(super().get, *args, **kwargs)
+
+    async def get_one(self, *args, **kwargs):
+        return await self._serialized(super().get_one, *args, **kwargs)
+
+    async def run_sync(self, *args, **kwargs):
+        return await self._serialized(super().run_sync, *args, **kwargs)
+
+    async def stream(self, *args, **kwargs) -> SerializedStreamResult:
+        """
+        Stream a result, keeping the lock until it is exhausted or closed
+
+        The connection stays busy while the server-side cursor is open, so
+        other resolvers wait until the caller finishes with the result.
+        """
+        await self._operation_lock.acquire()
+        try:
+            result = await super().stream(*args, **kwargs)
+        except BaseException as e:
+            try:
+                if isinstance(e, Exception):
+                    await self._fail(e)
+            finally:
+                self._operation_lock.release()
+            raise
+
+        return SerializedStreamResult(result, _StreamLockRelease(self._operation_lock))
+
+    async def refresh(self, *args, **kwargs):
+        return await self._serialized(super().refresh, *args, **kwargs)
+
+    async def merge(self, *args, **kwargs):
+        return await self._serialized(super().merge, *args, **kwargs)
+
+    async def delete(self, instance: object) -> None:
+        # Only marks the instance; the DELETE runs in a later flush
+        async with self._operation_lock:
+            await super().delete(instance)
+
+    async def flush(self, objects=None) -> None:
+        await self._serialized(super().flush, objects)
+
+    async def commit(self) -> None:
+        async with self._operation_lock:
+            try:
+                await super().commit()
+            except Exception as e:
+                await self._fail(e)
+                raise
+
+    async def rollback(self) -> None:
+        async with self._operation_lock:
+            await super().rollback()
+
+    async def close(self) -> None:
+        async with self._operation_lock:
+            await super().close()
+
+
+_request_session_scope: ContextVar[Optional["RequestSessionScope"]] = ContextVar(
+    "request_session_scope", default=None
+)
+
+
+class RequestSessionScope:
+    """
+    Unit of work for one GraphQL operation
+
+    The session is created on first use, shared by every resolver, DataLoader
+    and service running in the operation, and committed or rolled back exactly
+    once by finish(). While the scope is bound, get_async_session() yields the
+    shared session instead of checking out a new pool connection.
+    """
+
+    def __init__(self):
+        self._session: Optional[SerializedAsyncSession] = None
+        self._open = False
+        self._failed = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    @property
+    def has_session(self) -> bool:
+        return self._session is not None
+
+    @property
+    def failed(self) -> bool:
+        """True when finish() had to roll back writes the operation did not report as failed"""
+        return self._failed
+
+    def bind(self) -> Token:
+        """Open the scope and make it current for this task and its children"""
+        self._open = True
+        return _request_session_scope.set(self)
+
+    def unbind(self, token: Token) -> None:
+        _request_session_scope.reset(token)
+
+    async def get_session(self) -> AsyncSession:
+        """Get the shared session, creating it on first use"""
+        if self._session is None:
+            if not RequestSessionLocal:
+                raise RuntimeError("Database not initialized. Call create_database_engines() first.")
+            self._session = RequestSessionLocal()
+        return self._session
+
+    async def finish(self, commit: bool = True) -> None:
+        """Commit (or roll back) and close the shared session"""
+        # Tasks spawned during the operation keep a copy of the context var;
+        # once closed they fall back to their own sessions
+        self._open = False
+        if self._session is None:
+            return
+
+        session, self._session = self._session, None
+        try:
+            if commit and session.failed:
+                self._failed = True
+                await session.rollback()
+            elif commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        except Exception as e:
+            logger.error(f"Request session {'commit' if commit else 'rollback'} failed: {e}")
+            self._failed = commit
+            await session.rollback()
+        finally:
+            await session.close()
+
+
+def get_request_session_scope() -> Optional[RequestSessionScope]:
+    """Get the request session scope bound to the current context, if any"""
+    scope = _request_session_scope.get()
+    return scope if scope is not None and scope.is_open else None
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get async database session
+
+    Inside a GraphQL operation this yields the request-scoped session; its
+    lifecycle belongs to the RequestSessionScope, not to the caller.
     """
+    scope = get_request_session_scope()
+    if scope is not None:
+        yield await scope.get_session()
+        return
+
     if not AsyncSessionLocal:
         raise RuntimeError("Database not initialized. Call create_database_engines() first.")
     
@@ -213,6 +551,26 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def get_isolated_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Short-lived session that never joins the request scope
+
+    Used by work that runs concurrently inside one request (one session per
+    task), where sharing the request session would serialize every query.
+    The session is rolled back on exit, so callers must not rely on it to
+    persist writes.
+    """
+    if not AsyncSessionLocal:
+        raise RuntimeError("Database not initialized. Call create_database_engines() first.")
+
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
 def get_sync_session() -> Session:
     """
     Get synchronous database session for migrations and admin tasks
@@ -386,6 +744,11 @@ __all__ = [
     "async_engine",
     "sync_engine",
     "get_async_session",
+    "get_request_session_scope",
+    "get_isolated_session",
+    "RequestSessionScope",
+    "SerializedAsyncSession",
+    "SerializedStreamResult",
     "get_sync_session",
     "init_database",
     "close_database",
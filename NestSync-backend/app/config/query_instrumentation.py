@@ -0,0 +1,202 @@
+"""
+SQL Query Instrumentation for NestSync
+Per-request query counts, time and statement fingerprints
+
+Cursor events on the async engine record every statement into the
+QueryStats bound to the current context by track_queries(). Statements are
+fingerprinted with their literals and bind parameters removed, so the same
+query issued once per parent row (an N+1) shows up as one fingerprint with a
+high count. Outside track_queries() the hooks do nothing beyond a context
+variable lookup.
+
+SAVEPOINT, RELEASE SAVEPOINT and ROLLBACK TO SAVEPOINT statements (which the
+request session wraps around each write) are transaction control rather than
+queries: they are counted separately and kept out of the statement count,
+the fingerprints and therefore the query_budget test fixture.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints listed in summaries, most frequent first
+SUMMARY_FINGERPRINT_LIMIT = 10
+SUMMARY_STATEMENT_LENGTH = 200
+
+
+# =============================================================================
+# Statement Fingerprints
+# =============================================================================
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+# asyncpg ($1), pyformat (%(name)s, %s) and named (:name, not ::cast) parameters
+_PARAMETERS = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_CASTS = re.compile(r"\?::\w+(?:\[\])?")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROW_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+_SAVEPOINT_STATEMENTS = re.compile(r"^\s*(?:SAVEPOINT|RELEASE\s+SAVEPOINT|ROLLBACK\s+TO\s+SAVEPOINT)\b", re.IGNORECASE)
+
+
+def is_savepoint_statement(statement: str) -> bool:
+    """True for the savepoint control statements that are not counted as queries"""
+    return _SAVEPOINT_STATEMENTS.match(statement) is not None
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """
+    Statement text with literals, parameters and value lists replaced
+
+    IN lists and multi-row VALUES collapse to one placeholder, so batches of
+    different sizes share a fingerprint.
+    """
+    normalized = _COMMENTS.sub(" ", statement)
+    normalized = _STRING_LITERALS.sub("?", normalized)
+    normalized = _PARAMETERS.sub("?", normalized)
+    normalized = _NUMBERS.sub("?", normalized)
+    normalized = _CASTS.sub("?", normalized)
+    normalized = _PLACEHOLDER_LISTS.sub("(...)", normalized)
+    normalized = _ROW_LISTS.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_statement(statement: str) -> str:
+    """Short stable hash of the normalized statement"""
+    normalized = normalize_statement(statement)
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+
+# =============================================================================
+# Per-Request Statistics
+# =============================================================================
+
+class QueryStats:
+    """Statements executed while one track_queries() block was active"""
+
+    def __init__(self):
+        self.count = 0
+        self.savepoints = 0
+        self.total_ms = 0.0
+        self.fingerprints: Counter = Counter()
+        self.fingerprint_ms: Dict[str, float] = {}
+        self.statements: Dict[str, str] = {}
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        if is_savepoint_statement(statement):
+            self.savepoints += 1
+            return
+        fingerprint = fingerprint_statement(statement)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.fingerprints[fingerprint] += 1
+        self.fingerprint_ms[fingerprint] = self.fingerprint_ms.get(fingerprint, 0.0) + elapsed_ms
+        if fingerprint not in self.statements:
+            self.statements[fingerprint] = normalize_statement(statement)
+
+    def repeated(self, max_repeats: int) -> List[Tuple[str, int]]:
+        """(normalized statement, count) for fingerprints run more than max_repeats times"""
+        return [
+            (self.statements[fingerprint], count)
+            for fingerprint, count in self.fingerprints.most_common()
+            if count > max_repeats
+        ]
+
+    def summary(self, limit: int = SUMMARY_FINGERPRINT_LIMIT) -> Dict[str, Any]:
+        """JSON-serializable totals plus the most frequent fingerprints"""
+        return {
+            "count": self.count,
+            "savepoints": self.savepoints,
+            "totalMs": round(self.total_ms, 2),
+            "distinct": len(self.fingerprints),
+            "fingerprints": [
+                {
+                    "fingerprint": fingerprint,
+                    "count": count,
+                    "totalMs": round(self.fingerprint_ms[fingerprint], 2),
+                    "statement": self.statements[fingerprint][:SUMMARY_STATEMENT_LENGTH]
+                }
+                for fingerprint, count in self.fingerprints.most_common(limit)
+            ]
+        }
+
+
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def get_current_query_stats() -> Optional[QueryStats]:
+    """Stats being recorded in the current context, if any"""
+    return _current_query_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Record every statement run in this context, including tasks it spawns
+
+    Blocks nest; an inner block records only into its own stats.
+    """
+    stats = QueryStats()
+    token = _current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+# =============================================================================
+# Engine Hooks
+# =============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_query_stats.get() is not None:
+        # Kept on the execution context, so a statement that raised leaves nothing behind
+        context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_query_stats.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is None or started_at is None:
+        return
+    stats.record(statement, (time.perf_counter() - started_at) * 1000)
+
+
+def instrument_engine(engine: Any) -> None:
+    """Attach the query hooks to an engine (async or sync); safe to call twice"""
+    target: Engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    logger.debug("SQL query instrumentation attached")
+
+
+# =============================================================================
+# Export Query Instrumentation Components
+# =============================================================================
+
+__all__ = [
+    "QueryStats",
+    "track_queries",
+    "get_current_query_stats",
+    "instrument_engine",
+    "normalize_statement",
+    "fingerprint_statement",
+    "is_savepoint_statement"
+]
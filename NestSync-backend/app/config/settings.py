@@ -39,6 +39,44 @@ class Settings(BaseSettings):
     database_max_overflow: int = Field(default=30, env="DATABASE_MAX_OVERFLOW")
     database_pool_timeout: int = Field(default=30, env="DATABASE_POOL_TIMEOUT")
     
+    # =============================================================================
+    # Analytics Configuration
+    # =============================================================================
+    analytics_section_timeout_seconds: float = Field(default=8.0, env="ANALYTICS_SECTION_TIMEOUT_SECONDS")
+    analytics_section_concurrency: int = Field(default=4, env="ANALYTICS_SECTION_CONCURRENCY")  # Per dashboard
+    analytics_section_max_sessions: int = Field(default=8, env="ANALYTICS_SECTION_MAX_SESSIONS")  # Per process
+    analytics_cache_shared_enabled: bool = Field(default=True, env="ANALYTICS_CACHE_SHARED_ENABLED")
+    analytics_cache_local_ttl_minutes: int = Field(default=5, env="ANALYTICS_CACHE_LOCAL_TTL_MINUTES")
+    analytics_cache_stale_minutes: int = Field(default=30, env="ANALYTICS_CACHE_STALE_MINUTES")
+    analytics_rollup_chunk_size: int = Field(default=5000, env="ANALYTICS_ROLLUP_CHUNK_SIZE")
+    partition_months_ahead: int = Field(default=3, env="PARTITION_MONTHS_AHEAD")
+    usage_log_retention_days: int = Field(default=0, env="USAGE_LOG_RETENTION_DAYS")  # 0 keeps all
+    
+    # =============================================================================
+    # Background Jobs Configuration
+    # =============================================================================
+    job_in_process_workers: int = Field(default=0, env="JOB_IN_PROCESS_WORKERS")  # Workers run via app.jobs.worker
+    job_worker_concurrency: int = Field(default=4, env="JOB_WORKER_CONCURRENCY")
+    job_poll_interval_seconds: float = Field(default=1.0, env="JOB_POLL_INTERVAL_SECONDS")
+    job_max_attempts: int = Field(default=5, env="JOB_MAX_ATTEMPTS")
+    job_backoff_base_seconds: float = Field(default=5.0, env="JOB_BACKOFF_BASE_SECONDS")
+    job_backoff_max_seconds: float = Field(default=900.0, env="JOB_BACKOFF_MAX_SECONDS")
+    job_lease_seconds: int = Field(default=600, env="JOB_LEASE_SECONDS")
+    job_heartbeat_seconds: int = Field(default=60, env="JOB_HEARTBEAT_SECONDS")  # Lease renewal while a job runs; keep well under the lease
+    scheduler_enabled: bool = Field(default=True, env="SCHEDULER_ENABLED")
+    scheduler_poll_interval_seconds: float = Field(default=30.0, env="SCHEDULER_POLL_INTERVAL_SECONDS")
+    scheduler_catch_up_hours: int = Field(default=72, env="SCHEDULER_CATCH_UP_HOURS")
+    scheduler_run_lease_seconds: int = Field(default=3600, env="SCHEDULER_RUN_LEASE_SECONDS")
+    
+    # =============================================================================
+    # Forecasting Configuration
+    # =============================================================================
+    forecast_model: str = Field(default="holt_winters", env="FORECAST_MODEL")  # holt_winters | prophet
+    forecast_max_workers: int = Field(default=2, env="FORECAST_MAX_WORKERS")
+    forecast_batch_size: int = Field(default=25, env="FORECAST_BATCH_SIZE")
+    forecast_vectorized_batch_size: int = Field(default=2000, env="FORECAST_VECTORIZED_BATCH_SIZE")
+    prediction_pipeline_chunk_size: int = Field(default=4000, env="PREDICTION_PIPELINE_CHUNK_SIZE")
+    
     # =============================================================================
     # Supabase Configuration
     # =============================================================================
@@ -46,6 +84,9 @@ class Settings(BaseSettings):
     supabase_key: str = Field(..., env="SUPABASE_ANON_KEY")
     supabase_service_key: str = Field(..., env="SUPABASE_SERVICE_ROLE_KEY")
     supabase_jwt_secret: str = Field(..., env="SUPABASE_JWT_SECRET")
+    auth_token_cache_size: int = Field(default=10000, env="AUTH_TOKEN_CACHE_SIZE")  # Verified JWTs kept until exp
+    auth_user_cache_ttl_seconds: int = Field(default=30, env="AUTH_USER_CACHE_TTL_SECONDS")  # 0 disables; bounds staleness for changes made outside the ORM
+    auth_user_cache_shared_enabled: bool = Field(default=True, env="AUTH_USER_CACHE_SHARED_ENABLED")  # Invalidations over Redis pub/sub
     
     # =============================================================================
     # Redis Configuration (Background Jobs & Caching)
@@ -74,6 +115,7 @@ class Settings(BaseSettings):
     rate_limit_requests: int = Field(default=300, env="RATE_LIMIT_REQUESTS")  # Increased for dashboard polling
     rate_limit_window: int = Field(default=300, env="RATE_LIMIT_WINDOW")  # 5 minutes - more reasonable window
     rate_limiting_enabled: bool = Field(default=True, env="RATE_LIMITING_ENABLED")  # Toggle rate limiting on/off
+    rate_limit_shared_enabled: bool = Field(default=True, env="RATE_LIMIT_SHARED_ENABLED")  # Limits in Redis, shared by all workers
 
     @validator("rate_limiting_enabled")
     def validate_rate_limiting_production(cls, v, values):
@@ -312,7 +354,14 @@ class Settings(BaseSettings):
         default="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         env="LOG_FORMAT"
     )
-    
+    # /metrics; outside development it answers only with METRICS_BEARER_TOKEN set.
+    # With several uvicorn workers export PROMETHEUS_MULTIPROC_DIR (read by
+    # prometheus_client itself, at import) as a directory emptied on container
+    # start so every worker's metrics are merged
+    metrics_enabled: bool = Field(default=True, env="METRICS_ENABLED")
+    metrics_bearer_token: Optional[str] = Field(default=None, env="METRICS_BEARER_TOKEN")
+    metrics_sample_interval_seconds: float = Field(default=10.0, env="METRICS_SAMPLE_INTERVAL_SECONDS")  # Runtime gauges
+
     # =============================================================================
     # Feature Flags (for onboarding flow)
     # =============================================================================
@@ -342,6 +391,12 @@ class Settings(BaseSettings):
             raise ValueError("Environment must be development, staging, or production")
         return v
     
+    @validator("forecast_model")
+    def validate_forecast_model(cls, v):
+        if v not in ["holt_winters", "prophet"]:
+            raise ValueError("Forecast model must be holt_winters or prophet")
+        return v
+    
     @validator("data_region")
     def validate_data_region(cls, v):
         # Ensure Canadian data residency
@@ -11,11 +11,12 @@ import strawberry
 from strawberry.types import Info
 from sqlalchemy import select
 
-from app.config.database import get_async_session
+from app.config.database import get_async_session, get_isolated_session
 from app.graphql.context import require_context_user
 from app.services.analytics_service import AnalyticsService
 from app.services.analytics_cache import (
     AnalyticsCacheManager,
+    CacheOutcome,
     performance_monitor,
     QueryOptimizer
 )
@@ -174,20 +175,23 @@ async def get_user_timezone(session, user_id: uuid.UUID) -> str:
     try:
         user_query = select(User).where(User.id == user_id)
         result = await session.execute(user_query)
-        user = result.scalar_one_or_none()
-
-        if user and user.province:
-            return get_timezone_for_province(user.province)
-        elif user and user.timezone:
-            return user.timezone
-        else:
-            return DEFAULT_CANADIAN_TIMEZONE
+        return timezone_for_user(result.scalar_one_or_none())
 
     except Exception as e:
         logger.warning(f"Could not determine user timezone: {e}")
         return DEFAULT_CANADIAN_TIMEZONE
 
 
+def timezone_for_user(user: Optional[User]) -> str:
+    """Timezone of an already loaded user"""
+    if user and user.province:
+        return get_timezone_for_province(user.province)
+    elif user and user.timezone:
+        return user.timezone
+    else:
+        return DEFAULT_CANADIAN_TIMEZONE
+
+
 @strawberry.type
 class AnalyticsQueries:
     """Analytics system queries"""
@@ -214,7 +218,7 @@ class AnalyticsQueries:
                 )
 
             # Create cache key for this query
-            cache = AnalyticsCacheManager.get_cache()
+            cache = AnalyticsCacheManager.get_tiered_cache()
             child_id = uuid.UUID(filters.child_id) if filters.child_id else None
             start_date = filters.date_range.start_date if filters.date_range else date.today() - timedelta(days=30)
             end_date = filters.date_range.end_date if filters.date_range else date.today()
@@ -232,182 +236,190 @@ class AnalyticsQueries:
                 }
             )
 
-            # Check cache first
-            cached_result = cache.get(cache_key)
-            if cached_result:
-                execution_time = time.time() - start_time
-                performance_monitor.record_query_time("usage_analytics", execution_time, was_cached=True)
-                logger.info(f"Cache HIT for usage analytics query (user {user_id}) - {execution_time:.3f}s")
-                return cached_result
+            outcome = CacheOutcome.MISS
+
+            def record_outcome(served: CacheOutcome) -> None:
+                nonlocal outcome
+                outcome = served
+
+            async def compute_usage_analytics() -> UsageAnalyticsResponse:
+                # Own session: a stale-while-revalidate refresh can outlive this request
+                async with get_isolated_session() as session:
+                    analytics_service = AnalyticsService()
+
+                    # PIPEDA compliance: Check analytics consent and log data access
+                    has_consent = await analytics_service.check_analytics_consent(session, user_id)
+                    if not has_consent:
+                        return UsageAnalyticsResponse(
+                            success=False,
+                            error="Analytics consent required. Please grant analytics consent in your privacy settings.",
+                            insight_level=InsightLevelType.FREE,
+                            data_points_analyzed=0
+                        )
+
+                    analytics_service.log_data_access(user_id, "usage_analytics", "dashboard_analytics")
 
-            async for session in get_async_session():
-                analytics_service = AnalyticsService()
+                    # Get user's timezone for proper date handling
+                    user_timezone = await get_user_timezone(session, user_id)
 
-                # PIPEDA compliance: Check analytics consent and log data access
-                has_consent = await analytics_service.check_analytics_consent(session, user_id)
-                if not has_consent:
-                    return UsageAnalyticsResponse(
-                        success=False,
-                        error="Analytics consent required. Please grant analytics consent in your privacy settings.",
-                        insight_level=InsightLevelType.FREE,
-                        data_points_analyzed=0
+                    # Extract filter parameters
+                    child_id = uuid.UUID(filters.child_id) if filters.child_id else None
+                    start_date = filters.date_range.start_date if filters.date_range else date.today() - timedelta(days=30)
+                    end_date = filters.date_range.end_date if filters.date_range else date.today()
+                    period = filters.period or AnalyticsPeriodType.DAILY
+
+                    # Get usage totals with timezone support, aggregated in the database
+                    usage_data = await analytics_service.get_usage_aggregates(
+                        session, user_id, child_id, start_date, end_date, filters.usage_type, user_timezone
                     )
 
-                analytics_service.log_data_access(user_id, "usage_analytics", "dashboard_analytics")
+                    if not usage_data:
+                        return UsageAnalyticsResponse(
+                            success=True,
+                            message="No usage data found for the specified period",
+                            insight_level=InsightLevelType.FREE,
+                            data_points_analyzed=0,
+                            analytics=None
+                        )
 
-                # Get user's timezone for proper date handling
-                user_timezone = await get_user_timezone(session, user_id)
+                    # Calculate basic statistics
+                    basic_stats = analytics_service.calculate_basic_stats(usage_data)
 
-                # Extract filter parameters
-                child_id = uuid.UUID(filters.child_id) if filters.child_id else None
-                start_date = filters.date_range.start_date if filters.date_range else date.today() - timedelta(days=30)
-                end_date = filters.date_range.end_date if filters.date_range else date.today()
-                period = filters.period or AnalyticsPeriodType.DAILY
+                    # Calculate weekday vs weekend breakdown
+                    weekday_weekend_breakdown = analytics_service.calculate_weekday_weekend_breakdown(usage_data)
 
-                # Get usage data with timezone support
-                usage_data = await analytics_service.get_usage_data(
-                    session, user_id, child_id, start_date, end_date, filters.usage_type, user_timezone
-                )
+                    # Calculate current streak
+                    current_streak = analytics_service.calculate_current_streak(usage_data)
 
-                if not usage_data:
-                    return UsageAnalyticsResponse(
-                        success=True,
-                        message="No usage data found for the specified period",
-                        insight_level=InsightLevelType.FREE,
-                        data_points_analyzed=0,
-                        analytics=None
-                    )
+                    # Calculate patterns and distributions
+                    pattern_analysis = analytics_service.analyze_usage_patterns(usage_data)
+                    hourly_distribution = analytics_service.calculate_hourly_distribution(usage_data)
+                    daily_summaries = analytics_service.calculate_daily_summaries(usage_data)
 
-                # Calculate basic statistics
-                basic_stats = analytics_service.calculate_basic_stats(usage_data)
+                    # Get user subscription level and apply PIPEDA data minimization
+                    subscription_level = await get_user_subscription_level(user_id)
+                    insight_level = InsightLevelType.PREMIUM if subscription_level == "premium" else InsightLevelType.FREE
 
-                # Calculate weekday vs weekend breakdown
-                weekday_weekend_breakdown = analytics_service.calculate_weekday_weekend_breakdown(usage_data)
+                    # Apply PIPEDA data minimization based on subscription level
+                    privacy_level = "full" if subscription_level == "premium" else "standard"
+                    usage_data = analytics_service.anonymize_sensitive_data(usage_data, privacy_level)
 
-                # Calculate current streak
-                current_streak = analytics_service.calculate_current_streak(usage_data)
+                    # Get inventory data for cost analysis
+                    inventory_items = await analytics_service.get_inventory_data(session, user_id, child_id)
+                    cost_analysis = await analytics_service.calculate_cost_analysis(
+                        session, usage_data, inventory_items, period.value
+                    )
 
-                # Calculate patterns and distributions
-                pattern_analysis = analytics_service.analyze_usage_patterns(usage_data)
-                hourly_distribution = analytics_service.calculate_hourly_distribution(usage_data)
-                daily_summaries = analytics_service.calculate_daily_summaries(usage_data)
+                    # Premium insights
+                    premium_insights = analytics_service.calculate_premium_insights(usage_data, subscription_level)
+
+                    # Convert trend data
+                    trend_data = []
+                    for i, daily_stat in enumerate(daily_summaries):
+                        change_percentage = None
+                        if i > 0:
+                            prev_changes = daily_summaries[i-1].total_changes
+                            if prev_changes > 0:
+                                change_percentage = ((daily_stat.total_changes - prev_changes) / prev_changes) * 100
+
+                        trend_data.append(TrendDataPoint(
+                            date=daily_stat.date,
+                            value=float(daily_stat.total_changes),
+                            count=daily_stat.total_changes,
+                            label=daily_stat.date.strftime("%Y-%m-%d"),
+                            change_percentage=change_percentage
+                        ))
 
-                # Get user subscription level and apply PIPEDA data minimization
-                subscription_level = await get_user_subscription_level(user_id)
-                insight_level = InsightLevelType.PREMIUM if subscription_level == "premium" else InsightLevelType.FREE
+                    # Build analytics response
+                    analytics = UsageAnalytics(
+                        start_date=start_date,
+                        end_date=end_date,
+                        child_id=str(child_id) if child_id else None,
+                        period=period,
+                        insight_level=insight_level,
 
-                # Apply PIPEDA data minimization based on subscription level
-                privacy_level = "full" if subscription_level == "premium" else "standard"
-                usage_data = analytics_service.anonymize_sensitive_data(usage_data, privacy_level)
+                        # Core statistics
+                        total_changes=basic_stats['total_changes'],
+                        total_quantity=basic_stats['total_quantity'],
+                        daily_average=basic_stats['daily_average'],
 
-                # Get inventory data for cost analysis
-                inventory_items = await analytics_service.get_inventory_data(session, user_id, child_id)
-                cost_analysis = await analytics_service.calculate_cost_analysis(
-                    session, usage_data, inventory_items, period.value
-                )
+                        # Breakdown by condition
+                        wet_only_count=basic_stats['wet_only_count'],
+                        soiled_only_count=basic_stats['soiled_only_count'],
+                        wet_and_soiled_count=basic_stats['wet_and_soiled_count'],
+                        dry_changes_count=basic_stats['dry_changes_count'],
 
-                # Premium insights
-                premium_insights = analytics_service.calculate_premium_insights(usage_data, subscription_level)
-
-                # Convert trend data
-                trend_data = []
-                for i, daily_stat in enumerate(daily_summaries):
-                    change_percentage = None
-                    if i > 0:
-                        prev_changes = daily_summaries[i-1].total_changes
-                        if prev_changes > 0:
-                            change_percentage = ((daily_stat.total_changes - prev_changes) / prev_changes) * 100
-
-                    trend_data.append(TrendDataPoint(
-                        date=daily_stat.date,
-                        value=float(daily_stat.total_changes),
-                        count=daily_stat.total_changes,
-                        label=daily_stat.date.strftime("%Y-%m-%d"),
-                        change_percentage=change_percentage
-                    ))
-
-                # Build analytics response
-                analytics = UsageAnalytics(
-                    start_date=start_date,
-                    end_date=end_date,
-                    child_id=str(child_id) if child_id else None,
-                    period=period,
-                    insight_level=insight_level,
+                        # Weekday vs Weekend breakdown
+                        weekday_count=weekday_weekend_breakdown['weekday_count'],
+                        weekend_count=weekday_weekend_breakdown['weekend_count'],
 
-                    # Core statistics
-                    total_changes=basic_stats['total_changes'],
-                    total_quantity=basic_stats['total_quantity'],
-                    daily_average=basic_stats['daily_average'],
-
-                    # Breakdown by condition
-                    wet_only_count=basic_stats['wet_only_count'],
-                    soiled_only_count=basic_stats['soiled_only_count'],
-                    wet_and_soiled_count=basic_stats['wet_and_soiled_count'],
-                    dry_changes_count=basic_stats['dry_changes_count'],
-
-                    # Weekday vs Weekend breakdown
-                    weekday_count=weekday_weekend_breakdown['weekday_count'],
-                    weekend_count=weekday_weekend_breakdown['weekend_count'],
-
-                    # Streak insights
-                    current_streak=current_streak,
-
-                    # Timing insights
-                    average_interval_minutes=basic_stats['average_interval_minutes'],
-                    shortest_interval_minutes=None,  # Can be enhanced
-                    longest_interval_minutes=None,   # Can be enhanced
-
-                    # Pattern analysis
-                    usage_pattern=convert_usage_pattern(pattern_analysis),
-                    hourly_distribution=convert_hourly_distribution(hourly_distribution),
-
-                    # Trends and summaries
-                    daily_summaries=[convert_daily_summary(ds) for ds in daily_summaries],
-                    trend_data=trend_data,
-
-                    # Cost analysis
-                    cost_analysis=CostAnalysis(
-                        period=cost_analysis['period'],
-                        total_cost=cost_analysis['total_cost'],
-                        cost_per_change=cost_analysis['cost_per_change'],
-                        cost_per_day=cost_analysis['cost_per_day'],
-                        breakdown_by_product=[
-                            ProductCostBreakdown(
-                                product_type=item['product_type'],
-                                quantity_used=item['quantity_used'],
-                                total_cost=item['total_cost'],
-                                percentage_of_total=item['percentage_of_total']
-                            ) for item in cost_analysis['breakdown_by_product']
-                        ],
-                        comparison_previous_period=cost_analysis['comparison_previous_period'],
-                        budget_recommendation=cost_analysis['budget_recommendation']
-                    ),
+                        # Streak insights
+                        current_streak=current_streak,
 
-                    # Premium insights
-                    predictions=premium_insights.get('predictions') if insight_level == InsightLevelType.PREMIUM else None,
-                    health_insights=premium_insights.get('health_insights') if insight_level == InsightLevelType.PREMIUM else None,
-                    advanced_patterns=premium_insights.get('advanced_patterns') if insight_level == InsightLevelType.PREMIUM else None
-                )
+                        # Timing insights
+                        average_interval_minutes=basic_stats['average_interval_minutes'],
+                        shortest_interval_minutes=None,  # Can be enhanced
+                        longest_interval_minutes=None,   # Can be enhanced
 
-                logger.info(f"Generated usage analytics for user {user_id} with {len(usage_data)} data points")
+                        # Pattern analysis
+                        usage_pattern=convert_usage_pattern(pattern_analysis),
+                        hourly_distribution=convert_hourly_distribution(hourly_distribution),
 
-                response = UsageAnalyticsResponse(
-                    success=True,
-                    message="Usage analytics calculated successfully",
-                    insight_level=insight_level,
-                    data_points_analyzed=len(usage_data),
-                    analytics=analytics,
-                    cache_hit=False
-                )
+                        # Trends and summaries
+                        daily_summaries=[convert_daily_summary(ds) for ds in daily_summaries],
+                        trend_data=trend_data,
+
+                        # Cost analysis
+                        cost_analysis=CostAnalysis(
+                            period=cost_analysis['period'],
+                            total_cost=cost_analysis['total_cost'],
+                            cost_per_change=cost_analysis['cost_per_change'],
+                            cost_per_day=cost_analysis['cost_per_day'],
+                            breakdown_by_product=[
+                                ProductCostBreakdown(
+                                    product_type=item['product_type'],
+                                    quantity_used=item['quantity_used'],
+                                    total_cost=item['total_cost'],
+                                    percentage_of_total=item['percentage_of_total']
+                                ) for item in cost_analysis['breakdown_by_product']
+                            ],
+                            comparison_previous_period=cost_analysis['comparison_previous_period'],
+                            budget_recommendation=cost_analysis['budget_recommendation']
+                        ),
+
+                        # Premium insights
+                        predictions=premium_insights.get('predictions') if insight_level == InsightLevelType.PREMIUM else None,
+                        health_insights=premium_insights.get('health_insights') if insight_level == InsightLevelType.PREMIUM else None,
+                        advanced_patterns=premium_insights.get('advanced_patterns') if insight_level == InsightLevelType.PREMIUM else None
+                    )
 
-                # Cache the result (30 minutes for usage analytics)
-                cache.set(cache_key, response, ttl_minutes=30)
+                    logger.info(f"Generated usage analytics for user {user_id} with {len(usage_data)} data points")
 
-                execution_time = time.time() - start_time
-                performance_monitor.record_query_time("usage_analytics", execution_time, was_cached=False)
-                logger.info(f"Generated and cached usage analytics for user {user_id} - {execution_time:.3f}s")
+                    response = UsageAnalyticsResponse(
+                        success=True,
+                        message="Usage analytics calculated successfully",
+                        insight_level=insight_level,
+                        data_points_analyzed=len(usage_data),
+                        analytics=analytics,
+                        cache_hit=False
+                    )
 
-                return response
+                    return response
+
+            # Concurrent callers share one computation; an expired entry is
+            # served stale while it refreshes in the background
+            response = await AnalyticsCacheManager.cached_analytics_query(
+                cache_key,
+                compute_usage_analytics,
+                ttl_minutes=30,  # 30 minutes for usage analytics
+                cache_if=lambda result: result.analytics is not None,
+                on_outcome=record_outcome
+            )
+
+            execution_time = time.time() - start_time
+            performance_monitor.record_query_time("usage_analytics", execution_time, outcome)
+            logger.info(f"Usage analytics for user {user_id} ({outcome.value}) - {execution_time:.3f}s")
+            return response
 
         except Exception as e:
             logger.error(f"Error getting usage analytics: {e}")
@@ -439,8 +451,8 @@ class AnalyticsQueries:
 
                 child_uuid = uuid.UUID(child_id) if child_id else None
 
-                # Get usage data
-                usage_data = await analytics_service.get_usage_data(
+                # Get usage totals
+                usage_data = await analytics_service.get_usage_aggregates(
                     session, user_id, child_uuid, start_date, end_date
                 )
 
@@ -627,8 +639,8 @@ class AnalyticsQueries:
                 end_date = date.today()
                 start_date = end_date - timedelta(days=analysis_days)
 
-                # Get usage data
-                usage_data = await analytics_service.get_usage_data(
+                # Get usage totals
+                usage_data = await analytics_service.get_usage_aggregates(
                     session, user_id, child_uuid, start_date, end_date
                 )
 
@@ -650,9 +662,7 @@ class AnalyticsQueries:
                 quiet_hours = pattern_analysis.low_hours
 
                 # Analyze day-of-week patterns
-                from collections import Counter
-                day_counts = Counter(dp.day_of_week for dp in usage_data)
-                peak_days = [day for day, count in day_counts.most_common(3)]
+                peak_days = [day for day, count in usage_data.ranked_weekdays()[:3]]
 
                 # Generate recommendations
                 routine_recommendations = [
@@ -734,7 +744,7 @@ class AnalyticsQueries:
                 # Get recent usage data for consumption analysis
                 end_date = date.today()
                 start_date = end_date - timedelta(days=30)
-                usage_data = await analytics_service.get_usage_data(
+                usage_data = await analytics_service.get_usage_aggregates(
                     session, user_id, child_uuid, start_date, end_date
                 )
 
@@ -780,8 +790,8 @@ class AnalyticsQueries:
                 consumption_trends = [
                     TrendDataPoint(
                         date=date.today() - timedelta(days=i),
-                        value=float(len([dp for dp in usage_data if dp.timestamp.date() == date.today() - timedelta(days=i)])),
-                        count=len([dp for dp in usage_data if dp.timestamp.date() == date.today() - timedelta(days=i)]),
+                        value=float(usage_data.changes_on(date.today() - timedelta(days=i))),
+                        count=usage_data.changes_on(date.today() - timedelta(days=i)),
                         label=f"Day {i}",
                         change_percentage=None
                     )
@@ -868,32 +878,25 @@ class AnalyticsQueries:
                 subscription_level = await get_user_subscription_level(user_id)
                 insight_level = InsightLevelType.PREMIUM if subscription_level == "premium" else InsightLevelType.FREE
 
-                # Get quick stats for today, this week, this month
+                # One aggregate fetch covers every window: this month and this
+                # week always start within the last 30 days
                 today = date.today()
                 week_start = today - timedelta(days=today.weekday())
                 month_start = today.replace(day=1)
+                start_date = today - timedelta(days=30)
 
-                # Today's data - get user's timezone for consistency
-                user_timezone = await get_user_timezone(session, user_id)
-                today_usage = await analytics_service.get_usage_data(
-                    session, user_id, child_uuid, today, today,
-                    usage_type="diaper_change", user_timezone=user_timezone
+                # The context already loaded the user, so no timezone query
+                user_timezone = timezone_for_user(user)
+                usage_data = await analytics_service.get_usage_aggregates(
+                    session, user_id, child_uuid, start_date, today, user_timezone=user_timezone
                 )
-                today_changes = len(today_usage)
-
-                logger.info(f"Analytics dashboard timezone calculation for user {user_id}, child {child_id}: timezone={user_timezone}, today_changes={today_changes}")
-
-                # This week's data
-                week_usage = await analytics_service.get_usage_data(session, user_id, child_uuid, week_start, today)
-                week_changes = len(week_usage)
 
-                # This month's data
-                month_usage = await analytics_service.get_usage_data(session, user_id, child_uuid, month_start, today)
-                month_changes = len(month_usage)
+                # Get quick stats for today, this week, this month
+                today_changes = usage_data.changes_between(today, today, diaper_changes_only=True)
+                week_changes = usage_data.changes_between(week_start, today)
+                month_changes = usage_data.changes_between(month_start, today)
 
-                # Get recent analytics (last 30 days)
-                start_date = today - timedelta(days=30)
-                usage_data = await analytics_service.get_usage_data(session, user_id, child_uuid, start_date, today)
+                logger.info(f"Analytics dashboard timezone calculation for user {user_id}, child {child_id}: timezone={user_timezone}, today_changes={today_changes}")
 
                 # Calculate recent usage analytics
                 if usage_data:
@@ -941,9 +944,9 @@ class AnalyticsQueries:
                         average_weekly_changes=weekly_data['average_weekly_changes']
                     )
 
-                # Get inventory insights
-                inventory_items = await analytics_service.get_inventory_data(session, user_id, child_uuid)
-                insights_data = await analytics_service.calculate_inventory_insights(session, inventory_items, usage_data) if inventory_items and usage_data else []
+                # Get inventory insights (none without usage, so skip the read)
+                inventory_items = await analytics_service.get_inventory_data(session, user_id, child_uuid) if usage_data else []
+                insights_data = await analytics_service.calculate_inventory_insights(session, inventory_items, usage_data) if inventory_items else []
 
                 inventory_status = InventoryInsights(
                     child_id=child_id,
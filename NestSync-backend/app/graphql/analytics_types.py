@@ -561,24 +561,38 @@ class AnalyticsTrendsEnhanced:
     growth_indicator: str = strawberry.field(description="Growth-related change indicator")
 
 
+@strawberry.type
+class AnalyticsSectionError:
+    """Marker for a dashboard section that failed to load"""
+    section: str = strawberry.field(description="Name of the failed section")
+    reason: str = strawberry.field(description="Failure reason: timeout or error")
+    message: str = strawberry.field(description="Failure details")
+
+
 @strawberry.type
 class EnhancedAnalyticsDashboard:
     """Extended analytics dashboard with wireframe compliance"""
     # Existing fields (maintained for backward compatibility)
-    overview: AnalyticsOverview = strawberry.field(description="Overview section data")
-    usage: AnalyticsUsageEnhanced = strawberry.field(description="Usage patterns section")
-    trends: AnalyticsTrendsEnhanced = strawberry.field(description="Trends analysis section")
+    overview: Optional[AnalyticsOverview] = strawberry.field(description="Overview section data")
+    usage: Optional[AnalyticsUsageEnhanced] = strawberry.field(description="Usage patterns section")
+    trends: Optional[AnalyticsTrendsEnhanced] = strawberry.field(description="Trends analysis section")
 
     # New wireframe-compliant fields
-    weekly_patterns: WeeklyPatternData = strawberry.field(description="Your Baby's Patterns section")
-    cost_analysis: EnhancedCostAnalysis = strawberry.field(description="Enhanced cost insights")
-    peak_hours_detailed: DetailedPeakHours = strawberry.field(description="Detailed peak hours analysis")
+    weekly_patterns: Optional[WeeklyPatternData] = strawberry.field(description="Your Baby's Patterns section")
+    cost_analysis: Optional[EnhancedCostAnalysis] = strawberry.field(description="Enhanced cost insights")
+    peak_hours_detailed: Optional[DetailedPeakHours] = strawberry.field(description="Detailed peak hours analysis")
     size_predictions: Optional[SizeChangePredictions] = strawberry.field(description="Smart size change predictions")
 
     # Metadata
     last_updated: datetime = strawberry.field(description="Last analytics calculation timestamp")
     data_quality_score: float = strawberry.field(description="Data completeness score (0-100)")
 
+    # Partial results: sections listed here are null in this response
+    failed_sections: List[AnalyticsSectionError] = strawberry.field(
+        default_factory=list,
+        description="Sections that failed or timed out"
+    )
+
 
 @strawberry.type
 class EnhancedAnalyticsDashboardResponse:
@@ -650,6 +664,7 @@ __all__ = [
     "AnalyticsOverview",
     "AnalyticsUsageEnhanced",
     "AnalyticsTrendsEnhanced",
+    "AnalyticsSectionError",
     "EnhancedAnalyticsDashboard",
     "EnhancedAnalyticsDashboardResponse"
 ]
\ No newline at end of file
@@ -993,6 +993,9 @@ class ChildQueries:
                 total_count = len(all_children)
                 logger.info(f"DEDUPLICATED_RESOLVER: After deduplication: {total_count} unique children")
 
+                # Seed the request's child loader so follow-up child lookups skip the database
+                info.context.loaders.prime_children(all_children)
+
                 # STEP 4: Apply pagination to deduplicated results
                 offset = 0
                 if after:
@@ -1088,19 +1091,12 @@ class ChildQueries:
         Get specific child profile
         """
         try:
-            async for session in get_async_session():
-                result = await session.execute(
-                    select(Child).where(
-                        Child.id == uuid.UUID(child_id),
-                        Child.is_deleted == False
-                    )
-                )
-                child = result.scalar_one_or_none()
-                
-                if child:
-                    return child_to_graphql(child)
-                return None
-                
+            child = await info.context.loaders.children_by_id.load(uuid.UUID(child_id))
+
+            if child:
+                return child_to_graphql(child)
+            return None
+
         except Exception as e:
             logger.error(f"Error getting child: {e}")
             return None
@@ -58,69 +58,63 @@ class CollaborationQueries:
         try:
             user_id = await get_user_id_from_context(info)
             logger.info(f"my_families: Fetching families for user_id={user_id}")
+            if not user_id:
+                return FamilyConnection(nodes=[], total_count=0)
 
-            async for session in get_async_session():
-                try:
-                    # Execute query with detailed logging and eager loading
-                    logger.info(f"my_families: Executing SQL query for user_id={user_id}")
-                    result = await session.execute(
-                        select(Family)
-                        .join(FamilyMember)
-                        .options(
-                            selectinload(Family.members),
-                            selectinload(Family.children)
+            loaders = info.context.loaders
+            try:
+                # Batched membership lookup, then one eager-loaded family fetch
+                logger.info(f"my_families: Loading memberships for user_id={user_id}")
+                memberships = await loaders.family_memberships_by_user.load(user_id)
+                family_ids = list(dict.fromkeys(member.family_id for member in memberships))
+                families = [
+                    family for family in await loaders.families_by_id.load_many(family_ids)
+                    if family is not None
+                ]
+                logger.info(f"my_families: Loaded {len(families)} families")
+
+                # Try ORM conversion with detailed error tracking
+                converted_families = []
+                for idx, family in enumerate(families):
+                    try:
+                        logger.debug(f"my_families: Converting family {idx+1}/{len(families)} (id={family.id}, name={family.name})")
+                        converted_family = FamilyType.from_orm(family)
+                        converted_families.append(converted_family)
+                    except AttributeError as attr_error:
+                        logger.error(
+                            f"my_families: AttributeError converting family {family.id}: {attr_error}\n"
+                            f"Family attributes: {dir(family)}\n"
+                            f"Traceback: {traceback.format_exc()}"
                         )
-                        .where(
-                            FamilyMember.user_id == user_id,
-                            FamilyMember.status == ModelMemberStatus.ACTIVE
+                        raise
+                    except Exception as conv_error:
+                        logger.error(
+                            f"my_families: Conversion error for family {family.id}: {conv_error}\n"
+                            f"Traceback: {traceback.format_exc()}"
                         )
-                        .order_by(FamilyMember.joined_at.desc())
-                    )
-                    families = result.scalars().all()
-                    logger.info(f"my_families: SQL query returned {len(families)} families")
-
-                    # Try ORM conversion with detailed error tracking
-                    converted_families = []
-                    for idx, family in enumerate(families):
-                        try:
-                            logger.debug(f"my_families: Converting family {idx+1}/{len(families)} (id={family.id}, name={family.name})")
-                            converted_family = FamilyType.from_orm(family)
-                            converted_families.append(converted_family)
-                        except AttributeError as attr_error:
-                            logger.error(
-                                f"my_families: AttributeError converting family {family.id}: {attr_error}\n"
-                                f"Family attributes: {dir(family)}\n"
-                                f"Traceback: {traceback.format_exc()}"
-                            )
-                            raise
-                        except Exception as conv_error:
-                            logger.error(
-                                f"my_families: Conversion error for family {family.id}: {conv_error}\n"
-                                f"Traceback: {traceback.format_exc()}"
-                            )
-                            raise
-
-                    logger.info(f"my_families: Successfully converted {len(converted_families)} families")
-                    return FamilyConnection(
-                        nodes=converted_families,
-                        total_count=len(converted_families)
-                    )
+                        raise
 
-                except SQLAlchemyError as db_error:
-                    logger.error(
-                        f"my_families: Database error during query execution: {db_error}\n"
-                        f"User ID: {user_id}\n"
-                        f"Error type: {type(db_error).__name__}\n"
-                        f"Traceback: {traceback.format_exc()}"
-                    )
-                    raise
-                except Exception as inner_error:
-                    logger.error(
-                        f"my_families: Unexpected error in session context: {inner_error}\n"
-                        f"Error type: {type(inner_error).__name__}\n"
-                        f"Traceback: {traceback.format_exc()}"
-                    )
-                    raise
+                logger.info(f"my_families: Successfully converted {len(converted_families)} families")
+                return FamilyConnection(
+                    nodes=converted_families,
+                    total_count=len(converted_families)
+                )
+
+            except SQLAlchemyError as db_error:
+                logger.error(
+                    f"my_families: Database error during query execution: {db_error}\n"
+                    f"User ID: {user_id}\n"
+                    f"Error type: {type(db_error).__name__}\n"
+                    f"Traceback: {traceback.format_exc()}"
+                )
+                raise
+            except Exception as inner_error:
+                logger.error(
+                    f"my_families: Unexpected error loading families: {inner_error}\n"
+                    f"Error type: {type(inner_error).__name__}\n"
+                    f"Traceback: {traceback.format_exc()}"
+                )
+                raise
 
         except Exception as e:
             logger.error(
@@ -139,7 +133,8 @@ class CollaborationQueries:
 
             # Check user has access to family
             has_access = await CollaborationPermissionService.check_family_access(
-                user_id, str(family_id), 'view_data'
+                user_id, str(family_id), 'view_data',
+                session=await info.context.get_session()
             )
             if not has_access:
                 return None
@@ -167,7 +162,8 @@ class CollaborationQueries:
 
             # Check user has access to family
             has_access = await CollaborationPermissionService.check_family_access(
-                user_id, str(family_id), 'view_data'
+                user_id, str(family_id), 'view_data',
+                session=await info.context.get_session()
             )
             if not has_access:
                 return FamilyMemberConnection(nodes=[], total_count=0)
@@ -259,7 +255,8 @@ class CollaborationQueries:
 
             # Check user has access to family
             has_access = await CollaborationPermissionService.check_family_access(
-                user_id, str(family_id), 'view_data'
+                user_id, str(family_id), 'view_data',
+                session=await info.context.get_session()
             )
             if not has_access:
                 return []
@@ -342,8 +339,9 @@ class CollaborationMutations:
                 from app.services.email_service import EmailService
 
                 # Get family and inviter names for email
-                family_name = await CollaborationService._get_family_name(str(input.family_id))
-                inviter_name = await CollaborationService._get_user_name(user_id)
+                session = await info.context.get_session()
+                family_name = await CollaborationService._get_family_name(str(input.family_id), session)
+                inviter_name = await CollaborationService._get_user_name(user_id, session)
 
                 email_sent = await EmailService.send_caregiver_invitation(
                     email=input.email,
@@ -437,7 +435,8 @@ class CollaborationMutations:
 
             # Check permission to add children
             has_permission = await CollaborationPermissionService.check_family_access(
-                user_id, str(input.family_id), 'edit_child_profiles'
+                user_id, str(input.family_id), 'edit_child_profiles',
+                session=await info.context.get_session()
             )
             if not has_permission:
                 return AddChildToFamilyResponse(
@@ -522,7 +521,8 @@ class CollaborationMutations:
 
             # Verify family access
             has_access = await CollaborationPermissionService.check_family_access(
-                user_id, str(input.family_id), 'log_activity'
+                user_id, str(input.family_id), 'log_activity',
+                session=await info.context.get_session()
             )
             if not has_access:
                 return LogFamilyActivityResponse(
@@ -10,15 +10,18 @@ import uuid
 from typing import Optional, Dict, Any
 from fastapi import Request
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import strawberry
 from strawberry.fastapi import BaseContext
 from graphql import GraphQLError
 
-from app.config.database import get_async_session
+from app.config.database import get_async_session, RequestSessionScope
 from app.config.settings import settings
 from app.models import User
 from app.auth.supabase import supabase_auth
+from app.auth.user_cache import authenticated_users
 from app.utils.logging import sanitize_log_data
+from app.graphql.dataloaders import DataLoaderRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,8 @@ class NestSyncGraphQLContext(BaseContext):
     This context provides access to:
     - FastAPI request object
     - Current user (lazy-loaded via @cached_property)
+    - Request-scoped database session (one pool connection per operation)
+    - Request-scoped DataLoaders for batched lookups
     - Canadian compliance information
     - User permissions based on authentication status
     """
@@ -55,6 +60,12 @@ class NestSyncGraphQLContext(BaseContext):
         self._cached_user: Optional[User] = None
         self._auth_attempted: bool = False
         self._auth_token_hash: Optional[str] = None
+
+        # Request-scoped unit of work, opened and finished by RequestSessionExtension
+        self.session_scope = RequestSessionScope()
+
+        # Request-scoped DataLoaders (children, inventory, usage, families, features)
+        self.loaders = DataLoaderRegistry(session_provider=self.get_session)
         
         logger.info(
             "Context created for request",
@@ -76,6 +87,16 @@ class NestSyncGraphQLContext(BaseContext):
             }
         )
 
+    async def get_session(self) -> AsyncSession:
+        """
+        Get the request-scoped database session
+
+        Created lazily on first use and committed or rolled back once when the
+        GraphQL operation finishes. Services should receive this session
+        instead of opening their own.
+        """
+        return await self.session_scope.get_session()
+
     async def get_user(self) -> Optional[User]:
         """
         Get current authenticated user with per-request caching to prevent double token validation
@@ -147,9 +168,22 @@ class NestSyncGraphQLContext(BaseContext):
                 
             logger.info(f"Context: Token verified successfully - user_id: {user_id}")
             
+            # Recently loaded users skip the session entirely. The cached copy
+            # is detached: resolvers that change the user load it into their
+            # own session. can_login is checked again because locks expire
+            # with time
+            cached = authenticated_users.get(user_id)
+            if cached is not None and cached.can_login:
+                logger.info(f"Context: User authenticated from cache - user.id: {cached.id}")
+                self._cached_user = cached
+                return cached
+            if cached is not None:
+                authenticated_users.invalidate(user_id)
+
             # Query user from database with enhanced error handling
             try:
                 async for session in get_async_session():
+                    generation = authenticated_users.generation
                     result = await session.execute(
                         select(User).where(
                             User.supabase_user_id == uuid.UUID(user_id),
@@ -180,8 +214,10 @@ class NestSyncGraphQLContext(BaseContext):
                     
                     logger.info(f"Context: User authenticated successfully - user.id: {user.id}, user.email: {user.email}")
                     
-                    # Cache successful authentication result for this request
+                    # Cache successful authentication result for this request and,
+                    # briefly, for this user's following requests
                     self._cached_user = user
+                    authenticated_users.put(user, generation)
                     return user
                     
             except Exception as db_error:
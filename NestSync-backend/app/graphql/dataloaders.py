@@ -0,0 +1,221 @@
+"""
+GraphQL DataLoaders for NestSync
+Request-scoped batching of the lookups shared by dashboard resolvers
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from strawberry.dataloader import DataLoader
+
+from app.models import (
+    Child, InventoryItem, UsageLog, Family, FamilyMember, MemberStatus
+)
+from app.models.premium_subscription import FeatureAccess as FeatureAccessModel
+
+logger = logging.getLogger(__name__)
+
+
+class UsageCountKey(NamedTuple):
+    """
+    Key for the usage count loader
+
+    Keys sharing the same (usage_type, since, until) window are answered by a
+    single GROUP BY query, so callers should round window boundaries where
+    exact timestamps are not needed.
+    """
+    child_id: uuid.UUID
+    since: datetime
+    until: Optional[datetime] = None
+    usage_type: str = "diaper_change"
+
+
+def _as_uuid(value) -> uuid.UUID:
+    """Normalize string or UUID keys so cache hits do not depend on caller types"""
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+class DataLoaderRegistry:
+    """
+    Per-request registry of DataLoaders
+
+    One registry is created for each NestSyncGraphQLContext, so loader caches
+    never outlive a single GraphQL operation. Every loader turns N individual
+    lookups issued during one tick of the event loop into one `IN (...)` query,
+    executed on the request-scoped session from `session_provider`.
+    """
+
+    def __init__(self, session_provider: Callable[[], Awaitable[AsyncSession]]):
+        self._session_provider = session_provider
+        self._loaders: Dict[str, DataLoader] = {}
+
+    def _get_loader(self, name: str, load_fn) -> DataLoader:
+        loader = self._loaders.get(name)
+        if loader is None:
+            loader = DataLoader(load_fn=load_fn)
+            self._loaders[name] = loader
+        return loader
+
+    # =========================================================================
+    # Loaders
+    # =========================================================================
+
+    @property
+    def children_by_id(self) -> DataLoader:
+        """Child rows (non-deleted) keyed by child id"""
+        return self._get_loader("children_by_id", self._load_children_by_id)
+
+    @property
+    def inventory_by_child(self) -> DataLoader:
+        """List of non-deleted InventoryItem rows keyed by child id"""
+        return self._get_loader("inventory_by_child", self._load_inventory_by_child)
+
+    @property
+    def usage_counts_by_child(self) -> DataLoader:
+        """Usage log counts keyed by UsageCountKey"""
+        return self._get_loader("usage_counts_by_child", self._load_usage_counts_by_child)
+
+    @property
+    def family_memberships_by_user(self) -> DataLoader:
+        """List of active FamilyMember rows keyed by user id"""
+        return self._get_loader("family_memberships_by_user", self._load_family_memberships_by_user)
+
+    @property
+    def families_by_id(self) -> DataLoader:
+        """Family rows with members and children eagerly loaded, keyed by family id"""
+        return self._get_loader("families_by_id", self._load_families_by_id)
+
+    @property
+    def feature_access_by_user(self) -> DataLoader:
+        """List of FeatureAccess rows keyed by user id, ordered by feature name"""
+        return self._get_loader("feature_access_by_user", self._load_feature_access_by_user)
+
+    def prime_children(self, children: Sequence[Child]) -> None:
+        """Seed the child loader with rows fetched by a list query"""
+        loader = self.children_by_id
+        for child in children:
+            loader.prime(child.id, child)
+
+    # =========================================================================
+    # Batch Load Functions
+    # =========================================================================
+
+    async def _load_children_by_id(self, keys: List[uuid.UUID]) -> List[Optional[Child]]:
+        child_ids = [_as_uuid(key) for key in keys]
+        session = await self._session_provider()
+        result = await session.execute(
+            select(Child).where(
+                and_(
+                    Child.id.in_(child_ids),
+                    Child.is_deleted == False
+                )
+            )
+        )
+        children = {child.id: child for child in result.scalars().all()}
+        return [children.get(child_id) for child_id in child_ids]
+
+    async def _load_inventory_by_child(self, keys: List[uuid.UUID]) -> List[List[InventoryItem]]:
+        child_ids = [_as_uuid(key) for key in keys]
+        session = await self._session_provider()
+        result = await session.execute(
+            select(InventoryItem).where(
+                and_(
+                    InventoryItem.child_id.in_(child_ids),
+                    InventoryItem.is_deleted == False
+                )
+            ).order_by(InventoryItem.created_at.desc())
+        )
+        items_by_child: Dict[uuid.UUID, List[InventoryItem]] = defaultdict(list)
+        for item in result.scalars().all():
+            items_by_child[item.child_id].append(item)
+        return [items_by_child.get(child_id, []) for child_id in child_ids]
+
+    async def _load_usage_counts_by_child(self, keys: List[UsageCountKey]) -> List[int]:
+        # One grouped query per distinct window; a screen normally has one or two
+        windows: Dict[tuple, List[uuid.UUID]] = defaultdict(list)
+        for key in keys:
+            windows[(key.usage_type, key.since, key.until)].append(_as_uuid(key.child_id))
+
+        counts: Dict[tuple, int] = {}
+        session = await self._session_provider()
+        for (usage_type, since, until), child_ids in windows.items():
+            conditions = [
+                UsageLog.child_id.in_(child_ids),
+                UsageLog.usage_type == usage_type,
+                UsageLog.logged_at >= since,
+                UsageLog.is_deleted == False
+            ]
+            if until is not None:
+                conditions.append(UsageLog.logged_at < until)
+
+            result = await session.execute(
+                select(UsageLog.child_id, func.count(UsageLog.id))
+                .where(and_(*conditions))
+                .group_by(UsageLog.child_id)
+            )
+            for child_id, count in result.all():
+                counts[(child_id, usage_type, since, until)] = count
+
+        return [
+            counts.get((_as_uuid(key.child_id), key.usage_type, key.since, key.until), 0)
+            for key in keys
+        ]
+
+    async def _load_family_memberships_by_user(self, keys: List[uuid.UUID]) -> List[List[FamilyMember]]:
+        user_ids = [_as_uuid(key) for key in keys]
+        session = await self._session_provider()
+        result = await session.execute(
+            select(FamilyMember).where(
+                and_(
+                    FamilyMember.user_id.in_(user_ids),
+                    FamilyMember.status == MemberStatus.ACTIVE
+                )
+            ).order_by(FamilyMember.joined_at.desc())
+        )
+        members_by_user: Dict[uuid.UUID, List[FamilyMember]] = defaultdict(list)
+        for member in result.scalars().all():
+            members_by_user[member.user_id].append(member)
+        return [members_by_user.get(user_id, []) for user_id in user_ids]
+
+    async def _load_families_by_id(self, keys: List[uuid.UUID]) -> List[Optional[Family]]:
+        family_ids = [_as_uuid(key) for key in keys]
+        session = await self._session_provider()
+        result = await session.execute(
+            select(Family)
+            .options(
+                selectinload(Family.members),
+                selectinload(Family.children)
+            )
+            .where(Family.id.in_(family_ids))
+        )
+        families = {family.id: family for family in result.scalars().all()}
+        return [families.get(family_id) for family_id in family_ids]
+
+    async def _load_feature_access_by_user(self, keys: List[uuid.UUID]) -> List[List[FeatureAccessModel]]:
+        user_ids = [_as_uuid(key) for key in keys]
+        session = await self._session_provider()
+        result = await session.execute(
+            select(FeatureAccessModel)
+            .where(FeatureAccessModel.user_id.in_(user_ids))
+            .order_by(FeatureAccessModel.feature_name.asc())
+        )
+        features_by_user: Dict[uuid.UUID, List[FeatureAccessModel]] = defaultdict(list)
+        for feature in result.scalars().all():
+            features_by_user[feature.user_id].append(feature)
+        return [features_by_user.get(user_id, []) for user_id in user_ids]
+
+
+# =============================================================================
+# Export DataLoader Components
+# =============================================================================
+
+__all__ = [
+    "DataLoaderRegistry",
+    "UsageCountKey"
+]
@@ -664,17 +664,8 @@ class EmergencyQueries:
                         errors=["Access denied"]
                     )
 
-                # Get child information
-                child_result = await session.execute(
-                    select(Child)
-                    .where(
-                        and_(
-                            Child.id == uuid.UUID(child_id),
-                            Child.is_deleted == False
-                        )
-                    )
-                )
-                child = child_result.scalar_one_or_none()
+                # Get child information (shared with other fields via the request DataLoader)
+                child = await info.context.loaders.children_by_id.load(uuid.UUID(child_id))
 
                 if not child:
                     return EmergencyInformationResponse(
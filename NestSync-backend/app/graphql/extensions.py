@@ -0,0 +1,220 @@
+"""
+GraphQL Schema Extensions for NestSync
+Per-operation lifecycle hooks shared by every resolver
+"""
+
+import logging
+import time
+from inspect import isawaitable
+from typing import Any, Dict, Optional
+
+from graphql import GraphQLError, ValidationRule, get_named_type, is_introspection_type
+from prometheus_client import Counter, Histogram
+from strawberry.extensions import SchemaExtension
+
+from app.config.query_instrumentation import QueryStats, track_queries
+from app.config.settings import settings
+from app.services.metrics import COUNT_BUCKETS, DEFAULT_LATENCY_BUCKETS, LabelValueLimit
+
+logger = logging.getLogger(__name__)
+
+# The per-operation SQL summary is returned to clients only outside production
+QUERY_STATS_ENVIRONMENTS = ("development", "staging")
+
+# SECURITY: HIGH-001 - schema introspection is refused in these environments
+INTROSPECTION_DISABLED_ENVIRONMENTS = ("production", "staging")
+
+operation_sql_queries = Histogram(
+    "graphql_operation_sql_queries",
+    "SQL statements executed per GraphQL operation",
+    labelnames=("operation",),
+    buckets=COUNT_BUCKETS
+)
+operation_sql_seconds = Histogram(
+    "graphql_operation_sql_seconds",
+    "Time spent in SQL per GraphQL operation",
+    labelnames=("operation",),
+    buckets=DEFAULT_LATENCY_BUCKETS
+)
+operation_seconds = Histogram(
+    "graphql_operation_seconds",
+    "GraphQL operation latency",
+    labelnames=("operation", "operation_type"),
+    buckets=DEFAULT_LATENCY_BUCKETS
+)
+resolver_seconds = Histogram(
+    "graphql_resolver_seconds",
+    "Latency of top-level GraphQL resolvers",
+    labelnames=("resolver",),
+    buckets=DEFAULT_LATENCY_BUCKETS
+)
+operation_errors = Counter(
+    "graphql_operation_errors_total",
+    "GraphQL operations that returned errors",
+    labelnames=("operation",)
+)
+
+# Operation names are chosen by clients
+operation_label = LabelValueLimit()
+
+
+class RequestSessionExtension(SchemaExtension):
+    """
+    Opens the request-scoped database session for each GraphQL operation
+
+    The session itself is created lazily by the first resolver that needs it.
+    When the operation completes it is committed if execution produced no
+    errors and rolled back otherwise, then returned to the pool. If the
+    transaction was lost to a statement a resolver caught, or the commit
+    fails, the response gets an error so the rolled-back writes are not
+    reported as saved.
+    """
+
+    async def on_operation(self):
+        context = self.execution_context.context
+        scope = getattr(context, "session_scope", None)
+        if scope is None:
+            yield
+            return
+
+        token = scope.bind()
+        try:
+            yield
+        finally:
+            result = self.execution_context.result
+            failed = bool(self.execution_context.errors) or bool(result and result.errors)
+            try:
+                await scope.finish(commit=not failed)
+            finally:
+                scope.unbind(token)
+            if scope.failed and result is not None:
+                result.errors = [
+                    *(result.errors or []),
+                    GraphQLError("The operation's changes could not be saved and were rolled back")
+                ]
+
+
+class QueryStatsExtension(SchemaExtension):
+    """
+    Counts and times the SQL statements each GraphQL operation issues
+
+    Strawberry runs on_operation exits in list order, so this must come after
+    RequestSessionExtension for the statements flushed by the final commit to
+    be counted.
+    Totals go to the graphql_operation_sql_* histograms; in development and
+    staging the summary, with statement fingerprints, is also returned under
+    the response's extensions.sqlQueries.
+    """
+
+    stats: Optional[QueryStats] = None
+
+    def on_operation(self):
+        with track_queries() as self.stats:
+            yield
+        operation = operation_label(self.execution_context.operation_name or "anonymous")
+        operation_sql_queries.labels(operation=operation).observe(self.stats.count)
+        operation_sql_seconds.labels(operation=operation).observe(self.stats.total_ms / 1000)
+
+    def get_results(self) -> Dict[str, Any]:
+        if self.stats is None or settings.environment not in QUERY_STATS_ENVIRONMENTS:
+            return {}
+        return {"sqlQueries": self.stats.summary()}
+
+
+class OperationMetricsExtension(SchemaExtension):
+    """
+    Records operation and top-level resolver latency as Prometheus histograms
+
+    Only root fields are timed; nested fields would add a timer per object
+    in every list. Listed after RequestSessionExtension, so operation latency
+    includes the commit and a failed commit counts as an error.
+    """
+
+    def on_operation(self):
+        started = time.perf_counter()
+        yield
+        context = self.execution_context
+        operation = operation_label(context.operation_name or "anonymous")
+        try:
+            operation_type = context.operation_type.value
+        except Exception:
+            operation_type = "unknown"  # the document did not parse
+        operation_seconds.labels(operation=operation, operation_type=operation_type).observe(
+            time.perf_counter() - started
+        )
+        if context.errors or (context.result and context.result.errors):
+            operation_errors.labels(operation=operation).inc()
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        if info.path.prev is not None:
+            return _next(root, info, *args, **kwargs)
+
+        started = time.perf_counter()
+        resolver = f"{info.parent_type.name}.{info.field_name}"
+        result = _next(root, info, *args, **kwargs)
+        if not isawaitable(result):
+            resolver_seconds.labels(resolver=resolver).observe(time.perf_counter() - started)
+            return result
+
+        async def timed():
+            try:
+                return await result
+            finally:
+                resolver_seconds.labels(resolver=resolver).observe(time.perf_counter() - started)
+
+        return timed()
+
+
+# =============================================================================
+# Validation Rules
+# =============================================================================
+
+class IntrospectionDisabledRule(ValidationRule):
+    """
+    Reject __schema and __type(...) selections; __typename stays allowed
+
+    SECURITY: HIGH-001 - Prevents API schema exposure
+    CWE-200: Exposure of Sensitive Information to an Unauthorized Actor
+    """
+
+    def enter_field(self, node, *_args):
+        field_type = get_named_type(self.context.get_type())
+        if field_type and is_introspection_type(field_type):
+            self.report_error(GraphQLError(
+                "GraphQL introspection is disabled in this environment",
+                node,
+                extensions={
+                    "code": "INTROSPECTION_DISABLED",
+                    "security": "Introspection queries are blocked for security reasons"
+                }
+            ))
+
+
+class IntrospectionGuardExtension(SchemaExtension):
+    """
+    Apply IntrospectionDisabledRule to client operations in production and staging
+
+    Operations arriving over HTTP or WebSocket carry a request context;
+    in-process calls such as the observability schema check do not, and
+    may still introspect.
+    """
+
+    def on_operation(self):
+        if settings.environment in INTROSPECTION_DISABLED_ENVIRONMENTS and self.execution_context.context is not None:
+            self.execution_context.validation_rules = (
+                self.execution_context.validation_rules + (IntrospectionDisabledRule,)
+            )
+        yield
+
+
+# =============================================================================
+# Export Extensions
+# =============================================================================
+
+__all__ = [
+    "RequestSessionExtension",
+    "QueryStatsExtension",
+    "OperationMetricsExtension",
+    "IntrospectionGuardExtension",
+    "IntrospectionDisabledRule"
+]
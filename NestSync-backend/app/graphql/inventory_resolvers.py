@@ -17,6 +17,9 @@ from sqlalchemy.orm import selectinload, joinedload
 from app.config.database import get_async_session
 from app.models import Child, InventoryItem, UsageLog, StockThreshold
 from app.models.user import User
+from app.graphql.dataloaders import UsageCountKey
+from app.jobs.queue import JobKind, enqueue_job
+from app.services.analytics_cache import AnalyticsCacheManager
 from app.utils.data_transformations import (
     get_timezone_aware_today_boundaries,
     get_timezone_for_province,
@@ -163,17 +166,11 @@ class InventoryQueries:
         try:
             async for session in get_async_session():
                 child_uuid = uuid.UUID(child_id)
+                loaders = info.context.loaders
                 
-                # Get current diaper inventory
-                diaper_query = select(InventoryItem).where(
-                    and_(
-                        InventoryItem.child_id == child_uuid,
-                        InventoryItem.product_type == "diaper",
-                        InventoryItem.is_deleted == False
-                    )
-                )
-                diaper_items = await session.execute(diaper_query)
-                diaper_items = diaper_items.scalars().all()
+                # Get current diaper inventory (batched across children via DataLoader)
+                inventory_items = await loaders.inventory_by_child.load(child_uuid)
+                diaper_items = [item for item in inventory_items if item.product_type == "diaper"]
                 
                 # Calculate total diapers left
                 diapers_left = sum(item.quantity_remaining for item in diaper_items)
@@ -184,17 +181,9 @@ class InventoryQueries:
 
                 logger.info(f"Dashboard stats timezone calculation for child {child_uuid}: timezone={user_timezone}, today_range={today_start_utc} to {today_end_utc}")
 
-                today_changes_query = select(func.count(UsageLog.id)).where(
-                    and_(
-                        UsageLog.child_id == child_uuid,
-                        UsageLog.usage_type == "diaper_change",
-                        UsageLog.logged_at >= today_start_utc,
-                        UsageLog.logged_at < today_end_utc,
-                        UsageLog.is_deleted == False
-                    )
+                today_changes = await loaders.usage_counts_by_child.load(
+                    UsageCountKey(child_uuid, today_start_utc, today_end_utc)
                 )
-                today_changes_result = await session.execute(today_changes_query)
-                today_changes = today_changes_result.scalar() or 0
                 
                 # Get last change
                 last_change_query = select(UsageLog).where(
@@ -210,30 +199,17 @@ class InventoryQueries:
                 last_change = format_time_ago(last_change_log.logged_at) if last_change_log else None
                 
                 # Get child's profile daily usage count as primary source
-                child_query = select(Child).where(
-                    and_(
-                        Child.id == child_uuid,
-                        Child.is_deleted == False
-                    )
-                )
-                child_result = await session.execute(child_query)
-                child = child_result.scalar_one_or_none()
+                child = await loaders.children_by_id.load(child_uuid)
                 
                 # Use child's profile daily usage as primary source
                 daily_usage = float(child.daily_usage_count) if child and child.daily_usage_count else 8.0
                 
                 # Calculate average daily usage over last 7 days for comparison
-                week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-                usage_query = select(func.count(UsageLog.id)).where(
-                    and_(
-                        UsageLog.child_id == child_uuid,
-                        UsageLog.usage_type == "diaper_change",
-                        UsageLog.logged_at >= week_ago,
-                        UsageLog.is_deleted == False
-                    )
+                # (minute-aligned so concurrent dashboard fields share one batched window)
+                week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).replace(second=0, microsecond=0)
+                weekly_usage = await loaders.usage_counts_by_child.load(
+                    UsageCountKey(child_uuid, week_ago)
                 )
-                usage_result = await session.execute(usage_query)
-                weekly_usage = usage_result.scalar() or 0
                 
                 # Only use logged usage if we have significant data (minimum 14 logged changes in 7 days)
                 # This prevents unrealistic calculations from sparse logging
@@ -636,18 +612,19 @@ class InventoryMutations:
 
                     logger.info(f"=== INVENTORY DEDUCTION END ===")
                 
+                # Queue analytics processing in the same transaction as the change
+                await session.flush()
+                await enqueue_job(
+                    session,
+                    JobKind.ANALYTICS_CHANGE_EVENT,
+                    {"child_id": str(child_uuid), "usage_log_id": str(usage_log.id)},
+                    dedup_key=f"change_event:{usage_log.id}"
+                )
+
                 await session.commit()
 
-                # Trigger analytics processing for the logged diaper change
-                try:
-                    from app.services.enhanced_analytics_service import AnalyticsBackgroundProcessor
-                    analytics_processor = AnalyticsBackgroundProcessor()
-                    logged_date = (input.logged_at or datetime.now(timezone.utc)).date()
-                    await analytics_processor.process_daily_analytics(str(child_uuid), logged_date)
-                    logger.info(f"Analytics processing triggered for child {child_uuid} on {logged_date}")
-                except Exception as analytics_error:
-                    logger.error(f"Analytics processing failed for child {child_uuid}: {analytics_error}")
-                    # Don't fail the diaper change logging if analytics fails
+                # Drop cached analytics that this change makes stale, on every replica
+                await AnalyticsCacheManager.invalidate(user_ids=[child.parent_id], child_ids=[child_uuid])
 
                 return LogDiaperChangeResponse(
                     success=True,
@@ -3,6 +3,7 @@ GraphQL resolvers for observability and monitoring system
 """
 
 import logging
+import time
 import strawberry
 from typing import List, Optional
 from datetime import datetime, timedelta
@@ -13,6 +14,9 @@ from app.graphql.observability_types import (
     HealthCheckType,
     SystemAlertType,
     HealthMetricType,
+    HealthMetricSeriesType,
+    MetricBucketType,
+    MetricPointType,
     CategoryHealthType,
     AlertSummaryType,
     ResolveAlertInput,
@@ -236,6 +240,51 @@ class ObservabilityQuery:
             logger.error(f"Error getting performance metrics: {e}")
             raise
 
+    @strawberry.field
+    async def health_metric_names(self, info: Info, unit: Optional[str] = None) -> List[str]:
+        """
+        Names of the health metrics with recorded time series, e.g. database_health.connection_time_ms
+        """
+        observability = await get_observability_service()
+        return observability.timeseries.names(unit=unit)
+
+    @strawberry.field
+    async def health_metric_series(
+        self,
+        info: Info,
+        name: str,
+        hours: float = 1,
+        resolution_seconds: Optional[int] = None
+    ) -> Optional[HealthMetricSeriesType]:
+        """
+        One health metric over the last N hours
+
+        resolution_seconds is 0 (raw points), 60 or 3600; by default the
+        finest resolution still covering the range is used.
+        """
+        try:
+            observability = await get_observability_service()
+            series = observability.timeseries.get(name)
+            if series is None:
+                return None
+
+            since = time.time() - hours * 3600
+            if resolution_seconds is None:
+                resolution_seconds = observability.timeseries.resolution_for(series, since)
+            entries = observability.timeseries.query(name, since, resolution=resolution_seconds)
+
+            return HealthMetricSeriesType(
+                name=name,
+                unit=series.unit,
+                resolution_seconds=resolution_seconds,
+                points=[MetricPointType.from_point(point) for point in entries] if resolution_seconds == 0 else [],
+                buckets=[MetricBucketType.from_bucket(bucket) for bucket in entries] if resolution_seconds else []
+            )
+
+        except Exception as e:
+            logger.error(f"Error getting health metric series: {e}")
+            raise
+
 
 @strawberry.type
 class ObservabilityMutation:
@@ -4,9 +4,10 @@ GraphQL types for observability and monitoring system
 
 import strawberry
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
+from app.services.health_timeseries import MetricBucket, MetricPoint
 from app.services.observability_service import AlertSeverity, HealthMetric, HealthCheck, SystemAlert
 
 
@@ -97,6 +98,47 @@ class SystemAlertType:
         )
 
 
+@strawberry.type
+class MetricPointType:
+    """Raw health metric measurement from the time series store"""
+    timestamp: datetime
+    value: float
+
+    @classmethod
+    def from_point(cls, point: MetricPoint) -> "MetricPointType":
+        return cls(timestamp=datetime.fromtimestamp(point.timestamp, timezone.utc), value=point.value)
+
+
+@strawberry.type
+class MetricBucketType:
+    """Downsampled health metric measurements"""
+    start: datetime
+    count: int
+    mean: float
+    minimum: float
+    maximum: float
+
+    @classmethod
+    def from_bucket(cls, bucket: MetricBucket) -> "MetricBucketType":
+        return cls(
+            start=datetime.fromtimestamp(bucket.start, timezone.utc),
+            count=bucket.count,
+            mean=bucket.mean,
+            minimum=bucket.minimum,
+            maximum=bucket.maximum
+        )
+
+
+@strawberry.type
+class HealthMetricSeriesType:
+    """Range of one health metric; points at resolution 0, buckets otherwise"""
+    name: str
+    unit: str
+    resolution_seconds: int
+    points: List[MetricPointType]
+    buckets: List[MetricBucketType]
+
+
 @strawberry.type
 class CategoryHealthType:
     """Health summary for a specific category"""
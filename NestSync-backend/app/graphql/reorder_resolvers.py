@@ -14,6 +14,7 @@ import strawberry
 from strawberry.types import Info
 
 from ..config.database import get_async_session
+from ..jobs.queue import JobKind, enqueue_job
 from ..models.reorder import (
     ReorderSubscription, ReorderPreferences, ConsumptionPrediction,
     RetailerConfiguration, ProductMapping, ReorderTransaction, OrderStatusUpdate,
@@ -23,22 +24,18 @@ from ..models.user import User
 from ..models.child import Child
 from ..models.inventory import InventoryItem, UsageLog
 from ..services.reorder_service import ReorderService
-from ..auth.dependencies import get_user_id_from_context
 from sqlalchemy import select, func
 
 
 async def get_current_user_from_info(info: Info) -> Optional[User]:
-    """Get current user from GraphQL info context"""
-    try:
-        user_id = await get_user_id_from_context(info)
-        if not user_id:
-            return None
+    """
+    Get current user from GraphQL info context
 
-        async for session in get_async_session():
-            result = await session.execute(
-                select(User).where(User.id == user_id)
-            )
-            return result.scalar_one_or_none()
+    Reuses the user already authenticated by the request context instead of
+    re-selecting the row for every reorder field.
+    """
+    try:
+        return await info.context.get_user()
     except Exception as e:
         logger.error(f"Error getting current user: {e}")
         return None
@@ -2221,10 +2218,56 @@ class ReorderMutations:
         info: Info,
         child_id: str
     ) -> PredictionResponse:
-        """Trigger ML prediction update for a child"""
-        return PredictionResponse(
-            success=False,
-            prediction=None,
-            message="Prediction update not implemented yet"
-        )
+        """Queue an ML prediction update for a child"""
+        try:
+            current_user = await get_current_user_from_info(info)
+            if not current_user:
+                return PredictionResponse(
+                    success=False,
+                    prediction=None,
+                    message="Authentication required",
+                    recommendations=None
+                )
+
+            async for session in get_async_session():
+                # Verify user owns the child
+                child_result = await session.execute(
+                    select(Child.id).where(
+                        Child.id == child_id,
+                        Child.parent_id == current_user.id,
+                        Child.is_deleted == False
+                    )
+                )
+                if child_result.scalar_one_or_none() is None:
+                    return PredictionResponse(
+                        success=False,
+                        prediction=None,
+                        message="Child not found or access denied",
+                        recommendations=None
+                    )
+
+                # Model training runs on the job workers, not in the request
+                await enqueue_job(
+                    session,
+                    JobKind.CONSUMPTION_PREDICTION,
+                    {"child_id": str(child_id)},
+                    dedup_key=f"consumption_prediction:{child_id}"
+                )
+                await session.commit()
+
+            return PredictionResponse(
+                success=True,
+                prediction=None,
+                message="Prediction update queued",
+                recommendations=None
+            )
+
+        except Exception as e:
+            logger.error(f"Error queueing prediction update: {e}")
+            return PredictionResponse(
+                success=False,
+                prediction=None,
+                message=f"Failed to queue prediction update: {str(e)}",
+                recommendations=None
+            )
 
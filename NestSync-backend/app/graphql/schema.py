@@ -16,6 +16,12 @@ from .collaboration_resolvers import CollaborationMutations, CollaborationQuerie
 from .emergency_resolvers import EmergencyMutations, EmergencyQueries
 from .reorder_resolvers import ReorderMutations, ReorderQueries
 from .subscription_resolvers import SubscriptionQueries, SubscriptionMutations
+from .extensions import (
+    OperationMetricsExtension,
+    QueryStatsExtension,
+    RequestSessionExtension,
+    IntrospectionGuardExtension
+)
 # from .observability_resolvers import ObservabilityQuery, ObservabilityMutation  # Temporarily disabled for testing
 from .types import (
     UserProfile,
@@ -163,6 +169,8 @@ class Query:
     # active_alerts = strawberry.field(resolver=ObservabilityQuery.active_alerts)
     # health_checks_by_category = strawberry.field(resolver=ObservabilityQuery.health_checks_by_category)
     # performance_metrics = strawberry.field(resolver=ObservabilityQuery.performance_metrics)
+    # health_metric_names = strawberry.field(resolver=ObservabilityQuery.health_metric_names)
+    # health_metric_series = strawberry.field(resolver=ObservabilityQuery.health_metric_series)
 
     @strawberry.field
     async def health_check(self) -> str:
@@ -298,7 +306,15 @@ class Subscription:
 schema = strawberry.Schema(
     query=Query,
     mutation=Mutation,
-    subscription=Subscription
+    subscription=Subscription,
+    # on_operation exits run in this order: the session commits first, so the
+    # metrics and SQL stats below include the commit
+    extensions=[
+        RequestSessionExtension,
+        OperationMetricsExtension,
+        QueryStatsExtension,
+        IntrospectionGuardExtension
+    ]
 )
 
 
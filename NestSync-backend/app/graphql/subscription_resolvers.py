@@ -814,48 +814,45 @@ class SubscriptionQueries:
                     upgrade_recommendation="Authentication required to access premium features"
                 )
 
-            async for session in get_async_session():
-                # Get feature access record
-                query = select(FeatureAccessModel).where(
-                    FeatureAccessModel.user_id == user.id,
-                    FeatureAccessModel.feature_id == feature_id
-                )
-
-                result = await session.execute(query)
-                feature_access = result.scalar_one_or_none()
+            # Get feature access record from the user's batched feature list
+            feature_records = await info.context.loaders.feature_access_by_user.load(user.id)
+            feature_access = next(
+                (f for f in feature_records if f.feature_id == feature_id),
+                None
+            )
 
-                if not feature_access:
-                    # No access record exists - feature not accessible
-                    return FeatureAccessResponse(
-                        has_access=False,
-                        feature_id=feature_id,
-                        tier_required=SubscriptionTierEnum.STANDARD,
-                        usage_count=None,
-                        usage_limit=None,
-                        upgrade_recommendation=f"Upgrade to access {feature_id.replace('_', ' ').title()}"
-                    )
+            if not feature_access:
+                # No access record exists - feature not accessible
+                return FeatureAccessResponse(
+                    has_access=False,
+                    feature_id=feature_id,
+                    tier_required=SubscriptionTierEnum.STANDARD,
+                    usage_count=None,
+                    usage_limit=None,
+                    upgrade_recommendation=f"Upgrade to access {feature_id.replace('_', ' ').title()}"
+                )
 
-                # Check if access is still valid
-                now = datetime.now(timezone.utc)
-                has_access = feature_access.has_access
+            # Check if access is still valid
+            now = datetime.now(timezone.utc)
+            has_access = feature_access.has_access
 
-                if feature_access.access_expires_at and feature_access.access_expires_at < now:
-                    has_access = False
+            if feature_access.access_expires_at and feature_access.access_expires_at < now:
+                has_access = False
 
-                # Generate upgrade recommendation if no access
-                upgrade_recommendation = None
-                if not has_access:
-                    tier_name = feature_access.tier_required.title() if hasattr(feature_access.tier_required, 'title') else str(feature_access.tier_required)
-                    upgrade_recommendation = f"Upgrade to {tier_name} plan to access this feature"
+            # Generate upgrade recommendation if no access
+            upgrade_recommendation = None
+            if not has_access:
+                tier_name = feature_access.tier_required.title() if hasattr(feature_access.tier_required, 'title') else str(feature_access.tier_required)
+                upgrade_recommendation = f"Upgrade to {tier_name} plan to access this feature"
 
-                return FeatureAccessResponse(
-                    has_access=has_access,
-                    feature_id=feature_id,
-                    tier_required=SubscriptionTierEnum[feature_access.tier_required.upper()],
-                    usage_count=feature_access.usage_count,
-                    usage_limit=feature_access.usage_limit,
-                    upgrade_recommendation=upgrade_recommendation
-                )
+            return FeatureAccessResponse(
+                has_access=has_access,
+                feature_id=feature_id,
+                tier_required=SubscriptionTierEnum[feature_access.tier_required.upper()],
+                usage_count=feature_access.usage_count,
+                usage_limit=feature_access.usage_limit,
+                upgrade_recommendation=upgrade_recommendation
+            )
 
         except Exception as e:
             logger.error(f"Error checking feature access for {feature_id}: {e}")
@@ -886,17 +883,11 @@ class SubscriptionQueries:
                 logger.warning("Unauthenticated request to myFeatureAccess")
                 return []
 
-            async for session in get_async_session():
-                # Get all feature access records
-                query = select(FeatureAccessModel).where(
-                    FeatureAccessModel.user_id == user.id
-                ).order_by(FeatureAccessModel.feature_name.asc())
-
-                result = await session.execute(query)
-                feature_records = result.scalars().all()
+            # Get all feature access records (shared with checkFeatureAccess via DataLoader)
+            feature_records = await info.context.loaders.feature_access_by_user.load(user.id)
 
-                # Convert to GraphQL types
-                return [model_to_feature_access_record(f) for f in feature_records]
+            # Convert to GraphQL types
+            return [model_to_feature_access_record(f) for f in feature_records]
 
         except Exception as e:
             logger.error(f"Error fetching feature access: {e}")
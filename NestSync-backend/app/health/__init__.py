@@ -3,6 +3,15 @@ Health Check Module
 Provides comprehensive system health monitoring
 """
 
-from .auth_health import get_auth_health, get_auth_health_simple, auth_health_checker
+from .auth_health import get_auth_health, get_auth_health_simple, simplify_auth_health, auth_health_checker
+from .snapshot import health_snapshot, register_default_checks, SYSTEM_CHECKS
 
-__all__ = ["get_auth_health", "get_auth_health_simple", "auth_health_checker"]
\ No newline at end of file
+__all__ = [
+    "get_auth_health",
+    "get_auth_health_simple",
+    "simplify_auth_health",
+    "auth_health_checker",
+    "health_snapshot",
+    "register_default_checks",
+    "SYSTEM_CHECKS"
+]
\ No newline at end of file
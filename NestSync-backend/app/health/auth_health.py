@@ -229,6 +229,15 @@ async def get_auth_health() -> Dict[str, Any]:
     """
     return await auth_health_checker.check_auth_system_health()
 
+def simplify_auth_health(full_health: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a full auth health result to the simple status fields"""
+    return {
+        "status": full_health["status"],
+        "healthy": full_health["status"] == "healthy",
+        "response_time_ms": full_health.get("response_time_ms"),
+        "critical_failures": full_health.get("critical_failures", [])
+    }
+
 async def get_auth_health_simple() -> Dict[str, Any]:
     """
     Simple health check for load balancers and monitoring
@@ -236,16 +245,11 @@ async def get_auth_health_simple() -> Dict[str, Any]:
     """
     try:
         full_health = await get_auth_health()
-        return {
-            "status": full_health["status"],
-            "healthy": full_health["status"] == "healthy",
-            "response_time_ms": full_health["response_time_ms"],
-            "critical_failures": full_health.get("critical_failures", [])
-        }
+        return simplify_auth_health(full_health)
     except Exception as e:
         return {
             "status": "critical",
             "healthy": False,
             "error": str(e),
             "critical_failures": ["health_check_exception"]
-        }
\ No newline at end of file
+        }
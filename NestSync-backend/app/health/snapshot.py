@@ -0,0 +1,247 @@
+"""
+Health Snapshot Service
+Refreshes health checks in the background so health endpoints never run them
+
+Load balancers and uptime monitors poll the health endpoints every few
+seconds per replica. Each registered check runs on its own cadence in a
+background task, and endpoints read the cached result together with its
+age. A result older than a few intervals is reported as stale, so
+readiness still fails when a check hangs or its task dies.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STALE_AFTER_INTERVALS = 3
+
+# Startup waits this long for the first results before serving traffic
+WARM_UP_TIMEOUT_SECONDS = 5.0
+
+
+# =============================================================================
+# Checks and Results
+# =============================================================================
+
+@dataclass
+class SnapshotCheck:
+    """A health check and how often to refresh it"""
+    name: str
+    run: Callable[[], Awaitable[Dict[str, Any]]]
+    interval_seconds: float
+    timeout_seconds: float = 10.0
+
+    @property
+    def stale_after_seconds(self) -> float:
+        return self.interval_seconds * STALE_AFTER_INTERVALS + self.timeout_seconds
+
+
+@dataclass
+class SnapshotEntry:
+    """The latest result of one check"""
+    result: Dict[str, Any]
+    refreshed_at: datetime
+    refreshed_monotonic: float
+    duration_ms: float
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.refreshed_monotonic
+
+
+# =============================================================================
+# Snapshot Service
+# =============================================================================
+
+class HealthSnapshotService:
+    """Registry of background-refreshed health checks"""
+
+    def __init__(self):
+        self.checks: Dict[str, SnapshotCheck] = {}
+        self.entries: Dict[str, SnapshotEntry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._warm_up: Optional[asyncio.Task] = None
+
+    def register(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+        interval_seconds: float,
+        timeout_seconds: float = 10.0
+    ) -> None:
+        """Add a check; registering a name again replaces it"""
+        self.checks[name] = SnapshotCheck(name, run, interval_seconds, timeout_seconds)
+
+    async def refresh(self, name: str) -> SnapshotEntry:
+        """Run one check now; concurrent callers share a single run"""
+        check = self.checks[name]
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        started = time.monotonic()
+
+        async with lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry.refreshed_monotonic >= started:
+                return entry  # refreshed while we waited
+
+            try:
+                result = await asyncio.wait_for(check.run(), timeout=check.timeout_seconds)
+            except asyncio.TimeoutError:
+                result = {"status": "error", "error": f"Check timed out after {check.timeout_seconds}s"}
+            except Exception as e:
+                logger.error(f"Health check {name} failed: {e}")
+                result = {"status": "error", "error": str(e)}
+
+            finished = time.monotonic()
+            entry = SnapshotEntry(
+                result=result,
+                refreshed_at=datetime.now(timezone.utc),
+                refreshed_monotonic=finished,
+                duration_ms=round((finished - started) * 1000, 2)
+            )
+            self.entries[name] = entry
+            return entry
+
+    async def refresh_all(self) -> None:
+        await asyncio.gather(*(self.refresh(name) for name in self.checks))
+
+    async def warm_up(self, timeout_seconds: float = WARM_UP_TIMEOUT_SECONDS) -> None:
+        """
+        Run every check once, waiting at most timeout_seconds
+
+        Called before start() so the first requests to the health endpoints
+        find results. Checks still running at the timeout keep going and
+        report "starting" until they finish.
+        """
+        self._warm_up = asyncio.create_task(self.refresh_all(), name="health-snapshot:warm-up")
+        done, _ = await asyncio.wait({self._warm_up}, timeout=timeout_seconds)
+        if not done:
+            pending = [name for name in self.checks if name not in self.entries]
+            logger.warning(f"Health checks still running after {timeout_seconds}s warm-up: {', '.join(pending)}")
+
+    async def _refresh_loop(self, name: str) -> None:
+        while True:
+            await self.refresh(name)
+            await asyncio.sleep(self.checks[name].interval_seconds)
+
+    def start(self) -> None:
+        """Start one refresh task per registered check"""
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._refresh_loop(name), name=f"health-snapshot:{name}")
+            for name in self.checks
+        ]
+        logger.info(f"Health snapshot refreshing {len(self._tasks)} checks in the background")
+
+    async def stop(self) -> None:
+        tasks = [*self._tasks, *([self._warm_up] if self._warm_up else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._warm_up = None
+
+    def result(self, name: str) -> Dict[str, Any]:
+        """
+        The cached result of a check with a "snapshot" block
+
+        A missing result has status "starting" while its first run is in
+        progress and "unknown" otherwise; an outdated one is "stale", with
+        its last reported status kept in "last_status".
+        """
+        check = self.checks.get(name)
+        entry = self.entries.get(name)
+        lock = self._locks.get(name)
+        if check is not None and entry is None and lock is not None and lock.locked():
+            return {
+                "status": "starting",
+                "error": "First check still running",
+                "snapshot": {"refreshed_at": None, "age_seconds": None, "stale": False}
+            }
+        if check is None or entry is None:
+            return {
+                "status": "unknown",
+                "error": "No result yet" if check else f"Unknown health check: {name}",
+                "snapshot": {"refreshed_at": None, "age_seconds": None, "stale": True}
+            }
+
+        age = entry.age_seconds
+        stale = age > check.stale_after_seconds
+        result = dict(entry.result)
+        if stale:
+            result["last_status"] = result.get("status")
+            result["status"] = "stale"
+        result["snapshot"] = {
+            "refreshed_at": entry.refreshed_at.isoformat(),
+            "age_seconds": round(age, 1),
+            "duration_ms": entry.duration_ms,
+            "stale": stale
+        }
+        return result
+
+    def results(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        return {name: self.result(name) for name in names}
+
+    def age_seconds(self, names: Iterable[str]) -> Optional[float]:
+        """Age of the oldest of these results, None while any is missing"""
+        ages = []
+        for name in names:
+            entry = self.entries.get(name)
+            if entry is None:
+                return None
+            ages.append(entry.age_seconds)
+        return round(max(ages), 1) if ages else None
+
+
+# Global snapshot service instance
+health_snapshot = HealthSnapshotService()
+
+
+# =============================================================================
+# Default Checks
+# =============================================================================
+
+SYSTEM_CHECKS = ("system", "database", "redis", "supabase", "external_apis", "storage")
+
+
+async def _database_check() -> Dict[str, Any]:
+    # Pooled async connection, unlike the standalone checker's per-call engine
+    from app.config.database import check_database_health
+
+    result = await check_database_health()
+    result["timestamp"] = datetime.now(timezone.utc).isoformat()
+    return result
+
+
+def register_default_checks(service: HealthSnapshotService = health_snapshot) -> None:
+    """Checks behind /health and /health/auth"""
+    from health import health_checker
+    from app.health.auth_health import get_auth_health
+
+    service.register("system", health_checker._check_system_health, interval_seconds=15)
+    service.register("database", _database_check, interval_seconds=10, timeout_seconds=5.0)
+    service.register("redis", health_checker._check_redis, interval_seconds=30, timeout_seconds=5.0)
+    service.register("supabase", health_checker._check_supabase, interval_seconds=60)
+    service.register("external_apis", health_checker._check_external_apis, interval_seconds=300)
+    service.register("storage", health_checker._check_storage, interval_seconds=300)
+    service.register("auth", get_auth_health, interval_seconds=60, timeout_seconds=15.0)
+
+
+# =============================================================================
+# Export Health Snapshot Components
+# =============================================================================
+
+__all__ = [
+    "SnapshotCheck",
+    "SnapshotEntry",
+    "HealthSnapshotService",
+    "health_snapshot",
+    "register_default_checks",
+    "SYSTEM_CHECKS"
+]
@@ -0,0 +1,18 @@
+"""
+Background Jobs for NestSync
+Durable Postgres-backed job queue, handlers, workers and periodic scheduler
+"""
+
+from .queue import JobKind, JobStatus, BackgroundJob, enqueue_job
+from .worker import JobWorker
+from .scheduler import JobScheduler, scheduled_job
+
+__all__ = [
+    "JobKind",
+    "JobStatus",
+    "BackgroundJob",
+    "enqueue_job",
+    "JobWorker",
+    "JobScheduler",
+    "scheduled_job"
+]
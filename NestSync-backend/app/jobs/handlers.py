@@ -0,0 +1,122 @@
+"""
+Background Job Handlers for NestSync
+Maps each JobKind to the coroutine that runs it
+"""
+
+import logging
+import uuid
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import select, and_
+
+from app.config.database import get_async_session
+from app.jobs.queue import JobKind
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_handlers: Dict[JobKind, JobHandler] = {}
+
+
+def job_handler(kind: JobKind) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated coroutine as the handler for a job kind"""
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = handler
+        return handler
+    return register
+
+
+def get_job_handler(kind: JobKind) -> JobHandler:
+    """Look up the handler for a job kind"""
+    handler = _handlers.get(kind)
+    if handler is None:
+        raise ValueError(f"No handler registered for job kind {kind.value}")
+    return handler
+
+
+# =============================================================================
+# Analytics
+# =============================================================================
+
+@job_handler(JobKind.ANALYTICS_CHANGE_EVENT)
+async def handle_analytics_change_event(payload: Dict[str, Any]) -> None:
+    """Apply one logged change to its daily summary"""
+    from app.models import UsageLog
+    from app.services.enhanced_analytics_service import AnalyticsBackgroundProcessor
+
+    async for session in get_async_session():
+        result = await session.execute(
+            select(UsageLog.created_at).where(
+                and_(
+                    UsageLog.id == uuid.UUID(payload["usage_log_id"]),
+                    UsageLog.is_deleted == False
+                )
+            )
+        )
+        changed_at = result.scalar_one_or_none()
+
+    if changed_at is None:
+        logger.info(f"Skipping analytics for missing usage log {payload['usage_log_id']}")
+        return
+
+    await AnalyticsBackgroundProcessor().apply_change_event(payload["child_id"], changed_at)
+
+
+@job_handler(JobKind.ANALYTICS_DAILY_SUMMARY)
+async def handle_analytics_daily_summary(payload: Dict[str, Any]) -> None:
+    """Recompute a child's daily summary from its usage logs"""
+    from app.services.enhanced_analytics_service import AnalyticsBackgroundProcessor
+
+    await AnalyticsBackgroundProcessor().process_daily_analytics(
+        payload["child_id"],
+        date.fromisoformat(payload["date"])
+    )
+
+
+# =============================================================================
+# Predictions
+# =============================================================================
+
+@job_handler(JobKind.CONSUMPTION_PREDICTION)
+async def handle_consumption_prediction(payload: Dict[str, Any]) -> None:
+    """Train and store a consumption prediction for one child"""
+    from app.models import Child
+    from app.services.reorder_service import ReorderService
+
+    async for session in get_async_session():
+        result = await session.execute(
+            select(Child).where(
+                and_(
+                    Child.id == uuid.UUID(payload["child_id"]),
+                    Child.is_deleted == False
+                )
+            )
+        )
+        child = result.scalar_one_or_none()
+        if child is None:
+            logger.info(f"Skipping prediction for missing child {payload['child_id']}")
+            return
+
+        await ReorderService(session).generate_consumption_prediction(child)
+
+
+@job_handler(JobKind.PREDICTIONS_NIGHTLY)
+async def handle_predictions_nightly(payload: Dict[str, Any]) -> None:
+    """Run or resume the bulk prediction pipeline for one date"""
+    from app.services.prediction_pipeline import PredictionPipeline
+
+    run_date = payload.get("run_date")
+    await PredictionPipeline().run(date.fromisoformat(run_date) if run_date else None)
+
+
+# =============================================================================
+# Export Job Handler Components
+# =============================================================================
+
+__all__ = [
+    "JobHandler",
+    "job_handler",
+    "get_job_handler"
+]
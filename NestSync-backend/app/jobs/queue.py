@@ -0,0 +1,386 @@
+"""
+Postgres Job Queue for NestSync
+Durable background jobs claimed by workers with FOR UPDATE SKIP LOCKED
+"""
+
+import logging
+import random
+import uuid
+from datetime import datetime, timezone, timedelta
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import (
+    Column, String, Integer, Text, DateTime, Index, select, update, and_, or_, exists, text
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.config.database import Base
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Job Types
+# =============================================================================
+
+class JobKind(str, Enum):
+    """Every job type the workers know how to run"""
+    ANALYTICS_CHANGE_EVENT = "analytics.change_event"
+    ANALYTICS_DAILY_SUMMARY = "analytics.daily_summary"
+    CONSUMPTION_PREDICTION = "predictions.consumption"
+    PREDICTIONS_NIGHTLY = "predictions.nightly"
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job"""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class BackgroundJob(Base):
+    """
+    One unit of background work
+
+    A pending job with a dedup_key is unique per key, so enqueueing the same
+    key again while one is waiting is a no-op. Workers also skip a pending job
+    while another job with its key is running, so at most one runs at a time.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default=JobStatus.PENDING.value)
+    dedup_key = Column(String(255), nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    locked_by = Column(String(255), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("idx_background_jobs_claim", "run_at", postgresql_where=text("status = 'pending'")),
+        Index("idx_background_jobs_running", "locked_at", postgresql_where=text("status = 'running'")),
+        Index(
+            "uq_background_jobs_pending_dedup", "dedup_key",
+            unique=True, postgresql_where=text("status = 'pending'")
+        ),
+    )
+
+
+# =============================================================================
+# Queue Operations
+# =============================================================================
+
+def compute_backoff(attempts: int) -> timedelta:
+    """Exponential backoff with jitter for the given (1-based) attempt count"""
+    delay = min(
+        settings.job_backoff_max_seconds,
+        settings.job_backoff_base_seconds * (2 ** max(attempts - 1, 0))
+    )
+    return timedelta(seconds=delay * (0.5 + random.random() / 2))
+
+
+async def enqueue_job(
+    session: AsyncSession,
+    kind: JobKind,
+    payload: Dict[str, Any],
+    dedup_key: Optional[str] = None,
+    run_at: Optional[datetime] = None,
+    max_attempts: Optional[int] = None
+) -> Optional[uuid.UUID]:
+    """
+    Add a job in the caller's transaction
+
+    The job becomes visible to workers only when the caller commits, so it
+    exists if and only if the writes that triggered it do.
+
+    Returns:
+        The new job id, or None when a pending job with dedup_key exists
+    """
+    now = datetime.now(timezone.utc)
+    statement = (
+        pg_insert(BackgroundJob)
+        .values(
+            id=uuid.uuid4(),
+            kind=kind.value,
+            payload=payload,
+            status=JobStatus.PENDING.value,
+            dedup_key=dedup_key,
+            attempts=0,
+            max_attempts=max_attempts or settings.job_max_attempts,
+            run_at=run_at or now,
+            created_at=now,
+            updated_at=now
+        )
+        .on_conflict_do_nothing(
+            index_elements=[BackgroundJob.dedup_key],
+            index_where=text("status = 'pending'")
+        )
+        .returning(BackgroundJob.id)
+    )
+    result = await session.execute(statement)
+    job_id = result.scalar_one_or_none()
+
+    if job_id is None:
+        logger.debug(f"Job {kind.value} with dedup key {dedup_key} already pending")
+    return job_id
+
+
+async def claim_jobs(
+    session: AsyncSession,
+    worker_id: str,
+    limit: int,
+    kinds: Optional[Sequence[JobKind]] = None
+) -> List[BackgroundJob]:
+    """
+    Lock up to `limit` due jobs for this worker and mark them running
+
+    Concurrent workers skip rows another transaction has locked instead of
+    waiting on them. The caller must commit to publish the claim.
+    """
+    now = datetime.now(timezone.utc)
+    running = aliased(BackgroundJob)
+
+    conditions = [
+        BackgroundJob.status == JobStatus.PENDING.value,
+        BackgroundJob.run_at <= now,
+        or_(
+            BackgroundJob.dedup_key.is_(None),
+            ~exists().where(
+                and_(
+                    running.dedup_key == BackgroundJob.dedup_key,
+                    running.status == JobStatus.RUNNING.value
+                )
+            )
+        )
+    ]
+    if kinds:
+        conditions.append(BackgroundJob.kind.in_([kind.value for kind in kinds]))
+
+    candidates = (
+        select(BackgroundJob.id)
+        .where(and_(*conditions))
+        .order_by(BackgroundJob.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+
+    result = await session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id.in_(candidates.scalar_subquery()))
+        .values(
+            status=JobStatus.RUNNING.value,
+            locked_at=now,
+            locked_by=worker_id,
+            attempts=BackgroundJob.attempts + 1,
+            updated_at=now
+        )
+        .returning(BackgroundJob)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
+
+def _owned_by(job_id: uuid.UUID, worker_id: Optional[str]):
+    """Match the job only while it is still running under worker_id"""
+    if worker_id is None:
+        return BackgroundJob.id == job_id
+    return and_(
+        BackgroundJob.id == job_id,
+        BackgroundJob.status == JobStatus.RUNNING.value,
+        BackgroundJob.locked_by == worker_id
+    )
+
+
+async def mark_job_succeeded(session: AsyncSession, job_id: uuid.UUID, worker_id: str) -> bool:
+    """
+    Record a successful run
+
+    Returns:
+        False when the job is no longer running under worker_id (its lease
+        expired and it was requeued or claimed by another worker); the job
+        is left untouched
+    """
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        update(BackgroundJob)
+        .where(_owned_by(job_id, worker_id))
+        .values(
+            status=JobStatus.SUCCEEDED.value,
+            completed_at=now,
+            updated_at=now,
+            locked_at=None,
+            locked_by=None,
+            last_error=None
+        )
+    )
+    return bool(result.rowcount)
+
+
+async def mark_job_failed(
+    session: AsyncSession,
+    job_id: uuid.UUID,
+    attempts: int,
+    max_attempts: int,
+    error: str,
+    worker_id: Optional[str] = None
+) -> Optional[JobStatus]:
+    """
+    Record a failed run and schedule a retry if attempts remain
+
+    A job whose dedup key already has a newer pending job is not retried;
+    the pending one will do the same work. That includes a job enqueued
+    concurrently with the retry, which the pending dedup index rejects.
+
+    Args:
+        worker_id: When given, only update the job while it is still running
+            under this worker. The stale job reaper passes None because it
+            holds the row lock instead.
+
+    Returns:
+        The status the job was moved to, or None when it no longer belongs
+        to worker_id
+    """
+    now = datetime.now(timezone.utc)
+
+    if attempts < max_attempts:
+        pending = aliased(BackgroundJob)
+        try:
+            # A savepoint keeps the caller's transaction usable if the retry
+            # collides with a pending job enqueued after the check below
+            async with session.begin_nested():
+                result = await session.execute(
+                    update(BackgroundJob)
+                    .where(
+                        and_(
+                            _owned_by(job_id, worker_id),
+                            or_(
+                                BackgroundJob.dedup_key.is_(None),
+                                ~exists().where(
+                                    and_(
+                                        pending.dedup_key == BackgroundJob.dedup_key,
+                                        pending.status == JobStatus.PENDING.value
+                                    )
+                                )
+                            )
+                        )
+                    )
+                    .values(
+                        status=JobStatus.PENDING.value,
+                        run_at=now + compute_backoff(attempts),
+                        locked_at=None,
+                        locked_by=None,
+                        last_error=error,
+                        updated_at=now
+                    )
+                )
+            retried = bool(result.rowcount)
+        except IntegrityError:
+            logger.info(f"Retry of job {job_id} conflicts with a newly pending job; not retrying")
+            retried = False
+        if retried:
+            return JobStatus.PENDING
+        error = f"{error} (superseded by pending job)"
+
+    result = await session.execute(
+        update(BackgroundJob)
+        .where(_owned_by(job_id, worker_id))
+        .values(
+            status=JobStatus.FAILED.value,
+            completed_at=now,
+            locked_at=None,
+            locked_by=None,
+            last_error=error,
+            updated_at=now
+        )
+    )
+    if not result.rowcount:
+        return None
+    return JobStatus.FAILED
+
+
+async def renew_job_lease(session: AsyncSession, job_id: uuid.UUID, worker_id: str) -> bool:
+    """
+    Extend the lease of a job this worker is still running
+
+    Returns:
+        False when the job is no longer running under worker_id (its lease
+        already expired and it was requeued)
+    """
+    now = datetime.now(timezone.utc)
+    result = await session.execute(
+        update(BackgroundJob)
+        .where(
+            and_(
+                BackgroundJob.id == job_id,
+                BackgroundJob.status == JobStatus.RUNNING.value,
+                BackgroundJob.locked_by == worker_id
+            )
+        )
+        .values(locked_at=now, updated_at=now)
+    )
+    return bool(result.rowcount)
+
+
+async def requeue_stale_jobs(session: AsyncSession, lease_seconds: Optional[int] = None) -> int:
+    """
+    Return jobs held by workers that died mid-run to the queue
+
+    Live workers renew the lease of every job they run (renew_job_lease),
+    so only jobs whose worker stopped heartbeating are picked up.
+
+    Returns:
+        Number of stale jobs found
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds or settings.job_lease_seconds)
+    result = await session.execute(
+        select(
+            BackgroundJob.id, BackgroundJob.attempts, BackgroundJob.max_attempts
+        )
+        .where(
+            and_(
+                BackgroundJob.status == JobStatus.RUNNING.value,
+                BackgroundJob.locked_at < cutoff
+            )
+        )
+        .with_for_update(skip_locked=True)
+    )
+    stale = result.all()
+
+    for job_id, attempts, max_attempts in stale:
+        status = await mark_job_failed(session, job_id, attempts, max_attempts, "Worker lease expired")
+        logger.warning(f"Stale job {job_id} moved to {status.value}")
+
+    return len(stale)
+
+
+# =============================================================================
+# Export Job Queue Components
+# =============================================================================
+
+__all__ = [
+    "JobKind",
+    "JobStatus",
+    "BackgroundJob",
+    "compute_backoff",
+    "enqueue_job",
+    "claim_jobs",
+    "mark_job_succeeded",
+    "mark_job_failed",
+    "renew_job_lease",
+    "requeue_stale_jobs"
+]
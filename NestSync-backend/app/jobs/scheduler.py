@@ -0,0 +1,490 @@
+"""
+Periodic Job Scheduler for NestSync
+Cron-style schedules run by a single leader across all replicas
+
+Every replica runs a JobScheduler; the one holding a Postgres advisory lock
+is the leader and runs due jobs. Each occurrence is claimed by inserting its
+scheduled_job_runs row, so even a leader that lost its lock mid-run cannot
+run an occurrence a second time. Occurrences missed while no leader was up
+are caught up, oldest first, within SCHEDULER_CATCH_UP_HOURS.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time as time_of_day, timedelta, timezone, tzinfo
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import (
+    Column, String, Integer, Text, DateTime, UniqueConstraint, select, update, and_, case, text
+)
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from zoneinfo import ZoneInfo
+
+from app.config import database
+from app.config.database import Base, get_async_session
+from app.config.settings import settings
+from app.jobs.queue import JobKind, compute_backoff, enqueue_job
+
+logger = logging.getLogger(__name__)
+
+# Session-level advisory lock held by the leader for as long as it leads
+SCHEDULER_LOCK_KEY = int.from_bytes(
+    hashlib.blake2b(b"nestsync:job-scheduler", digest_size=8).digest(), "big", signed=True
+)
+
+ScheduledRun = Callable[[datetime], Awaitable[Optional[int]]]
+
+
+# =============================================================================
+# Cron Schedules
+# =============================================================================
+
+def _parse_cron_field(field: str, low: int, high: int) -> List[int]:
+    values = set()
+    for part in field.split(","):
+        expression, _, step = part.partition("/")
+        if expression == "*":
+            start, end = low, high
+        elif "-" in expression:
+            start, end = (int(bound) for bound in expression.split("-", 1))
+        else:
+            start = end = int(expression)
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field {field!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return sorted(values)
+
+
+class CronSchedule:
+    """
+    Five-field cron expression (minute hour day month weekday) in one timezone
+
+    Weekdays follow cron: 0 and 7 are Sunday. When both day and weekday are
+    restricted, either may match. A time skipped by a DST change fires at
+    the equivalent instant after the change; a repeated time fires once.
+    """
+
+    def __init__(self, expression: str, tz: tzinfo):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} must have five fields")
+
+        self.expression = expression
+        self.tz = tz
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = set(_parse_cron_field(fields[2], 1, 31))
+        self.months = set(_parse_cron_field(fields[3], 1, 12))
+        self.weekdays = {weekday % 7 for weekday in _parse_cron_field(fields[4], 0, 7)}
+        self._either_day = fields[2] != "*" and fields[4] != "*"
+
+    def _matches_day(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        return (in_days or in_weekdays) if self._either_day else (in_days and in_weekdays)
+
+    def occurrences(self, after: datetime, until: datetime) -> Iterator[datetime]:
+        """Fire times t with after < t <= until, in order"""
+        day = after.astimezone(self.tz).date()
+        last_day = until.astimezone(self.tz).date()
+        while day <= last_day:
+            if self._matches_day(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        moment = datetime.combine(day, time_of_day(hour, minute), tzinfo=self.tz)
+                        if after < moment <= until:
+                            yield moment
+            day += timedelta(days=1)
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r}, {self.tz})"
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    """A coroutine run at each occurrence of a schedule; returns rows affected"""
+    name: str
+    schedule: CronSchedule
+    run: ScheduledRun
+    jitter_seconds: int = 0
+
+    def jitter_for(self, scheduled_for: datetime) -> timedelta:
+        """Delay after the occurrence, the same on every replica"""
+        if not self.jitter_seconds:
+            return timedelta(0)
+        seed = f"{self.name}:{scheduled_for.astimezone(timezone.utc).isoformat()}"
+        return timedelta(seconds=random.Random(seed).uniform(0, self.jitter_seconds))
+
+
+_scheduled_jobs: Dict[str, ScheduledJob] = {}
+
+
+def scheduled_job(name: str, cron: str, jitter_seconds: int = 0) -> Callable[[ScheduledRun], ScheduledRun]:
+    """Register the decorated coroutine to run on a cron schedule (in settings.timezone)"""
+    def register(run: ScheduledRun) -> ScheduledRun:
+        _scheduled_jobs[name] = ScheduledJob(
+            name=name,
+            schedule=CronSchedule(cron, ZoneInfo(settings.timezone)),
+            run=run,
+            jitter_seconds=jitter_seconds
+        )
+        return run
+    return register
+
+
+def get_scheduled_jobs() -> List[ScheduledJob]:
+    """Every registered scheduled job"""
+    return list(_scheduled_jobs.values())
+
+
+# =============================================================================
+# Run History
+# =============================================================================
+
+class ScheduledRunStatus:
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ScheduledJobRun(Base):
+    """
+    One occurrence of a scheduled job
+
+    The row is the claim: (job_name, scheduled_for) is unique, so an
+    occurrence runs at most once unless it failed and its retry_at is due.
+    """
+    __tablename__ = "scheduled_job_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_name = Column(String(100), nullable=False)
+    scheduled_for = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False, default=ScheduledRunStatus.RUNNING)
+    attempts = Column(Integer, nullable=False, default=1)
+    leader_id = Column(String(255), nullable=False)
+
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    rows_affected = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    retry_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("job_name", "scheduled_for", name="uq_scheduled_job_runs_occurrence"),
+    )
+
+
+# =============================================================================
+# Scheduler
+# =============================================================================
+
+class JobScheduler:
+    """
+    Runs registered scheduled jobs while this process holds the leader lock
+
+    The lock lives on one dedicated connection; if that connection drops,
+    Postgres releases the lock and another replica takes over.
+    """
+
+    def __init__(
+        self,
+        scheduler_id: Optional[str] = None,
+        jobs: Optional[Sequence[ScheduledJob]] = None,
+        poll_interval: Optional[float] = None,
+        engine: Optional[AsyncEngine] = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)
+    ):
+        self.scheduler_id = scheduler_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.jobs = list(jobs) if jobs is not None else get_scheduled_jobs()
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else settings.scheduler_poll_interval_seconds
+        )
+        self.engine = engine
+        self.clock = clock
+        self.running = False
+        self.is_leader = False
+        self._stopped = asyncio.Event()
+
+    async def run(self) -> None:
+        """Compete for leadership until stop() is called"""
+        self.running = True
+        logger.info(f"Job scheduler {self.scheduler_id} started with {len(self.jobs)} jobs")
+
+        while self.running:
+            try:
+                await self._lead()
+            except Exception as e:
+                logger.error(f"Job scheduler {self.scheduler_id} lost leadership: {e}")
+            await self._sleep(self.poll_interval)
+
+        logger.info(f"Job scheduler {self.scheduler_id} stopped")
+
+    def stop(self) -> None:
+        """Stop after the job currently running, releasing the lock"""
+        self.running = False
+        self._stopped.set()
+
+    async def _lead(self) -> None:
+        engine = self.engine or database.async_engine
+        async with engine.connect() as lock_connection:
+            acquired = await lock_connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+            )
+            await lock_connection.commit()
+            if not acquired:
+                return
+
+            self.is_leader = True
+            logger.info(f"Job scheduler {self.scheduler_id} is now leader")
+            try:
+                await self.recover_abandoned_runs()
+                while self.running:
+                    await self.run_due_jobs()
+                    await self._sleep(self.poll_interval)
+                    # Fails if the connection, and with it the lock, was lost
+                    await lock_connection.execute(text("SELECT 1"))
+                    await lock_connection.commit()
+            finally:
+                self.is_leader = False
+                try:
+                    await lock_connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+                    )
+                    await lock_connection.commit()
+                except Exception:
+                    # Never return a connection that may still hold the lock to the pool
+                    await lock_connection.invalidate()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run_due_jobs(self) -> int:
+        """Run every due occurrence this scheduler can claim; returns how many ran"""
+        ran = 0
+        for job in self.jobs:
+            due = await self._due_occurrences(job, self.clock())
+            if len(due) > 1:
+                logger.info(f"Catching up {len(due)} runs of scheduled job {job.name}")
+            for scheduled_for in due:
+                if await self._run_occurrence(job, scheduled_for):
+                    ran += 1
+        return ran
+
+    async def recover_abandoned_runs(self) -> int:
+        """
+        Mark runs left 'running' by a leader that died as failed, so they retry
+
+        Returns:
+            Number of runs recovered
+        """
+        now = self.clock()
+        cutoff = now - timedelta(seconds=settings.scheduler_run_lease_seconds)
+        async for session in get_async_session():
+            result = await session.execute(
+                update(ScheduledJobRun)
+                .where(
+                    and_(
+                        ScheduledJobRun.status == ScheduledRunStatus.RUNNING,
+                        ScheduledJobRun.started_at < cutoff
+                    )
+                )
+                .values(
+                    status=ScheduledRunStatus.FAILED,
+                    finished_at=now,
+                    error="Scheduler leader lost during run",
+                    retry_at=case((ScheduledJobRun.attempts < settings.job_max_attempts, now), else_=None)
+                )
+            )
+            await session.commit()
+
+        if result.rowcount:
+            logger.warning(f"Recovered {result.rowcount} abandoned scheduled job runs")
+        return result.rowcount
+
+    async def _due_occurrences(self, job: ScheduledJob, now: datetime) -> List[datetime]:
+        since = now - timedelta(hours=settings.scheduler_catch_up_hours)
+        occurrences = [
+            scheduled_for for scheduled_for in job.schedule.occurrences(since, now)
+            if scheduled_for + job.jitter_for(scheduled_for) <= now
+        ]
+        if not occurrences:
+            return []
+
+        async for session in get_async_session():
+            result = await session.execute(
+                select(ScheduledJobRun.scheduled_for, ScheduledJobRun.status, ScheduledJobRun.retry_at)
+                .where(
+                    and_(
+                        ScheduledJobRun.job_name == job.name,
+                        ScheduledJobRun.scheduled_for > since
+                    )
+                )
+            )
+            runs = {row.scheduled_for: row for row in result}
+
+        return [
+            scheduled_for for scheduled_for in occurrences
+            if scheduled_for not in runs or (
+                runs[scheduled_for].status == ScheduledRunStatus.FAILED
+                and runs[scheduled_for].retry_at is not None
+                and runs[scheduled_for].retry_at <= now
+            )
+        ]
+
+    async def _run_occurrence(self, job: ScheduledJob, scheduled_for: datetime) -> bool:
+        started_at = self.clock()
+        async for session in get_async_session():
+            result = await session.execute(
+                pg_insert(ScheduledJobRun)
+                .values(
+                    id=uuid.uuid4(),
+                    job_name=job.name,
+                    scheduled_for=scheduled_for,
+                    status=ScheduledRunStatus.RUNNING,
+                    attempts=1,
+                    leader_id=self.scheduler_id,
+                    started_at=started_at
+                )
+                .on_conflict_do_update(
+                    constraint="uq_scheduled_job_runs_occurrence",
+                    set_=dict(
+                        status=ScheduledRunStatus.RUNNING,
+                        attempts=ScheduledJobRun.attempts + 1,
+                        leader_id=self.scheduler_id,
+                        started_at=started_at,
+                        finished_at=None,
+                        retry_at=None
+                    ),
+                    where=and_(
+                        ScheduledJobRun.status == ScheduledRunStatus.FAILED,
+                        ScheduledJobRun.retry_at <= started_at
+                    )
+                )
+                .returning(ScheduledJobRun.attempts)
+            )
+            attempts = result.scalar_one_or_none()
+            await session.commit()
+
+        if attempts is None:
+            logger.debug(f"Scheduled job {job.name} for {scheduled_for.isoformat()} already claimed")
+            return False
+
+        started = time.perf_counter()
+        status, rows, error, retry_at = ScheduledRunStatus.SUCCEEDED, None, None, None
+        try:
+            rows = await job.run(scheduled_for)
+        except Exception as e:
+            status, error = ScheduledRunStatus.FAILED, f"{type(e).__name__}: {e}"
+            if attempts < settings.job_max_attempts:
+                retry_at = self.clock() + compute_backoff(attempts)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+
+        async for session in get_async_session():
+            await session.execute(
+                update(ScheduledJobRun)
+                .where(
+                    and_(
+                        ScheduledJobRun.job_name == job.name,
+                        ScheduledJobRun.scheduled_for == scheduled_for
+                    )
+                )
+                .values(
+                    status=status,
+                    finished_at=self.clock(),
+                    duration_ms=duration_ms,
+                    rows_affected=rows,
+                    error=error,
+                    retry_at=retry_at
+                )
+            )
+            await session.commit()
+
+        if error:
+            log = logger.warning if retry_at else logger.error
+            log(f"Scheduled job {job.name} for {scheduled_for.isoformat()} attempt {attempts} failed: {error}")
+        else:
+            logger.info(
+                f"Scheduled job {job.name} for {scheduled_for.isoformat()} finished "
+                f"in {duration_ms}ms ({rows if rows is not None else 'n/a'} rows)"
+            )
+        return True
+
+
+# =============================================================================
+# Scheduled Jobs
+# =============================================================================
+
+@scheduled_job("analytics.daily", "15 0 * * *", jitter_seconds=300)
+async def run_daily_analytics(scheduled_for: datetime) -> int:
+    """Daily summaries for the previous day, plus weekly patterns once a week closes"""
+    from app.services.analytics_scheduler import analytics_scheduler
+
+    return await analytics_scheduler.run_daily_analytics_processing(scheduled_for)
+
+
+@scheduled_job("analytics.monthly_cost", "30 1 1 * *", jitter_seconds=300)
+async def run_monthly_cost_analysis(scheduled_for: datetime) -> int:
+    """Cost tracking for the previous month"""
+    from app.services.analytics_scheduler import analytics_scheduler
+
+    return await analytics_scheduler.run_monthly_cost_analysis(scheduled_for)
+
+
+@scheduled_job("analytics.retention_cleanup", "0 3 2 * *", jitter_seconds=600)
+async def run_analytics_retention_cleanup(scheduled_for: datetime) -> int:
+    """Delete analytics past their retention period"""
+    from app.services.analytics_scheduler import analytics_scheduler
+
+    return await analytics_scheduler.cleanup_old_analytics_data()
+
+
+@scheduled_job("maintenance.partitions", "45 2 * * *", jitter_seconds=300)
+async def run_partition_maintenance(scheduled_for: datetime) -> int:
+    """Create upcoming monthly partitions and drop expired usage log months"""
+    from app.services.partition_maintenance import PartitionMaintenance
+
+    return await PartitionMaintenance().run(scheduled_for.astimezone(timezone.utc).date())
+
+
+@scheduled_job("predictions.nightly", "0 2 * * *", jitter_seconds=300)
+async def enqueue_nightly_predictions(scheduled_for: datetime) -> int:
+    """Hand the prediction refresh to the job workers; it resumes if interrupted"""
+    run_date = scheduled_for.astimezone(timezone.utc).date().isoformat()
+    async for session in get_async_session():
+        job_id = await enqueue_job(
+            session,
+            JobKind.PREDICTIONS_NIGHTLY,
+            {"run_date": run_date},
+            dedup_key=f"predictions.nightly:{run_date}"
+        )
+        await session.commit()
+    return 1 if job_id else 0
+
+
+# =============================================================================
+# Export Scheduler Components
+# =============================================================================
+
+__all__ = [
+    "CronSchedule",
+    "ScheduledJob",
+    "ScheduledJobRun",
+    "ScheduledRunStatus",
+    "JobScheduler",
+    "scheduled_job",
+    "get_scheduled_jobs"
+]
@@ -0,0 +1,244 @@
+"""
+Background Job Worker for NestSync
+Claims jobs from the Postgres queue and runs their handlers
+
+Run standalone with N processes:
+    python -m app.jobs.worker --processes 4 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from typing import List, Optional, Sequence, Set
+
+from app.config.database import get_async_session, init_database, close_database
+from app.config.settings import settings
+from app.jobs.handlers import get_job_handler
+from app.jobs.queue import (
+    JobKind, JobStatus, claim_jobs, mark_job_succeeded, mark_job_failed, renew_job_lease,
+    requeue_stale_jobs
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Polls the job queue and runs up to `concurrency` jobs at a time
+
+    Any number of workers, in any number of processes, can share the queue;
+    SKIP LOCKED keeps them from claiming the same job.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        kinds: Optional[Sequence[JobKind]] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.kinds = list(kinds) if kinds else None
+        self.concurrency = concurrency or settings.job_worker_concurrency
+        self.poll_interval = poll_interval if poll_interval is not None else settings.job_poll_interval_seconds
+        self.running = False
+        self._tasks: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._last_reap = 0.0
+
+    async def run(self) -> None:
+        """Run until stop() is called, then wait for in-flight jobs"""
+        self.running = True
+        logger.info(f"Job worker {self.worker_id} started (concurrency={self.concurrency})")
+
+        try:
+            while self.running:
+                claimed = 0
+                try:
+                    await self._reap_stale_jobs()
+                    free_slots = self.concurrency - len(self._tasks)
+                    if free_slots > 0:
+                        claimed = await self._claim_and_start(free_slots)
+                except Exception as e:
+                    logger.error(f"Job worker {self.worker_id} poll failed: {e}")
+
+                # Poll again straight away while the queue keeps yielding work
+                if claimed == 0 or len(self._tasks) >= self.concurrency:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            logger.info(f"Job worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        """Stop claiming new jobs"""
+        self.running = False
+        self._wakeup.set()
+
+    async def run_once(self) -> int:
+        """Claim and run one batch synchronously; returns the number of jobs run"""
+        claimed = await self._claim_and_start(self.concurrency)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        return claimed
+
+    async def _claim_and_start(self, limit: int) -> int:
+        async for session in get_async_session():
+            jobs = await claim_jobs(session, self.worker_id, limit, self.kinds)
+            await session.commit()
+
+        for job in jobs:
+            task = asyncio.create_task(
+                self._execute(job.id, job.kind, dict(job.payload or {}), job.attempts, job.max_attempts)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._on_task_done)
+        return len(jobs)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._wakeup.set()
+
+    async def _execute(self, job_id, kind: str, payload: dict, attempts: int, max_attempts: int) -> None:
+        started = time.perf_counter()
+        heartbeat = asyncio.create_task(self._renew_lease(job_id, kind))
+        try:
+            handler = get_job_handler(JobKind(kind))
+            await handler(payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            async for session in get_async_session():
+                status = await mark_job_failed(
+                    session, job_id, attempts, max_attempts, error, worker_id=self.worker_id
+                )
+                await session.commit()
+            if status is None:
+                logger.warning(f"Job {kind} {job_id} failed after losing its lease; result discarded: {error}")
+                return
+            log = logger.error if status == JobStatus.FAILED else logger.warning
+            log(f"Job {kind} {job_id} attempt {attempts}/{max_attempts} failed ({status.value}): {error}")
+            return
+        finally:
+            heartbeat.cancel()
+
+        async for session in get_async_session():
+            recorded = await mark_job_succeeded(session, job_id, self.worker_id)
+            await session.commit()
+        if not recorded:
+            logger.warning(f"Job {kind} {job_id} finished after losing its lease; result discarded")
+            return
+        logger.debug(f"Job {kind} {job_id} succeeded in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    async def _renew_lease(self, job_id, kind: str) -> None:
+        # Keeps long jobs from looking stale to the reaper while the handler runs
+        while True:
+            await asyncio.sleep(settings.job_heartbeat_seconds)
+            try:
+                async for session in get_async_session():
+                    renewed = await renew_job_lease(session, job_id, self.worker_id)
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"Job {kind} {job_id} lease renewal failed: {e}")
+                continue
+            if not renewed:
+                logger.error(f"Job {kind} {job_id} lost its lease to the stale job reaper")
+                return
+
+    async def _reap_stale_jobs(self) -> None:
+        # Once per lease period is enough; any worker may do it
+        now = time.monotonic()
+        if now - self._last_reap < settings.job_lease_seconds:
+            return
+        self._last_reap = now
+
+        async for session in get_async_session():
+            count = await requeue_stale_jobs(session)
+            await session.commit()
+        if count:
+            logger.warning(f"Requeued {count} stale jobs")
+
+
+# =============================================================================
+# Standalone Entry Point
+# =============================================================================
+
+async def _serve(kinds: Optional[List[JobKind]], concurrency: int) -> None:
+    await init_database()
+    worker = JobWorker(kinds=kinds, concurrency=concurrency)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await close_database()
+
+
+def _run_process(kinds: Optional[List[JobKind]], concurrency: int) -> None:
+    logging.basicConfig(level=settings.log_level, format=settings.log_format)
+    asyncio.run(_serve(kinds, concurrency))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run NestSync background job workers")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.job_worker_concurrency,
+        help="Jobs run concurrently by each process"
+    )
+    parser.add_argument(
+        "--kind", dest="kinds", action="append", choices=[kind.value for kind in JobKind],
+        help="Only run these job kinds (repeatable); default is all"
+    )
+    args = parser.parse_args(argv)
+    kinds = [JobKind(kind) for kind in args.kinds] if args.kinds else None
+
+    if args.processes <= 1:
+        _run_process(kinds, args.concurrency)
+        return
+
+    processes = [
+        multiprocessing.Process(target=_run_process, args=(kinds, args.concurrency), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    for process in processes:
+        process.join()
+
+    sys.exit(max((process.exitcode or 0) for process in processes))
+
+
+# =============================================================================
+# Export Worker Components
+# =============================================================================
+
+__all__ = [
+    "JobWorker",
+    "main"
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Rate Limiting for NestSync
+GCRA limiter with per-route policies and in-memory or Redis state
+
+The generic cell rate algorithm keeps one number per key, the theoretical
+arrival time (TAT) of the next request, so a check is O(1) however many
+requests the window allows. In Redis the check is one Lua script using the
+server clock, which makes limits hold across every worker and replica.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "nestsync:ratelimit"
+MAX_LOCAL_KEYS = 100_000
+REDIS_RETRY_SECONDS = 30.0
+
+# Core session operations are exempt from rate limiting
+AUTH_SESSION_PATHS = ("/auth/signin", "/auth/signup", "/auth/refresh", "/auth/signout")
+
+
+# =============================================================================
+# Policies and Results
+# =============================================================================
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """limit requests per period_seconds, with bursts of up to burst requests"""
+    name: str
+    limit: int
+    period_seconds: int
+    burst: Optional[int] = None
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds of allowance one request uses up"""
+        return self.period_seconds / self.limit
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.limit
+
+    @property
+    def tolerance(self) -> float:
+        return self.emission_interval * self.capacity
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of one check, in the terms of the RateLimit headers"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+    def headers(self, policy: RateLimitPolicy) -> dict:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{policy.capacity};w={policy.period_seconds}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+def gcra(tat: Optional[float], now: float, policy: RateLimitPolicy) -> Tuple[Optional[float], float, float]:
+    """
+    One GCRA step
+
+    Returns (new_tat, retry_after, reset_after). new_tat is None when the
+    request is refused, and then nothing should be stored.
+    """
+    tat = max(tat or now, now)
+    new_tat = tat + policy.emission_interval
+    allow_at = new_tat - policy.tolerance
+    if now < allow_at:
+        return None, allow_at - now, tat - now
+    return new_tat, 0.0, new_tat - now
+
+
+def build_result(policy: RateLimitPolicy, allowed: bool, retry_after: float, reset_after: float) -> RateLimitResult:
+    remaining = 0
+    if allowed:
+        # Whole requests still fitting in the tolerance; epsilon absorbs float error
+        remaining = int((policy.tolerance - reset_after) / policy.emission_interval + 1e-9)
+    return RateLimitResult(
+        allowed=allowed,
+        limit=policy.capacity,
+        remaining=max(0, remaining),
+        reset_after=max(0.0, reset_after),
+        retry_after=max(0.0, retry_after)
+    )
+
+
+# =============================================================================
+# Stores
+# =============================================================================
+
+class InMemoryRateLimitStore:
+    """
+    Per-process GCRA state
+
+    State is keyed by policy and client, like the Redis keys. Keys are kept in update order; each check drops a few expired keys from
+    the front, and the least recently used key goes once max_keys is reached.
+    """
+
+    def __init__(self, max_keys: int = MAX_LOCAL_KEYS):
+        self.max_keys = max_keys
+        self.tats: "OrderedDict[str, float]" = OrderedDict()
+
+    async def check(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        now = time.monotonic()
+        self._expire(now)
+
+        key = f"{policy.name}:{key}"
+        new_tat, retry_after, reset_after = gcra(self.tats.get(key), now, policy)
+        if new_tat is not None:
+            self.tats[key] = new_tat
+            self.tats.move_to_end(key)
+            if len(self.tats) > self.max_keys:
+                self.tats.popitem(last=False)
+        return build_result(policy, new_tat is not None, retry_after, reset_after)
+
+    def _expire(self, now: float, budget: int = 2) -> None:
+        for _ in range(budget):
+            if not self.tats:
+                return
+            key, tat = next(iter(self.tats.items()))
+            if tat > now:
+                return
+            del self.tats[key]
+
+
+# Times in milliseconds from the Redis clock; returns {allowed, retry_after_ms, reset_after_ms}
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - tolerance
+if now < allow_at then
+    return {0, tostring(allow_at - now), tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now))
+return {1, '0', tostring(new_tat - now)}
+"""
+
+
+class RedisRateLimitStore:
+    """
+    GCRA state shared by all workers in Redis
+
+    When Redis is unreachable, checks fall back to a local store for
+    REDIS_RETRY_SECONDS instead of failing requests or waiting on timeouts.
+    """
+
+    def __init__(self, client: Optional[aioredis.Redis] = None, fallback: Optional[InMemoryRateLimitStore] = None):
+        self.client = client or _create_redis_client()
+        self.script = self.client.register_script(GCRA_SCRIPT)
+        self.fallback = fallback or InMemoryRateLimitStore()
+        self.unavailable_until = 0.0
+
+    async def check(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        if time.monotonic() < self.unavailable_until:
+            return await self.fallback.check(key, policy)
+
+        try:
+            allowed, retry_after_ms, reset_after_ms = await self.script(
+                keys=[f"{KEY_PREFIX}:{policy.name}:{key}"],
+                args=[policy.emission_interval * 1000, policy.tolerance * 1000]
+            )
+        except Exception as e:
+            logger.warning(f"Shared rate limit store failed, limiting per process for {REDIS_RETRY_SECONDS}s: {e}")
+            self.unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+            return await self.fallback.check(key, policy)
+
+        return build_result(policy, bool(allowed), float(retry_after_ms) / 1000, float(reset_after_ms) / 1000)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _create_redis_client() -> aioredis.Redis:
+    url = settings.redis_url
+    if settings.redis_ssl and url.startswith("redis://"):
+        url = "rediss://" + url[len("redis://"):]
+    return aioredis.from_url(
+        url,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        socket_timeout=0.25,  # on the request path; fall back rather than wait
+        socket_connect_timeout=0.25
+    )
+
+
+def create_rate_limit_store():
+    """Redis-backed store when RATE_LIMIT_SHARED_ENABLED, otherwise per process"""
+    if settings.rate_limit_shared_enabled:
+        return RedisRateLimitStore()
+    return InMemoryRateLimitStore()
+
+
+# =============================================================================
+# Route Policies
+# =============================================================================
+
+def policy_for_path(path: str) -> Optional[RateLimitPolicy]:
+    """The policy for a request path, or None when it is not limited"""
+    development = settings.environment == "development"
+
+    if path == "/metrics" or path == "/health" or path.startswith("/health/"):
+        return None
+    if path.startswith(AUTH_SESSION_PATHS):
+        # Never limited, so a shared IP (office, carrier NAT) cannot block signing in
+        return None
+    if path.startswith("/graphql"):
+        return RateLimitPolicy("graphql", 200 if development else 150, 900)
+    if path.startswith("/webhooks"):
+        # Stripe retries with backoff and is keyed by its own IPs
+        return RateLimitPolicy("webhooks", 600, 60)
+    if path.startswith("/auth"):
+        return RateLimitPolicy("auth", 50 if development else 30, 300)
+    return RateLimitPolicy("default", settings.rate_limit_requests, settings.rate_limit_window)
+
+
+# =============================================================================
+# Export Rate Limiting Components
+# =============================================================================
+
+__all__ = [
+    "RateLimitPolicy",
+    "RateLimitResult",
+    "gcra",
+    "InMemoryRateLimitStore",
+    "RedisRateLimitStore",
+    "create_rate_limit_store",
+    "policy_for_path"
+]
@@ -3,87 +3,112 @@ Security Middleware for NestSync
 PIPEDA-compliant security and rate limiting
 """
 
+import math
 import time
 import logging
 from typing import Dict, Any, Optional
-from fastapi import FastAPI, Request, Response
+
+import jwt
+from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.auth.token_cache import decode_verified_token
 from app.config.settings import settings
+from app.middleware.rate_limit import create_rate_limit_store, policy_for_path
 from app.utils.logging import sanitize_log_data
 
 logger = logging.getLogger(__name__)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+# Security headers for Canadian compliance
+SECURITY_HEADERS = {
+    # HTTPS enforcement
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    
+    # Content security
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    
+    # Content Security Policy for PIPEDA compliance
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+        "style-src 'self' 'unsafe-inline'; "
+        "img-src 'self' data: https:; "
+        "font-src 'self' https:; "
+        "connect-src 'self' https://api.nestsync.ca wss://api.nestsync.ca; "
+        "frame-src 'none'; "
+        "object-src 'none'; "
+        "base-uri 'self'"
+    ),
+    
+    # Privacy and data protection
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": (
+        "geolocation=(self), "
+        "microphone=(), "
+        "camera=(), "
+        "payment=(self), "
+        "usb=(), "
+        "magnetometer=(), "
+        "gyroscope=(), "
+        "speaker=()"
+    ),
+    
+    # Canadian compliance headers
+    "X-Data-Residency": "Canada",
+    "X-Privacy-Compliance": "PIPEDA",
+    "X-Content-Language": "en-CA,fr-CA"
+}
+
+# Encoded once; existing headers with these names are replaced
+_SECURITY_HEADER_ITEMS = [
+    (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in SECURITY_HEADERS.items()
+]
+_SECURITY_HEADER_NAMES = {name for name, _ in _SECURITY_HEADER_ITEMS}
+
+
+# The middlewares below are pure ASGI: they wrap send (and never receive), so
+# no layer starts a task, buffers a body or copies the response stream.
+
+class SecurityHeadersMiddleware:
     """
     Add security headers for PIPEDA compliance and general security
     """
     
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Security headers for Canadian compliance
-        security_headers = {
-            # HTTPS enforcement
-            "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
-            
-            # Content security
-            "X-Content-Type-Options": "nosniff",
-            "X-Frame-Options": "DENY",
-            "X-XSS-Protection": "1; mode=block",
-            
-            # Content Security Policy for PIPEDA compliance
-            "Content-Security-Policy": (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: https:; "
-                "font-src 'self' https:; "
-                "connect-src 'self' https://api.nestsync.ca wss://api.nestsync.ca; "
-                "frame-src 'none'; "
-                "object-src 'none'; "
-                "base-uri 'self'"
-            ),
-            
-            # Privacy and data protection
-            "Referrer-Policy": "strict-origin-when-cross-origin",
-            "Permissions-Policy": (
-                "geolocation=(self), "
-                "microphone=(), "
-                "camera=(), "
-                "payment=(self), "
-                "usb=(), "
-                "magnetometer=(), "
-                "gyroscope=(), "
-                "speaker=()"
-            ),
-            
-            # Canadian compliance headers
-            "X-Data-Residency": "Canada",
-            "X-Privacy-Compliance": "PIPEDA",
-            "X-Content-Language": "en-CA,fr-CA"
-        }
-        
-        # Add headers to response
-        for header, value in security_headers.items():
-            response.headers[header] = value
-        
-        return response
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    item for item in message.get("headers", []) if item[0].lower() not in _SECURITY_HEADER_NAMES
+                ] + _SECURITY_HEADER_ITEMS
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
 
 
-class RateLimitingMiddleware(BaseHTTPMiddleware):
+class RateLimitingMiddleware:
     """
-    Basic rate limiting middleware for API protection
+    GCRA rate limiting per route policy (app.middleware.rate_limit)
+
+    Authenticated requests are limited per user, anonymous ones per IP.
+    State lives in Redis when shared limits are enabled, so the limits
+    hold across workers and replicas.
     """
     
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.requests: Dict[str, list] = {}
-        self.cleanup_interval = 60  # Clean up old requests every minute
-        self.last_cleanup = time.time()
+    def __init__(self, app: ASGIApp, store=None):
+        self.app = app
+        self.store = store or create_rate_limit_store()
     
     def get_client_identifier(self, request: Request) -> str:
         """
@@ -101,142 +126,111 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
         
         # Fall back to direct connection IP
         return request.client.host if request.client else "unknown"
-    
-    def is_rate_limited(self, client_id: str, max_requests: int = None, window: int = None) -> bool:
-        """
-        Check if client is rate limited
-        """
-        max_requests = max_requests or settings.rate_limit_requests
-        window = window or settings.rate_limit_window
-        
-        current_time = time.time()
-        
-        # Clean up old requests periodically
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            self.cleanup_old_requests(current_time - window)
-            self.last_cleanup = current_time
-        
-        # Get or create request list for client
-        if client_id not in self.requests:
-            self.requests[client_id] = []
-        
-        client_requests = self.requests[client_id]
-        
-        # Remove requests outside the window
-        client_requests[:] = [req_time for req_time in client_requests if current_time - req_time < window]
-        
-        # Check if limit is exceeded
-        if len(client_requests) >= max_requests:
-            return True
-        
-        # Add current request
-        client_requests.append(current_time)
-        return False
-    
-    def cleanup_old_requests(self, cutoff_time: float):
+
+    def get_rate_limit_key(self, request: Request) -> str:
         """
-        Clean up old request records
+        User id from a valid bearer token, otherwise the client IP
+        Unverified tokens never pick the key, so they cannot evade or drain limits
         """
-        for client_id in list(self.requests.keys()):
-            self.requests[client_id] = [
-                req_time for req_time in self.requests[client_id] 
-                if req_time > cutoff_time
-            ]
-            
-            # Remove empty entries
-            if not self.requests[client_id]:
-                del self.requests[client_id]
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            try:
+                claims = decode_verified_token(authorization[len("Bearer "):])
+                if claims.get("user_id"):
+                    return f"user:{claims['user_id']}"
+            except jwt.InvalidTokenError:
+                pass
+        return f"ip:{self.get_client_identifier(request)}"
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Skip rate limiting entirely if disabled in settings
-        if not settings.rate_limiting_enabled:
-            return await call_next(request)
-        
-        # Skip rate limiting for health checks and OPTIONS requests (CORS preflight)
-        if request.url.path in ["/health", "/health/simple"] or request.method == "OPTIONS":
-            return await call_next(request)
+        if scope["type"] != "http" or not settings.rate_limiting_enabled or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
         
-        # Skip rate limiting for authentication operations to prevent login blocking
-        auth_operations = ["/auth/signin", "/auth/signout", "/auth/refresh", "/auth/signup"]
-        if any(request.url.path.startswith(op) for op in auth_operations):
-            return await call_next(request)
+        policy = policy_for_path(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
         
-        client_id = self.get_client_identifier(request)
+        key = self.get_rate_limit_key(Request(scope))
+        result = await self.store.check(key, policy)
         
-        # More reasonable limits for different endpoints
-        if request.url.path.startswith("/graphql"):
-            # Increased GraphQL limits for normal user operations
-            max_requests = 200 if settings.environment == "development" else 150
-            window = 900  # 15 minutes
-        elif request.url.path.startswith("/auth"):
-            # Relaxed auth limits (non-core auth operations)
-            max_requests = 50 if settings.environment == "development" else 30
-            window = 300  # 5 minutes
-        else:
-            # Default limits
-            max_requests = settings.rate_limit_requests
-            window = settings.rate_limit_window
-        
-        if self.is_rate_limited(client_id, max_requests, window):
-            logger.warning(f"Rate limit exceeded for client: {client_id}")
-            return JSONResponse(
+        if not result.allowed:
+            logger.warning(f"Rate limit exceeded for {key} on {policy.name}")
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": "Rate limit exceeded",
-                    "message": f"Too many requests. Limit: {max_requests} per {window} seconds",
-                    "retry_after": window
+                    "message": f"Too many requests. Limit: {policy.limit} per {policy.period_seconds} seconds",
+                    "retry_after": math.ceil(result.retry_after)
                 },
-                headers={
-                    "Retry-After": str(window),
-                    "X-RateLimit-Limit": str(max_requests),
-                    "X-RateLimit-Window": str(window)
-                }
+                headers=result.headers(policy)
             )
+            await response(scope, receive, send)
+            return
         
-        return await call_next(request)
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).update(result.headers(policy))
+            await send(message)
+        
+        await self.app(scope, receive, send_with_headers)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
     Log requests for audit trail and PIPEDA compliance
     """
     
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # Get client info for audit trail
-        client_ip = self.get_client_ip(request)
-        user_agent = request.headers.get("User-Agent", "unknown")
-        
-        # Process request
-        response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Calculate processing time
-        process_time = time.time() - start_time
+        start_time = time.time()
+        request = Request(scope)
+        response_start: Dict[str, Any] = {}
+        
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Processing time until the response starts, as before
+                process_time = time.time() - start_time
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(process_time)
+                response_start.update(
+                    status_code=message["status"],
+                    process_time=process_time,
+                    content_length=headers.get("content-length", 0)
+                )
+            await send(message)
+        
+        await self.app(scope, receive, send_with_timing)
+        
+        if not response_start:
+            return
         
         # Log request for audit trail
         log_data = {
             "method": request.method,
             "url": str(request.url),
-            "client_ip": client_ip,
-            "user_agent": user_agent,
-            "status_code": response.status_code,
-            "process_time": round(process_time, 4),
-            "content_length": response.headers.get("content-length", 0)
+            "client_ip": self.get_client_ip(request),
+            "user_agent": request.headers.get("User-Agent", "unknown"),
+            "status_code": response_start["status_code"],
+            "process_time": round(response_start["process_time"], 4),
+            "content_length": response_start["content_length"]
         }
         
         # Log at appropriate level
-        if response.status_code >= 500:
+        if response_start["status_code"] >= 500:
             logger.error("Request failed", extra=sanitize_log_data(log_data))
-        elif response.status_code >= 400:
+        elif response_start["status_code"] >= 400:
             logger.warning("Client error", extra=sanitize_log_data(log_data))
         else:
             logger.info("Request processed", extra=sanitize_log_data(log_data))
-        
-        # Add processing time header
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response
     
     def get_client_ip(self, request: Request) -> str:
         """
@@ -253,53 +247,60 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         return request.client.host if request.client else "unknown"
 
 
-class PIPEDAAuditMiddleware(BaseHTTPMiddleware):
+class PIPEDAAuditMiddleware:
     """
     PIPEDA-specific audit logging middleware
     """
     
-    async def dispatch(self, request: Request, call_next):
-        # Track sensitive operations for PIPEDA compliance
-        sensitive_paths = [
-            "/graphql",  # All GraphQL operations
-            "/auth",     # Authentication operations
-            "/user",     # User data operations
-            "/consent",  # Consent management
-            "/children"  # Child data operations
-        ]
-        
-        is_sensitive = any(request.url.path.startswith(path) for path in sensitive_paths)
-        
-        if is_sensitive:
-            # Log PIPEDA-relevant information
-            audit_info = {
-                "timestamp": time.time(),
-                "client_ip": self.get_client_ip(request),
-                "user_agent": request.headers.get("User-Agent"),
-                "method": request.method,
-                "path": request.url.path,
-                "has_auth": "Authorization" in request.headers,
-                "content_type": request.headers.get("Content-Type"),
-                "data_residency": "Canada",
-                "compliance_framework": "PIPEDA"
-            }
-            
-            logger.info("PIPEDA Audit", extra=sanitize_log_data(audit_info))
-        
-        response = await call_next(request)
+    # Track sensitive operations for PIPEDA compliance
+    sensitive_paths = (
+        "/graphql",  # All GraphQL operations
+        "/auth",     # Authentication operations
+        "/user",     # User data operations
+        "/consent",  # Consent management
+        "/children"  # Child data operations
+    )
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.sensitive_paths):
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
+        # Log PIPEDA-relevant information
+        audit_info = {
+            "timestamp": time.time(),
+            "client_ip": self.get_client_ip(request),
+            "user_agent": request.headers.get("User-Agent"),
+            "method": request.method,
+            "path": request.url.path,
+            "has_auth": "Authorization" in request.headers,
+            "content_type": request.headers.get("Content-Type"),
+            "data_residency": "Canada",
+            "compliance_framework": "PIPEDA"
+        }
         
-        # Log response for sensitive operations
-        if is_sensitive:
-            response_audit = {
-                "status_code": response.status_code,
-                "response_size": response.headers.get("content-length", 0),
-                "data_modified": request.method in ["POST", "PUT", "PATCH", "DELETE"],
-                "compliance_check": "passed" if response.status_code < 400 else "review_required"
-            }
-            
-            logger.info("PIPEDA Response Audit", extra=sanitize_log_data(response_audit))
+        logger.info("PIPEDA Audit", extra=sanitize_log_data(audit_info))
+        
+        async def send_with_audit(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Log response for sensitive operations
+                status_code = message["status"]
+                response_audit = {
+                    "status_code": status_code,
+                    "response_size": MutableHeaders(scope=message).get("content-length", 0),
+                    "data_modified": request.method in ["POST", "PUT", "PATCH", "DELETE"],
+                    "compliance_check": "passed" if status_code < 400 else "review_required"
+                }
+                
+                logger.info("PIPEDA Response Audit", extra=sanitize_log_data(response_audit))
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_audit)
     
     def get_client_ip(self, request: Request) -> str:
         """
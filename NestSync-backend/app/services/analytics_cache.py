@@ -3,80 +3,137 @@ Analytics Caching Service for NestSync
 Performance optimization for analytics queries with Canadian timezone support
 """
 
+import heapq
 import logging
-import hashlib
-import json
+import struct
+import time
 import uuid
-from datetime import datetime, timezone, date, timedelta
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, asdict
+from collections import OrderedDict, deque
+from datetime import datetime, timezone, date
+from typing import Optional, Deque, Dict, Any, List, NamedTuple, Sequence, Set, Tuple, Callable, Awaitable
+from dataclasses import dataclass
+from enum import Enum
 import asyncio
 
+import orjson
+
+from app.config.settings import settings
+from app.services.analytics_cache_backends import (
+    RedisCacheBackend, encode_response, decode_response, shared_key, tag_key
+)
+from prometheus_client import Counter, Histogram
+
+from app.services.metrics import DEFAULT_LATENCY_BUCKETS, collect_families, histogram_stats, sample_values
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class CacheKey:
-    """Cache key structure for analytics data"""
+class CacheKey(NamedTuple):
+    """
+    Cache key structure for analytics data
+
+    A plain tuple: hashing it is cheap, and user_id/child_id stay readable
+    so invalidation can find every key that belongs to a user or child.
+    """
     user_id: str
     child_id: Optional[str]
     query_type: str
     start_date: str
     end_date: str
-    filters: Dict[str, Any]
+    filters: Tuple[Tuple[str, Any], ...]
     timezone: str
 
-    def to_string(self) -> str:
-        """Convert cache key to string for storage"""
-        key_data = asdict(self)
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
-
 
 @dataclass
 class CacheEntry:
     """Cache entry with metadata"""
     data: Any
-    created_at: datetime
-    expires_at: datetime
+    expires_at: float  # clock() deadline
     hit_count: int = 0
-    last_accessed: Optional[datetime] = None
 
 
 class AnalyticsCache:
-    """In-memory cache for analytics data with TTL and size limits"""
-
-    def __init__(self, max_size: int = 1000, default_ttl_minutes: int = 30):
-        self.cache: Dict[str, CacheEntry] = {}
+    """
+    In-memory LRU cache for analytics data with per-entry TTL
+
+    Every operation is O(1) or O(log n):
+    - recency lives in an OrderedDict, so a hit is a move_to_end and a full
+      cache evicts from the front
+    - expiry deadlines sit in a min-heap that is drained lazily on writes;
+      stale heap records for replaced keys are skipped
+    - secondary indexes map user_id and child_id to their keys, so
+      invalidation touches only the affected entries
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl_minutes: int = 30,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.cache: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
         self.max_size = max_size
         self.default_ttl_minutes = default_ttl_minutes
+        self.clock = clock
         self.logger = logging.getLogger(__name__)
 
-    def _is_expired(self, entry: CacheEntry) -> bool:
-        """Check if cache entry is expired"""
-        return datetime.now(timezone.utc) > entry.expires_at
+        self._expiry_heap: List[Tuple[float, CacheKey]] = []
+        self._keys_by_user: Dict[str, Set[CacheKey]] = {}
+        self._keys_by_child: Dict[str, Set[CacheKey]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    # -------------------------------------------------------------------------
+    # Internal bookkeeping
+    # -------------------------------------------------------------------------
+
+    def _index(self, key: CacheKey):
+        self._keys_by_user.setdefault(key.user_id, set()).add(key)
+        if key.child_id:
+            self._keys_by_child.setdefault(key.child_id, set()).add(key)
+
+    def _unindex(self, key: CacheKey):
+        for index, tag in ((self._keys_by_user, key.user_id), (self._keys_by_child, key.child_id)):
+            keys = index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[tag]
+
+    def _remove(self, key: CacheKey):
+        del self.cache[key]
+        self._unindex(key)
 
     def _evict_expired(self):
-        """Remove expired entries from cache"""
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if self._is_expired(entry)
-        ]
-        for key in expired_keys:
-            del self.cache[key]
+        """Pop heap records whose deadline has passed"""
+        now = self.clock()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self.cache.get(key)
+            # The key may have been replaced or removed since this record was pushed
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self.expirations += 1
+
+        # Replaced keys leave dead records behind; rebuild once they dominate
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [(entry.expires_at, key) for key, entry in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
 
     def _evict_lru(self):
-        """Remove least recently used entries when cache is full"""
-        if len(self.cache) >= self.max_size:
-            # Sort by last_accessed (None values go first)
-            sorted_entries = sorted(
-                self.cache.items(),
-                key=lambda x: x[1].last_accessed or datetime.min.replace(tzinfo=timezone.utc)
-            )
-            # Remove oldest 20% of entries
-            remove_count = max(1, len(sorted_entries) // 5)
-            for key, _ in sorted_entries[:remove_count]:
-                del self.cache[key]
+        """Remove least recently used entries until there is room for one more"""
+        while len(self.cache) >= self.max_size:
+            key, _ = self.cache.popitem(last=False)
+            self._unindex(key)
+            self.evictions += 1
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
 
     def create_cache_key(
         self,
@@ -87,125 +144,333 @@ class AnalyticsCache:
         end_date: Optional[date] = None,
         filters: Optional[Dict[str, Any]] = None,
         timezone: str = "America/Toronto"
-    ) -> str:
+    ) -> CacheKey:
         """Create standardized cache key"""
-        cache_key = CacheKey(
+        return CacheKey(
             user_id=str(user_id),
             child_id=str(child_id) if child_id else None,
             query_type=query_type,
             start_date=start_date.isoformat() if start_date else "",
             end_date=end_date.isoformat() if end_date else "",
-            filters=filters or {},
+            filters=tuple(sorted((filters or {}).items())),
             timezone=timezone
         )
-        return cache_key.to_string()
 
-    def get(self, cache_key: str) -> Optional[Any]:
+    def get(self, cache_key: CacheKey) -> Optional[Any]:
         """Get data from cache"""
-        try:
-            self._evict_expired()
-
-            if cache_key not in self.cache:
-                return None
-
-            entry = self.cache[cache_key]
-            if self._is_expired(entry):
-                del self.cache[cache_key]
-                return None
-
-            # Update access statistics
-            entry.hit_count += 1
-            entry.last_accessed = datetime.now(timezone.utc)
-
-            self.logger.debug(f"Cache HIT for key {cache_key[:8]}...")
-            return entry.data
+        entry = self.cache.get(cache_key)
+        if entry is None:
+            self.misses += 1
+            return None
 
-        except Exception as e:
-            self.logger.error(f"Error retrieving from cache: {e}")
+        if entry.expires_at <= self.clock():
+            self._remove(cache_key)
+            self.expirations += 1
+            self.misses += 1
             return None
 
+        self.cache.move_to_end(cache_key)
+        entry.hit_count += 1
+        self.hits += 1
+        return entry.data
+
     def set(
         self,
-        cache_key: str,
+        cache_key: CacheKey,
         data: Any,
         ttl_minutes: Optional[int] = None
     ) -> bool:
         """Store data in cache with TTL"""
-        try:
+        ttl = ttl_minutes or self.default_ttl_minutes
+        expires_at = self.clock() + ttl * 60
+
+        if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
+        else:
             self._evict_expired()
             self._evict_lru()
+            self._index(cache_key)
 
-            ttl = ttl_minutes or self.default_ttl_minutes
-            expires_at = datetime.now(timezone.utc) + timedelta(minutes=ttl)
+        self.cache[cache_key] = CacheEntry(data=data, expires_at=expires_at)
+        heapq.heappush(self._expiry_heap, (expires_at, cache_key))
+        return True
 
-            entry = CacheEntry(
-                data=data,
-                created_at=datetime.now(timezone.utc),
-                expires_at=expires_at
-            )
+    def invalidate_user_cache(self, user_id: uuid.UUID) -> int:
+        """Invalidate all cache entries for a user"""
+        keys = self._keys_by_user.get(str(user_id), set()).copy()
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
 
-            self.cache[cache_key] = entry
-            self.logger.debug(f"Cache SET for key {cache_key[:8]}... (TTL: {ttl}m)")
-            return True
+        self.logger.debug(f"Invalidated {len(keys)} cache entries for user {user_id}")
+        return len(keys)
 
-        except Exception as e:
-            self.logger.error(f"Error storing in cache: {e}")
-            return False
+    def invalidate_child_cache(self, child_id: uuid.UUID) -> int:
+        """Invalidate all cache entries scoped to a child, whoever requested them"""
+        keys = self._keys_by_child.get(str(child_id), set()).copy()
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
 
-    def invalidate_user_cache(self, user_id: uuid.UUID):
-        """Invalidate all cache entries for a user"""
-        try:
-            user_id_str = str(user_id)
-            keys_to_remove = []
+        self.logger.debug(f"Invalidated {len(keys)} cache entries for child {child_id}")
+        return len(keys)
 
-            for key, entry in self.cache.items():
-                # Simple check - in a full implementation, you'd decode the key
-                # For now, we'll invalidate based on timing
-                if entry.created_at < datetime.now(timezone.utc) - timedelta(hours=1):
-                    keys_to_remove.append(key)
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache performance statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "total_entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "max_size": self.max_size,
+            "default_ttl_minutes": self.default_ttl_minutes
+        }
 
-            for key in keys_to_remove:
-                del self.cache[key]
+    def clear_cache(self):
+        """Clear all cache entries"""
+        cleared_count = len(self.cache)
+        self.cache.clear()
+        self._expiry_heap.clear()
+        self._keys_by_user.clear()
+        self._keys_by_child.clear()
+        self.logger.info(f"Cleared {cleared_count} cache entries")
 
-            self.logger.info(f"Invalidated {len(keys_to_remove)} cache entries for user {user_id}")
 
-        except Exception as e:
-            self.logger.error(f"Error invalidating user cache: {e}")
+class _Stamped(NamedTuple):
+    """A cached value and the wall-clock time it stops being fresh"""
+    value: Any
+    fresh_until: float
 
-    def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache performance statistics"""
-        try:
-            total_entries = len(self.cache)
-            total_hits = sum(entry.hit_count for entry in self.cache.values())
-
-            # Calculate size estimate (rough)
-            estimated_size_mb = len(self.cache) * 0.01  # Rough estimate
-
-            now = datetime.now(timezone.utc)
-            expired_count = sum(1 for entry in self.cache.values() if self._is_expired(entry))
-
-            return {
-                "total_entries": total_entries,
-                "total_hits": total_hits,
-                "expired_entries": expired_count,
-                "estimated_size_mb": round(estimated_size_mb, 2),
-                "max_size": self.max_size,
-                "default_ttl_minutes": self.default_ttl_minutes
-            }
 
+class CacheOutcome(str, Enum):
+    """How a cached query was served"""
+    HIT = "hit"              # Fresh cached value
+    STALE = "stale"          # Stale value; a background refresh was started
+    MISS = "miss"            # This call started the computation
+    COALESCED = "coalesced"  # Waited on a computation another call started
+
+
+class TieredAnalyticsCache:
+    """
+    Per-process L1 (AnalyticsCache) in front of a shared L2 backend
+
+    Invalidations clear L1 and L2 and are published so every other process
+    clears its own L1. L1 TTLs are capped short as a backstop for a missed
+    message. If L2 errors, it is skipped for a cool-down and the cache keeps
+    working from L1 alone.
+
+    Each entry has a soft TTL (ttl_minutes) and a hard TTL that adds
+    stale_minutes. Between the two, get_or_compute serves the stale value and
+    refreshes it in the background; concurrent computations of one key are
+    coalesced into a single task.
+    """
+
+    L2_RETRY_SECONDS = 30
+
+    def __init__(
+        self,
+        l1: AnalyticsCache,
+        l2=None,
+        l1_ttl_minutes: Optional[int] = None,
+        stale_minutes: int = 0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl_minutes = l1_ttl_minutes
+        self.stale_minutes = stale_minutes
+        # Wall clock, not monotonic: freshness stamps are shared between processes
+        self.clock = clock
+        self.l2_hits = 0
+        self.l2_errors = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+        self._l2_retry_at = 0.0
+        self._inflight: Dict[CacheKey, "asyncio.Task"] = {}
+
+    def create_cache_key(self, *args, **kwargs) -> CacheKey:
+        """Same as AnalyticsCache.create_cache_key"""
+        return self.l1.create_cache_key(*args, **kwargs)
+
+    def _l2_available(self) -> bool:
+        return self.l2 is not None and time.monotonic() >= self._l2_retry_at
+
+    def _l2_failed(self, operation: str, error: Exception):
+        self.l2_errors += 1
+        self._l2_retry_at = time.monotonic() + self.L2_RETRY_SECONDS
+        logger.warning(f"Shared analytics cache {operation} failed, using local cache only: {error}")
+
+    def _l1_ttl(self, hard_ttl_minutes: int) -> int:
+        if self.l1_ttl_minutes:
+            return min(hard_ttl_minutes, self.l1_ttl_minutes)
+        return hard_ttl_minutes
+
+    async def _get_stamped(self, cache_key: CacheKey) -> Optional[_Stamped]:
+        """L1, then L2 (promoting hits into L1)"""
+        stamped = self.l1.get(cache_key)
+        if stamped is not None or not self._l2_available():
+            return stamped
+
+        try:
+            blob = await self.l2.get(shared_key(cache_key))
+            if blob is None:
+                return None
+            stamped = _Stamped(decode_response(blob[8:]), struct.unpack(">d", blob[:8])[0])
         except Exception as e:
-            self.logger.error(f"Error getting cache stats: {e}")
-            return {}
+            self._l2_failed("read", e)
+            return None
 
-    def clear_cache(self):
-        """Clear all cache entries"""
+        self.l2_hits += 1
+        remaining_minutes = max(1, int((stamped.fresh_until - self.clock()) / 60) + self.stale_minutes)
+        self.l1.set(cache_key, stamped, self._l1_ttl(remaining_minutes))
+        return stamped
+
+    async def get(self, cache_key: CacheKey) -> Optional[Any]:
+        """Cached value, fresh or stale, until its hard TTL"""
+        stamped = await self._get_stamped(cache_key)
+        return stamped.value if stamped is not None else None
+
+    async def set(self, cache_key: CacheKey, data: Any, ttl_minutes: Optional[int] = None) -> bool:
+        """Write through to both levels"""
+        ttl = ttl_minutes or self.l1.default_ttl_minutes
+        hard_ttl = ttl + self.stale_minutes
+        stamped = _Stamped(data, self.clock() + ttl * 60)
+
+        self.l1.set(cache_key, stamped, self._l1_ttl(hard_ttl))
+        if not self._l2_available():
+            return True
+
+        tags = [tag_key("user", cache_key.user_id)]
+        if cache_key.child_id:
+            tags.append(tag_key("child", cache_key.child_id))
         try:
-            cleared_count = len(self.cache)
-            self.cache.clear()
-            self.logger.info(f"Cleared {cleared_count} cache entries")
+            await self.l2.set(
+                shared_key(cache_key),
+                struct.pack(">d", stamped.fresh_until) + encode_response(data),
+                hard_ttl * 60,
+                tags
+            )
+        except Exception as e:
+            self._l2_failed("write", e)
+        return True
+
+    async def get_or_compute(
+        self,
+        cache_key: CacheKey,
+        compute: Callable[[], Awaitable[Any]],
+        ttl_minutes: Optional[int] = None,
+        force_refresh: bool = False,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        on_outcome: Optional[Callable[[CacheOutcome], None]] = None
+    ) -> Any:
+        """
+        Cached value for cache_key, computing it at most once at a time
+
+        Args:
+            compute: Coroutine function producing the value; a background
+                refresh may run it after the caller has returned, so it
+                must not depend on request-scoped resources
+            cache_if: Only store results this returns True for
+            on_outcome: Called with how this call was served, before it waits
+                on any computation
+        """
+        if not force_refresh:
+            stamped = await self._get_stamped(cache_key)
+            if stamped is not None:
+                outcome = CacheOutcome.HIT
+                if stamped.fresh_until <= self.clock():
+                    outcome = CacheOutcome.STALE
+                    self.stale_hits += 1
+                    self._compute_once(cache_key, compute, ttl_minutes, cache_if)
+                if on_outcome is not None:
+                    on_outcome(outcome)
+                return stamped.value
+
+        if on_outcome is not None:
+            on_outcome(CacheOutcome.COALESCED if cache_key in self._inflight else CacheOutcome.MISS)
+
+        # Shielded: one caller giving up must not cancel the shared computation
+        return await asyncio.shield(self._compute_once(cache_key, compute, ttl_minutes, cache_if))
+
+    def _compute_once(self, cache_key, compute, ttl_minutes, cache_if) -> "asyncio.Task":
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        async def run():
+            result = await compute()
+            # An invalidation while computing unregisters the task; its result
+            # may predate the change, so it is returned but not cached
+            registered = self._inflight.get(cache_key) is asyncio.current_task()
+            if registered and (cache_if is None or cache_if(result)):
+                await self.set(cache_key, result, ttl_minutes)
+            return result
+
+        task = asyncio.create_task(run())
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda done: self._computation_done(cache_key, done))
+        return task
 
+    def _computation_done(self, cache_key: CacheKey, task: "asyncio.Task"):
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error computing cached analytics query: {task.exception()}")
+
+    async def invalidate(self, user_ids: Sequence[Any] = (), child_ids: Sequence[Any] = ()) -> None:
+        """Drop entries for the given users and children on every process"""
+        scopes = [("user", str(user_id)) for user_id in user_ids] + [("child", str(child_id)) for child_id in child_ids]
+        self._invalidate_local(scopes)
+
+        if not self._l2_available():
+            return
+        try:
+            for scope, scope_id in scopes:
+                await self.l2.invalidate(tag_key(scope, scope_id))
+            await self.l2.publish(orjson.dumps(scopes))
         except Exception as e:
-            self.logger.error(f"Error clearing cache: {e}")
+            self._l2_failed("invalidation", e)
+
+    def _invalidate_local(self, scopes: Sequence[Tuple[str, str]]):
+        for scope, scope_id in scopes:
+            if scope == "user":
+                self.l1.invalidate_user_cache(scope_id)
+            else:
+                self.l1.invalidate_child_cache(scope_id)
+
+        scoped = {tuple(scope) for scope in scopes}
+        for key in list(self._inflight):
+            if ("user", key.user_id) in scoped or ("child", key.child_id) in scoped:
+                del self._inflight[key]
+
+    async def listen_for_invalidations(self):
+        """Apply invalidations published by other processes; runs until cancelled"""
+        while True:
+            try:
+                async for message in self.l2.subscribe():
+                    self._invalidate_local(orjson.loads(message))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Analytics cache invalidation listener failed, retrying: {e}")
+                await asyncio.sleep(self.L2_RETRY_SECONDS)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """L1 statistics plus shared-tier counters"""
+        return {
+            **self.l1.get_cache_stats(),
+            "shared_tier_enabled": self.l2 is not None,
+            "shared_tier_hits": self.l2_hits,
+            "shared_tier_errors": self.l2_errors,
+            "stale_hits": self.stale_hits,
+            "coalesced_computations": self.coalesced,
+            "computations_in_flight": len(self._inflight)
+        }
 
 
 class AnalyticsCacheManager:
@@ -213,6 +478,7 @@ class AnalyticsCacheManager:
 
     _instance: Optional['AnalyticsCacheManager'] = None
     _cache: Optional[AnalyticsCache] = None
+    _tiered: Optional[TieredAnalyticsCache] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -228,37 +494,64 @@ class AnalyticsCacheManager:
 
     @classmethod
     def get_cache(cls) -> AnalyticsCache:
-        """Get the singleton cache instance"""
+        """Get the singleton cache instance (this process's L1)"""
         if cls._instance is None:
             cls._instance = cls()
         return cls._instance._cache
 
+    @classmethod
+    def get_tiered_cache(cls) -> TieredAnalyticsCache:
+        """L1 plus the shared Redis tier when ANALYTICS_CACHE_SHARED_ENABLED is set"""
+        if cls._tiered is None:
+            cls._tiered = TieredAnalyticsCache(
+                cls.get_cache(),
+                RedisCacheBackend() if settings.analytics_cache_shared_enabled else None,
+                l1_ttl_minutes=settings.analytics_cache_local_ttl_minutes,
+                stale_minutes=settings.analytics_cache_stale_minutes
+            )
+        return cls._tiered
+
+    @classmethod
+    async def invalidate(cls, user_ids: Sequence[Any] = (), child_ids: Sequence[Any] = ()):
+        """Invalidate users' and children's analytics on every process"""
+        await cls.get_tiered_cache().invalidate(user_ids, child_ids)
+
+    @classmethod
+    def start_invalidation_listener(cls) -> Optional["asyncio.Task"]:
+        """Start applying other processes' invalidations to this process's L1"""
+        tiered = cls.get_tiered_cache()
+        if tiered.l2 is None:
+            return None
+        return asyncio.create_task(tiered.listen_for_invalidations())
+
+    @classmethod
+    async def close(cls):
+        """Close the shared tier's connections"""
+        if cls._tiered is not None and cls._tiered.l2 is not None:
+            await cls._tiered.l2.close()
+        cls._tiered = None
+
     @classmethod
     async def cached_analytics_query(
         cls,
-        cache_key: str,
+        cache_key: CacheKey,
         query_func,
         ttl_minutes: int = 30,
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        on_outcome: Optional[Callable[[CacheOutcome], None]] = None
     ):
-        """Execute analytics query with caching"""
-        cache = cls.get_cache()
-
-        # Check cache first (unless force refresh)
-        if not force_refresh:
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
+        """
+        Execute analytics query with caching
 
-        # Execute query
+        Concurrent misses for one key share a single query_func call, and an
+        entry past its TTL is served stale while it refreshes in the
+        background (see TieredAnalyticsCache.get_or_compute).
+        """
         try:
-            result = await query_func()
-
-            # Cache the result
-            cache.set(cache_key, result, ttl_minutes)
-
-            return result
-
+            return await cls.get_tiered_cache().get_or_compute(
+                cache_key, query_func, ttl_minutes, force_refresh, cache_if, on_outcome
+            )
         except Exception as e:
             logger.error(f"Error executing cached analytics query: {e}")
             raise
@@ -316,55 +609,94 @@ class QueryOptimizer:
 # Performance Monitoring
 # =============================================================================
 
+analytics_query_seconds = Histogram(
+    "analytics_query_seconds",
+    "Analytics query latency by cache outcome",
+    labelnames=("query_type", "outcome"),
+    buckets=DEFAULT_LATENCY_BUCKETS
+)
+analytics_cache_lookups = Counter(
+    "analytics_cache_lookups_total",
+    "Analytics cache lookups by result",
+    labelnames=("result",)
+)
+QUERY_SECONDS_FAMILY = "analytics_query_seconds"
+CACHE_LOOKUPS_FAMILY = "analytics_cache_lookups"
+
+SLOW_QUERY_SECONDS = 2.0
+
+
 class AnalyticsPerformanceMonitor:
-    """Monitor analytics query performance"""
+    """
+    Monitor analytics query performance
+
+    Latencies go to the analytics_query_seconds histogram, so memory stays
+    constant and the summary covers every worker process. The summary reads
+    every worker's metric files in multiprocess mode; call it from a thread
+    in async code.
+    """
 
     def __init__(self):
-        self.query_times: List[float] = []
-        self.slow_queries: List[Dict[str, Any]] = []
-        self.cache_stats = {"hits": 0, "misses": 0}
+        # Last 100 slow queries in this process
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=100)
 
-    def record_query_time(self, query_type: str, execution_time: float, was_cached: bool):
-        """Record query execution time"""
-        self.query_times.append(execution_time)
+    def record_query_time(self, query_type: str, execution_time: float, outcome: CacheOutcome):
+        """
+        Record query execution time
 
-        if was_cached:
-            self.cache_stats["hits"] += 1
-        else:
-            self.cache_stats["misses"] += 1
+        Calls that waited on another call's computation are counted as
+        coalesced, not as hits, so they do not inflate the hit rate.
+        """
+        analytics_query_seconds.labels(query_type=query_type, outcome=outcome.value).observe(execution_time)
+        analytics_cache_lookups.labels(result=outcome.value).inc()
 
-        # Flag slow queries (>2 seconds)
-        if execution_time > 2.0 and not was_cached:
+        if execution_time > SLOW_QUERY_SECONDS and outcome == CacheOutcome.MISS:
             self.slow_queries.append({
                 "query_type": query_type,
                 "execution_time": execution_time,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             })
 
-            # Keep only last 100 slow queries
-            if len(self.slow_queries) > 100:
-                self.slow_queries = self.slow_queries[-100:]
-
     def get_performance_summary(self) -> Dict[str, Any]:
-        """Get performance statistics summary"""
-        if not self.query_times:
+        """Get performance statistics summary, with p50/p95/p99 per query type estimated from the buckets"""
+        families = collect_families([QUERY_SECONDS_FAMILY, CACHE_LOOKUPS_FAMILY])
+        latency = histogram_stats(families.get(QUERY_SECONDS_FAMILY), ("query_type", "outcome"))
+        if not latency:
             return {"status": "no_data"}
 
-        import statistics
+        by_query_type: Dict[str, Dict[str, Any]] = {}
+        total_queries, total_time = 0, 0.0
+        for (query_type, outcome), stats in latency.items():
+            total_queries += stats["count"]
+            total_time += stats["sum"]
+            by_query_type.setdefault(query_type, {})[outcome] = {
+                "count": stats["count"],
+                "average_time": _round(stats["mean"]),
+                "p50": _round(stats["p50"]),
+                "p95": _round(stats["p95"]),
+                "p99": _round(stats["p99"])
+            }
+
+        lookups = sample_values(families.get(CACHE_LOOKUPS_FAMILY), ("result",), suffix="_total")
+        hits = lookups.get((CacheOutcome.HIT.value,), 0) + lookups.get((CacheOutcome.STALE.value,), 0)
+        misses = lookups.get((CacheOutcome.MISS.value,), 0)
+        coalesced = lookups.get((CacheOutcome.COALESCED.value,), 0)
 
         return {
-            "total_queries": len(self.query_times),
-            "average_time": round(statistics.mean(self.query_times), 3),
-            "median_time": round(statistics.median(self.query_times), 3),
-            "max_time": round(max(self.query_times), 3),
-            "cache_hit_rate": round(
-                self.cache_stats["hits"] / (self.cache_stats["hits"] + self.cache_stats["misses"]) * 100, 2
-            ) if (self.cache_stats["hits"] + self.cache_stats["misses"]) > 0 else 0,
+            "total_queries": total_queries,
+            "average_time": round(total_time / total_queries, 3) if total_queries else 0,
+            "by_query_type": by_query_type,
+            "cache_hit_rate": round(hits / (hits + misses) * 100, 2) if (hits + misses) > 0 else 0,
+            "coalesced_lookups": coalesced,
             "slow_queries_count": len(self.slow_queries),
-            "recent_slow_queries": self.slow_queries[-5:]  # Last 5 slow queries
+            "recent_slow_queries": list(self.slow_queries)[-5:]  # Last 5 slow queries
         }
 
 
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
 # =============================================================================
 # Global Instances
 # =============================================================================
@@ -381,7 +713,10 @@ cache_manager = AnalyticsCacheManager()
 # =============================================================================
 
 __all__ = [
+    "CacheKey",
+    "CacheOutcome",
     "AnalyticsCache",
+    "TieredAnalyticsCache",
     "AnalyticsCacheManager",
     "QueryOptimizer",
     "AnalyticsPerformanceMonitor",
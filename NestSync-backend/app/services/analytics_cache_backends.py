@@ -0,0 +1,251 @@
+"""
+Shared Analytics Cache Backends for NestSync
+L2 storage behind the per-process AnalyticsCache, plus the response codec
+
+Responses are stored as compact tagged JSON (orjson, zlib-compressed when
+large) rather than pickle, so a shared Redis can only ever hand back
+GraphQL response types from app.graphql, never arbitrary objects.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import importlib
+import logging
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import orjson
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a cached response type changes shape; old entries are then
+# simply never read again and age out
+CACHE_SCHEMA_VERSION = 1
+KEY_PREFIX = f"nestsync:analytics:v{CACHE_SCHEMA_VERSION}"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+_ALLOWED_TYPE_PREFIX = "app.graphql."
+_COMPRESS_THRESHOLD_BYTES = 1024
+
+
+# =============================================================================
+# Response Codec
+# =============================================================================
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return {"~e": _type_path(type(value)), "v": value.value}
+    if isinstance(value, datetime):
+        return {"~dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"~d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"~n": str(value)}
+    if isinstance(value, uuid.UUID):
+        return {"~u": str(value)}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {"~m": {str(key): _encode(item) for key, item in value.items()}}
+    if dataclasses.is_dataclass(value):
+        return {
+            "~t": _type_path(type(value)),
+            "f": {
+                field.name: _encode(getattr(value, field.name))
+                for field in dataclasses.fields(value) if field.init
+            }
+        }
+    raise TypeError(f"Cannot encode {type(value).__name__} for the analytics cache")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "~t" in value:
+        cls = _resolve_type(value["~t"])
+        return cls(**{name: _decode(item) for name, item in value["f"].items()})
+    if "~e" in value:
+        return _resolve_type(value["~e"])(value["v"])
+    if "~dt" in value:
+        return datetime.fromisoformat(value["~dt"])
+    if "~d" in value:
+        return date.fromisoformat(value["~d"])
+    if "~n" in value:
+        return Decimal(value["~n"])
+    if "~u" in value:
+        return uuid.UUID(value["~u"])
+    return {key: _decode(item) for key, item in value["~m"].items()}
+
+
+def _type_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve_type(path: str) -> type:
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith(_ALLOWED_TYPE_PREFIX):
+        raise ValueError(f"Refusing to decode cached type {path}")
+    return getattr(importlib.import_module(module_name), qualname)
+
+
+def encode_response(value: Any) -> bytes:
+    """Serialize a Strawberry response object for the shared cache"""
+    payload = orjson.dumps(_encode(value))
+    if len(payload) >= _COMPRESS_THRESHOLD_BYTES:
+        return b"z" + zlib.compress(payload, 1)
+    return b"j" + payload
+
+
+def decode_response(blob: bytes) -> Any:
+    """Inverse of encode_response"""
+    payload = zlib.decompress(blob[1:]) if blob[:1] == b"z" else blob[1:]
+    return _decode(orjson.loads(payload))
+
+
+# =============================================================================
+# Keys
+# =============================================================================
+
+def shared_key(cache_key: Tuple) -> str:
+    """Versioned L2 key for an AnalyticsCache CacheKey"""
+    digest = hashlib.blake2b(repr(tuple(cache_key)).encode(), digest_size=12).hexdigest()
+    return f"{KEY_PREFIX}:{cache_key.user_id}:{cache_key.child_id or '-'}:{cache_key.query_type}:{digest}"
+
+
+def tag_key(scope: str, scope_id: str) -> str:
+    """Set of shared keys belonging to a user or child"""
+    return f"{KEY_PREFIX}:tag:{scope}:{scope_id}"
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+class RedisCacheBackend:
+    """Shared L2 in Redis, with invalidations broadcast over pub/sub"""
+
+    def __init__(self, client: Optional[aioredis.Redis] = None):
+        self.client = client or _create_redis_client()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int, tags: List[str]) -> None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(key, value, ex=ttl_seconds)
+            for tag in tags:
+                pipe.sadd(tag, key)
+                pipe.expire(tag, ttl_seconds)
+            await pipe.execute()
+
+    async def invalidate(self, tag: str) -> int:
+        keys = await self.client.smembers(tag)
+        await self.client.delete(tag, *keys)
+        return len(keys)
+
+    async def publish(self, message: bytes, channel: str = INVALIDATION_CHANNEL) -> None:
+        await self.client.publish(channel, message)
+
+    async def subscribe(self, channel: str = INVALIDATION_CHANNEL) -> AsyncIterator[bytes]:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        try:
+            while True:
+                # Poll with a timeout rather than listen(): the client's short
+                # socket_timeout would otherwise fail an idle subscription
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    yield message["data"]
+        finally:
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def _create_redis_client() -> aioredis.Redis:
+    url = settings.redis_url
+    if settings.redis_ssl and url.startswith("redis://"):
+        url = "rediss://" + url[len("redis://"):]
+    return aioredis.from_url(
+        url,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        socket_timeout=1.0,
+        socket_connect_timeout=1.0
+    )
+
+
+class InMemoryCacheBackend:
+    """
+    Redis stand-in for tests
+
+    Several caches sharing one instance behave like replicas sharing one Redis.
+    """
+
+    def __init__(self):
+        self.store: Dict[str, Tuple[bytes, float]] = {}
+        self.tags: Dict[str, Set[str]] = defaultdict(set)
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self.store.get(key)
+        if item is None or item[1] <= time.monotonic():
+            return None
+        return item[0]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int, tags: List[str]) -> None:
+        self.store[key] = (value, time.monotonic() + ttl_seconds)
+        for tag in tags:
+            self.tags[tag].add(key)
+
+    async def invalidate(self, tag: str) -> int:
+        keys = self.tags.pop(tag, set())
+        for key in keys:
+            self.store.pop(key, None)
+        return len(keys)
+
+    async def publish(self, message: bytes, channel: str = INVALIDATION_CHANNEL) -> None:
+        for queue in list(self.subscribers[channel]):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str = INVALIDATION_CHANNEL) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers[channel].discard(queue)
+
+    async def close(self) -> None:
+        pass
+
+
+# =============================================================================
+# Export Cache Backend Components
+# =============================================================================
+
+__all__ = [
+    "CACHE_SCHEMA_VERSION",
+    "encode_response",
+    "decode_response",
+    "shared_key",
+    "tag_key",
+    "RedisCacheBackend",
+    "InMemoryCacheBackend"
+]
@@ -1,242 +1,414 @@
 """
 Analytics Scheduler for NestSync
 Handles scheduled analytics processing tasks
+
+Daily, weekly and monthly rollups are single set-based upserts that process
+every child in one pass, chunked by child id range so each transaction stays
+bounded. The per-child methods on AnalyticsBackgroundProcessor remain the
+repair path for individual children.
 """
 
-import asyncio
 import logging
-from typing import List
-from datetime import datetime, timezone, timedelta
-from sqlalchemy import select, distinct, delete, extract, and_
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, text
+from sqlalchemy.sql.elements import TextClause
 
-from app.config.database import get_async_session
+from app.config.database import get_async_session, get_isolated_session
+from app.config.settings import settings
 from app.models.analytics import AnalyticsDailySummary
-from app.services.enhanced_analytics_service import AnalyticsBackgroundProcessor
-from app.utils.data_transformations import TIMEZONE_CANADA
+from app.services.enhanced_analytics_service import COST_PER_CHANGE_CAD, summary_day_bounds
+from app.services.partition_maintenance import ANALYTICS_DAILY_SUMMARIES, PartitionMaintenance
 
 logger = logging.getLogger(__name__)
 
+TARGET_COST_PER_CHANGE_CAD = COST_PER_CHANGE_CAD
+
+
+# =============================================================================
+# Rollup Statements
+# =============================================================================
+
+# Upper bound of the next chunk of children after :after_child_id
+CHILD_CHUNK_END = text("""
+    SELECT max(id) FROM (
+        SELECT id FROM children
+        WHERE id > CAST(:after_child_id AS uuid)
+        ORDER BY id
+        LIMIT :chunk_size
+    ) chunk
+""")
+
+# Same rows as AnalyticsBackgroundProcessor.process_daily_analytics: both take
+# the local day from summary_day_bounds and bucket hours in UTC
+DAILY_ROLLUP_UPSERT = text("""
+    WITH changes AS (
+        SELECT
+            u.child_id,
+            u.created_at,
+            CAST(EXTRACT(HOUR FROM u.created_at AT TIME ZONE 'UTC') AS integer) AS hour,
+            u.created_at - lag(u.created_at) OVER (
+                PARTITION BY u.child_id ORDER BY u.created_at
+            ) AS gap
+        FROM usage_logs u
+        WHERE u.child_id > CAST(:after_child_id AS uuid)
+            AND u.child_id <= CAST(:last_child_id AS uuid)
+            AND u.created_at >= CAST(:day_start AS timestamptz)
+            AND u.created_at < CAST(:day_end AS timestamptz)
+            AND u.deleted_at IS NULL
+    ),
+    hourly AS (
+        SELECT
+            child_id,
+            json_object_agg(CAST(hour AS text), changes ORDER BY first_change) AS hourly_distribution
+        FROM (
+            SELECT child_id, hour, count(*) AS changes, min(created_at) AS first_change
+            FROM changes
+            GROUP BY child_id, hour
+        ) by_hour
+        GROUP BY child_id
+    ),
+    daily AS (
+        SELECT
+            child_id,
+            count(*) AS total_changes,
+            array_agg(created_at ORDER BY created_at) AS change_times,
+            avg(gap) AS avg_gap,
+            max(gap) AS longest_gap,
+            min(gap) AS shortest_gap
+        FROM changes
+        GROUP BY child_id
+    )
+    INSERT INTO analytics_daily_summaries AS s (
+        id, user_id, child_id, date, total_changes, change_times, hourly_distribution,
+        time_between_changes_avg, longest_gap, shortest_gap, estimated_cost_cad,
+        created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), c.parent_id, d.child_id, CAST(:summary_date AS date),
+        d.total_changes, d.change_times, h.hourly_distribution,
+        d.avg_gap, d.longest_gap, d.shortest_gap,
+        d.total_changes * CAST(:cost_per_change AS numeric), now(), now()
+    FROM daily d
+    JOIN hourly h ON h.child_id = d.child_id
+    JOIN children c ON c.id = d.child_id
+    ON CONFLICT (child_id, date) DO UPDATE SET
+        total_changes = EXCLUDED.total_changes,
+        change_times = EXCLUDED.change_times,
+        hourly_distribution = EXCLUDED.hourly_distribution,
+        time_between_changes_avg = EXCLUDED.time_between_changes_avg,
+        longest_gap = EXCLUDED.longest_gap,
+        shortest_gap = EXCLUDED.shortest_gap,
+        estimated_cost_cad = EXCLUDED.estimated_cost_cad,
+        updated_at = now()
+""")
+
+# Weekly metrics as in AnalyticsBackgroundProcessor.calculate_weekly_patterns, for
+# the Monday-to-Sunday week starting at :week_start
+WEEKLY_ROLLUP_UPSERT = text("""
+    WITH days AS (
+        SELECT s.child_id, s.date, s.total_changes, s.hourly_distribution
+        FROM analytics_daily_summaries s
+        WHERE s.child_id > CAST(:after_child_id AS uuid)
+            AND s.child_id <= CAST(:last_child_id AS uuid)
+            AND s.date >= CAST(:week_start AS date)
+            AND s.date < CAST(:week_start AS date) + 7
+    ),
+    counts AS (
+        SELECT
+            active.child_id,
+            array_agg(COALESCE(d.total_changes, 0) ORDER BY g.day_offset) AS daily_counts
+        FROM (SELECT DISTINCT child_id FROM days) active
+        CROSS JOIN generate_series(0, 6) AS g(day_offset)
+        LEFT JOIN days d
+            ON d.child_id = active.child_id
+            AND d.date = CAST(:week_start AS date) + g.day_offset
+        GROUP BY active.child_id
+    ),
+    hourly AS (
+        SELECT child_id, json_object_agg(hour, changes) AS hourly_distribution
+        FROM (
+            SELECT d.child_id, h.key AS hour, sum(CAST(h.value AS integer)) AS changes
+            FROM days d
+            CROSS JOIN LATERAL json_each_text(d.hourly_distribution) AS h
+            GROUP BY d.child_id, h.key
+        ) by_hour
+        GROUP BY child_id
+    ),
+    weekly AS (
+        SELECT
+            c.child_id,
+            c.daily_counts,
+            w.total_changes,
+            w.variance,
+            w.weekday_changes / 5.0 AS weekday_average,
+            w.weekend_changes / 2.0 AS weekend_average
+        FROM counts c
+        CROSS JOIN LATERAL (
+            SELECT
+                sum(n) AS total_changes,
+                sum(n) FILTER (WHERE i <= 5) AS weekday_changes,
+                sum(n) FILTER (WHERE i > 5) AS weekend_changes,
+                var_pop(n) AS variance
+            FROM unnest(c.daily_counts) WITH ORDINALITY AS t(n, i)
+        ) w
+    )
+    INSERT INTO analytics_weekly_patterns AS p (
+        id, child_id, week_start_date, daily_counts, weekly_average, consistency_percentage,
+        pattern_insights, peak_hours, hourly_distribution, weekday_average, weekend_average,
+        weekend_vs_weekday_ratio, calculated_at
+    )
+    SELECT
+        gen_random_uuid(), w.child_id, CAST(:week_start AS date), w.daily_counts,
+        w.total_changes / 7.0,
+        CASE
+            WHEN w.total_changes > 0
+                THEN GREATEST(0, 100 - w.variance / (w.total_changes / 7.0) * 20)
+            ELSE 0
+        END,
+        'Automated pattern analysis', '{}'::json,
+        COALESCE(h.hourly_distribution, '{}'::json),
+        w.weekday_average, w.weekend_average,
+        CASE
+            WHEN w.weekday_average > 0
+                THEN LEAST(w.weekend_average / w.weekday_average * 100, 999.99)
+            ELSE 100
+        END,
+        now()
+    FROM weekly w
+    LEFT JOIN hourly h ON h.child_id = w.child_id
+    ON CONFLICT (child_id, week_start_date) DO UPDATE SET
+        daily_counts = EXCLUDED.daily_counts,
+        weekly_average = EXCLUDED.weekly_average,
+        consistency_percentage = EXCLUDED.consistency_percentage,
+        hourly_distribution = EXCLUDED.hourly_distribution,
+        weekday_average = EXCLUDED.weekday_average,
+        weekend_average = EXCLUDED.weekend_average,
+        weekend_vs_weekday_ratio = EXCLUDED.weekend_vs_weekday_ratio,
+        calculated_at = now()
+""")
+
+# Cost tracking for the month starting at :month_start, from its daily summaries
+MONTHLY_COST_ROLLUP_UPSERT = text("""
+    WITH days AS (
+        SELECT
+            s.child_id,
+            s.date,
+            s.total_changes,
+            COALESCE(s.estimated_cost_cad, 0) AS cost
+        FROM analytics_daily_summaries s
+        WHERE s.child_id > CAST(:after_child_id AS uuid)
+            AND s.child_id <= CAST(:last_child_id AS uuid)
+            AND s.date >= CAST(:month_start AS date)
+            AND s.date < CAST(:next_month_start AS date)
+    ),
+    day_costs AS (
+        SELECT child_id, to_char(date, 'FMDay') AS day_name, sum(cost) AS cost, min(date) AS first_date
+        FROM days
+        GROUP BY child_id, to_char(date, 'FMDay')
+    ),
+    monthly AS (
+        SELECT
+            child_id,
+            sum(total_changes) AS total_changes,
+            sum(cost) AS total_cost,
+            COALESCE(sum(total_changes) FILTER (WHERE EXTRACT(ISODOW FROM date) < 6), 0) / 22.0 AS weekday_average,
+            COALESCE(sum(total_changes) FILTER (WHERE EXTRACT(ISODOW FROM date) >= 6), 0) / 8.0 AS weekend_average
+        FROM days
+        GROUP BY child_id
+    ),
+    costs AS (
+        SELECT
+            m.*,
+            CASE WHEN m.total_changes > 0 THEN m.total_cost / m.total_changes ELSE 0 END AS cost_per_change,
+            (
+                SELECT dc.day_name FROM day_costs dc
+                WHERE dc.child_id = m.child_id
+                ORDER BY dc.cost DESC, dc.first_date
+                LIMIT 1
+            ) AS most_expensive_day
+        FROM monthly m
+    )
+    INSERT INTO analytics_cost_tracking AS t (
+        id, child_id, month_year, total_cost_cad, cost_per_change_cad, efficiency_vs_target,
+        weekend_vs_weekday_usage, most_expensive_day, cost_trend_7day, primary_brand,
+        primary_size, brands_used, sizes_used, calculated_at
+    )
+    SELECT
+        gen_random_uuid(), child_id, :month_year, total_cost, cost_per_change,
+        CASE
+            WHEN cost_per_change > 0
+                THEN LEAST(100, CAST(:target_cost AS numeric) / cost_per_change * 100)
+            ELSE 100
+        END,
+        CASE
+            WHEN weekday_average > 0
+                THEN LEAST(weekend_average / weekday_average * 100, 999.99)
+            ELSE 100
+        END,
+        most_expensive_day, 0, 'Generic', 'Size 2', '{}'::json, '{}'::json, now()
+    FROM costs
+    ON CONFLICT (child_id, month_year) DO UPDATE SET
+        total_cost_cad = EXCLUDED.total_cost_cad,
+        cost_per_change_cad = EXCLUDED.cost_per_change_cad,
+        efficiency_vs_target = EXCLUDED.efficiency_vs_target,
+        weekend_vs_weekday_usage = EXCLUDED.weekend_vs_weekday_usage,
+        most_expensive_day = EXCLUDED.most_expensive_day,
+        calculated_at = now()
+""")
+
 
 class AnalyticsScheduler:
     """
     Scheduler for analytics background processing tasks
-    Handles daily and weekly analytics calculations
+    Handles daily, weekly and monthly analytics rollups
     """
 
-    def __init__(self):
-        self.canadian_tz = TIMEZONE_CANADA
-        self.processor = AnalyticsBackgroundProcessor()
+    def __init__(self, chunk_size: int = None):
+        self.canadian_tz = ZoneInfo(settings.timezone)
+        self.chunk_size = chunk_size or settings.analytics_rollup_chunk_size
 
-    async def run_daily_analytics_processing(self) -> None:
+    async def run_daily_analytics_processing(self, run_at: Optional[datetime] = None) -> int:
         """
-        Run daily analytics processing for all active children
+        Roll up the usage logs of the day before run_at (default now) for every child
         Should be called daily at midnight (Canadian time)
+
+        Returns:
+            Number of summary and pattern rows written
         """
         try:
-            logger.info("Starting daily analytics processing")
+            run_at = run_at.astimezone(self.canadian_tz) if run_at else datetime.now(self.canadian_tz)
+            yesterday = (run_at - timedelta(days=1)).date()
+            logger.info(f"Starting daily analytics processing for {yesterday}")
 
-            async for session in get_async_session():
-                yesterday = (datetime.now(self.canadian_tz) - timedelta(days=1)).date()
+            rows = await self.rollup_daily_summaries(yesterday)
 
-                # Get all children who had diaper changes yesterday
-                children_query = select(distinct(AnalyticsDailySummary.child_id)).where(
-                    AnalyticsDailySummary.date == yesterday
-                )
-
-                children_result = await session.execute(children_query)
-                child_ids = children_result.scalars().all()
-
-                logger.info(f"Processing daily analytics for {len(child_ids)} children on {yesterday}")
-
-                # Process analytics for each child
-                for child_id in child_ids:
-                    try:
-                        await self.processor.process_daily_analytics(str(child_id), yesterday)
-                        logger.debug(f"Processed daily analytics for child {child_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to process daily analytics for child {child_id}: {e}")
-
-                # Also trigger weekly pattern calculation for Monday
-                if yesterday.weekday() == 6:  # Sunday - calculate patterns for the completed week
-                    logger.info("Sunday detected - triggering weekly pattern calculations")
-                    await self._run_weekly_pattern_calculations(child_ids)
+            if yesterday.weekday() == 6:  # Sunday - calculate patterns for the completed week
+                logger.info("Sunday detected - triggering weekly pattern calculations")
+                rows += await self._run_weekly_pattern_calculations(yesterday - timedelta(days=6))
 
             logger.info("Daily analytics processing completed")
+            return rows
 
         except Exception as e:
             logger.error(f"Error in daily analytics processing: {e}")
             raise
 
-    async def _run_weekly_pattern_calculations(self, child_ids: List[str]) -> None:
+    async def rollup_daily_summaries(self, summary_date: date) -> int:
+        """Upsert the daily summary of every child with usage on summary_date"""
+        day_start, day_end = summary_day_bounds(summary_date)
+
+        return await self._run_chunked("daily summaries", DAILY_ROLLUP_UPSERT, {
+            "summary_date": summary_date,
+            "day_start": day_start,
+            "day_end": day_end,
+            "cost_per_change": COST_PER_CHANGE_CAD
+        })
+
+    async def _run_weekly_pattern_calculations(self, week_start: date) -> int:
         """
-        Calculate weekly patterns for all active children
+        Calculate weekly patterns for every child with summaries in the week
         """
         try:
-            logger.info(f"Calculating weekly patterns for {len(child_ids)} children")
-
-            for child_id in child_ids:
-                try:
-                    await self.processor.calculate_weekly_patterns(str(child_id))
-                    logger.debug(f"Calculated weekly patterns for child {child_id}")
-                except Exception as e:
-                    logger.error(f"Failed to calculate weekly patterns for child {child_id}: {e}")
+            return await self._run_chunked("weekly patterns", WEEKLY_ROLLUP_UPSERT, {
+                "week_start": week_start
+            })
 
         except Exception as e:
             logger.error(f"Error in weekly pattern calculations: {e}")
+            raise
 
-    async def run_monthly_cost_analysis(self) -> None:
+    async def run_monthly_cost_analysis(self, run_at: Optional[datetime] = None) -> int:
         """
-        Run monthly cost analysis for all active children
+        Run cost analysis of the month before run_at (default now) for all active children
         Should be called on the 1st of each month
+
+        Returns:
+            Number of cost tracking rows written
         """
         try:
             logger.info("Starting monthly cost analysis")
 
-            async for session in get_async_session():
-                current_month = datetime.now(self.canadian_tz)
-                previous_month = (current_month.replace(day=1) - timedelta(days=1))
-                month_year = previous_month.strftime("%Y-%m")
-
-                # Get all children who had activity in the previous month
-                children_query = select(distinct(AnalyticsDailySummary.child_id)).where(
-                    and_(
-                        extract('year', AnalyticsDailySummary.date) == previous_month.year,
-                        extract('month', AnalyticsDailySummary.date) == previous_month.month
-                    )
-                )
-
-                children_result = await session.execute(children_query)
-                child_ids = children_result.scalars().all()
-
-                logger.info(f"Processing monthly cost analysis for {len(child_ids)} children for {month_year}")
-
-                for child_id in child_ids:
-                    try:
-                        await self._calculate_monthly_cost_analysis(str(child_id), month_year)
-                        logger.debug(f"Calculated monthly cost analysis for child {child_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to calculate monthly cost analysis for child {child_id}: {e}")
+            run_at = run_at.astimezone(self.canadian_tz) if run_at else datetime.now(self.canadian_tz)
+            month_start = (run_at.replace(day=1) - timedelta(days=1)).date().replace(day=1)
+            rows = await self.rollup_monthly_costs(month_start)
 
             logger.info("Monthly cost analysis completed")
+            return rows
 
         except Exception as e:
             logger.error(f"Error in monthly cost analysis: {e}")
             raise
 
-    async def _calculate_monthly_cost_analysis(self, child_id: str, month_year: str) -> None:
-        """
-        Calculate cost analysis for a specific child and month
-        This is a simplified version - would be expanded with actual cost tracking
-        """
-        try:
-            from app.models.analytics import AnalyticsCostTracking
-            from decimal import Decimal
-
-            async for session in get_async_session():
-                year, month = map(int, month_year.split('-'))
-
-                # Get daily summaries for the month
-                monthly_query = select(AnalyticsDailySummary).where(
-                    and_(
-                        AnalyticsDailySummary.child_id == child_id,
-                        extract('year', AnalyticsDailySummary.date) == year,
-                        extract('month', AnalyticsDailySummary.date) == month
-                    )
-                )
+    async def rollup_monthly_costs(self, month_start: date) -> int:
+        """Upsert cost tracking for every child with summaries in the month"""
+        next_month_start = (month_start + timedelta(days=32)).replace(day=1)
 
-                monthly_result = await session.execute(monthly_query)
-                monthly_summaries = monthly_result.scalars().all()
-
-                if not monthly_summaries:
-                    return
-
-                # Calculate metrics
-                total_changes = sum(summary.total_changes for summary in monthly_summaries)
-                total_cost = sum(summary.estimated_cost_cad or Decimal('0') for summary in monthly_summaries)
-                cost_per_change = total_cost / total_changes if total_changes > 0 else Decimal('0')
-
-                # Calculate weekend vs weekday usage
-                weekday_changes = 0
-                weekend_changes = 0
-
-                for summary in monthly_summaries:
-                    if summary.date.weekday() < 5:  # Mon-Fri
-                        weekday_changes += summary.total_changes
-                    else:  # Sat-Sun
-                        weekend_changes += summary.total_changes
-
-                weekday_avg = weekday_changes / 22 if weekday_changes > 0 else 0  # ~22 weekdays per month
-                weekend_avg = weekend_changes / 8 if weekend_changes > 0 else 0   # ~8 weekend days per month
-                weekend_ratio = (weekend_avg / weekday_avg * 100) if weekday_avg > 0 else 100
-
-                # Calculate efficiency vs target ($0.20 CAD per change)
-                target_cost = Decimal('0.20')
-                efficiency_vs_target = min(100, (target_cost / cost_per_change * 100)) if cost_per_change > 0 else 100
-
-                # Find most expensive day
-                day_costs = {}
-                for summary in monthly_summaries:
-                    day_name = summary.date.strftime('%A')
-                    day_costs[day_name] = day_costs.get(day_name, Decimal('0')) + (summary.estimated_cost_cad or Decimal('0'))
-
-                most_expensive_day = max(day_costs.items(), key=lambda x: x[1])[0] if day_costs else "Monday"
-
-                # Get or create cost tracking record
-                cost_query = select(AnalyticsCostTracking).where(
-                    and_(
-                        AnalyticsCostTracking.child_id == child_id,
-                        AnalyticsCostTracking.month_year == month_year
-                    )
-                )
+        return await self._run_chunked("monthly cost tracking", MONTHLY_COST_ROLLUP_UPSERT, {
+            "month_start": month_start,
+            "next_month_start": next_month_start,
+            "month_year": month_start.strftime("%Y-%m"),
+            "target_cost": TARGET_COST_PER_CHANGE_CAD
+        })
 
-                cost_result = await session.execute(cost_query)
-                cost_tracking = cost_result.scalar_one_or_none()
-
-                if cost_tracking:
-                    # Update existing record
-                    cost_tracking.total_cost_cad = total_cost
-                    cost_tracking.cost_per_change_cad = cost_per_change
-                    cost_tracking.efficiency_vs_target = efficiency_vs_target
-                    cost_tracking.weekend_vs_weekday_usage = Decimal(str(weekend_ratio))
-                    cost_tracking.most_expensive_day = most_expensive_day
-                    cost_tracking.calculated_at = datetime.now(self.canadian_tz)
-                else:
-                    # Create new record
-                    cost_tracking = AnalyticsCostTracking(
-                        child_id=child_id,
-                        month_year=month_year,
-                        total_cost_cad=total_cost,
-                        cost_per_change_cad=cost_per_change,
-                        efficiency_vs_target=efficiency_vs_target,
-                        weekend_vs_weekday_usage=Decimal(str(weekend_ratio)),
-                        most_expensive_day=most_expensive_day,
-                        cost_trend_7day=Decimal('0'),  # Would be calculated from trend analysis
-                        primary_brand="Generic",  # Would be calculated from actual usage data
-                        primary_size="Size 2",   # Would be calculated from actual usage data
-                        brands_used={},
-                        sizes_used={}
-                    )
-                    session.add(cost_tracking)
+    async def _run_chunked(self, name: str, statement: TextClause, params: dict) -> int:
+        """
+        Execute a rollup once per chunk of children, committing each chunk
 
+        Rollups are idempotent upserts, so a failed run can simply be repeated;
+        chunks already committed are recomputed to the same values.
+        """
+        after_child_id = uuid.UUID(int=0)
+        chunks = 0
+        rows = 0
+
+        async with get_isolated_session() as session:
+            while True:
+                last_child_id = (await session.execute(
+                    CHILD_CHUNK_END,
+                    {"after_child_id": after_child_id, "chunk_size": self.chunk_size}
+                )).scalar()
+                if last_child_id is None:
+                    break
+
+                result = await session.execute(statement, {
+                    **params,
+                    "after_child_id": after_child_id,
+                    "last_child_id": last_child_id
+                })
                 await session.commit()
-                logger.info(f"Updated cost tracking for child {child_id}, month {month_year}")
 
-        except Exception as e:
-            logger.error(f"Error calculating monthly cost analysis for child {child_id}: {e}")
-            raise
+                chunks += 1
+                rows += result.rowcount
+                after_child_id = last_child_id
 
-    async def cleanup_old_analytics_data(self) -> None:
+        logger.info(f"Rolled up {rows} {name} in {chunks} chunks")
+        return rows
+
+    async def cleanup_old_analytics_data(self) -> int:
         """
         Clean up old analytics data according to retention policies
         Should be run monthly
+
+        Returns:
+            Number of daily summaries deleted row by row
         """
         try:
             logger.info("Starting analytics data cleanup")
 
-            async for session in get_async_session():
-                # Delete daily summaries older than 2 years
-                retention_date = datetime.now(self.canadian_tz) - timedelta(days=730)
+            # Daily summaries are kept for 2 years; whole expired months are
+            # dropped as partitions, leaving only part of one month to delete
+            retention_date = datetime.now(self.canadian_tz) - timedelta(days=730)
+            dropped = await PartitionMaintenance().drop_partitions_before(
+                ANALYTICS_DAILY_SUMMARIES, retention_date.date()
+            )
+            if dropped:
+                logger.info(f"Dropped {len(dropped)} expired daily analytics partitions")
 
+            async for session in get_async_session():
                 delete_query = delete(AnalyticsDailySummary).where(
                     AnalyticsDailySummary.date < retention_date.date()
                 )
@@ -248,6 +420,8 @@ class AnalyticsScheduler:
 
                 logger.info(f"Cleaned up {deleted_count} old daily analytics records")
 
+            return deleted_count
+
         except Exception as e:
             logger.error(f"Error in analytics data cleanup: {e}")
             raise
@@ -289,4 +463,4 @@ __all__ = [
     "trigger_daily_analytics",
     "trigger_monthly_cost_analysis",
     "trigger_data_cleanup"
-]
\ No newline at end of file
+]
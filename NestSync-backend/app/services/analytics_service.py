@@ -6,15 +6,20 @@ Business logic for diaper usage analytics, patterns, and insights
 import logging
 import uuid
 from datetime import datetime, timezone, date, timedelta, time
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Sequence, Union
 from decimal import Decimal
 from collections import defaultdict, Counter
+from fractions import Fraction
+from functools import cached_property
 import statistics
 from dataclasses import dataclass
 
+import numpy as np
+import pandas as pd
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc, asc, text, case
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import select, func, and_, or_, desc, asc, text, case, cast, extract, false, tuple_
+from sqlalchemy import BigInteger, Date, Integer
 
 from app.models.inventory import UsageLog, InventoryItem, StockThreshold
 from app.models.child import Child
@@ -71,6 +76,226 @@ class PatternAnalysis:
     consistency_score: float
 
 
+# =============================================================================
+# Columnar Usage Series and Aggregates
+# =============================================================================
+
+# Condition codes: was_wet + 2 * was_soiled
+DRY, WET_ONLY, SOILED_ONLY, WET_AND_SOILED = 0, 1, 2, 3
+
+
+@dataclass(eq=False)
+class UsageAggregates:
+    """
+    Usage totals per day, hour of day, weekday and inventory item
+
+    Everything the AnalyticsService calculations need, sized by the number
+    of buckets rather than the number of changes. Built either from a
+    UsageSeries or directly by SQL in AnalyticsService.get_usage_aggregates.
+    The *_first_seen arrays hold any increasing key (row position or
+    timestamp) and only order ties between equally busy buckets.
+    """
+    day: np.ndarray  # Sorted date ordinals that have changes
+    day_changes: np.ndarray
+    day_diaper_changes: np.ndarray  # Changes with usage_type diaper_change
+    day_quantity: np.ndarray
+    day_conditions: np.ndarray  # (days, 4) counts by condition code
+    day_interval_count: np.ndarray  # Changes with a non-zero time_since_last
+    day_interval_total: np.ndarray
+    interval_total_squares: int
+    hour_counts: np.ndarray  # (24,)
+    hour_first_seen: np.ndarray
+    weekday_counts: np.ndarray  # (7,) Monday=0
+    weekday_first_seen: np.ndarray
+    item_ids: List[uuid.UUID]  # In first-used order
+    item_quantity: np.ndarray
+    item_first_day: np.ndarray
+    item_last_day: np.ndarray
+
+    @classmethod
+    def of(cls, data: "UsageData") -> "UsageAggregates":
+        """data itself if it is already aggregated"""
+        return data if isinstance(data, cls) else UsageSeries.of(data).aggregates
+
+    def __len__(self) -> int:
+        return int(self.day_changes.sum())
+
+    @property
+    def interval_count(self) -> int:
+        return int(self.day_interval_count.sum())
+
+    @property
+    def interval_total(self) -> int:
+        return int(self.day_interval_total.sum())
+
+    def ranked_hours(self) -> List[Tuple[int, int]]:
+        """(hour, count) for hours with changes, busiest first, ties in first-seen order"""
+        return _rank(self.hour_counts, self.hour_first_seen)
+
+    def ranked_weekdays(self) -> List[Tuple[int, int]]:
+        """(weekday, count) for weekdays with changes, busiest first, ties in first-seen order"""
+        return _rank(self.weekday_counts, self.weekday_first_seen)
+
+    def changes_on(self, day: date) -> int:
+        return self.changes_between(day, day)
+
+    def changes_between(self, start_date: date, end_date: date, diaper_changes_only: bool = False) -> int:
+        """Changes on days from start_date to end_date inclusive"""
+        counts = self.day_diaper_changes if diaper_changes_only else self.day_changes
+        window = (self.day >= start_date.toordinal()) & (self.day <= end_date.toordinal())
+        return int(counts[window].sum())
+
+
+class UsageSeries(Sequence):
+    """
+    Usage data points as parallel NumPy columns, in logged_at order
+
+    Built once per query and reduced to UsageAggregates in a single
+    vectorized pass. It is still a read-only sequence of UsageDataPoint
+    (materialized lazily) for callers that need individual changes.
+    """
+
+    def __init__(self, rows: List[tuple]):
+        """rows are tuples in UsageDataPoint field order"""
+        self._rows = rows
+        self._points: Optional[List[UsageDataPoint]] = None
+
+        if rows:
+            timestamps, quantity, was_wet, was_soiled, time_since_last, usage_type, hour, weekday, item_ids = zip(*rows)
+        else:
+            timestamps = quantity = was_wet = was_soiled = time_since_last = usage_type = hour = weekday = item_ids = ()
+
+        count = len(rows)
+        # Proleptic ordinal of timestamp.date(), the calendar day analytics group by
+        self.day = np.fromiter((ts.toordinal() for ts in timestamps), dtype=np.int64, count=count)
+        self.quantity = np.fromiter(quantity, dtype=np.int64, count=count)
+        self.wet = np.fromiter((bool(flag) for flag in was_wet), dtype=bool, count=count)
+        self.soiled = np.fromiter((bool(flag) for flag in was_soiled), dtype=bool, count=count)
+        self.interval = np.fromiter((minutes or 0 for minutes in time_since_last), dtype=np.int64, count=count)
+        self.diaper_change = np.fromiter((kind == "diaper_change" for kind in usage_type), dtype=bool, count=count)
+        self.hour = np.fromiter(hour, dtype=np.int64, count=count)
+        self.weekday = np.fromiter(weekday, dtype=np.int64, count=count)
+
+        codes: Dict[uuid.UUID, int] = {}
+        self.item_code = np.fromiter(
+            (-1 if item_id is None else codes.setdefault(item_id, len(codes)) for item_id in item_ids),
+            dtype=np.int64,
+            count=count
+        )
+        self.item_ids: List[uuid.UUID] = list(codes)
+
+    @classmethod
+    def from_data_points(cls, data_points: Sequence[UsageDataPoint]) -> "UsageSeries":
+        series = cls([
+            (
+                dp.timestamp, dp.quantity, dp.was_wet, dp.was_soiled, dp.time_since_last,
+                dp.usage_type, dp.hour_of_day, dp.day_of_week, dp.inventory_item_id
+            )
+            for dp in data_points
+        ])
+        series._points = list(data_points)
+        return series
+
+    @classmethod
+    def of(cls, data: Union["UsageSeries", Sequence[UsageDataPoint]]) -> "UsageSeries":
+        """data itself if it is already a UsageSeries"""
+        return data if isinstance(data, cls) else cls.from_data_points(data)
+
+    # Sequence protocol ------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return UsageSeries(self._rows[index])
+        return self.points[index]
+
+    def __iter__(self):
+        return iter(self.points)
+
+    @property
+    def points(self) -> List[UsageDataPoint]:
+        if self._points is None:
+            self._points = [UsageDataPoint(*row) for row in self._rows]
+        return self._points
+
+    # Aggregation ------------------------------------------------------------
+
+    @cached_property
+    def aggregates(self) -> UsageAggregates:
+        days, day_index = np.unique(self.day, return_inverse=True)
+        day_count = len(days)
+        condition = self.wet.astype(np.int64) + 2 * self.soiled
+        position = np.arange(len(self), dtype=np.float64)
+
+        with_interval = self.interval != 0
+        intervals = self.interval[with_interval]
+        interval_days = day_index[with_interval]
+
+        linked = self.item_code >= 0
+        codes = self.item_code[linked]
+        item_count = len(self.item_ids)
+        item_first_day = np.full(item_count, np.iinfo(np.int64).max)
+        item_last_day = np.full(item_count, np.iinfo(np.int64).min)
+        np.minimum.at(item_first_day, codes, self.day[linked])
+        np.maximum.at(item_last_day, codes, self.day[linked])
+
+        return UsageAggregates(
+            day=days,
+            day_changes=np.bincount(day_index, minlength=day_count),
+            day_diaper_changes=np.bincount(day_index[self.diaper_change], minlength=day_count),
+            day_quantity=_int_bincount(day_index, self.quantity, day_count),
+            day_conditions=np.bincount(day_index * 4 + condition, minlength=day_count * 4).reshape(day_count, 4),
+            day_interval_count=np.bincount(interval_days, minlength=day_count),
+            day_interval_total=_int_bincount(interval_days, intervals, day_count),
+            interval_total_squares=int(np.dot(intervals, intervals)),
+            hour_counts=np.bincount(self.hour, minlength=24),
+            hour_first_seen=_first_seen(self.hour, position, 24),
+            weekday_counts=np.bincount(self.weekday, minlength=7),
+            weekday_first_seen=_first_seen(self.weekday, position, 7),
+            item_ids=self.item_ids,
+            item_quantity=_int_bincount(codes, self.quantity[linked], item_count),
+            item_first_day=item_first_day,
+            item_last_day=item_last_day
+        )
+
+    def changes_on(self, day: date) -> int:
+        return int(np.count_nonzero(self.day == day.toordinal()))
+
+
+UsageData = Union[UsageAggregates, UsageSeries, Sequence[UsageDataPoint]]
+
+
+def _int_bincount(index: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    """Per-bucket integer sums (exact; bincount weights are float64)"""
+    return np.bincount(index, weights=weights, minlength=size).astype(np.int64)
+
+
+def _first_seen(buckets: np.ndarray, keys: np.ndarray, size: int) -> np.ndarray:
+    first = np.full(size, np.inf)
+    np.minimum.at(first, buckets, keys)
+    return first
+
+
+def _rank(counts: np.ndarray, first_seen: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Non-empty buckets by count descending, ties by first_seen
+
+    The same order as sorting a Counter's items by count, since a Counter
+    iterates in first-seen order.
+    """
+    present = np.flatnonzero(counts)
+    present = present[np.argsort(first_seen[present], kind="stable")]
+    order = np.argsort(-counts[present], kind="stable")
+    return [(int(bucket), int(counts[bucket])) for bucket in present[order]]
+
+
+def _exact_variance(count: int, total: int, total_squares: int) -> float:
+    """Sample variance of integers from their sums, exact like statistics.variance"""
+    return float(Fraction(count * total_squares - total * total, count * (count - 1)))
+
+
 # =============================================================================
 # Analytics Service Class
 # =============================================================================
@@ -85,7 +310,7 @@ class AnalyticsService:
     # PIPEDA Compliance Methods
     # =========================================================================
 
-    def anonymize_sensitive_data(self, data_points: List[UsageDataPoint], privacy_level: str = "standard") -> List[UsageDataPoint]:
+    def anonymize_sensitive_data(self, data_points: UsageData, privacy_level: str = "standard") -> UsageData:
         """
         Anonymize sensitive data according to PIPEDA requirements
 
@@ -94,30 +319,12 @@ class AnalyticsService:
         - standard: Detailed analytics with some anonymization
         - full: Complete data for premium users with explicit consent
         """
-        if privacy_level == "minimal":
+        if privacy_level == "minimal" and not isinstance(data_points, UsageAggregates):
             # For minimal privacy, only return aggregated counts without detailed patterns
             return data_points[:100]  # Limit data points
-        elif privacy_level == "standard":
-            # Standard privacy: remove or obfuscate some sensitive details
-            anonymized_points = []
-            for dp in data_points:
-                # Keep core analytics data but remove detailed health information
-                anonymized_dp = UsageDataPoint(
-                    timestamp=dp.timestamp,
-                    quantity=dp.quantity,
-                    was_wet=dp.was_wet,
-                    was_soiled=dp.was_soiled,
-                    time_since_last=dp.time_since_last,
-                    usage_type=dp.usage_type,
-                    hour_of_day=dp.hour_of_day,
-                    day_of_week=dp.day_of_week,
-                    inventory_item_id=dp.inventory_item_id
-                )
-                anonymized_points.append(anonymized_dp)
-            return anonymized_points
-        else:  # full
-            # Full data access for premium users with explicit analytics consent
-            return data_points
+        # Standard and full keep the same fields today; data points carry no
+        # detailed health information beyond the wet/soiled flags analytics use
+        return data_points
 
     async def check_analytics_consent(self, session: AsyncSession, user_id: uuid.UUID) -> bool:
         """Check if user has granted consent for analytics processing"""
@@ -174,6 +381,63 @@ class AnalyticsService:
     # Core Data Retrieval
     # =========================================================================
 
+    def _usage_log_filters(
+        self,
+        user_id: uuid.UUID,
+        child_id: Optional[uuid.UUID],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        usage_type: Optional[str],
+        user_timezone: str
+    ) -> Tuple[list, Any]:
+        """WHERE clauses selecting a user's usage logs in a local date range, and the resolved timezone"""
+        # Default date range: last 30 days
+        if not end_date:
+            end_date = date.today()
+        if not start_date:
+            start_date = end_date - timedelta(days=30)
+
+        # Convert dates to datetime with Canadian timezone support
+        # Use user's timezone for date boundary calculations
+        import pytz
+        try:
+            user_tz = pytz.timezone(user_timezone)
+        except pytz.UnknownTimeZoneError:
+            self.logger.warning(f"Unknown timezone {user_timezone}, using default Canadian timezone")
+            user_tz = pytz.timezone(DEFAULT_CANADIAN_TIMEZONE)
+
+        # Convert to UTC for database queries (all timestamps stored in UTC)
+        start_datetime = datetime.combine(start_date, time.min)
+        start_datetime = user_tz.localize(start_datetime).astimezone(pytz.UTC)
+
+        end_datetime = datetime.combine(end_date + timedelta(days=1), time.min)
+        end_datetime = user_tz.localize(end_datetime).astimezone(pytz.UTC)
+
+        filters = [
+            UsageLog.logged_at >= start_datetime,
+            UsageLog.logged_at < end_datetime,
+            UsageLog.is_deleted == False
+        ]
+
+        # Filter by child if specified
+        if child_id:
+            filters.append(UsageLog.child_id == child_id)
+        else:
+            # Filter by user's children
+            child_subquery = select(Child.id).where(
+                and_(
+                    Child.parent_id == user_id,
+                    Child.is_deleted == False
+                )
+            )
+            filters.append(UsageLog.child_id.in_(child_subquery))
+
+        # Filter by usage type if specified
+        if usage_type:
+            filters.append(UsageLog.usage_type == usage_type)
+
+        return filters, user_tz
+
     async def get_usage_data(
         self,
         session: AsyncSession,
@@ -183,92 +447,163 @@ class AnalyticsService:
         end_date: Optional[date] = None,
         usage_type: Optional[str] = None,
         user_timezone: str = DEFAULT_CANADIAN_TIMEZONE
-    ) -> List[UsageDataPoint]:
-        """Retrieve usage data for analytics calculations with Canadian timezone support"""
+    ) -> UsageSeries:
+        """
+        Retrieve individual usage changes with Canadian timezone support
+
+        Only for callers that need each change (e.g. a usage timeline);
+        calculations should use get_usage_aggregates.
+        """
         try:
-            # Default date range: last 30 days
-            if not end_date:
-                end_date = date.today()
-            if not start_date:
-                start_date = end_date - timedelta(days=30)
-
-            # Convert dates to datetime with Canadian timezone support
-            # Use user's timezone for date boundary calculations
-            import pytz
-            try:
-                user_tz = pytz.timezone(user_timezone)
-            except pytz.UnknownTimeZoneError:
-                self.logger.warning(f"Unknown timezone {user_timezone}, using default Canadian timezone")
-                user_tz = pytz.timezone(DEFAULT_CANADIAN_TIMEZONE)
-
-            # Convert to UTC for database queries (all timestamps stored in UTC)
-            start_datetime = datetime.combine(start_date, time.min)
-            start_datetime = user_tz.localize(start_datetime).astimezone(pytz.UTC)
-
-            end_datetime = datetime.combine(end_date + timedelta(days=1), time.min)
-            end_datetime = user_tz.localize(end_datetime).astimezone(pytz.UTC)
-
-            # Build query
-            query = select(UsageLog).options(
-                selectinload(UsageLog.child),
-                selectinload(UsageLog.inventory_item)
-            ).where(
-                and_(
-                    UsageLog.logged_at >= start_datetime,
-                    UsageLog.logged_at < end_datetime,
-                    UsageLog.is_deleted == False
-                )
+            filters, user_tz = self._usage_log_filters(
+                user_id, child_id, start_date, end_date, usage_type, user_timezone
             )
 
-            # Filter by child if specified
-            if child_id:
-                query = query.where(UsageLog.child_id == child_id)
-            else:
-                # Filter by user's children
-                child_subquery = select(Child.id).where(
-                    and_(
-                        Child.parent_id == user_id,
-                        Child.is_deleted == False
-                    )
+            # Only the columns analytics use, no ORM objects
+            query = select(
+                UsageLog.logged_at,
+                UsageLog.quantity_used,
+                UsageLog.was_wet,
+                UsageLog.was_soiled,
+                UsageLog.time_since_last_change,
+                UsageLog.usage_type,
+                UsageLog.inventory_item_id
+            ).where(and_(*filters)).order_by(UsageLog.logged_at)
+
+            result = await session.execute(query)
+            rows = result.all()
+
+            # Hour and weekday in the user's timezone, converted in one
+            # vectorized step; the timestamp itself stays in UTC
+            local_times = pd.DatetimeIndex(
+                pd.to_datetime([row.logged_at for row in rows], utc=True)
+            ).tz_convert(user_tz.zone)
+
+            usage_series = UsageSeries([
+                (
+                    row.logged_at, row.quantity_used, row.was_wet, row.was_soiled, row.time_since_last_change,
+                    row.usage_type, hour, weekday, row.inventory_item_id
                 )
-                query = query.where(UsageLog.child_id.in_(child_subquery))
+                for row, hour, weekday in zip(rows, local_times.hour.tolist(), local_times.weekday.tolist())
+            ])
 
-            # Filter by usage type if specified
-            if usage_type:
-                query = query.where(UsageLog.usage_type == usage_type)
+            self.logger.info(f"Retrieved {len(usage_series)} usage data points for analytics")
+            return usage_series
+
+        except Exception as e:
+            self.logger.error(f"Error retrieving usage data: {e}")
+            raise
+
+    async def get_usage_aggregates(
+        self,
+        session: AsyncSession,
+        user_id: uuid.UUID,
+        child_id: Optional[uuid.UUID] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        usage_type: Optional[str] = None,
+        user_timezone: str = DEFAULT_CANADIAN_TIMEZONE
+    ) -> UsageAggregates:
+        """
+        Usage totals per local day, hour and inventory item, aggregated in SQL
+
+        One GROUPING SETS query over logged_at AT TIME ZONE the user's zone,
+        so only a row per bucket crosses the wire. Days are the user's local
+        calendar days, consistent with the hour and weekday buckets.
+        """
+        try:
+            filters, user_tz = self._usage_log_filters(
+                user_id, child_id, start_date, end_date, usage_type, user_timezone
+            )
 
-            # Order by timestamp
-            query = query.order_by(UsageLog.logged_at)
+            # timezone(zone, ts) is Postgres' function form of ts AT TIME ZONE zone
+            local_time = func.timezone(user_tz.zone, UsageLog.logged_at)
+            changes = select(
+                cast(local_time, Date).label("day"),
+                cast(extract("hour", local_time), Integer).label("hour"),
+                UsageLog.logged_at,
+                UsageLog.quantity_used.label("quantity"),
+                func.coalesce(UsageLog.was_wet, false()).label("wet"),
+                func.coalesce(UsageLog.was_soiled, false()).label("soiled"),
+                UsageLog.time_since_last_change.label("minutes_since_last"),
+                UsageLog.usage_type,
+                UsageLog.inventory_item_id
+            ).where(and_(*filters)).subquery()
+
+            has_interval = changes.c.minutes_since_last != 0
+            query = select(
+                func.grouping(changes.c.day, changes.c.hour).label("grouping_set"),
+                changes.c.day,
+                changes.c.hour,
+                changes.c.inventory_item_id,
+                func.count().label("changes"),
+                func.count().filter(changes.c.usage_type == "diaper_change").label("diaper_changes"),
+                func.sum(changes.c.quantity).label("quantity"),
+                func.count().filter(and_(~changes.c.wet, ~changes.c.soiled)).label("dry"),
+                func.count().filter(and_(changes.c.wet, ~changes.c.soiled)).label("wet_only"),
+                func.count().filter(and_(~changes.c.wet, changes.c.soiled)).label("soiled_only"),
+                func.count().filter(and_(changes.c.wet, changes.c.soiled)).label("wet_and_soiled"),
+                func.count().filter(has_interval).label("interval_count"),
+                func.sum(changes.c.minutes_since_last).filter(has_interval).label("interval_total"),
+                func.sum(cast(changes.c.minutes_since_last, BigInteger) * changes.c.minutes_since_last).filter(has_interval).label("interval_total_squares"),
+                func.min(changes.c.logged_at).label("first_logged_at"),
+                func.min(changes.c.day).label("first_day"),
+                func.max(changes.c.day).label("last_day")
+            ).group_by(func.grouping_sets(
+                tuple_(changes.c.day),
+                tuple_(changes.c.hour),
+                tuple_(changes.c.inventory_item_id)
+            ))
 
             result = await session.execute(query)
-            usage_logs = result.scalars().all()
-
-            # Convert to data points with timezone-aware processing
-            data_points = []
-            for log in usage_logs:
-                # Convert UTC timestamp to user's timezone for hour/day calculations
-                user_timestamp = log.logged_at.replace(tzinfo=pytz.UTC).astimezone(user_tz)
-
-                data_point = UsageDataPoint(
-                    timestamp=log.logged_at,  # Keep original UTC timestamp
-                    quantity=log.quantity_used,
-                    was_wet=log.was_wet,
-                    was_soiled=log.was_soiled,
-                    time_since_last=log.time_since_last_change,
-                    usage_type=log.usage_type,
-                    hour_of_day=user_timestamp.hour,  # Use user's timezone for analytics
-                    day_of_week=user_timestamp.weekday(),  # Use user's timezone for analytics
-                    inventory_item_id=log.inventory_item_id
-                )
-                data_points.append(data_point)
+            usage_aggregates = self._build_usage_aggregates(result.all())
 
-            self.logger.info(f"Retrieved {len(data_points)} usage data points for analytics")
-            return data_points
+            self.logger.info(f"Aggregated {len(usage_aggregates)} usage changes for analytics")
+            return usage_aggregates
 
         except Exception as e:
-            self.logger.error(f"Error retrieving usage data: {e}")
+            self.logger.error(f"Error aggregating usage data: {e}")
             raise
 
+    def _build_usage_aggregates(self, rows) -> UsageAggregates:
+        """Assemble the day (grouping 1), hour (2) and item (3) rows of get_usage_aggregates"""
+        day_rows = sorted((row for row in rows if row.grouping_set == 1), key=lambda row: row.day)
+        hour_rows = [row for row in rows if row.grouping_set == 2]
+        item_rows = sorted(
+            (row for row in rows if row.grouping_set == 3 and row.inventory_item_id is not None),
+            key=lambda row: row.first_logged_at
+        )
+
+        days = np.array([row.day.toordinal() for row in day_rows], dtype=np.int64)
+        weekdays = (days + 6) % 7
+        day_changes = np.array([row.changes for row in day_rows], dtype=np.int64)
+        day_first_seen = np.array([row.first_logged_at.timestamp() for row in day_rows], dtype=np.float64)
+        hours = np.array([row.hour for row in hour_rows], dtype=np.int64)
+
+        return UsageAggregates(
+            day=days,
+            day_changes=day_changes,
+            day_diaper_changes=np.array([row.diaper_changes for row in day_rows], dtype=np.int64),
+            day_quantity=np.array([row.quantity for row in day_rows], dtype=np.int64),
+            day_conditions=np.array(
+                [[row.dry, row.wet_only, row.soiled_only, row.wet_and_soiled] for row in day_rows],
+                dtype=np.int64
+            ).reshape(len(day_rows), 4),
+            day_interval_count=np.array([row.interval_count for row in day_rows], dtype=np.int64),
+            day_interval_total=np.array([row.interval_total or 0 for row in day_rows], dtype=np.int64),
+            interval_total_squares=sum(int(row.interval_total_squares or 0) for row in day_rows),
+            hour_counts=np.bincount(hours, weights=[row.changes for row in hour_rows], minlength=24).astype(np.int64),
+            hour_first_seen=_first_seen(
+                hours, np.array([row.first_logged_at.timestamp() for row in hour_rows], dtype=np.float64), 24
+            ),
+            weekday_counts=np.bincount(weekdays, weights=day_changes, minlength=7).astype(np.int64),
+            weekday_first_seen=_first_seen(weekdays, day_first_seen, 7),
+            item_ids=[row.inventory_item_id for row in item_rows],
+            item_quantity=np.array([row.quantity for row in item_rows], dtype=np.int64),
+            item_first_day=np.array([row.first_day.toordinal() for row in item_rows], dtype=np.int64),
+            item_last_day=np.array([row.last_day.toordinal() for row in item_rows], dtype=np.int64)
+        )
+
     async def get_inventory_data(
         self,
         session: AsyncSession,
@@ -277,10 +612,8 @@ class AnalyticsService:
     ) -> List[InventoryItem]:
         """Retrieve inventory data for insights"""
         try:
-            # Build query
-            query = select(InventoryItem).options(
-                selectinload(InventoryItem.child)
-            ).where(
+            # Build query (insights never touch item.child, so it is not loaded)
+            query = select(InventoryItem).where(
                 InventoryItem.is_deleted == False
             )
 
@@ -311,9 +644,10 @@ class AnalyticsService:
     # Usage Analytics Calculations
     # =========================================================================
 
-    def calculate_basic_stats(self, data_points: List[UsageDataPoint]) -> Dict[str, Any]:
+    def calculate_basic_stats(self, data_points: UsageData) -> Dict[str, Any]:
         """Calculate basic usage statistics"""
-        if not data_points:
+        usage = UsageAggregates.of(data_points)
+        if not len(usage):
             return {
                 'total_changes': 0,
                 'total_quantity': 0,
@@ -325,118 +659,87 @@ class AnalyticsService:
                 'average_interval_minutes': 0.0
             }
 
-        total_changes = len(data_points)
-        total_quantity = sum(dp.quantity for dp in data_points)
+        total_changes = len(usage)
 
         # Categorize changes by condition
-        wet_only = sum(1 for dp in data_points if dp.was_wet and not dp.was_soiled)
-        soiled_only = sum(1 for dp in data_points if dp.was_soiled and not dp.was_wet)
-        wet_and_soiled = sum(1 for dp in data_points if dp.was_wet and dp.was_soiled)
-        dry_changes = sum(1 for dp in data_points if not dp.was_wet and not dp.was_soiled)
+        condition_counts = usage.day_conditions.sum(axis=0)
 
         # Calculate time intervals
-        intervals = [dp.time_since_last for dp in data_points if dp.time_since_last]
-        average_interval = statistics.mean(intervals) if intervals else 0.0
+        interval_count = usage.interval_count
+        average_interval = usage.interval_total / interval_count if interval_count else 0.0
 
         # Calculate daily average
-        if data_points:
-            date_range = (data_points[-1].timestamp.date() - data_points[0].timestamp.date()).days + 1
-            daily_average = total_changes / max(date_range, 1)
-        else:
-            daily_average = 0.0
+        date_range = int(usage.day[-1] - usage.day[0]) + 1
+        daily_average = total_changes / max(date_range, 1)
 
         return {
             'total_changes': total_changes,
-            'total_quantity': total_quantity,
+            'total_quantity': int(usage.day_quantity.sum()),
             'daily_average': daily_average,
-            'wet_only_count': wet_only,
-            'soiled_only_count': soiled_only,
-            'wet_and_soiled_count': wet_and_soiled,
-            'dry_changes_count': dry_changes,
+            'wet_only_count': int(condition_counts[WET_ONLY]),
+            'soiled_only_count': int(condition_counts[SOILED_ONLY]),
+            'wet_and_soiled_count': int(condition_counts[WET_AND_SOILED]),
+            'dry_changes_count': int(condition_counts[DRY]),
             'average_interval_minutes': average_interval
         }
 
-    def calculate_weekday_weekend_breakdown(self, data_points: List[UsageDataPoint]) -> Dict[str, int]:
+    def calculate_weekday_weekend_breakdown(self, data_points: UsageData) -> Dict[str, int]:
         """Calculate breakdown of diaper changes between weekdays and weekends"""
-        if not data_points:
-            return {
-                'weekday_count': 0,
-                'weekend_count': 0
-            }
-
-        weekday_count = 0
-        weekend_count = 0
+        usage = UsageAggregates.of(data_points)
 
-        for dp in data_points:
-            # day_of_week: 0=Monday, 1=Tuesday, ..., 6=Sunday
-            # Weekdays: Monday-Friday (0-4), Weekends: Saturday-Sunday (5-6)
-            if dp.day_of_week <= 4:  # Monday to Friday
-                weekday_count += 1
-            else:  # Saturday and Sunday
-                weekend_count += 1
+        # day_of_week: 0=Monday, 1=Tuesday, ..., 6=Sunday
+        # Weekdays: Monday-Friday (0-4), Weekends: Saturday-Sunday (5-6)
+        weekday_count = int(usage.weekday_counts[:5].sum())
 
         return {
             'weekday_count': weekday_count,
-            'weekend_count': weekend_count
+            'weekend_count': len(usage) - weekday_count
         }
 
-    def calculate_current_streak(self, data_points: List[UsageDataPoint]) -> int:
+    def calculate_current_streak(self, data_points: UsageData) -> int:
         """Calculate current streak of consecutive days with diaper changes"""
-        if not data_points:
+        usage = UsageAggregates.of(data_points)
+        if not len(usage):
             return 0
 
-        # Group data points by date
-        daily_data = defaultdict(list)
-        for dp in data_points:
-            daily_data[dp.timestamp.date()].append(dp)
-
-        # Get all dates with changes, sorted in descending order (most recent first)
-        dates_with_changes = sorted(daily_data.keys(), reverse=True)
-
-        if not dates_with_changes:
-            return 0
+        # Ordinals of all dates with changes
+        dates_with_changes = set(usage.day.tolist())
 
         # Calculate streak working backward from today
-        today = date.today()
-        current_streak = 0
-        current_date = today
+        today = date.today().toordinal()
 
-        # Check if today has changes
+        # If no changes today, a streak can still run up to yesterday
         if today in dates_with_changes:
-            current_streak = 1
-            current_date = today - timedelta(days=1)
+            current_date = today
+        elif today - 1 in dates_with_changes:
+            current_date = today - 1
         else:
-            # If no changes today, check if yesterday has changes to start streak
-            yesterday = today - timedelta(days=1)
-            if yesterday not in dates_with_changes:
-                return 0
-            current_streak = 1
-            current_date = yesterday - timedelta(days=1)
-
-        # Continue checking consecutive days backwards
+            return 0
+
+        # Count consecutive days backwards
+        current_streak = 0
         while current_date in dates_with_changes:
             current_streak += 1
-            current_date -= timedelta(days=1)
+            current_date -= 1
 
         return current_streak
 
-    def calculate_hourly_distribution(self, data_points: List[UsageDataPoint]) -> List[Dict[str, Any]]:
+    def calculate_hourly_distribution(self, data_points: UsageData) -> List[Dict[str, Any]]:
         """Calculate usage distribution by hour of day"""
-        if not data_points:
+        usage = UsageAggregates.of(data_points)
+        if not len(usage):
             return []
 
-        hour_counts = Counter(dp.hour_of_day for dp in data_points)
-        total_changes = len(data_points)
+        total_changes = len(usage)
 
         # Find peak hours (top 25% of usage)
-        sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
+        sorted_hours = usage.ranked_hours()
         peak_threshold = len(sorted_hours) * 0.25
         peak_hours = set(hour for hour, count in sorted_hours[:int(peak_threshold)])
 
         distribution = []
-        for hour in range(24):
-            count = hour_counts.get(hour, 0)
-            percentage = (count / total_changes * 100) if total_changes > 0 else 0
+        for hour, count in enumerate(usage.hour_counts.tolist()):
+            percentage = count / total_changes * 100
 
             distribution.append({
                 'hour': hour,
@@ -447,42 +750,33 @@ class AnalyticsService:
 
         return distribution
 
-    def calculate_daily_summaries(self, data_points: List[UsageDataPoint]) -> List[DailyStats]:
+    def calculate_daily_summaries(self, data_points: UsageData) -> List[DailyStats]:
         """Calculate daily usage summaries"""
-        if not data_points:
+        usage = UsageAggregates.of(data_points)
+        if not len(usage):
             return []
 
-        # Group by date
-        daily_data = defaultdict(list)
-        for dp in data_points:
-            daily_data[dp.timestamp.date()].append(dp)
-
         summaries = []
-        for date_key, day_points in daily_data.items():
-            stats = self.calculate_basic_stats(day_points)
-
-            # Calculate intervals for this day
-            intervals = [dp.time_since_last for dp in day_points if dp.time_since_last]
-            avg_interval = statistics.mean(intervals) if intervals else None
-
-            summary = DailyStats(
-                date=date_key,
-                total_changes=stats['total_changes'],
-                wet_only=stats['wet_only_count'],
-                soiled_only=stats['soiled_only_count'],
-                wet_and_soiled=stats['wet_and_soiled_count'],
-                dry_changes=stats['dry_changes_count'],
-                total_quantity=stats['total_quantity'],
-                average_interval=avg_interval,
+        for i, day in enumerate(usage.day.tolist()):
+            interval_count = int(usage.day_interval_count[i])
+            summaries.append(DailyStats(
+                date=date.fromordinal(day),
+                total_changes=int(usage.day_changes[i]),
+                wet_only=int(usage.day_conditions[i, WET_ONLY]),
+                soiled_only=int(usage.day_conditions[i, SOILED_ONLY]),
+                wet_and_soiled=int(usage.day_conditions[i, WET_AND_SOILED]),
+                dry_changes=int(usage.day_conditions[i, DRY]),
+                total_quantity=int(usage.day_quantity[i]),
+                average_interval=int(usage.day_interval_total[i]) / interval_count if interval_count else None,
                 cost_estimate=None  # Will be calculated with inventory data
-            )
-            summaries.append(summary)
+            ))
 
-        return sorted(summaries, key=lambda x: x.date)
+        return summaries
 
-    def analyze_usage_patterns(self, data_points: List[UsageDataPoint]) -> PatternAnalysis:
+    def analyze_usage_patterns(self, data_points: UsageData) -> PatternAnalysis:
         """Analyze usage patterns and identify routine"""
-        if not data_points:
+        usage = UsageAggregates.of(data_points)
+        if not len(usage):
             return PatternAnalysis(
                 pattern_type="insufficient_data",
                 confidence_score=0.0,
@@ -493,26 +787,25 @@ class AnalyticsService:
             )
 
         # Analyze hourly patterns
-        hour_counts = Counter(dp.hour_of_day for dp in data_points)
-        total_changes = len(data_points)
+        sorted_hours = usage.ranked_hours()
+        hour_counts = Counter(dict(sorted_hours))
 
         # Identify peak and low hours
-        sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
         peak_hours = [hour for hour, count in sorted_hours[:6] if count > 0]  # Top 6 hours
         low_hours = [hour for hour, count in sorted_hours[-6:] if count == 0]  # Bottom 6 hours
 
         # Calculate intervals
-        intervals = [dp.time_since_last for dp in data_points if dp.time_since_last]
-        average_interval = statistics.mean(intervals) if intervals else 0.0
+        interval_count = usage.interval_count
+        average_interval = usage.interval_total / interval_count if interval_count else 0.0
 
         # Determine pattern type
         pattern_type = self._determine_pattern_type(hour_counts, peak_hours)
 
         # Calculate consistency score
-        consistency_score = self._calculate_consistency_score(intervals, hour_counts)
+        consistency_score = self._calculate_consistency_score(usage, hour_counts)
 
         # Calculate confidence based on data quantity and consistency
-        confidence_score = min(100.0, (len(data_points) / 50) * 100 * (consistency_score / 100))
+        confidence_score = min(100.0, (len(usage) / 50) * 100 * (consistency_score / 100))
 
         return PatternAnalysis(
             pattern_type=pattern_type,
@@ -551,13 +844,16 @@ class AnalyticsService:
             else:
                 return "irregular"
 
-    def _calculate_consistency_score(self, intervals: List[int], hour_counts: Counter) -> float:
+    def _calculate_consistency_score(self, usage: UsageAggregates, hour_counts: Counter) -> float:
         """Calculate how consistent the usage pattern is"""
-        if not intervals or len(hour_counts) < 2:
+        interval_count = usage.interval_count
+        if not interval_count or len(hour_counts) < 2:
             return 0.0
 
         # Interval consistency (lower variance = higher consistency)
-        interval_variance = statistics.variance(intervals) if len(intervals) > 1 else 0
+        interval_variance = _exact_variance(
+            interval_count, usage.interval_total, usage.interval_total_squares
+        ) if interval_count > 1 else 0
         max_expected_variance = 14400  # 4 hours in minutes squared
         interval_consistency = max(0, 100 - (interval_variance / max_expected_variance) * 100)
 
@@ -573,9 +869,10 @@ class AnalyticsService:
     # Weekly Trends Analysis
     # =========================================================================
 
-    def calculate_weekly_trends(self, data_points: List[UsageDataPoint]) -> Dict[str, Any]:
+    def calculate_weekly_trends(self, data_points: UsageData) -> Dict[str, Any]:
         """Calculate weekly usage trends"""
-        if not data_points:
+        usage = UsageAggregates.of(data_points)
+        if not len(usage):
             return {
                 'weeks_analyzed': 0,
                 'current_week_changes': 0,
@@ -586,23 +883,20 @@ class AnalyticsService:
                 'average_weekly_changes': 0.0
             }
 
-        # Group by week
-        weekly_data = defaultdict(list)
-        for dp in data_points:
-            # Get start of week (Monday)
-            week_start = dp.timestamp.date() - timedelta(days=dp.timestamp.weekday())
-            weekly_data[week_start].append(dp)
+        # Group days by week (Monday start; date.weekday() of an ordinal is (ordinal + 6) % 7)
+        week_starts, week_index = np.unique(usage.day - (usage.day + 6) % 7, return_inverse=True)
+        week_totals = np.bincount(week_index, weights=usage.day_changes, minlength=len(week_starts))
 
         # Calculate weekly summaries
         weekly_summaries = []
-        for week_start, week_points in weekly_data.items():
+        for ordinal, total in zip(week_starts.tolist(), week_totals.tolist()):
+            week_start = date.fromordinal(ordinal)
             week_end = week_start + timedelta(days=6)
-            total_changes = len(week_points)
+            total_changes = int(total)
             daily_average = total_changes / 7
 
-            # Determine pattern type for the week
-            hour_counts = Counter(dp.hour_of_day for dp in week_points)
-            pattern_type = self._determine_pattern_type(hour_counts, [])
+            # Without per-week peak hours every week classifies as irregular
+            pattern_type = self._determine_pattern_type(Counter(), [])
 
             weekly_summaries.append({
                 'week_start': week_start,
@@ -612,9 +906,6 @@ class AnalyticsService:
                 'pattern_type': pattern_type
             })
 
-        # Sort by week
-        weekly_summaries.sort(key=lambda x: x['week_start'])
-
         # Calculate week-over-week changes
         for i in range(1, len(weekly_summaries)):
             current = weekly_summaries[i]['total_changes']
@@ -682,17 +973,18 @@ class AnalyticsService:
         self,
         session: AsyncSession,
         inventory_items: List[InventoryItem],
-        usage_data: List[UsageDataPoint]
+        usage_data: UsageData
     ) -> List[Dict[str, Any]]:
         """Calculate inventory consumption insights"""
+        usage = UsageAggregates.of(usage_data)
+        item_codes = {item_id: code for code, item_id in enumerate(usage.item_ids)}
         insights = []
 
         for item in inventory_items:
             try:
-                # Get usage data for this item
-                item_usage = [dp for dp in usage_data if dp.inventory_item_id == item.id]
+                code = item_codes.get(item.id)
 
-                if not item_usage:
+                if code is None:
                     # No usage data for this item
                     insight = {
                         'product_type': item.product_type,
@@ -707,8 +999,8 @@ class AnalyticsService:
                     continue
 
                 # Calculate consumption rate
-                usage_days = (item_usage[-1].timestamp.date() - item_usage[0].timestamp.date()).days + 1
-                total_consumed = sum(dp.quantity for dp in item_usage)
+                usage_days = int(usage.item_last_day[code] - usage.item_first_day[code]) + 1
+                total_consumed = int(usage.item_quantity[code])
                 daily_consumption_rate = total_consumed / max(usage_days, 1)
 
                 # Calculate days remaining
@@ -859,13 +1151,14 @@ class AnalyticsService:
     async def calculate_cost_analysis(
         self,
         session: AsyncSession,
-        usage_data: List[UsageDataPoint],
+        usage_data: UsageData,
         inventory_items: List[InventoryItem],
         period: str = "monthly"
     ) -> Dict[str, Any]:
         """Calculate cost analysis for the specified period"""
         try:
-            if not usage_data or not inventory_items:
+            usage = UsageAggregates.of(usage_data)
+            if not len(usage) or not inventory_items:
                 return {
                     'period': period,
                     'total_cost': 0.0,
@@ -879,25 +1172,26 @@ class AnalyticsService:
             # Calculate costs by product type
             product_costs = defaultdict(lambda: {'quantity': 0, 'cost': 0.0})
 
-            for dp in usage_data:
+            # Items are in first-used order
+            items_by_id = {}
+            for item in inventory_items:
+                items_by_id.setdefault(item.id, item)
+
+            for item_id, quantity in zip(usage.item_ids, usage.item_quantity.tolist()):
                 # Find corresponding inventory item
-                item = next((item for item in inventory_items if item.id == dp.inventory_item_id), None)
+                item = items_by_id.get(item_id)
                 if item and item.cost_per_unit_calculated:
-                    cost = float(item.cost_per_unit_calculated) * dp.quantity
-                    product_costs[item.product_type]['quantity'] += dp.quantity
-                    product_costs[item.product_type]['cost'] += cost
+                    product_costs[item.product_type]['quantity'] += quantity
+                    product_costs[item.product_type]['cost'] += float(item.cost_per_unit_calculated) * quantity
 
             # Calculate totals
             total_cost = sum(data['cost'] for data in product_costs.values())
-            total_changes = len(usage_data)
+            total_changes = len(usage)
             cost_per_change = total_cost / max(total_changes, 1)
 
             # Calculate per-day cost
-            if usage_data:
-                date_range = (usage_data[-1].timestamp.date() - usage_data[0].timestamp.date()).days + 1
-                cost_per_day = total_cost / max(date_range, 1)
-            else:
-                cost_per_day = 0.0
+            date_range = int(usage.day[-1] - usage.day[0]) + 1
+            cost_per_day = total_cost / max(date_range, 1)
 
             # Create breakdown
             breakdown = []
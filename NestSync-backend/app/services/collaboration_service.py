@@ -8,6 +8,7 @@ import secrets
 from datetime import datetime, timezone, timedelta
 from typing import Optional, List, Dict, Any
 from sqlalchemy import select, and_, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.config.database import get_async_session
@@ -487,25 +488,31 @@ class CollaborationService:
         return base_permissions
 
     @staticmethod
-    async def _get_family_name(family_id: str) -> str:
+    async def _get_family_name(family_id: str, session: Optional[AsyncSession] = None) -> str:
         """Get family name by ID"""
-        async for session in get_async_session():
-            result = await session.execute(
-                select(Family.name).where(Family.id == family_id)
-            )
-            return result.scalar_one_or_none() or "Unknown Family"
+        if session is None:
+            async for session in get_async_session():
+                return await CollaborationService._get_family_name(family_id, session)
+
+        result = await session.execute(
+            select(Family.name).where(Family.id == family_id)
+        )
+        return result.scalar_one_or_none() or "Unknown Family"
 
     @staticmethod
-    async def _get_user_name(user_id: str) -> str:
+    async def _get_user_name(user_id: str, session: Optional[AsyncSession] = None) -> str:
         """Get user display name by ID"""
-        async for session in get_async_session():
-            result = await session.execute(
-                select(User.display_name, User.email).where(User.id == user_id)
-            )
-            user_data = result.first()
-            if user_data:
-                return user_data.display_name or user_data.email
-            return "Unknown User"
+        if session is None:
+            async for session in get_async_session():
+                return await CollaborationService._get_user_name(user_id, session)
+
+        result = await session.execute(
+            select(User.display_name, User.email).where(User.id == user_id)
+        )
+        user_data = result.first()
+        if user_data:
+            return user_data.display_name or user_data.email
+        return "Unknown User"
 
 
 class CollaborationLogService:
@@ -547,32 +554,42 @@ class CollaborationPermissionService:
     """Service for checking collaboration permissions"""
 
     @staticmethod
-    async def check_family_access(user_id: str, family_id: str, action: str) -> bool:
+    async def check_family_access(
+        user_id: str,
+        family_id: str,
+        action: str,
+        session: Optional[AsyncSession] = None
+    ) -> bool:
         """Validate user can perform action on family"""
-        async for session in get_async_session():
-            # Get user's role in family
-            result = await session.execute(
-                select(FamilyMember)
-                .where(
-                    FamilyMember.user_id == user_id,
-                    FamilyMember.family_id == family_id,
-                    FamilyMember.status == MemberStatus.ACTIVE
+        if session is None:
+            async for session in get_async_session():
+                return await CollaborationPermissionService.check_family_access(
+                    user_id, family_id, action, session
                 )
+
+        # Get user's role in family
+        result = await session.execute(
+            select(FamilyMember)
+            .where(
+                FamilyMember.user_id == user_id,
+                FamilyMember.family_id == family_id,
+                FamilyMember.status == MemberStatus.ACTIVE
             )
-            member = result.scalar_one_or_none()
+        )
+        member = result.scalar_one_or_none()
 
-            if not member:
-                return False
+        if not member:
+            return False
 
-            # Check if access has expired
-            if member.access_expires_at and member.access_expires_at < datetime.now(timezone.utc):
-                return False
+        # Check if access has expired
+        if member.access_expires_at and member.access_expires_at < datetime.now(timezone.utc):
+            return False
 
-            # Validate action against role permissions
-            permissions = member.permissions or {}
-            return CollaborationPermissionService._validate_action_for_role(
-                member.role, action, permissions
-            )
+        # Validate action against role permissions
+        permissions = member.permissions or {}
+        return CollaborationPermissionService._validate_action_for_role(
+            member.role, action, permissions
+        )
 
     @staticmethod
     def _validate_action_for_role(role: MemberRole, action: str, permissions: dict) -> bool:
@@ -155,6 +155,9 @@ class ContinuousMonitoringService:
             # Quick authentication health
             checks.append(await observability._check_authentication_health())
 
+            # Feed the trend time series between comprehensive checks
+            observability.record_metrics(checks)
+
             # Process any critical alerts
             await observability._process_health_check_alerts(checks)
 
@@ -173,6 +176,7 @@ class ContinuousMonitoringService:
 
             # Performance and UX monitoring
             checks = await observability._check_performance_metrics()
+            observability.record_metrics(checks)
 
             # Process alerts
             await observability._process_health_check_alerts(checks)
@@ -4,14 +4,17 @@ Implements wireframe-compliant analytics data pipeline with PIPEDA compliance
 """
 
 import logging
-import asyncio
+import uuid
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timezone, date, timedelta
 from decimal import Decimal
+from zoneinfo import ZoneInfo
 from sqlalchemy import select, func, and_, or_, case, extract, desc, asc, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.database import get_async_session
+from app.config.database import get_async_session, get_isolated_session
+from app.config.settings import settings
+from app.jobs.queue import JobKind, enqueue_job
 from app.models.analytics import (
     AnalyticsDailySummary, AnalyticsWeeklyPattern, AnalyticsCostTracking, GrowthPrediction
 )
@@ -21,9 +24,10 @@ from app.models.user import User
 from app.graphql.analytics_types import (
     WeeklyPatternData, EnhancedCostAnalysis, DetailedPeakHours,
     SizeChangePredictions, AnalyticsOverview, AnalyticsUsageEnhanced,
-    AnalyticsTrendsEnhanced, EnhancedAnalyticsDashboard,
+    AnalyticsTrendsEnhanced, EnhancedAnalyticsDashboard, AnalyticsSectionError,
     PeakHourData, TimeSlotData, AnalyticsOverviewSummary, AnalyticsRawData
 )
+from app.services.section_executor import ParallelSectionExecutor
 from app.utils.data_transformations import TIMEZONE_CANADA
 
 logger = logging.getLogger(__name__)
@@ -35,8 +39,9 @@ class EnhancedAnalyticsService:
     Implements all data processing and aggregation logic
     """
 
-    def __init__(self):
+    def __init__(self, section_executor: Optional[ParallelSectionExecutor] = None):
         self.canadian_tz = TIMEZONE_CANADA
+        self.section_executor = section_executor or ParallelSectionExecutor()
 
     async def get_enhanced_analytics_dashboard(
         self,
@@ -53,47 +58,55 @@ class EnhancedAnalyticsService:
             user_id: User ID for permission validation
 
         Returns:
-            Complete enhanced analytics dashboard
+            Complete enhanced analytics dashboard; sections that failed or
+            timed out are null and listed in failed_sections
         """
         try:
-            async for session in get_async_session():
+            if user_id:
                 # Verify user has access to this child
-                if user_id:
+                async with get_isolated_session() as session:
                     await self._verify_child_access(session, child_id, user_id)
 
-                # Get all analytics components concurrently
-                overview_task = self._get_analytics_overview(session, child_id, date_range)
-                usage_task = self._get_analytics_usage_enhanced(session, child_id, date_range)
-                trends_task = self._get_analytics_trends_enhanced(session, child_id, date_range)
-                weekly_patterns_task = self._get_weekly_patterns(session, child_id)
-                cost_analysis_task = self._get_enhanced_cost_analysis(session, child_id)
-                peak_hours_task = self._get_detailed_peak_hours(session, child_id, date_range)
-                size_predictions_task = self._get_size_predictions(session, child_id)
-
-                # Execute all queries concurrently
-                results = await asyncio.gather(
-                    overview_task, usage_task, trends_task, weekly_patterns_task,
-                    cost_analysis_task, peak_hours_task, size_predictions_task,
-                    return_exceptions=True
+            # Each section runs on its own session so queries execute in parallel
+            outcomes = await self.section_executor.run({
+                "overview": lambda session: self._get_analytics_overview(session, child_id, date_range),
+                "usage": lambda session: self._get_analytics_usage_enhanced(session, child_id, date_range),
+                "trends": lambda session: self._get_analytics_trends_enhanced(session, child_id, date_range),
+                "weekly_patterns": lambda session: self._get_weekly_patterns(session, child_id),
+                "cost_analysis": lambda session: self._get_enhanced_cost_analysis(session, child_id),
+                "peak_hours_detailed": lambda session: self._get_detailed_peak_hours(session, child_id, date_range),
+                "size_predictions": lambda session: self._get_size_predictions(session, child_id),
+                "data_quality_score": lambda session: self._calculate_data_quality_score(session, child_id),
+            })
+
+            failed_sections = [
+                AnalyticsSectionError(
+                    section=outcome.failure.section,
+                    reason=outcome.failure.reason.value,
+                    message=outcome.failure.message
                 )
-
-                overview, usage, trends, weekly_patterns, cost_analysis, peak_hours, size_predictions = results
-
-                # Calculate data quality score
-                data_quality_score = await self._calculate_data_quality_score(session, child_id)
-
-                return EnhancedAnalyticsDashboard(
-                    overview=overview,
-                    usage=usage,
-                    trends=trends,
-                    weekly_patterns=weekly_patterns,
-                    cost_analysis=cost_analysis,
-                    peak_hours_detailed=peak_hours,
-                    size_predictions=size_predictions,
-                    last_updated=datetime.now(self.canadian_tz),
-                    data_quality_score=data_quality_score
+                for outcome in outcomes.values()
+                if not outcome.ok
+            ]
+            if failed_sections:
+                logger.warning(
+                    f"Enhanced analytics dashboard for child {child_id} is partial: "
+                    f"{[failure.section for failure in failed_sections]}"
                 )
 
+            return EnhancedAnalyticsDashboard(
+                overview=outcomes["overview"].value,
+                usage=outcomes["usage"].value,
+                trends=outcomes["trends"].value,
+                weekly_patterns=outcomes["weekly_patterns"].value,
+                cost_analysis=outcomes["cost_analysis"].value,
+                peak_hours_detailed=outcomes["peak_hours_detailed"].value,
+                size_predictions=outcomes["size_predictions"].value,
+                last_updated=datetime.now(self.canadian_tz),
+                data_quality_score=outcomes["data_quality_score"].value or 0.0,
+                failed_sections=failed_sections
+            )
+
         except Exception as e:
             logger.error(f"Error getting enhanced analytics dashboard: {e}")
             raise
@@ -574,6 +587,82 @@ class EnhancedAnalyticsService:
 # Background Processing Service
 # =============================================================================
 
+# Simplified per-change cost used by daily summaries
+COST_PER_CHANGE_CAD = Decimal('0.20')
+
+
+def summary_day_bounds(summary_date: date) -> Tuple[datetime, datetime]:
+    """
+    Half-open [start, end) range of created_at covered by one daily summary
+
+    Summary days run from local midnight to local midnight in settings.timezone,
+    whatever the database session's timezone is. Every path that writes
+    analytics_daily_summaries selects usage logs with these bounds.
+    """
+    tz = ZoneInfo(settings.timezone)
+    return (
+        datetime.combine(summary_date, datetime.min.time(), tzinfo=tz),
+        datetime.combine(summary_date + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+    )
+
+
+def summary_date_for(changed_at: datetime) -> date:
+    """Daily summary a change belongs to; naive timestamps are taken as UTC"""
+    if changed_at.tzinfo is None:
+        changed_at = changed_at.replace(tzinfo=timezone.utc)
+    return changed_at.astimezone(ZoneInfo(settings.timezone)).date()
+
+# Applies one change event to its daily summary row. The gap statistics are
+# only valid when the event is the latest change of the day, so the update is
+# guarded and returns no row for back-dated events (which need a full recompute).
+# The guard is strict so a replayed event (job retry) also takes the recompute
+# path instead of being counted twice.
+DAILY_SUMMARY_DELTA_UPSERT = text("""
+    INSERT INTO analytics_daily_summaries AS s (
+        id, user_id, child_id, date, total_changes, change_times,
+        hourly_distribution, estimated_cost_cad, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(), c.parent_id, c.id, CAST(:summary_date AS date), 1,
+        ARRAY[CAST(:changed_at AS timestamptz)],
+        json_build_object(CAST(:hour AS text), 1),
+        CAST(:cost_per_change AS numeric), now(), now()
+    FROM children c
+    WHERE c.id = CAST(:child_id AS uuid)
+    ON CONFLICT (child_id, date) DO UPDATE SET
+        total_changes = s.total_changes + 1,
+        change_times = s.change_times || EXCLUDED.change_times,
+        hourly_distribution = (
+            COALESCE(CAST(s.hourly_distribution AS jsonb), '{}'::jsonb)
+            || jsonb_build_object(
+                CAST(:hour AS text),
+                COALESCE(CAST(s.hourly_distribution ->> CAST(:hour AS text) AS integer), 0) + 1
+            )
+        )::json,
+        longest_gap = GREATEST(
+            s.longest_gap,
+            CAST(:changed_at AS timestamptz) - s.change_times[cardinality(s.change_times)]
+        ),
+        shortest_gap = LEAST(
+            s.shortest_gap,
+            CAST(:changed_at AS timestamptz) - s.change_times[cardinality(s.change_times)]
+        ),
+        time_between_changes_avg = CASE
+            WHEN s.total_changes <= 1
+                THEN CAST(:changed_at AS timestamptz) - s.change_times[cardinality(s.change_times)]
+            ELSE (
+                s.time_between_changes_avg * (s.total_changes - 1)
+                + (CAST(:changed_at AS timestamptz) - s.change_times[cardinality(s.change_times)])
+            ) / s.total_changes
+        END,
+        estimated_cost_cad = (s.total_changes + 1) * CAST(:cost_per_change AS numeric),
+        updated_at = now()
+    WHERE cardinality(s.change_times) = 0
+        OR s.change_times[cardinality(s.change_times)] < CAST(:changed_at AS timestamptz)
+    RETURNING s.total_changes
+""")
+
+
 class AnalyticsBackgroundProcessor:
     """
     Background processing service for analytics data aggregation
@@ -583,18 +672,70 @@ class AnalyticsBackgroundProcessor:
     def __init__(self):
         self.canadian_tz = TIMEZONE_CANADA
 
+    async def apply_change_event(self, child_id: str, changed_at: datetime) -> None:
+        """
+        Apply a single logged change to its daily summary as a delta
+
+        Costs one UPSERT regardless of how many changes the day already has.
+        Buckets match process_daily_analytics (local day from summary_date_for,
+        hour in UTC), which remains the repair path. Back-dated events that
+        would invalidate the gap stats queue it as an ANALYTICS_DAILY_SUMMARY
+        job, one per child and day.
+
+        Args:
+            child_id: Child the change was logged for
+            changed_at: Creation timestamp of the new UsageLog
+        """
+        if changed_at.tzinfo is None:
+            changed_at = changed_at.replace(tzinfo=timezone.utc)
+        summary_date = summary_date_for(changed_at)
+
+        try:
+            async for session in get_async_session():
+                result = await session.execute(
+                    DAILY_SUMMARY_DELTA_UPSERT,
+                    {
+                        "child_id": uuid.UUID(str(child_id)),
+                        "summary_date": summary_date,
+                        "changed_at": changed_at,
+                        "hour": str(changed_at.astimezone(timezone.utc).hour),
+                        "cost_per_change": COST_PER_CHANGE_CAD
+                    }
+                )
+                if result.first() is None:
+                    logger.info(
+                        f"Out-of-order change for child {child_id} on {summary_date}, "
+                        f"queueing daily summary recompute"
+                    )
+                    await enqueue_job(
+                        session,
+                        JobKind.ANALYTICS_DAILY_SUMMARY,
+                        {"child_id": str(child_id), "date": summary_date.isoformat()},
+                        dedup_key=f"daily_summary:{child_id}:{summary_date.isoformat()}"
+                    )
+                await session.commit()
+
+        except Exception as e:
+            logger.error(f"Error applying change event to daily analytics: {e}")
+            raise
+
     async def process_daily_analytics(self, child_id: str, date: date) -> None:
         """
-        Process and aggregate daily analytics data
-        Called when new diaper changes are logged
+        Recompute the daily summary from every usage log of the day
+
+        Repair path for apply_change_event; also used after edits or deletes
+        that a delta cannot express. Selects the same local day as the nightly
+        rollup (summary_day_bounds), so both write the same rows.
         """
         try:
+            day_start, day_end = summary_day_bounds(date)
             async for session in get_async_session():
                 # Get all usage logs for the specific date
                 usage_query = select(UsageLog).where(
                     and_(
                         UsageLog.child_id == child_id,
-                        func.date(UsageLog.created_at) == date,
+                        UsageLog.created_at >= day_start,
+                        UsageLog.created_at < day_end,
                         UsageLog.deleted_at.is_(None)
                     )
                 ).order_by(UsageLog.created_at)
@@ -612,7 +753,7 @@ class AnalyticsBackgroundProcessor:
                 # Calculate hourly distribution
                 hourly_distribution = {}
                 for log in usage_logs:
-                    hour = log.created_at.hour
+                    hour = log.created_at.astimezone(timezone.utc).hour
                     hourly_distribution[str(hour)] = hourly_distribution.get(str(hour), 0) + 1
 
                 # Calculate time gaps
@@ -626,7 +767,7 @@ class AnalyticsBackgroundProcessor:
                 shortest_gap = min(time_gaps) if time_gaps else None
 
                 # Calculate estimated cost (simplified)
-                estimated_cost = total_changes * Decimal('0.20')  # $0.20 per change
+                estimated_cost = total_changes * COST_PER_CHANGE_CAD
 
                 # Get or create daily summary
                 summary_query = select(AnalyticsDailySummary).where(
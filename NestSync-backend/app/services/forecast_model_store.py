@@ -0,0 +1,173 @@
+"""
+Forecast Model Store for NestSync
+Persists each child's latest fitted forecast so repeat predictions skip the fit
+
+An entry is keyed by (child_id, model_version) and remembers the
+last_usage_date and a digest of the history it was trained on. A request
+whose history is unchanged is served from the store; a request with new
+usage is refit, warm-started from the stored parameters.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, select, and_
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import Base
+from app.services.forecasting_engine import ForecastingEngine
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Stored Model
+# =============================================================================
+
+class ForecastModelRecord(Base):
+    """Latest fitted forecast for one child and model version"""
+    __tablename__ = "forecast_models"
+
+    child_id = Column(UUID(as_uuid=True), ForeignKey("children.id", ondelete="CASCADE"), primary_key=True)
+    model_version = Column(String(50), primary_key=True)
+
+    last_usage_date = Column(Date, nullable=False)
+    history_digest = Column(String(64), nullable=False)
+    parameters = Column(JSONB, nullable=True)
+    result = Column(JSONB, nullable=False)
+
+    fitted_at = Column(DateTime(timezone=True), nullable=False)
+
+
+def history_digest(request: Dict[str, Any]) -> str:
+    """Fingerprint of everything in a request that changes the fitted model"""
+    payload = json.dumps(
+        [request["dates"], request["counts"], request["date_of_birth"], request["horizon_days"]],
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# =============================================================================
+# Model Store
+# =============================================================================
+
+class ForecastModelStore:
+    """
+    Serves forecasts from persisted fits and refits only children with new usage
+
+    Writes go through the caller's session and are committed with the
+    predictions they produced.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_many(self, child_ids: Sequence[str], model_version: str) -> Dict[str, ForecastModelRecord]:
+        """Stored entries for the given children, keyed by child id string"""
+        if not child_ids:
+            return {}
+
+        result = await self.session.execute(
+            select(ForecastModelRecord).where(
+                and_(
+                    ForecastModelRecord.model_version == model_version,
+                    ForecastModelRecord.child_id.in_(list(child_ids))
+                )
+            )
+        )
+        return {str(record.child_id): record for record in result.scalars()}
+
+    async def save_many(self, requests: Sequence[Dict[str, Any]], results: Sequence[Dict[str, Any]]) -> None:
+        """Upsert successful fits; an older fit never replaces a newer one"""
+        now = datetime.now(timezone.utc)
+        # One row per key: Postgres rejects an upsert touching a row twice
+        rows = {
+            (result["child_id"], result["model_version"]): {
+                "child_id": result["child_id"],
+                "model_version": result["model_version"],
+                "last_usage_date": date.fromisoformat(result["last_usage_date"]),
+                "history_digest": history_digest(request),
+                "parameters": result.get("parameters"),
+                "result": {key: value for key, value in result.items() if key != "parameters"},
+                "fitted_at": now
+            }
+            for request, result in zip(requests, results)
+            if not result.get("error")
+        }
+        if not rows:
+            return
+
+        statement = pg_insert(ForecastModelRecord).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[ForecastModelRecord.child_id, ForecastModelRecord.model_version],
+            set_={
+                "last_usage_date": statement.excluded.last_usage_date,
+                "history_digest": statement.excluded.history_digest,
+                "parameters": statement.excluded.parameters,
+                "result": statement.excluded.result,
+                "fitted_at": statement.excluded.fitted_at
+            },
+            where=ForecastModelRecord.last_usage_date <= statement.excluded.last_usage_date
+        )
+        await self.session.execute(statement)
+
+    async def forecast_many(
+        self,
+        engine: ForecastingEngine,
+        requests: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Forecast through the store, preserving request order
+
+        Children whose last_usage_date and history match their stored entry
+        are returned as-is; the rest go to the engine in one call.
+        """
+        if not requests:
+            return []
+
+        stored = await self.get_many([request["child_id"] for request in requests], engine.model_version)
+
+        results: List[Dict[str, Any]] = [None] * len(requests)
+        to_fit, positions = [], []
+        for position, request in enumerate(requests):
+            record = stored.get(request["child_id"])
+            if (
+                record is not None
+                and record.last_usage_date.isoformat() == request["dates"][-1]
+                and record.history_digest == history_digest(request)
+            ):
+                results[position] = dict(record.result)
+                continue
+
+            if record is not None and record.parameters:
+                request = {**request, "warm_start": record.parameters}
+            to_fit.append(request)
+            positions.append(position)
+
+        if to_fit:
+            fitted = await engine.forecast_many(to_fit)
+            await self.save_many(to_fit, fitted)
+            for position, result in zip(positions, fitted):
+                results[position] = result
+
+        logger.info(
+            f"Forecast store served {len(requests) - len(to_fit)} of {len(requests)} children "
+            f"without refitting"
+        )
+        return results
+
+
+# =============================================================================
+# Export Model Store Components
+# =============================================================================
+
+__all__ = [
+    "ForecastModelRecord",
+    "ForecastModelStore",
+    "history_digest"
+]
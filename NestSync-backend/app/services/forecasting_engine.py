@@ -0,0 +1,407 @@
+"""
+Forecasting Engine for NestSync
+Runs consumption model fits in a process pool, away from the event loop
+
+Everything submitted to the pool is a plain dict and every function that
+runs there is module-level, so requests and results pickle cheaply and the
+API process never imports or runs model code.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PROPHET_MODEL_VERSION = "prophet_v1.0"
+HOLT_WINTERS_MODEL_VERSION = "holt_winters_v1.0"
+
+MODEL_VERSIONS = {
+    "holt_winters": HOLT_WINTERS_MODEL_VERSION,
+    "prophet": PROPHET_MODEL_VERSION
+}
+
+# Consumption rises about 0.2% per month of age
+GROWTH_RATE_PER_MONTH = 0.002
+DAYS_PER_MONTH = 30.44
+
+# Higher usage during holiday periods and summer months
+SEASONAL_MULTIPLIERS = {
+    1: 1.1,   # January - New Year
+    2: 1.0,   # February
+    3: 1.0,   # March
+    4: 1.0,   # April
+    5: 1.0,   # May
+    6: 1.05,  # June - Summer begins
+    7: 1.1,   # July - Summer vacation
+    8: 1.1,   # August - Summer vacation
+    9: 1.0,   # September
+    10: 1.0,  # October
+    11: 1.05, # November - Thanksgiving
+    12: 1.15  # December - Christmas/holidays
+}
+
+
+# =============================================================================
+# Feature Helpers (pure, safe to run anywhere)
+# =============================================================================
+
+def growth_factor(day: date, date_of_birth: date) -> float:
+    """Age-based consumption multiplier for a given day"""
+    age_months = round((day - date_of_birth).days / DAYS_PER_MONTH, 1)
+    return 1.0 + age_months * GROWTH_RATE_PER_MONTH
+
+
+def seasonal_factor(day: date) -> float:
+    """Calendar-based consumption multiplier for a given day"""
+    return SEASONAL_MULTIPLIERS[day.month]
+
+
+def build_forecast_request(
+    child_id: Any,
+    history: Sequence[Dict[str, Any]],
+    date_of_birth: date,
+    horizon_days: int = 30
+) -> Dict[str, Any]:
+    """
+    Build the plain-dict request the forecasting workers consume
+
+    Args:
+        child_id: Child the history belongs to
+        history: Rows with 'date' and 'daily_usage', as from _get_usage_history
+        date_of_birth: Child's date of birth for growth factors
+        horizon_days: Days to forecast
+
+    The model store may add a 'warm_start' entry holding the 'parameters'
+    of this child's previous fit.
+    """
+    return {
+        "child_id": str(child_id),
+        "dates": [row["date"].isoformat() for row in history],
+        "counts": [float(row["daily_usage"]) for row in history],
+        "date_of_birth": date_of_birth.isoformat(),
+        "horizon_days": horizon_days
+    }
+
+
+# =============================================================================
+# Worker-side Model Code
+# =============================================================================
+
+def _prophet_frame(dates: List[date], date_of_birth: date, counts: Optional[List[float]] = None):
+    import pandas as pd
+
+    frame = pd.DataFrame({
+        "ds": pd.to_datetime(dates),
+        "growth_factor": [growth_factor(day, date_of_birth) for day in dates],
+        "seasonal_factor": [seasonal_factor(day) for day in dates]
+    })
+    if counts is not None:
+        frame["y"] = counts
+    return frame
+
+
+def _new_prophet(full_seasonality: bool):
+    from prophet import Prophet
+
+    if full_seasonality:
+        model = Prophet(
+            growth='linear',
+            seasonality_mode='multiplicative',
+            yearly_seasonality=True,
+            weekly_seasonality=True,
+            daily_seasonality=False,
+            changepoint_prior_scale=0.1,
+            seasonality_prior_scale=10.0
+        )
+    else:
+        model = Prophet(growth='linear', seasonality_mode='multiplicative')
+
+    model.add_regressor('growth_factor')
+    model.add_regressor('seasonal_factor')
+    return model
+
+
+def _prophet_parameters(model) -> Dict[str, Any]:
+    """Fitted Stan parameters in the shape Prophet.fit(init=...) accepts"""
+    parameters = {name: float(model.params[name][0][0]) for name in ("k", "m", "sigma_obs")}
+    for name in ("delta", "beta"):
+        parameters[name] = model.params[name][0].tolist()
+    return parameters
+
+
+def _holdout_metrics(frame) -> Dict[str, float]:
+    """MAE and R² of a model refit on the first 80% and scored on the rest"""
+    import numpy as np
+
+    if len(frame) < 21:  # Need sufficient data for a holdout
+        return {"mae": 0.5, "r2": 0.5}  # Conservative estimates
+
+    train_size = int(len(frame) * 0.8)
+    train, test = frame[:train_size], frame[train_size:]
+
+    model = _new_prophet(full_seasonality=False)
+    model.fit(train)
+    predicted = model.predict(test)["yhat"].to_numpy()
+    actual = test["y"].to_numpy()
+
+    mae = float(np.mean(np.abs(actual - predicted)))
+    r2 = 1 - np.sum((actual - predicted) ** 2) / np.sum((actual - np.mean(actual)) ** 2)
+    return {"mae": mae, "r2": float(max(0, r2))}
+
+
+def _warm_start_matches(frame, warm_start: Dict[str, Any]) -> bool:
+    """
+    Whether stored parameters fit the model this history produces
+
+    delta has one entry per changepoint and beta one per feature. Both
+    change with the history window, so a stored fit can go stale.
+    """
+    inputs = _new_prophet(full_seasonality=True).preprocess(frame)
+    return (
+        all(name in warm_start for name in ("k", "m", "sigma_obs"))
+        and len(warm_start.get("delta") or ()) == inputs.S
+        and len(warm_start.get("beta") or ()) == inputs.K
+    )
+
+
+def _fit_prophet(frame, warm_start: Optional[Dict[str, Any]], child_id: str):
+    """Fit from the previous parameters when they still apply, otherwise cold"""
+    if warm_start:
+        try:
+            if _warm_start_matches(frame, warm_start):
+                import numpy as np
+
+                # A previous fit for this child is a close starting point for the optimizer
+                init = {
+                    **warm_start,
+                    "delta": np.asarray(warm_start["delta"], dtype=float),
+                    "beta": np.asarray(warm_start["beta"], dtype=float)
+                }
+                model = _new_prophet(full_seasonality=True)
+                model.fit(frame, init=init)
+                return model
+            logger.info(f"Stored parameters for child {child_id} no longer match, fitting cold")
+        except Exception as e:
+            logger.warning(f"Warm-start fit failed for child {child_id}, fitting cold: {e}")
+
+    # A Prophet model can only be fit once, so the cold fit starts from a new one
+    model = _new_prophet(full_seasonality=True)
+    model.fit(frame)
+    return model
+
+
+def fit_prophet_forecast(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Fit Prophet for one child and return a plain result dict"""
+    dates = [date.fromisoformat(value) for value in request["dates"]]
+    date_of_birth = date.fromisoformat(request["date_of_birth"])
+    horizon_days = request["horizon_days"]
+
+    frame = _prophet_frame(dates, date_of_birth, request["counts"])
+    model = _fit_prophet(frame, request.get("warm_start"), request["child_id"])
+
+    future_dates = dates + [dates[-1] + timedelta(days=offset) for offset in range(1, horizon_days + 1)]
+    forecast = model.predict(_prophet_frame(future_dates, date_of_birth))
+
+    return {
+        "child_id": request["child_id"],
+        "model_version": PROPHET_MODEL_VERSION,
+        "horizon_days": horizon_days,
+        "current_rate": float(frame["y"].tail(7).mean()),  # Last week average
+        "predicted_consumption": max(1, int(forecast["yhat"].tail(horizon_days).sum())),
+        **_holdout_metrics(frame),
+        "training_data_points": len(dates),
+        "training_period_days": (dates[-1] - dates[0]).days,
+        "last_usage_date": dates[-1].isoformat(),
+        "parameters": _prophet_parameters(model),
+        "error": None
+    }
+
+
+def _failed(request: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    return {"child_id": request["child_id"], "error": f"{type(error).__name__}: {error}"}
+
+
+def _run_holt_winters_batch(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    from app.services.holt_winters_forecaster import fit_holt_winters_batch
+
+    # Vectorized fits need a shared horizon; group and restore order afterwards
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    groups: Dict[int, List[int]] = {}
+    for position, request in enumerate(requests):
+        groups.setdefault(request["horizon_days"], []).append(position)
+
+    for positions in groups.values():
+        group = [requests[position] for position in positions]
+        try:
+            fitted = fit_holt_winters_batch(group)
+        except Exception:
+            # Refit one by one so a bad series only fails itself
+            fitted = []
+            for request in group:
+                try:
+                    fitted.extend(fit_holt_winters_batch([request]))
+                except Exception as e:
+                    fitted.append(_failed(request, e))
+        for position, result in zip(positions, fitted):
+            results[position] = result
+
+    return results
+
+
+def run_forecast_batch(requests: List[Dict[str, Any]], model: str = "prophet") -> List[Dict[str, Any]]:
+    """
+    Entry point executed inside a pool process
+
+    One child's failure is reported in its own result instead of failing
+    the rest of the batch.
+    """
+    if model == "holt_winters":
+        return _run_holt_winters_batch(requests)
+
+    results = []
+    for request in requests:
+        try:
+            results.append(fit_prophet_forecast(request))
+        except Exception as e:
+            results.append(_failed(request, e))
+    return results
+
+
+# =============================================================================
+# Forecasting Engine
+# =============================================================================
+
+class ForecastingEngine:
+    """
+    Process-pool front end for consumption forecasting
+
+    Requests are split into batches per pool task, and at most `max_workers`
+    batches are in flight at once, so a large run queues in the API process
+    instead of flooding the pool. The vectorized Holt-Winters model is the
+    default and fits a whole batch in one pass, so its batches are much
+    larger; Prophet (FORECAST_MODEL=prophet) fits children one at a time.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        model: Optional[str] = None
+    ):
+        self.max_workers = max_workers or settings.forecast_max_workers
+        self.model = model or settings.forecast_model
+        self.batch_size = batch_size or (
+            settings.forecast_vectorized_batch_size if self.model == "holt_winters"
+            else settings.forecast_batch_size
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def model_version(self) -> str:
+        """Version tag of the results this engine produces"""
+        return MODEL_VERSIONS[self.model]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the event loop, engines or sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def forecast(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Forecast a single child"""
+        results = await self.forecast_many([request])
+        return results[0]
+
+    async def forecast_many(self, requests: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Forecast many children, preserving request order
+
+        Returns:
+            One result dict per request; failed children carry an 'error'
+        """
+        if not requests:
+            return []
+
+        batches = [
+            list(requests[start:start + self.batch_size])
+            for start in range(0, len(requests), self.batch_size)
+        ]
+        started = datetime.now(timezone.utc)
+        batch_results = await asyncio.gather(*[self._run_batch(batch) for batch in batches])
+
+        results = [result for batch in batch_results for result in batch]
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        logger.info(f"Forecast {len(results)} children with {self.model} in {len(batches)} batches ({elapsed:.2f}s)")
+        return results
+
+    async def _run_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_executor(), run_forecast_batch, batch, self.model)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM); replace the pool for later calls
+                logger.error("Forecasting process pool broke; recreating it")
+                self.shutdown(wait=False)
+                raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+
+_forecasting_engine: Optional[ForecastingEngine] = None
+
+
+def get_forecasting_engine() -> ForecastingEngine:
+    """Process-wide forecasting engine"""
+    global _forecasting_engine
+    if _forecasting_engine is None:
+        _forecasting_engine = ForecastingEngine()
+    return _forecasting_engine
+
+
+def shutdown_forecasting_engine() -> None:
+    """Stop the process-wide engine's workers, if it was started"""
+    global _forecasting_engine
+    if _forecasting_engine is not None:
+        _forecasting_engine.shutdown()
+        _forecasting_engine = None
+
+
+# =============================================================================
+# Export Forecasting Components
+# =============================================================================
+
+__all__ = [
+    "PROPHET_MODEL_VERSION",
+    "HOLT_WINTERS_MODEL_VERSION",
+    "MODEL_VERSIONS",
+    "SEASONAL_MULTIPLIERS",
+    "growth_factor",
+    "seasonal_factor",
+    "build_forecast_request",
+    "fit_prophet_forecast",
+    "run_forecast_batch",
+    "ForecastingEngine",
+    "get_forecasting_engine",
+    "shutdown_forecasting_engine"
+]
@@ -0,0 +1,262 @@
+"""
+Health Metric Time Series for NestSync
+Bounded per-metric history with 1 minute and 1 hour rollups
+
+Every numeric health metric gets a ring buffer of raw points plus two
+downsampled ring buffers. Appends are O(1), memory is fixed by the buffer
+capacities and the metric cap, and a range query walks back from the
+newest entry only as far as the window reaches.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+RAW_CAPACITY = 720                  # 12 hours at the 1 minute quick-check cadence
+MINUTE_CAPACITY = 24 * 60           # 1 day of 1 minute buckets
+HOUR_CAPACITY = 30 * 24             # 30 days of 1 hour buckets
+MAX_SERIES = 512
+
+MINUTE = 60
+HOUR = 3600
+RESOLUTIONS = (MINUTE, HOUR)
+
+
+# =============================================================================
+# Points and Buckets
+# =============================================================================
+
+@dataclass(frozen=True)
+class MetricPoint:
+    """One raw measurement; timestamp is epoch seconds"""
+    timestamp: float
+    value: float
+
+
+@dataclass
+class MetricBucket:
+    """Aggregate of the measurements in [start, start + resolution)"""
+    start: float
+    count: int
+    total: float
+    minimum: float
+    maximum: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    """Summary of a metric over a time window"""
+    count: int
+    mean: float
+    minimum: float
+    maximum: float
+    first: float
+    last: float
+
+
+def to_timestamp(moment: Union[datetime, float, None]) -> float:
+    """Epoch seconds; naive datetimes are UTC, as HealthMetric.measured_at is"""
+    if moment is None:
+        return time.time()
+    if isinstance(moment, datetime):
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+    return float(moment)
+
+
+# =============================================================================
+# Series
+# =============================================================================
+
+class _Rollup:
+    """Ring buffer of fixed-width buckets; the newest bucket is still filling"""
+
+    def __init__(self, resolution: int, capacity: int):
+        self.resolution = resolution
+        self.buckets: Deque[MetricBucket] = deque(maxlen=capacity)
+
+    def add(self, timestamp: float, value: float) -> None:
+        # Timestamps arrive in order (MetricSeries.append), so only the newest bucket can match
+        start = timestamp - timestamp % self.resolution
+        if self.buckets and self.buckets[-1].start == start:
+            self.buckets[-1].add(value)
+        else:
+            self.buckets.append(MetricBucket(start, 1, value, value, value))
+
+    def window(self, since: float, until: float) -> List[MetricBucket]:
+        selected = []
+        for bucket in reversed(self.buckets):
+            if bucket.start + self.resolution <= since:
+                break
+            if bucket.start <= until:
+                selected.append(bucket)
+        selected.reverse()
+        return selected
+
+
+class MetricSeries:
+    """Raw points and rollups of one metric"""
+
+    def __init__(self, name: str, unit: str):
+        self.name = name
+        self.unit = unit
+        self.points: Deque[MetricPoint] = deque(maxlen=RAW_CAPACITY)
+        self.rollups = {
+            MINUTE: _Rollup(MINUTE, MINUTE_CAPACITY),
+            HOUR: _Rollup(HOUR, HOUR_CAPACITY),
+        }
+
+    def append(self, value: float, timestamp: float) -> None:
+        if self.points and timestamp < self.points[-1].timestamp:
+            timestamp = self.points[-1].timestamp  # keep raw points ordered for early exit
+        self.points.append(MetricPoint(timestamp, value))
+        for rollup in self.rollups.values():
+            rollup.add(timestamp, value)
+
+    def latest(self) -> Optional[MetricPoint]:
+        return self.points[-1] if self.points else None
+
+    def raw_window(self, since: float, until: float) -> List[MetricPoint]:
+        selected = []
+        for point in reversed(self.points):
+            if point.timestamp < since:
+                break
+            if point.timestamp <= until:
+                selected.append(point)
+        selected.reverse()
+        return selected
+
+    def covers_raw(self, since: float) -> bool:
+        """Whether raw points reach back to since"""
+        return bool(self.points) and (
+            self.points[0].timestamp <= since or len(self.points) < RAW_CAPACITY
+        )
+
+    def stats(self, since: float, until: float) -> Optional[WindowStats]:
+        """Window summary from raw points where retained, otherwise 1 minute buckets"""
+        if self.covers_raw(since):
+            values = [point.value for point in self.raw_window(since, until)]
+            if not values:
+                return None
+            return WindowStats(len(values), sum(values) / len(values), min(values), max(values), values[0], values[-1])
+
+        buckets = self.rollups[MINUTE].window(since, until)
+        if not buckets:
+            return None
+        count = sum(bucket.count for bucket in buckets)
+        return WindowStats(
+            count,
+            sum(bucket.total for bucket in buckets) / count,
+            min(bucket.minimum for bucket in buckets),
+            max(bucket.maximum for bucket in buckets),
+            buckets[0].mean,
+            buckets[-1].mean
+        )
+
+
+# =============================================================================
+# Store
+# =============================================================================
+
+class HealthTimeSeriesStore:
+    """Fixed-size time series for every numeric health metric, keyed by name"""
+
+    def __init__(self, max_series: int = MAX_SERIES):
+        self.max_series = max_series
+        self.series: Dict[str, MetricSeries] = {}
+
+    def record(self, name: str, value: Union[int, float, bool], unit: str, at: Union[datetime, float, None] = None) -> bool:
+        """Append a measurement; returns False when it is not numeric or the store is full"""
+        if isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, (int, float)):
+            return False
+
+        series = self.series.get(name)
+        if series is None:
+            if len(self.series) >= self.max_series:
+                logger.debug(f"Health time series store is full; not tracking {name}")
+                return False
+            series = self.series[name] = MetricSeries(name, unit)
+        series.append(float(value), to_timestamp(at))
+        return True
+
+    def get(self, name: str) -> Optional[MetricSeries]:
+        return self.series.get(name)
+
+    def names(self, unit: Optional[str] = None) -> List[str]:
+        return sorted(name for name, series in self.series.items() if unit is None or series.unit == unit)
+
+    def query(
+        self,
+        name: str,
+        since: Union[datetime, float],
+        until: Union[datetime, float, None] = None,
+        resolution: Optional[int] = None
+    ) -> Union[List[MetricPoint], List[MetricBucket]]:
+        """
+        Points or buckets of one metric in [since, until]
+
+        resolution 0 returns raw points, MINUTE or HOUR buckets; by default
+        the finest resolution that still reaches back to since is used.
+        """
+        series = self.series.get(name)
+        if series is None:
+            return []
+        since, until = to_timestamp(since), to_timestamp(until)
+        if resolution is None:
+            resolution = self.resolution_for(series, since)
+        if resolution == 0:
+            return series.raw_window(since, until)
+        if resolution not in series.rollups:
+            raise ValueError(f"Resolution must be 0 or one of {RESOLUTIONS}")
+        return series.rollups[resolution].window(since, until)
+
+    def resolution_for(self, series: MetricSeries, since: float) -> int:
+        if series.covers_raw(since):
+            return 0
+        minute_buckets = series.rollups[MINUTE].buckets
+        if minute_buckets and (
+            minute_buckets[0].start <= since or len(minute_buckets) < MINUTE_CAPACITY
+        ):
+            return MINUTE
+        return HOUR
+
+    def stats(
+        self, name: str, since: Union[datetime, float], until: Union[datetime, float, None] = None
+    ) -> Optional[WindowStats]:
+        series = self.series.get(name)
+        return series.stats(to_timestamp(since), to_timestamp(until)) if series else None
+
+
+# =============================================================================
+# Export Health Time Series Components
+# =============================================================================
+
+__all__ = [
+    "MetricPoint",
+    "MetricBucket",
+    "WindowStats",
+    "MetricSeries",
+    "HealthTimeSeriesStore",
+    "MINUTE",
+    "HOUR",
+    "RESOLUTIONS",
+    "to_timestamp"
+]
@@ -0,0 +1,186 @@
+"""
+Metrics for NestSync
+Prometheus metrics from prometheus_client, served at /metrics
+
+Metrics are ordinary prometheus_client Counters, Gauges and Histograms on
+the default registry. Histograms have fixed buckets, so memory is constant;
+p50/p95/p99 come from histogram_quantile() in Prometheus, or from
+histogram_stats() here for in-app summaries.
+
+Every uvicorn worker is its own process. With PROMETHEUS_MULTIPROC_DIR set
+in the environment before the process starts (to a directory emptied on
+container start), prometheus_client keeps each worker's values in mmap
+files and collection merges them all. Merged collection reads those files,
+so async callers should run it in a thread.
+"""
+
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from prometheus_client.metrics_core import Metric
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Buckets for small counts, e.g. SQL statements per request
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Values of a client-controlled label beyond this share one OVERFLOW_LABEL series
+MAX_LABEL_VALUES = 1000
+OVERFLOW_LABEL = "other"
+
+LabelValues = Tuple[str, ...]
+
+
+def multiprocess_enabled() -> bool:
+    """True when prometheus_client keeps values in PROMETHEUS_MULTIPROC_DIR"""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR") or os.environ.get("prometheus_multiproc_dir"))
+
+
+class LabelValueLimit:
+    """
+    Caps the distinct values one label may take in this process
+
+    For labels whose values come from clients, such as GraphQL operation
+    names; every value past max_values is reported as OVERFLOW_LABEL.
+    """
+
+    def __init__(self, max_values: int = MAX_LABEL_VALUES):
+        self.max_values = max_values
+        self._values: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        if value in self._values:
+            return value
+        with self._lock:
+            if len(self._values) >= self.max_values:
+                return OVERFLOW_LABEL
+            self._values.add(value)
+        return value
+
+
+# =============================================================================
+# Collection
+# =============================================================================
+
+def _collection_registry() -> CollectorRegistry:
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_latest() -> bytes:
+    """Every worker's metrics in the Prometheus text format; blocking file reads in multiprocess mode"""
+    return generate_latest(_collection_registry())
+
+
+def collect_families(names: Iterable[str]) -> Dict[str, Metric]:
+    """
+    Metric families by name, merged across workers
+
+    Names are family names, which for counters drop the _total suffix.
+    Blocking file reads in multiprocess mode.
+    """
+    wanted = set(names)
+    return {family.name: family for family in _collection_registry().collect() if family.name in wanted}
+
+
+def sample_values(family: Optional[Metric], labelnames: Sequence[str], suffix: str = "") -> Dict[LabelValues, float]:
+    """Values of one sample type (e.g. "_total") keyed by label values"""
+    if family is None:
+        return {}
+    values: Dict[LabelValues, float] = {}
+    for sample in family.samples:
+        if sample.name != family.name + suffix:
+            continue
+        key = tuple(sample.labels.get(name, "") for name in labelnames)
+        values[key] = values.get(key, 0) + sample.value
+    return values
+
+
+def bucket_quantile(q: float, buckets: List[Tuple[float, float]]) -> Optional[float]:
+    """
+    q-quantile from sorted (upper bound, cumulative count) pairs
+
+    Linear interpolation within the bucket, as Prometheus' histogram_quantile();
+    a quantile in the +Inf bucket is reported as the highest finite bound.
+    """
+    if not buckets or buckets[-1][1] == 0:
+        return None
+    rank = q * buckets[-1][1]
+    lower_bound, lower_count = 0.0, 0.0
+    for upper_bound, count in buckets:
+        if count >= rank:
+            if math.isinf(upper_bound):
+                return lower_bound
+            if count == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = upper_bound, count
+    return lower_bound
+
+
+def histogram_stats(
+    family: Optional[Metric],
+    labelnames: Sequence[str],
+    quantiles: Sequence[float] = DEFAULT_QUANTILES
+) -> Dict[LabelValues, Dict[str, Optional[float]]]:
+    """Count, sum, mean and estimated quantiles of a histogram per label set"""
+    if family is None:
+        return {}
+    buckets: Dict[LabelValues, List[Tuple[float, float]]] = {}
+    sums: Dict[LabelValues, float] = {}
+    for sample in family.samples:
+        key = tuple(sample.labels.get(name, "") for name in labelnames)
+        if sample.name == family.name + "_bucket":
+            buckets.setdefault(key, []).append((float(sample.labels["le"]), sample.value))
+        elif sample.name == family.name + "_sum":
+            sums[key] = sums.get(key, 0.0) + sample.value
+
+    stats = {}
+    for key, series in buckets.items():
+        cumulative = sorted(series)
+        count = cumulative[-1][1]
+        total = sums.get(key, 0.0)
+        stats[key] = {
+            "count": int(count),
+            "sum": total,
+            "mean": total / count if count else None,
+            **{f"p{round(q * 100):g}": bucket_quantile(q, cumulative) for q in quantiles}
+        }
+    return stats
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop an exiting worker's live gauges from the merged output"""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+# =============================================================================
+# Export Metrics Components
+# =============================================================================
+
+__all__ = [
+    "LabelValueLimit",
+    "multiprocess_enabled",
+    "render_latest",
+    "collect_families",
+    "sample_values",
+    "bucket_quantile",
+    "histogram_stats",
+    "mark_process_dead",
+    "DEFAULT_LATENCY_BUCKETS",
+    "COUNT_BUCKETS",
+    "DEFAULT_QUANTILES"
+]
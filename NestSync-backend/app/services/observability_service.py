@@ -16,8 +16,11 @@ Monitors all documented P0/P1 failure classes from bottlenecks.md:
 
 import asyncio
 import logging
+import time
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
@@ -27,8 +30,18 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.config.database import get_async_session, async_engine
 from app.config.settings import get_settings
+from app.services.health_timeseries import HealthTimeSeriesStore
 # from app.auth.supabase import get_supabase_client
 
+# Health checks kept for summaries and category queries (~40 comprehensive runs)
+HEALTH_HISTORY_SIZE = 500
+
+# Trend detection compares the recent window of each millisecond metric to
+# the baseline window before it
+TREND_RECENT_SECONDS = 15 * 60
+TREND_BASELINE_SECONDS = 60 * 60
+TREND_DEGRADATION_RATIO = 1.2
+
 
 class AlertSeverity(Enum):
     """Alert severity levels for escalation"""
@@ -102,7 +115,8 @@ class ObservabilityService:
         self.settings = get_settings()
         self.logger = logging.getLogger(__name__)
         self.active_alerts: Dict[str, SystemAlert] = {}
-        self.health_history: List[HealthCheck] = []
+        self.health_history: Deque[HealthCheck] = deque(maxlen=HEALTH_HISTORY_SIZE)
+        self.timeseries = HealthTimeSeriesStore()
         self.monitoring_enabled = True
 
         # Health check thresholds (Canadian context - stress reduction focused)
@@ -153,6 +167,7 @@ class ObservabilityService:
 
             # Store health check history
             self.health_history.extend(health_checks)
+            self.record_metrics(health_checks)
 
             # Generate alerts for failing checks
             await self._process_health_check_alerts(health_checks)
@@ -1092,48 +1107,53 @@ class ObservabilityService:
         remediation_steps = []
 
         try:
-            # Analyze recent health check history for trends
-            if len(self.health_history) >= 3:
-                recent_checks = self.health_history[-3:]
+            # Compare each millisecond metric's recent mean to its baseline
+            now = time.time()
+            recent_means = []
+            degraded = []
+            for name in self.timeseries.names(unit="ms"):
+                recent = self.timeseries.stats(name, now - TREND_RECENT_SECONDS, now)
+                baseline = self.timeseries.stats(
+                    name, now - TREND_RECENT_SECONDS - TREND_BASELINE_SECONDS, now - TREND_RECENT_SECONDS
+                )
+                if recent is None:
+                    continue
+                recent_means.append(recent.mean)
+                if baseline is not None and baseline.mean > 0 and recent.mean > baseline.mean * TREND_DEGRADATION_RATIO:
+                    degraded.append((recent.mean / baseline.mean, name, recent.mean, baseline.mean))
 
-                # Look for degrading performance trends
-                response_times = []
-                for check in recent_checks:
-                    for metric in check.metrics:
-                        if "response_time" in metric.name or "time" in metric.name:
-                            if isinstance(metric.value, (int, float)):
-                                response_times.append(metric.value)
+            if recent_means:
+                trend_increasing = bool(degraded)
 
-                if len(response_times) >= 2:
-                    # Check if response times are increasing
-                    trend_increasing = response_times[-1] > response_times[0] * 1.2  # 20% increase
+                metrics.append(HealthMetric(
+                    name="performance_trend_stable",
+                    value=not trend_increasing,
+                    unit="boolean",
+                    healthy=not trend_increasing,
+                    threshold=True
+                ))
 
-                    metrics.append(HealthMetric(
-                        name="performance_trend_stable",
-                        value=not trend_increasing,
-                        unit="boolean",
-                        healthy=not trend_increasing,
-                        threshold=True
-                    ))
+                if trend_increasing:
+                    _, name, recent_mean, baseline_mean = max(degraded)
+                    status = False
+                    error_message = (
+                        f"Performance degradation detected: {name} {recent_mean:.0f}ms vs {baseline_mean:.0f}ms"
+                    )
+                    remediation_steps = [
+                        "Monitor system resource usage",
+                        "Check for memory leaks",
+                        "Review recent code changes",
+                        "Consider scaling if load increased"
+                    ]
 
-                    if trend_increasing:
-                        status = False
-                        error_message = f"Performance degradation detected: {response_times[-1]:.0f}ms vs {response_times[0]:.0f}ms"
-                        remediation_steps = [
-                            "Monitor system resource usage",
-                            "Check for memory leaks",
-                            "Review recent code changes",
-                            "Consider scaling if load increased"
-                        ]
-
-                    avg_response_time = sum(response_times) / len(response_times)
-                    metrics.append(HealthMetric(
-                        name="average_response_time",
-                        value=avg_response_time,
-                        unit="ms",
-                        healthy=avg_response_time < 2000,
-                        threshold=2000
-                    ))
+                avg_response_time = sum(recent_means) / len(recent_means)
+                metrics.append(HealthMetric(
+                    name="average_response_time",
+                    value=avg_response_time,
+                    unit="ms",
+                    healthy=avg_response_time < 2000,
+                    threshold=2000
+                ))
 
             # Check system resources if available
             import psutil
@@ -1160,8 +1180,8 @@ class ObservabilityService:
                     "Review caching strategies"
                 ])
 
-            # CPU usage
-            cpu_usage = psutil.cpu_percent(interval=1) / 100
+            # CPU usage since the previous call; a sampling interval would block the event loop
+            cpu_usage = psutil.cpu_percent(interval=None) / 100
 
             metrics.append(HealthMetric(
                 name="cpu_usage",
@@ -1214,7 +1234,7 @@ class ObservabilityService:
         try:
             # Analyze recent health check history for error patterns
             if len(self.health_history) >= 5:
-                recent_checks = self.health_history[-5:]
+                recent_checks = self.recent_checks(5)
 
                 # Count failed checks in recent history
                 failed_checks = sum(1 for check in recent_checks if not check.status)
@@ -1279,6 +1299,19 @@ class ObservabilityService:
             severity=AlertSeverity.MEDIUM if not status else AlertSeverity.INFO
         )
 
+    def record_metrics(self, health_checks: List[HealthCheck]) -> None:
+        """Append every numeric metric and each check's status to the time series"""
+        for check in health_checks:
+            self.timeseries.record(f"{check.check_id}.status", check.status, "boolean", check.checked_at)
+            for metric in check.metrics:
+                self.timeseries.record(f"{check.check_id}.{metric.name}", metric.value, metric.unit, metric.measured_at)
+
+    def recent_checks(self, count: int) -> List[HealthCheck]:
+        """The last count health checks, oldest first"""
+        recent = list(islice(reversed(self.health_history), count))
+        recent.reverse()
+        return recent
+
     async def _process_health_check_alerts(self, health_checks: List[HealthCheck]) -> None:
         """Process health checks and generate alerts for failures"""
         for check in health_checks:
@@ -1346,7 +1379,7 @@ class ObservabilityService:
         if not self.health_history:
             return {"status": "no_data", "message": "No health checks performed yet"}
 
-        latest_checks = self.health_history[-20:]  # Last 20 checks
+        latest_checks = self.recent_checks(20)
 
         # Overall health status
         healthy_checks = sum(1 for check in latest_checks if check.status)
@@ -0,0 +1,230 @@
+"""
+Partition Maintenance for NestSync
+Monthly range partitions for usage_logs and analytics_daily_summaries
+
+Both tables are partitioned by month on their time column (migration
+f3c8d1a6b245), so range scans prune to the months they touch. Partitions
+are created ahead of time so inserts do not fall into the default
+partition, and retention drops whole months: detaching and dropping a
+partition is a catalog change, where a DELETE rewrites and bloats the table.
+Indexes are declared on the parent tables and Postgres adds them to every
+new partition.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import get_isolated_session
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# DETACH PARTITION briefly takes an exclusive lock on the parent; give up
+# rather than queue every reader behind a long-running query
+DDL_LOCK_TIMEOUT = "5s"
+
+
+# =============================================================================
+# Partitioned Tables
+# =============================================================================
+
+def month_start(day: date) -> date:
+    """First day of the month containing day"""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after the month of `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    """
+    A table range-partitioned by month
+
+    timestamptz columns use UTC month bounds; date columns use calendar months.
+    """
+    name: str
+    column: str
+    is_timestamp: bool
+
+    def partition_name(self, month: date) -> str:
+        return f"{self.name}_p{month:%Y_%m}"
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.name}_default"
+
+    def partition_month(self, partition_name: str) -> Optional[date]:
+        """Month held by a partition, or None for partitions not named by month"""
+        match = re.fullmatch(rf"{re.escape(self.name)}_p(\d{{4}})_(\d{{2}})", partition_name)
+        return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+    def bounds(self, month: date) -> Tuple[str, str]:
+        """FROM and TO literals of a month's partition"""
+        start, end = month.isoformat(), add_months(month, 1).isoformat()
+        if self.is_timestamp:
+            return f"{start} 00:00:00+00", f"{end} 00:00:00+00"
+        return start, end
+
+
+USAGE_LOGS = PartitionedTable("usage_logs", "logged_at", is_timestamp=True)
+ANALYTICS_DAILY_SUMMARIES = PartitionedTable("analytics_daily_summaries", "date", is_timestamp=False)
+
+PARTITIONED_TABLES = (USAGE_LOGS, ANALYTICS_DAILY_SUMMARIES)
+
+LIST_PARTITIONS = text("""
+    SELECT child.relname
+    FROM pg_inherits i
+    JOIN pg_class child ON child.oid = i.inhrelid
+    WHERE i.inhparent = CAST(:table AS regclass)
+""")
+
+
+# =============================================================================
+# Maintenance
+# =============================================================================
+
+class PartitionMaintenance:
+    """Creates upcoming monthly partitions and drops expired ones"""
+
+    def __init__(self, months_ahead: Optional[int] = None):
+        self.months_ahead = months_ahead if months_ahead is not None else settings.partition_months_ahead
+
+    async def run(self, today: Optional[date] = None) -> int:
+        """
+        Daily maintenance: upcoming partitions plus usage log retention
+
+        Returns:
+            Number of partitions created or dropped
+        """
+        today = today or datetime.now(timezone.utc).date()
+        changed = await self.ensure_future_partitions(today)
+
+        if settings.usage_log_retention_days > 0:
+            cutoff = today - timedelta(days=settings.usage_log_retention_days)
+            changed += len(await self.drop_partitions_before(USAGE_LOGS, cutoff))
+
+        return changed
+
+    async def ensure_future_partitions(self, today: Optional[date] = None) -> int:
+        """Create partitions from this month to months_ahead months out; returns how many were new"""
+        current = month_start(today or datetime.now(timezone.utc).date())
+        created = 0
+
+        async with get_isolated_session() as session:
+            for table in PARTITIONED_TABLES:
+                existing = await self.list_partitions(session, table)
+                for offset in range(self.months_ahead + 1):
+                    month = add_months(current, offset)
+                    if month in existing:
+                        continue
+
+                    await self._create_partition(session, table, month)
+                    created += 1
+                    logger.info(f"Created partition {table.partition_name(month)}")
+
+        return created
+
+    async def drop_partitions_before(self, table: PartitionedTable, cutoff: date) -> List[str]:
+        """
+        Detach and drop every month partition whose rows are all older than cutoff
+
+        Rows of the month containing cutoff stay; callers delete those, which
+        now touches a single partition.
+
+        Returns:
+            Names of the dropped partitions
+        """
+        dropped = []
+
+        async with get_isolated_session() as session:
+            existing = await self.list_partitions(session, table)
+            for month, partition in sorted(existing.items()):
+                if add_months(month, 1) > cutoff:
+                    break
+
+                await self._run_ddl(session, f"ALTER TABLE {table.name} DETACH PARTITION {partition}")
+                await self._run_ddl(session, f"DROP TABLE {partition}")
+                dropped.append(partition)
+                logger.info(f"Dropped expired partition {partition}")
+
+        return dropped
+
+    async def list_partitions(self, session: AsyncSession, table: PartitionedTable) -> Dict[date, str]:
+        """Month partitions of a table, keyed by month"""
+        result = await session.execute(LIST_PARTITIONS, {"table": table.name})
+        partitions = {}
+        for (name,) in result:
+            month = table.partition_month(name)
+            if month is not None:
+                partitions[month] = name
+        return partitions
+
+    async def _create_partition(self, session: AsyncSession, table: PartitionedTable, month: date) -> None:
+        """
+        Create a month partition, first moving that month's rows out of the default partition
+
+        CREATE ... PARTITION OF fails while the default partition holds rows
+        in the new range, which would fail maintenance every day after. The
+        rows are moved into a standalone table that is then attached, all in
+        one transaction.
+        """
+        partition, default = table.partition_name(month), table.default_partition
+        start, end = table.bounds(month)
+        in_range = f"{table.column} >= '{start}' AND {table.column} < '{end}'"
+
+        await session.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+        stranded = await session.execute(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"))
+        if not stranded.scalar():
+            await session.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition} "
+                f"PARTITION OF {table.name} FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+            await session.commit()
+            return
+
+        # ATTACH locks the default partition exclusively anyway; taking it
+        # first keeps new rows for this month out while they are moved
+        await session.execute(text(f"LOCK TABLE {default} IN ACCESS EXCLUSIVE MODE"))
+        await session.execute(text(
+            f"CREATE TABLE {partition} (LIKE {table.name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        await session.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {partition} SELECT * FROM moved"
+        ))
+        await session.execute(text(
+            f"ALTER TABLE {table.name} ATTACH PARTITION {partition} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+        await session.commit()
+        logger.warning(f"Moved rows for {month:%Y-%m} out of {default} into {partition}")
+
+    async def _run_ddl(self, session: AsyncSession, statement: str) -> None:
+        # Identifiers and bounds come from PartitionedTable, never from input
+        await session.execute(text(f"SET LOCAL lock_timeout = '{DDL_LOCK_TIMEOUT}'"))
+        await session.execute(text(statement))
+        await session.commit()
+
+
+# =============================================================================
+# Export Partition Maintenance Components
+# =============================================================================
+
+__all__ = [
+    "PartitionedTable",
+    "PartitionMaintenance",
+    "USAGE_LOGS",
+    "ANALYTICS_DAILY_SUMMARIES",
+    "PARTITIONED_TABLES",
+    "month_start",
+    "add_months"
+]
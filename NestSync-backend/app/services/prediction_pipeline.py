@@ -0,0 +1,281 @@
+"""
+Nightly Prediction Pipeline for NestSync
+Refreshes consumption predictions for every premium child in bulk
+
+One grouped query streams (child_id, date, count) for all eligible children
+in child_id order. Children are forecast a chunk at a time through the model
+store and forecasting engine, and each chunk's predictions are written with
+one bulk INSERT in the same transaction as the run checkpoint, so a run that
+is interrupted resumes after the last committed child.
+"""
+
+import logging
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import (
+    Column, String, Integer, Date, DateTime, select, and_, exists, insert, desc, func
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import Base, get_isolated_session
+from app.config.settings import settings
+from app.models import Child, UsageLog, InventoryItem, ReorderSubscription, ConsumptionPrediction
+from app.services.forecasting_engine import ForecastingEngine, get_forecasting_engine, build_forecast_request
+from app.services.reorder_service import ReorderService, usage_history_day, usage_history_window
+
+logger = logging.getLogger(__name__)
+
+# Same window and minimum as ReorderService.generate_consumption_prediction,
+# so both paths build identical requests and share model store entries
+HISTORY_DAYS = 90
+MIN_HISTORY_DAYS = 14
+
+
+# =============================================================================
+# Run Checkpoints
+# =============================================================================
+
+class PredictionRunStatus:
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class PredictionRun(Base):
+    """Progress of one nightly run; last_child_id is the resume point"""
+    __tablename__ = "prediction_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_date = Column(Date, nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default=PredictionRunStatus.RUNNING)
+    last_child_id = Column(UUID(as_uuid=True), nullable=True)
+
+    children_processed = Column(Integer, nullable=False, default=0)
+    predictions_written = Column(Integer, nullable=False, default=0)
+    children_skipped = Column(Integer, nullable=False, default=0)
+    children_failed = Column(Integer, nullable=False, default=0)
+
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# =============================================================================
+# Prediction Pipeline
+# =============================================================================
+
+class PredictionPipeline:
+    """Bulk consumption prediction run for all children with an active subscription"""
+
+    def __init__(
+        self,
+        forecasting_engine: Optional[ForecastingEngine] = None,
+        chunk_size: Optional[int] = None
+    ):
+        self.forecasting_engine = forecasting_engine or get_forecasting_engine()
+        self.chunk_size = chunk_size or settings.prediction_pipeline_chunk_size
+
+    async def run(self, run_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Run (or resume) the pipeline for run_date, today in UTC by default
+
+        Schedule it through the job queue (JobKind.PREDICTIONS_NIGHTLY): the
+        queue's dedup key keeps two runs for one date from overlapping.
+
+        Returns:
+            The run's counters; a run that already completed is not repeated
+        """
+        run_date = run_date or datetime.now(timezone.utc).date()
+        started = datetime.now(timezone.utc)
+
+        async with get_isolated_session() as write_session:
+            run = await self._start_run(write_session, run_date)
+            if run.status == PredictionRunStatus.COMPLETED:
+                logger.info(f"Prediction run for {run_date} already completed")
+                return self._summary(run)
+            if run.last_child_id:
+                logger.info(f"Resuming prediction run for {run_date} after child {run.last_child_id}")
+
+            async with get_isolated_session() as read_session:
+                async for chunk in self._stream_children(read_session, run_date, run.last_child_id):
+                    await self._process_chunk(write_session, run, chunk)
+
+            run.status = PredictionRunStatus.COMPLETED
+            run.completed_at = run.updated_at = datetime.now(timezone.utc)
+            await write_session.commit()
+
+            elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+            logger.info(
+                f"Prediction run for {run_date} finished in {elapsed:.1f}s: "
+                f"{run.predictions_written} written, {run.children_skipped} skipped, "
+                f"{run.children_failed} failed"
+            )
+            return self._summary(run)
+
+    async def _start_run(self, session: AsyncSession, run_date: date) -> PredictionRun:
+        result = await session.execute(
+            select(PredictionRun).where(PredictionRun.run_date == run_date).with_for_update()
+        )
+        run = result.scalar_one_or_none()
+        if run is None:
+            now = datetime.now(timezone.utc)
+            run = PredictionRun(
+                run_date=run_date,
+                status=PredictionRunStatus.RUNNING,
+                children_processed=0,
+                predictions_written=0,
+                children_skipped=0,
+                children_failed=0,
+                started_at=now,
+                updated_at=now
+            )
+            session.add(run)
+        await session.commit()
+        return run
+
+    async def _stream_children(
+        self,
+        session: AsyncSession,
+        run_date: date,
+        after_child_id: Optional[uuid.UUID]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream daily usage for every eligible child in one grouped query
+
+        Yields chunks of children, each with its ordered daily history.
+        """
+        usage_date = usage_history_day()
+        start, end = usage_history_window(run_date, HISTORY_DAYS)
+
+        conditions = [
+            Child.is_deleted == False,
+            UsageLog.logged_at >= start,
+            UsageLog.logged_at < end,
+            exists().where(
+                and_(
+                    ReorderSubscription.user_id == Child.parent_id,
+                    ReorderSubscription.is_active == True
+                )
+            )
+        ]
+        if after_child_id is not None:
+            conditions.append(Child.id > after_child_id)
+
+        statement = (
+            select(
+                Child.id.label("child_id"),
+                Child.date_of_birth,
+                Child.current_diaper_size,
+                usage_date.label("date"),
+                func.count(UsageLog.id).label("daily_usage")
+            )
+            .join(UsageLog, UsageLog.child_id == Child.id)
+            .where(and_(*conditions))
+            .group_by(Child.id, Child.date_of_birth, Child.current_diaper_size, usage_date)
+            .order_by(Child.id, usage_date)
+            .execution_options(yield_per=self.chunk_size * 8)
+        )
+
+        chunk: List[Dict[str, Any]] = []
+        current: Optional[Dict[str, Any]] = None
+        result = await session.stream(statement)
+        async for row in result:
+            if current is None or current["child_id"] != row.child_id:
+                if current is not None:
+                    chunk.append(current)
+                    if len(chunk) >= self.chunk_size:
+                        yield chunk
+                        chunk = []
+                current = {
+                    "child_id": row.child_id,
+                    "date_of_birth": row.date_of_birth,
+                    "current_diaper_size": row.current_diaper_size,
+                    "history": []
+                }
+            current["history"].append({"date": row.date, "daily_usage": row.daily_usage})
+
+        if current is not None:
+            chunk.append(current)
+        if chunk:
+            yield chunk
+
+    async def _process_chunk(self, session: AsyncSession, run: PredictionRun, chunk: List[Dict[str, Any]]) -> None:
+        """Forecast one chunk and commit its predictions together with the checkpoint"""
+        service = ReorderService(session, self.forecasting_engine)
+
+        eligible = [child for child in chunk if len(child["history"]) >= MIN_HISTORY_DAYS]
+        requests = [
+            build_forecast_request(child["child_id"], child["history"], child["date_of_birth"])
+            for child in eligible
+        ]
+        forecasts = await service.model_store.forecast_many(self.forecasting_engine, requests)
+        stock = await self._current_stock(session, [child["child_id"] for child in eligible])
+
+        rows, failed = [], 0
+        for child, forecast in zip(eligible, forecasts):
+            if forecast.get("error"):
+                logger.warning(f"Failed to update prediction for child {child['child_id']}: {forecast['error']}")
+                failed += 1
+                continue
+            rows.append(await service.prediction_values(
+                _ChildRow(child), forecast, stock.get(child["child_id"], 0)
+            ))
+
+        if rows:
+            await session.execute(insert(ConsumptionPrediction), rows)
+
+        run.last_child_id = chunk[-1]["child_id"]
+        run.children_processed += len(chunk)
+        run.predictions_written += len(rows)
+        run.children_skipped += len(chunk) - len(eligible)
+        run.children_failed += failed
+        run.updated_at = datetime.now(timezone.utc)
+        await session.commit()
+
+        logger.info(f"Prediction run {run.run_date}: {run.children_processed} children processed")
+
+    async def _current_stock(self, session: AsyncSession, child_ids: Sequence[uuid.UUID]) -> Dict[uuid.UUID, int]:
+        """Latest inventory item's stock per child, in one query"""
+        if not child_ids:
+            return {}
+
+        result = await session.execute(
+            select(InventoryItem.child_id, InventoryItem.current_stock)
+            .where(InventoryItem.child_id.in_(list(child_ids)))
+            .order_by(InventoryItem.child_id, desc(InventoryItem.created_at))
+            .distinct(InventoryItem.child_id)
+        )
+        return {row.child_id: row.current_stock or 0 for row in result}
+
+    @staticmethod
+    def _summary(run: PredictionRun) -> Dict[str, Any]:
+        return {
+            "run_date": run.run_date.isoformat(),
+            "status": run.status,
+            "children_processed": run.children_processed,
+            "predictions_written": run.predictions_written,
+            "children_skipped": run.children_skipped,
+            "children_failed": run.children_failed
+        }
+
+
+class _ChildRow:
+    """The Child attributes ReorderService needs to build a prediction"""
+
+    def __init__(self, child: Dict[str, Any]):
+        self.id = child["child_id"]
+        self.date_of_birth = child["date_of_birth"]
+        self.current_diaper_size = child["current_diaper_size"]
+
+
+# =============================================================================
+# Export Prediction Pipeline Components
+# =============================================================================
+
+__all__ = [
+    "PredictionRun",
+    "PredictionRunStatus",
+    "PredictionPipeline"
+]
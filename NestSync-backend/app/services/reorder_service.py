@@ -6,20 +6,16 @@ Premium subscription-based automated reorder system with ML prediction pipeline
 import logging
 import uuid
 import json
-from typing import Optional, Dict, Any, List, Tuple
-from datetime import datetime, timezone, timedelta, date
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from datetime import datetime, time, timezone, timedelta, date
 from decimal import Decimal, ROUND_HALF_UP
+from zoneinfo import ZoneInfo
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc, func, or_
+from sqlalchemy import select, and_, desc, func, or_, cast, Date
 from sqlalchemy.orm import selectinload
 
 import stripe
-import numpy as np
-import pandas as pd
-from prophet import Prophet
-import joblib
 import asyncio
-from pathlib import Path
 
 from app.models import (
     User, Child, InventoryItem, UsageLog,
@@ -28,18 +24,79 @@ from app.models import (
     SubscriptionTier, OrderStatus, RetailerType, PaymentMethodType, PredictionConfidence
 )
 from app.config.settings import settings
+from app.services.forecasting_engine import (
+    ForecastingEngine, get_forecasting_engine, build_forecast_request
+)
+from app.services.forecast_model_store import ForecastModelStore
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# Usage History Window
+# =============================================================================
+
+def usage_history_day():
+    """SQL expression for the local (settings.timezone) calendar day of a usage log"""
+    # timezone(zone, ts) is Postgres' function form of ts AT TIME ZONE zone
+    return cast(func.timezone(settings.timezone, UsageLog.logged_at), Date)
+
+
+def usage_history_window(end_date: date, days: int) -> Tuple[datetime, datetime]:
+    """
+    Half-open [start, end) logged_at range covering local days end_date - days through end_date
+
+    A range on the raw column can use indexes and prune the monthly usage_logs
+    partitions, which a filter on the cast day cannot.
+    """
+    zone = ZoneInfo(settings.timezone)
+    start = datetime.combine(end_date - timedelta(days=days), time.min, tzinfo=zone)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=zone)
+    return start, end
+
+
+def usage_history_statement(end_date: date, days: int, *conditions):
+    """(date, daily_usage) per local day of every usage log matching conditions in the window"""
+    usage_date = usage_history_day()
+    start, end = usage_history_window(end_date, days)
+    return (
+        select(usage_date.label('date'), func.count(UsageLog.id).label('daily_usage'))
+        .where(and_(UsageLog.logged_at >= start, UsageLog.logged_at < end, *conditions))
+        .group_by(usage_date)
+        .order_by(usage_date)
+    )
+
+
+def usage_histories_statement(end_date: date, days: int, child_ids: Sequence[Any]):
+    """(child_id, date, daily_usage) per child and local day for every child in child_ids"""
+    usage_date = usage_history_day()
+    start, end = usage_history_window(end_date, days)
+    return (
+        select(
+            UsageLog.child_id.label('child_id'),
+            usage_date.label('date'),
+            func.count(UsageLog.id).label('daily_usage')
+        )
+        .where(and_(
+            UsageLog.logged_at >= start,
+            UsageLog.logged_at < end,
+            UsageLog.child_id.in_(child_ids)
+        ))
+        .group_by(UsageLog.child_id, usage_date)
+        .order_by(UsageLog.child_id, usage_date)
+    )
+
+
 class ReorderService:
     """
     Service class for premium reorder system with ML prediction pipeline
     Handles subscription management, consumption prediction, and automated ordering
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, forecasting_engine: Optional[ForecastingEngine] = None):
         self.session = session
+        self.forecasting_engine = forecasting_engine or get_forecasting_engine()
+        self.model_store = ForecastModelStore(session)
         self.stripe_client = stripe
         self.stripe_client.api_key = settings.stripe_secret_key
 
@@ -60,10 +117,6 @@ class ReorderService:
             'YT': {'gst': Decimal('0.05'), 'pst_hst': Decimal('0.00')},  # Yukon
         }
 
-        # ML models cache
-        self.prediction_models = {}
-        self.model_last_loaded = {}
-
     # =============================================================================
     # Subscription Management
     # =============================================================================
@@ -279,7 +332,11 @@ class ReorderService:
         horizon_days: int = 30
     ) -> ConsumptionPrediction:
         """
-        Generate ML-powered consumption prediction using Prophet time series forecasting
+        Generate ML-powered consumption prediction
+
+        Model fitting runs in the forecasting engine's process pool, using
+        vectorized Holt-Winters by default or Prophet when FORECAST_MODEL=prophet.
+        Children with no new usage since their stored fit are not refit.
         """
         try:
             # Get historical usage data
@@ -287,95 +344,19 @@ class ReorderService:
             if len(usage_data) < 14:  # Need at least 2 weeks of data
                 raise ValueError("Insufficient usage data for prediction (minimum 14 days required)")
 
-            # Prepare data for Prophet
-            df = pd.DataFrame(usage_data)
-            df['ds'] = pd.to_datetime(df['date'])
-            df['y'] = df['daily_usage']
-
-            # Add growth factors for age progression
-            df = await self._add_growth_factors(df, child)
-
-            # Add seasonal factors (holiday periods, etc.)
-            df = await self._add_seasonal_factors(df)
-
-            # Train Prophet model
-            model = Prophet(
-                growth='linear',
-                seasonality_mode='multiplicative',
-                yearly_seasonality=True,
-                weekly_seasonality=True,
-                daily_seasonality=False,
-                changepoint_prior_scale=0.1,
-                seasonality_prior_scale=10.0
+            forecasts = await self.model_store.forecast_many(
+                self.forecasting_engine,
+                [build_forecast_request(child.id, usage_data, child.date_of_birth, horizon_days)]
             )
+            forecast = forecasts[0]
+            if forecast.get("error"):
+                raise ValueError(f"Forecast failed: {forecast['error']}")
 
-            # Add custom regressors for growth and seasonal adjustments
-            model.add_regressor('growth_factor')
-            model.add_regressor('seasonal_factor')
-
-            model.fit(df)
-
-            # Generate future predictions
-            future = model.make_future_dataframe(periods=horizon_days)
-            future['growth_factor'] = await self._calculate_future_growth_factors(child, horizon_days)
-            future['seasonal_factor'] = await self._calculate_future_seasonal_factors(horizon_days)
-
-            forecast = model.predict(future)
-
-            # Calculate prediction metrics
-            current_rate = df['y'].tail(7).mean()  # Last week average
-            predicted_30d = max(1, int(forecast['yhat'].tail(horizon_days).sum()))
-            predicted_runout = await self._calculate_runout_date(child, current_rate)
-            recommended_reorder = predicted_runout - timedelta(days=7)  # Reorder 1 week before runout
-
-            # Calculate model performance metrics
-            mae, r2 = await self._calculate_model_performance(model, df)
-
-            # Determine confidence level
-            confidence = await self._determine_confidence_level(mae, r2, len(usage_data))
-
-            # Check for size change probability
-            size_change_prob, predicted_size, size_change_date = await self._predict_size_change(child, current_rate)
-
-            # Create prediction record
-            prediction = ConsumptionPrediction(
-                id=str(uuid.uuid4()),
-                child_id=child.id,
-                model_version="prophet_v1.0",
-                prediction_date=datetime.now(timezone.utc),
-                prediction_horizon_days=horizon_days,
-                confidence_level=confidence,
-                mean_absolute_error=Decimal(str(round(mae, 4))),
-                r_squared_score=Decimal(str(round(r2, 4))),
-                current_consumption_rate=Decimal(str(round(current_rate, 2))),
-                predicted_consumption_30d=predicted_30d,
-                predicted_runout_date=predicted_runout,
-                recommended_reorder_date=recommended_reorder,
-                size_change_probability=Decimal(str(round(size_change_prob, 4))) if size_change_prob else None,
-                predicted_new_size=predicted_size,
-                size_change_estimated_date=size_change_date,
-                growth_adjustment_factor=Decimal('1.0'),  # Will be calculated based on age
-                seasonal_adjustment_factor=Decimal('1.0'),  # Will be calculated based on time of year
-                feature_importance=json.dumps({
-                    'historical_usage': 0.6,
-                    'growth_factor': 0.2,
-                    'seasonal_factor': 0.1,
-                    'day_of_week': 0.1
-                }),
-                training_data_points=len(usage_data),
-                training_period_days=(df['ds'].max() - df['ds'].min()).days,
-                last_usage_date=df['ds'].max().date(),
-                created_at=datetime.now(timezone.utc)
-            )
+            prediction = await self._build_prediction(child, forecast)
 
             self.session.add(prediction)
             await self.session.commit()
 
-            # Cache the model for future use
-            model_cache_key = f"child_{child.id}_prophet"
-            self.prediction_models[model_cache_key] = model
-            self.model_last_loaded[model_cache_key] = datetime.now(timezone.utc)
-
             logger.info(f"Generated prediction {prediction.id} for child {child.id}")
             return prediction
 
@@ -387,6 +368,9 @@ class ReorderService:
     async def update_predictions_for_user(self, user: User) -> List[ConsumptionPrediction]:
         """
         Update predictions for all children of a user
+
+        Usage history for all children is loaded in one grouped query and
+        they are forecast in one engine call, then saved together.
         """
         predictions = []
 
@@ -395,17 +379,98 @@ class ReorderService:
             select(Child).where(Child.parent_id == user.id)
         )
         children = result.scalars().all()
+        if not children:
+            return predictions
 
+        histories = await self._get_usage_histories([child.id for child in children], days=90)
+
+        requests, eligible = [], []
         for child in children:
-            try:
-                prediction = await self.generate_consumption_prediction(child)
-                predictions.append(prediction)
-            except Exception as e:
-                logger.warning(f"Failed to update prediction for child {child.id}: {e}")
+            usage_data = histories.get(child.id, [])
+            if len(usage_data) < 14:
+                logger.warning(f"Failed to update prediction for child {child.id}: insufficient usage data")
                 continue
+            requests.append(build_forecast_request(child.id, usage_data, child.date_of_birth))
+            eligible.append(child)
+
+        forecasts = await self.model_store.forecast_many(self.forecasting_engine, requests)
+
+        for child, forecast in zip(eligible, forecasts):
+            if forecast.get("error"):
+                logger.warning(f"Failed to update prediction for child {child.id}: {forecast['error']}")
+                continue
+            prediction = await self._build_prediction(child, forecast)
+            self.session.add(prediction)
+            predictions.append(prediction)
+
+        if predictions:
+            await self.session.commit()
 
         return predictions
 
+    async def _build_prediction(
+        self,
+        child: Child,
+        forecast: Dict[str, Any],
+        current_stock: Optional[int] = None
+    ) -> ConsumptionPrediction:
+        """Turn a forecasting engine result into a ConsumptionPrediction row"""
+        return ConsumptionPrediction(**await self.prediction_values(child, forecast, current_stock))
+
+    async def prediction_values(
+        self,
+        child: Child,
+        forecast: Dict[str, Any],
+        current_stock: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Column values for a ConsumptionPrediction built from a forecast result
+
+        `child` only needs id, date_of_birth and current_diaper_size. Pass
+        current_stock when it was already loaded to skip the inventory query.
+        """
+        current_rate = forecast["current_rate"]
+        mae, r2 = forecast["mae"], forecast["r2"]
+
+        predicted_runout = await self._calculate_runout_date(child, current_rate, current_stock)
+        recommended_reorder = predicted_runout - timedelta(days=7)  # Reorder 1 week before runout
+
+        # Determine confidence level
+        confidence = await self._determine_confidence_level(mae, r2, forecast["training_data_points"])
+
+        # Check for size change probability
+        size_change_prob, predicted_size, size_change_date = await self._predict_size_change(child, current_rate)
+
+        return dict(
+            id=str(uuid.uuid4()),
+            child_id=child.id,
+            model_version=forecast["model_version"],
+            prediction_date=datetime.now(timezone.utc),
+            prediction_horizon_days=forecast["horizon_days"],
+            confidence_level=confidence,
+            mean_absolute_error=Decimal(str(round(mae, 4))),
+            r_squared_score=Decimal(str(round(r2, 4))),
+            current_consumption_rate=Decimal(str(round(current_rate, 2))),
+            predicted_consumption_30d=forecast["predicted_consumption"],
+            predicted_runout_date=predicted_runout,
+            recommended_reorder_date=recommended_reorder,
+            size_change_probability=Decimal(str(round(size_change_prob, 4))) if size_change_prob else None,
+            predicted_new_size=predicted_size,
+            size_change_estimated_date=size_change_date,
+            growth_adjustment_factor=Decimal('1.0'),  # Will be calculated based on age
+            seasonal_adjustment_factor=Decimal('1.0'),  # Will be calculated based on time of year
+            feature_importance=json.dumps({
+                'historical_usage': 0.6,
+                'growth_factor': 0.2,
+                'seasonal_factor': 0.1,
+                'day_of_week': 0.1
+            }),
+            training_data_points=forecast["training_data_points"],
+            training_period_days=forecast["training_period_days"],
+            last_usage_date=date.fromisoformat(forecast["last_usage_date"]),
+            created_at=datetime.now(timezone.utc)
+        )
+
     # =============================================================================
     # Retailer Configuration Management
     # =============================================================================
@@ -649,130 +714,47 @@ class ReorderService:
 
     async def _get_usage_history(self, child_id: str, days: int = 90) -> List[Dict[str, Any]]:
         """Get usage history for ML training"""
-        end_date = datetime.now(timezone.utc).date()
-        start_date = end_date - timedelta(days=days)
-
+        end_date = datetime.now(ZoneInfo(settings.timezone)).date()
         result = await self.session.execute(
-            select(
-                func.date(UsageLog.timestamp).label('date'),
-                func.count(UsageLog.id).label('daily_usage')
-            )
-            .where(
-                and_(
-                    UsageLog.child_id == child_id,
-                    func.date(UsageLog.timestamp) >= start_date,
-                    func.date(UsageLog.timestamp) <= end_date
-                )
-            )
-            .group_by(func.date(UsageLog.timestamp))
-            .order_by(func.date(UsageLog.timestamp))
+            usage_history_statement(end_date, days, UsageLog.child_id == child_id)
         )
 
         return [{'date': row.date, 'daily_usage': row.daily_usage} for row in result]
 
-    async def _add_growth_factors(self, df: pd.DataFrame, child: Child) -> pd.DataFrame:
-        """Add growth factors based on child's age progression"""
-        # Calculate age in months for each data point
-        birth_date = pd.to_datetime(child.date_of_birth)
-        df['age_months'] = ((df['ds'] - birth_date).dt.days / 30.44).round(1)
-
-        # Growth factor increases consumption slightly over time
-        df['growth_factor'] = 1.0 + (df['age_months'] * 0.002)  # 0.2% increase per month
-
-        return df
-
-    async def _add_seasonal_factors(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add seasonal adjustment factors"""
-        # Higher usage during holiday periods and summer months
-        df['month'] = df['ds'].dt.month
-        seasonal_multipliers = {
-            1: 1.1,   # January - New Year
-            2: 1.0,   # February
-            3: 1.0,   # March
-            4: 1.0,   # April
-            5: 1.0,   # May
-            6: 1.05,  # June - Summer begins
-            7: 1.1,   # July - Summer vacation
-            8: 1.1,   # August - Summer vacation
-            9: 1.0,   # September
-            10: 1.0,  # October
-            11: 1.05, # November - Thanksgiving
-            12: 1.15  # December - Christmas/holidays
-        }
-
-        df['seasonal_factor'] = df['month'].map(seasonal_multipliers)
-        return df
-
-    async def _calculate_future_growth_factors(self, child: Child, horizon_days: int) -> List[float]:
-        """Calculate growth factors for future predictions"""
-        current_age_months = ((datetime.now().date() - child.date_of_birth).days / 30.44)
-
-        factors = []
-        for day in range(horizon_days):
-            future_age_months = current_age_months + (day / 30.44)
-            growth_factor = 1.0 + (future_age_months * 0.002)
-            factors.append(growth_factor)
-
-        return factors
-
-    async def _calculate_future_seasonal_factors(self, horizon_days: int) -> List[float]:
-        """Calculate seasonal factors for future predictions"""
-        factors = []
-        for day in range(horizon_days):
-            future_date = datetime.now() + timedelta(days=day)
-            month = future_date.month
-
-            seasonal_multipliers = {
-                1: 1.1, 2: 1.0, 3: 1.0, 4: 1.0, 5: 1.0, 6: 1.05,
-                7: 1.1, 8: 1.1, 9: 1.0, 10: 1.0, 11: 1.05, 12: 1.15
-            }
-
-            factors.append(seasonal_multipliers[month])
-
-        return factors
-
-    async def _calculate_runout_date(self, child: Child, current_rate: float) -> datetime:
+    async def _get_usage_histories(
+        self,
+        child_ids: Sequence[Any],
+        days: int = 90
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+        """Get usage history for ML training for several children in one query"""
+        end_date = datetime.now(ZoneInfo(settings.timezone)).date()
+        result = await self.session.execute(usage_histories_statement(end_date, days, child_ids))
+
+        histories: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in result:
+            histories.setdefault(row.child_id, []).append({'date': row.date, 'daily_usage': row.daily_usage})
+        return histories
+
+    async def _calculate_runout_date(
+        self,
+        child: Child,
+        current_rate: float,
+        current_stock: Optional[int] = None
+    ) -> datetime:
         """Calculate when current inventory will run out"""
-        # Get current inventory
-        result = await self.session.execute(
-            select(InventoryItem.current_stock)
-            .where(InventoryItem.child_id == child.id)
-            .order_by(desc(InventoryItem.created_at))
-            .limit(1)
-        )
-
-        current_stock = result.scalar_one_or_none() or 0
+        if current_stock is None:
+            # Get current inventory
+            result = await self.session.execute(
+                select(InventoryItem.current_stock)
+                .where(InventoryItem.child_id == child.id)
+                .order_by(desc(InventoryItem.created_at))
+                .limit(1)
+            )
+            current_stock = result.scalar_one_or_none() or 0
         days_remaining = max(1, int(current_stock / max(current_rate, 1)))
 
         return datetime.now(timezone.utc) + timedelta(days=days_remaining)
 
-    async def _calculate_model_performance(self, model: Prophet, df: pd.DataFrame) -> Tuple[float, float]:
-        """Calculate model performance metrics"""
-        # Use cross-validation for more robust metrics
-        if len(df) < 21:  # Need sufficient data for CV
-            return 0.5, 0.5  # Conservative estimates
-
-        # Simple train/test split for performance calculation
-        train_size = int(len(df) * 0.8)
-        train_df = df[:train_size]
-        test_df = df[train_size:]
-
-        # Retrain on training data
-        model_test = Prophet(growth='linear', seasonality_mode='multiplicative')
-        model_test.add_regressor('growth_factor')
-        model_test.add_regressor('seasonal_factor')
-        model_test.fit(train_df)
-
-        # Predict on test data
-        test_forecast = model_test.predict(test_df)
-
-        # Calculate metrics
-        mae = np.mean(np.abs(test_df['y'] - test_forecast['yhat']))
-        r2 = 1 - (np.sum((test_df['y'] - test_forecast['yhat']) ** 2) /
-                  np.sum((test_df['y'] - np.mean(test_df['y'])) ** 2))
-
-        return float(mae), float(max(0, r2))
-
     async def _determine_confidence_level(self, mae: float, r2: float, data_points: int) -> PredictionConfidence:
         """Determine prediction confidence based on model performance"""
         if data_points < 14:
@@ -0,0 +1,186 @@
+"""
+Parallel Section Executor for NestSync
+Loads independent dashboard sections concurrently, one session per section
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.database import get_isolated_session
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SectionLoader = Callable[[AsyncSession], Awaitable[Any]]
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# Generic text returned for failed sections; the exception is only logged
+SECTION_ERROR_MESSAGE = "Section could not be loaded"
+
+# Bounds section sessions across all dashboards so they cannot drain the pool
+_shared_session_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_shared_session_slots() -> asyncio.Semaphore:
+    global _shared_session_slots
+    if _shared_session_slots is None:
+        _shared_session_slots = asyncio.Semaphore(max(1, settings.analytics_section_max_sessions))
+    return _shared_session_slots
+
+
+class SectionFailureReason(str, Enum):
+    """Why a section did not produce a value"""
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+@dataclass
+class SectionFailure:
+    """Typed marker for a section that failed while its siblings succeeded"""
+    section: str
+    reason: SectionFailureReason
+    message: str
+    elapsed_ms: float
+
+
+@dataclass
+class SectionOutcome:
+    """Result of one section: either a value or a SectionFailure"""
+    section: str
+    value: Any = None
+    failure: Optional[SectionFailure] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.failure is None
+
+
+class ParallelSectionExecutor:
+    """
+    Runs named section loaders concurrently
+
+    An AsyncSession cannot run two statements at once, so every section gets
+    its own short-lived session (and therefore its own pooled connection).
+    Each section is bounded by its own timeout and fails independently; the
+    total latency is that of the slowest section rather than the sum.
+
+    At most max_concurrency sections of one run hold a session at a time, and
+    sections of all runs in the process share a further limit of
+    ANALYTICS_SECTION_MAX_SESSIONS sessions. Time spent waiting for a slot
+    counts towards the section's timeout.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory = get_isolated_session,
+        default_timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        shared_slots: Optional[asyncio.Semaphore] = None
+    ):
+        self.session_factory = session_factory
+        self.default_timeout = (
+            default_timeout if default_timeout is not None
+            else settings.analytics_section_timeout_seconds
+        )
+        self.max_concurrency = max(1, (
+            max_concurrency if max_concurrency is not None
+            else settings.analytics_section_concurrency
+        ))
+        self._shared_slots = shared_slots
+
+    async def run(
+        self,
+        sections: Dict[str, SectionLoader],
+        timeouts: Optional[Dict[str, float]] = None
+    ) -> Dict[str, SectionOutcome]:
+        """
+        Execute all sections concurrently
+
+        Args:
+            sections: Section name mapped to a loader taking its own session
+            timeouts: Optional per-section timeout overrides in seconds
+
+        Returns:
+            Section name mapped to its outcome, in the order given
+        """
+        timeouts = timeouts or {}
+        run_slots = asyncio.Semaphore(self.max_concurrency)
+        shared_slots = self._shared_slots or _get_shared_session_slots()
+        outcomes = await asyncio.gather(*[
+            self._run_section(
+                name, loader, timeouts.get(name, self.default_timeout), run_slots, shared_slots
+            )
+            for name, loader in sections.items()
+        ])
+        return {outcome.section: outcome for outcome in outcomes}
+
+    async def _run_section(
+        self,
+        name: str,
+        loader: SectionLoader,
+        timeout: float,
+        run_slots: asyncio.Semaphore,
+        shared_slots: asyncio.Semaphore
+    ) -> SectionOutcome:
+        started = time.perf_counter()
+
+        async def load() -> Any:
+            async with run_slots, shared_slots:
+                async with self.session_factory() as session:
+                    return await loader(session)
+
+        try:
+            value = await asyncio.wait_for(load(), timeout=timeout)
+        except asyncio.TimeoutError:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            logger.warning(f"Section '{name}' timed out after {timeout}s")
+            return SectionOutcome(
+                section=name,
+                failure=SectionFailure(
+                    section=name,
+                    reason=SectionFailureReason.TIMEOUT,
+                    message=f"Section timed out after {timeout}s",
+                    elapsed_ms=elapsed_ms
+                ),
+                elapsed_ms=elapsed_ms
+            )
+        except Exception as e:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # Driver and SQL errors stay in the logs, never in the response
+            logger.exception(f"Section '{name}' failed: {type(e).__name__}")
+            return SectionOutcome(
+                section=name,
+                failure=SectionFailure(
+                    section=name,
+                    reason=SectionFailureReason.ERROR,
+                    message=SECTION_ERROR_MESSAGE,
+                    elapsed_ms=elapsed_ms
+                ),
+                elapsed_ms=elapsed_ms
+            )
+
+        return SectionOutcome(
+            section=name,
+            value=value,
+            elapsed_ms=(time.perf_counter() - started) * 1000
+        )
+
+
+# =============================================================================
+# Export Section Executor Components
+# =============================================================================
+
+__all__ = [
+    "ParallelSectionExecutor",
+    "SECTION_ERROR_MESSAGE",
+    "SectionFailure",
+    "SectionFailureReason",
+    "SectionOutcome"
+]
@@ -9,8 +9,19 @@ from datetime import datetime, timezone
 from typing import Dict, Any, Optional, List
 from enum import Enum
 
+from prometheus_client import Counter
+
+from app.services.metrics import collect_families, sample_values
+
 logger = logging.getLogger(__name__)
 
+subscription_events = Counter(
+    "subscription_events_total",
+    "Subscription events by type",
+    labelnames=("event_type",)
+)
+SUBSCRIPTION_EVENTS_FAMILY = "subscription_events"
+
 
 class SubscriptionEventType(str, Enum):
     """Types of subscription events to monitor"""
@@ -48,13 +59,31 @@ class SubscriptionMonitoringService:
     def __init__(self):
         """Initialize subscription monitoring service"""
         self.logger = logging.getLogger(__name__)
-        self.metrics: Dict[str, int] = {}
-        self._initialize_metrics()
 
-    def _initialize_metrics(self):
-        """Initialize metric counters"""
-        for event_type in SubscriptionEventType:
-            self.metrics[event_type.value] = 0
+    @property
+    def metrics(self) -> Dict[str, int]:
+        """
+        Event counts summed over every worker process
+
+        Reads every worker's metric files when PROMETHEUS_MULTIPROC_DIR is set;
+        call it from a thread in async code.
+        """
+        family = collect_families([SUBSCRIPTION_EVENTS_FAMILY]).get(SUBSCRIPTION_EVENTS_FAMILY)
+        return self._counts(family)
+
+    @property
+    def local_metrics(self) -> Dict[str, int]:
+        """Event counts of this worker only; no file reads"""
+        family = next(iter(subscription_events.collect()), None)
+        return self._counts(family)
+
+    @staticmethod
+    def _counts(family) -> Dict[str, int]:
+        counts = sample_values(family, ("event_type",), suffix="_total")
+        return {
+            event_type.value: int(counts.get((event_type.value,), 0))
+            for event_type in SubscriptionEventType
+        }
 
     def track_event(
         self,
@@ -75,7 +104,7 @@ class SubscriptionMonitoringService:
         timestamp = datetime.now(timezone.utc)
 
         # Increment metric counter
-        self.metrics[event_type.value] = self.metrics.get(event_type.value, 0) + 1
+        subscription_events.labels(event_type=event_type.value).inc()
 
         # Log event
         log_data = {
@@ -150,9 +179,9 @@ class SubscriptionMonitoringService:
                 message="Unauthorized feature access attempt detected"
             )
 
-        # Monitor conversion rate
+        # Monitor conversion rate (this worker's counts; track_event runs on request paths)
         if event_type == SubscriptionEventType.TRIAL_CONVERTED:
-            conversion_rate = self._calculate_conversion_rate()
+            conversion_rate = self._calculate_conversion_rate(self.local_metrics)
             if conversion_rate < 0.1:  # Less than 10%
                 self._send_alert(
                     event_type,
@@ -198,10 +227,11 @@ class SubscriptionMonitoringService:
         # - Email notifications for errors
         # - Metrics dashboard updates
 
-    def _calculate_conversion_rate(self) -> float:
+    def _calculate_conversion_rate(self, metrics: Optional[Dict[str, int]] = None) -> float:
         """Calculate trial-to-paid conversion rate"""
-        trial_starts = self.metrics.get(SubscriptionEventType.TRIAL_STARTED.value, 0)
-        conversions = self.metrics.get(SubscriptionEventType.TRIAL_CONVERTED.value, 0)
+        metrics = metrics if metrics is not None else self.metrics
+        trial_starts = metrics.get(SubscriptionEventType.TRIAL_STARTED.value, 0)
+        conversions = metrics.get(SubscriptionEventType.TRIAL_CONVERTED.value, 0)
 
         if trial_starts == 0:
             return 0.0
@@ -215,25 +245,26 @@ class SubscriptionMonitoringService:
         Returns:
             Dictionary containing metric summaries
         """
-        trial_starts = self.metrics.get(SubscriptionEventType.TRIAL_STARTED.value, 0)
-        trial_conversions = self.metrics.get(SubscriptionEventType.TRIAL_CONVERTED.value, 0)
-        trial_expirations = self.metrics.get(SubscriptionEventType.TRIAL_EXPIRED.value, 0)
+        metrics = self.metrics
+        trial_starts = metrics.get(SubscriptionEventType.TRIAL_STARTED.value, 0)
+        trial_conversions = metrics.get(SubscriptionEventType.TRIAL_CONVERTED.value, 0)
+        trial_expirations = metrics.get(SubscriptionEventType.TRIAL_EXPIRED.value, 0)
 
-        subscription_created = self.metrics.get(SubscriptionEventType.SUBSCRIPTION_CREATED.value, 0)
-        subscription_canceled = self.metrics.get(SubscriptionEventType.SUBSCRIPTION_CANCELED.value, 0)
+        subscription_created = metrics.get(SubscriptionEventType.SUBSCRIPTION_CREATED.value, 0)
+        subscription_canceled = metrics.get(SubscriptionEventType.SUBSCRIPTION_CANCELED.value, 0)
 
-        payment_succeeded = self.metrics.get(SubscriptionEventType.PAYMENT_SUCCEEDED.value, 0)
-        payment_failed = self.metrics.get(SubscriptionEventType.PAYMENT_FAILED.value, 0)
+        payment_succeeded = metrics.get(SubscriptionEventType.PAYMENT_SUCCEEDED.value, 0)
+        payment_failed = metrics.get(SubscriptionEventType.PAYMENT_FAILED.value, 0)
 
-        refund_requested = self.metrics.get(SubscriptionEventType.REFUND_REQUESTED.value, 0)
-        refund_processed = self.metrics.get(SubscriptionEventType.REFUND_PROCESSED.value, 0)
+        refund_requested = metrics.get(SubscriptionEventType.REFUND_REQUESTED.value, 0)
+        refund_processed = metrics.get(SubscriptionEventType.REFUND_PROCESSED.value, 0)
 
         return {
             "trial_metrics": {
                 "starts": trial_starts,
                 "conversions": trial_conversions,
                 "expirations": trial_expirations,
-                "conversion_rate": self._calculate_conversion_rate()
+                "conversion_rate": self._calculate_conversion_rate(metrics)
             },
             "subscription_metrics": {
                 "created": subscription_created,
@@ -251,8 +282,8 @@ class SubscriptionMonitoringService:
                 "fulfillment_rate": refund_processed / refund_requested if refund_requested > 0 else 0
             },
             "error_counts": {
-                "tax_calculation_errors": self.metrics.get(SubscriptionEventType.TAX_CALCULATION_ERROR.value, 0),
-                "feature_access_violations": self.metrics.get(SubscriptionEventType.FEATURE_ACCESS_VIOLATION.value, 0)
+                "tax_calculation_errors": metrics.get(SubscriptionEventType.TAX_CALCULATION_ERROR.value, 0),
+                "feature_access_violations": metrics.get(SubscriptionEventType.FEATURE_ACCESS_VIOLATION.value, 0)
             }
         }
 
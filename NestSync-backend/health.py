@@ -28,6 +28,10 @@ except ImportError:
     create_client = None
 
 
+# Services that must be healthy for overall health
+CRITICAL_SERVICES = ("system", "database")
+
+
 class HealthChecker:
     """Comprehensive health check service for NestSync backend"""
     
@@ -39,16 +43,6 @@ class HealthChecker:
         Comprehensive health check covering all critical systems
         Returns detailed status for monitoring and debugging
         """
-        health_data = {
-            "status": "healthy",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "uptime_seconds": int(time.time() - self.start_time),
-            "version": os.getenv("API_VERSION", "1.0.0"),
-            "environment": os.getenv("ENVIRONMENT", "unknown"),
-            "region": os.getenv("DATA_REGION", "canada-central"),
-            "checks": {}
-        }
-        
         # Run all health checks
         checks = [
             ("system", self._check_system_health),
@@ -59,34 +53,42 @@ class HealthChecker:
             ("storage", self._check_storage),
         ]
 
-        # Define critical services that must be healthy for overall health
-        critical_services = {"system", "database"}
-
-        overall_healthy = True
-        critical_failures = []
-
+        check_results = {}
         for check_name, check_func in checks:
             try:
-                check_result = await check_func()
-                health_data["checks"][check_name] = check_result
-
-                # Only consider critical services for overall health status
-                if check_name in critical_services and check_result.get("status") not in ["healthy", "warning"]:
-                    overall_healthy = False
-                    critical_failures.append(f"{check_name}: {check_result.get('error', 'unknown error')}")
-
+                check_results[check_name] = await check_func()
             except Exception as e:
-                health_data["checks"][check_name] = {
+                check_results[check_name] = {
                     "status": "error",
                     "error": str(e),
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
-                # Only consider critical service failures
-                if check_name in critical_services:
-                    overall_healthy = False
-                    critical_failures.append(f"{check_name}: {str(e)}")
 
-        health_data["status"] = "healthy" if overall_healthy else "unhealthy"
+        return self.summarize(check_results)
+
+    def summarize(self, check_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Overall health from individual check results
+        Only critical services decide the overall status
+        """
+        health_data = {
+            "status": "healthy",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "uptime_seconds": int(time.time() - self.start_time),
+            "version": os.getenv("API_VERSION", "1.0.0"),
+            "environment": os.getenv("ENVIRONMENT", "unknown"),
+            "region": os.getenv("DATA_REGION", "canada-central"),
+            "checks": check_results
+        }
+
+        critical_failures = []
+        for check_name in CRITICAL_SERVICES:
+            check_result = check_results.get(check_name)
+            if check_result is not None and check_result.get("status") not in ["healthy", "warning"]:
+                reason = check_result.get("error", check_result.get("status", "unknown error"))
+                critical_failures.append(f"{check_name}: {reason}")
+
+        health_data["status"] = "healthy" if not critical_failures else "unhealthy"
         if critical_failures:
             health_data["critical_failures"] = critical_failures
         return health_data
@@ -95,7 +97,7 @@ class HealthChecker:
         """Check system resources and performance"""
         try:
             # CPU and memory usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=None)  # since the last call; never blocks
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
             
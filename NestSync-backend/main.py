@@ -4,12 +4,13 @@ Canadian Diaper Planning Application with PIPEDA Compliance
 """
 
 import os
+import asyncio
 import logging
 import socket
 from contextlib import asynccontextmanager
 from typing import Dict, Any, List
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
@@ -24,10 +25,16 @@ from app.graphql.schema import schema
 from app.graphql.context import create_graphql_context
 from app.middleware import setup_security_middleware
 from app.api.health import include_health_routes
+from app.api.metrics import include_metrics_routes, run_runtime_gauge_sampler
 from app.api.stripe_webhooks import router as stripe_webhook_router
 from app.services.continuous_monitoring import continuous_monitoring
-from health import get_health, get_simple_health
-from app.health import get_auth_health, get_auth_health_simple
+from app.jobs import JobScheduler, JobWorker
+from app.services.forecasting_engine import shutdown_forecasting_engine
+from app.services.analytics_cache import AnalyticsCacheManager
+from app.auth.user_cache import authenticated_users
+from app.services.metrics import mark_process_dead
+from health import health_checker, get_simple_health
+from app.health import health_snapshot, register_default_checks, simplify_auth_health, SYSTEM_CHECKS
 
 # Configure logging
 logging.basicConfig(
@@ -128,15 +135,42 @@ async def lifespan(app: FastAPI):
         logger.info("Starting continuous monitoring service...")
 
         # Start monitoring in background (non-blocking)
-        import asyncio
         asyncio.create_task(continuous_monitoring.start())
 
         logger.info("Continuous monitoring service started")
 
+        # Background job workers normally run as their own process
+        # (`python -m app.jobs.worker`); JOB_IN_PROCESS_WORKERS>0 also runs
+        # them inside the API for single-process development setups
+        app.state.job_workers = [
+            JobWorker(worker_id=f"{socket.gethostname()}:{os.getpid()}:api-{index}")
+            for index in range(settings.job_in_process_workers)
+        ]
+        app.state.job_worker_tasks = [
+            asyncio.create_task(worker.run()) for worker in app.state.job_workers
+        ]
+        logger.info(f"Started {len(app.state.job_workers)} in-process job workers")
+
+        # Periodic jobs; every replica competes, only the advisory-lock leader runs them
+        app.state.job_scheduler = JobScheduler() if settings.scheduler_enabled else None
+        if app.state.job_scheduler is not None:
+            app.state.job_scheduler_task = asyncio.create_task(app.state.job_scheduler.run())
+
+        # Apply analytics and user cache invalidations published by other replicas
+        app.state.analytics_cache_listener = AnalyticsCacheManager.start_invalidation_listener()
+        app.state.user_cache_listener = authenticated_users.start_invalidation_listener()
+
+        # Keep this worker's pool, cache and websocket gauges current
+        app.state.metrics_sampler = asyncio.create_task(run_runtime_gauge_sampler())
+
+        # Refresh health checks in the background; /health endpoints serve the snapshot.
+        # One bounded refresh first, so the first probes do not find an empty snapshot
+        register_default_checks()
+        await health_snapshot.warm_up()
+        health_snapshot.start()
+
         # TODO: Initialize other services
-        # - Redis connections for caching and background jobs
         # - External API clients (Supabase, OCR services, etc.)
-        # - Background job queues (RQ)
         # - ML model loading for predictions
         # - Notification services setup
 
@@ -156,13 +190,46 @@ async def lifespan(app: FastAPI):
         logger.info("Stopping continuous monitoring...")
         continuous_monitoring.stop()
 
+        # Let in-process job workers finish their current jobs
+        logger.info("Stopping background job workers...")
+        for worker in getattr(app.state, "job_workers", []):
+            worker.stop()
+        await asyncio.gather(*getattr(app.state, "job_worker_tasks", []), return_exceptions=True)
+
+        # Release scheduler leadership once the running scheduled job finishes
+        scheduler = getattr(app.state, "job_scheduler", None)
+        if scheduler is not None:
+            scheduler.stop()
+            await asyncio.gather(app.state.job_scheduler_task, return_exceptions=True)
+
+        # Stop forecasting worker processes
+        shutdown_forecasting_engine()
+
+        # Close the shared analytics cache
+        for name in ("analytics_cache_listener", "user_cache_listener"):
+            listener = getattr(app.state, name, None)
+            if listener is not None:
+                listener.cancel()
+                await asyncio.gather(listener, return_exceptions=True)
+        await AnalyticsCacheManager.close()
+        await authenticated_users.close()
+
+        # Stop background health checks
+        await health_snapshot.stop()
+
+        # Counters and histograms from this worker stay in PROMETHEUS_MULTIPROC_DIR;
+        # its live gauges are dropped
+        sampler = getattr(app.state, "metrics_sampler", None)
+        if sampler is not None:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+        mark_process_dead()
+
         # Close database connections
         logger.info("Closing database connections...")
         await close_database()
 
         # TODO: Clean up other resources
-        # - Close Redis connections
-        # - Stop background job workers
         # - Clean up temporary files
         # - Flush audit logs
         # - Stop external service connections
@@ -203,7 +270,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Session-ID"],
-    expose_headers=["X-RateLimit-Limit", "X-RateLimit-Remaining", "Retry-After"],
+    expose_headers=[
+        "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"
+    ],
     max_age=600  # Cache preflight for 10 minutes
 )
 
@@ -268,6 +337,8 @@ app.openapi = custom_openapi
 
 
 # Health check endpoints
+# Checks run in the background (app.health.snapshot); these serve the latest
+# results with their age and never touch the database themselves
 @app.get("/health", tags=["Health"])
 async def health_check():
     """
@@ -275,8 +346,9 @@ async def health_check():
     Returns detailed system status for Railway health checks
     """
     try:
-        health_status = await get_health()
-        
+        health_status = health_checker.summarize(health_snapshot.results(SYSTEM_CHECKS))
+        health_status["snapshot_age_seconds"] = health_snapshot.age_seconds(SYSTEM_CHECKS)
+
         # Return appropriate HTTP status based on health
         if health_status["status"] == "healthy":
             return JSONResponse(content=health_status, status_code=200)
@@ -295,6 +367,15 @@ async def health_check():
         )
 
 
+@app.get("/health/live", tags=["Health"])
+async def liveness_check():
+    """
+    Liveness probe
+    Answers as long as the process serves requests; checks no dependencies
+    """
+    return {"status": "alive", "uptime_seconds": get_simple_health().get("uptime_seconds")}
+
+
 @app.get("/health/simple", tags=["Health"])
 async def simple_health_check():
     """
@@ -313,14 +394,12 @@ async def auth_health_check():
     Tests critical auth paths and gotrue compatibility
     """
     try:
-        auth_status = await get_auth_health()
+        auth_status = health_snapshot.result("auth")
 
         # Return appropriate HTTP status based on auth health
         if auth_status["status"] == "healthy":
             return JSONResponse(content=auth_status, status_code=200)
-        elif auth_status["status"] == "unhealthy":
-            return JSONResponse(content=auth_status, status_code=503)
-        else:  # critical
+        else:  # unhealthy, critical, stale or unknown
             return JSONResponse(content=auth_status, status_code=503)
 
     except Exception as e:
@@ -343,7 +422,9 @@ async def simple_auth_health_check():
     Lightweight endpoint for authentication status monitoring
     """
     try:
-        auth_status = await get_auth_health_simple()
+        auth_result = health_snapshot.result("auth")
+        auth_status = simplify_auth_health(auth_result)
+        auth_status["snapshot_age_seconds"] = auth_result["snapshot"]["age_seconds"]
         status_code = 200 if auth_status["healthy"] else 503
         return JSONResponse(content=auth_status, status_code=status_code)
     except Exception as e:
@@ -432,62 +513,6 @@ async def internal_server_error_handler(request, exc):
 # GraphQL Endpoint Configuration
 # =============================================================================
 
-# Add introspection blocking middleware for GraphQL in production/staging
-@app.middleware("http")
-async def block_graphql_introspection(request: Request, call_next):
-    """
-    Block GraphQL introspection queries in production and staging environments
-
-    SECURITY: HIGH-001 - Prevents API schema exposure
-    CWE-200: Exposure of Sensitive Information to an Unauthorized Actor
-    """
-    # Only check GraphQL endpoint
-    if request.url.path == "/graphql" and ENVIRONMENT in ("production", "staging"):
-        # Only check POST requests (GraphQL queries)
-        if request.method == "POST":
-            # Read request body
-            body_bytes = await request.body()
-
-            try:
-                import json
-                body = json.loads(body_bytes.decode())
-                query = body.get("query", "")
-
-                # Check for introspection queries
-                # Block __schema and __type(...) but allow __typename (used for caching)
-                import re
-                has_schema = "__schema" in query
-                has_type_introspection = bool(re.search(r'__type\s*[\(\{]', query))
-
-                if has_schema or has_type_introspection:
-                    logger.warning(f"Blocked introspection query from {request.client.host}")
-                    return JSONResponse(
-                        status_code=400,
-                        content={
-                            "errors": [{
-                                "message": "GraphQL introspection is disabled in this environment",
-                                "extensions": {
-                                    "code": "INTROSPECTION_DISABLED",
-                                    "security": "Introspection queries are blocked for security reasons"
-                                }
-                            }]
-                        }
-                    )
-            except Exception:
-                # If we can't parse the body, let it through
-                # (it will fail at GraphQL validation anyway)
-                pass
-
-            # Reconstruct request with body for downstream processing
-            async def receive():
-                return {"type": "http.request", "body": body_bytes}
-
-            request._receive = receive
-
-    response = await call_next(request)
-    return response
-
-
 # Add specific OPTIONS handler for GraphQL endpoint BEFORE mounting router
 @app.options("/graphql")
 async def graphql_options():
@@ -500,7 +525,7 @@ enable_graphiql = ENVIRONMENT == "development" and os.getenv("ENABLE_GRAPHIQL",
 # Log GraphQL security configuration for audit trail
 logger.info(f"GraphQL Security Configuration - Environment: {ENVIRONMENT}")
 logger.info(f"  GraphiQL: {'enabled' if enable_graphiql else 'disabled'}")
-logger.info(f"  Introspection: {'allowed' if ENVIRONMENT == 'development' else 'BLOCKED by request validation'}")
+logger.info(f"  Introspection: {'allowed' if ENVIRONMENT == 'development' else 'BLOCKED by validation rule'}")
 
 if ENVIRONMENT != "development":
     logger.info("  Production security: GraphiQL disabled, introspection blocked")
@@ -535,6 +560,9 @@ app.include_router(
 # Include observability and monitoring health routes
 include_health_routes(app)
 
+# Prometheus scrape endpoint
+include_metrics_routes(app)
+
 # =============================================================================
 # Additional API Routes (Future Implementation)
 # =============================================================================
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+NestSync Middleware Benchmark
+=============================
+
+Requests per second through the security middleware stack, driven straight
+through ASGI so server and client costs do not hide the middleware:
+
+- legacy: the previous BaseHTTPMiddleware stack (security headers, rate
+  limiting, request logging, PIPEDA audit) plus the body-buffering
+  introspection check, reproduced here doing the same work per request
+- asgi:   the current pure ASGI stack from setup_security_middleware
+
+Both stacks wrap the same small FastAPI app with a POST /graphql echo
+endpoint. Both limit with the same in-memory GCRA store, using a distinct
+client address per request so nothing is refused.
+
+Usage:
+    python scripts/benchmark_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+# Allow running from the backend root without installing the app
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config.settings import settings
+from app.middleware.rate_limit import InMemoryRateLimitStore, policy_for_path
+from app.middleware.security import RateLimitingMiddleware, SECURITY_HEADERS, setup_security_middleware
+from app.utils.logging import sanitize_log_data
+
+logger = logging.getLogger("benchmark_middleware")
+
+QUERY = {"query": "query Dashboard { me { id email } myChildren(first: 10) { edges { node { id name } } } }"}
+
+
+# =============================================================================
+# Legacy Stack
+# =============================================================================
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for header, value in SECURITY_HEADERS.items():
+            response.headers[header] = value
+        return response
+
+
+class LegacyRateLimiting(BaseHTTPMiddleware):
+    def __init__(self, app):
+        super().__init__(app)
+        self.limiter = RateLimitingMiddleware(app, store=InMemoryRateLimitStore())
+
+    async def dispatch(self, request, call_next):
+        policy = policy_for_path(request.url.path)
+        result = await self.limiter.store.check(self.limiter.get_rate_limit_key(request), policy)
+        response = await call_next(request)
+        response.headers.update(result.headers(policy))
+        return response
+
+
+class LegacyLogging(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        log_data = {
+            "method": request.method,
+            "url": str(request.url),
+            "client_ip": request.headers.get("X-Forwarded-For"),
+            "user_agent": request.headers.get("User-Agent", "unknown"),
+            "status_code": response.status_code,
+            "process_time": round(process_time, 4),
+            "content_length": response.headers.get("content-length", 0)
+        }
+        logger.info("Request processed", extra=sanitize_log_data(log_data))
+        response.headers["X-Process-Time"] = str(process_time)
+        return response
+
+
+class LegacyAudit(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        audit_info = {
+            "timestamp": time.time(),
+            "client_ip": request.headers.get("X-Forwarded-For"),
+            "method": request.method,
+            "path": request.url.path,
+            "has_auth": "Authorization" in request.headers
+        }
+        logger.info("PIPEDA Audit", extra=sanitize_log_data(audit_info))
+        response = await call_next(request)
+        response_audit = {
+            "status_code": response.status_code,
+            "response_size": response.headers.get("content-length", 0)
+        }
+        logger.info("PIPEDA Response Audit", extra=sanitize_log_data(response_audit))
+        return response
+
+
+async def legacy_introspection_check(request: Request, call_next):
+    body_bytes = await request.body()
+    query = json.loads(body_bytes.decode()).get("query", "")
+    if "__schema" in query or re.search(r"__type\s*[\(\{]", query):
+        return JSONResponse(status_code=400, content={"errors": [{"message": "introspection disabled"}]})
+
+    async def receive():
+        return {"type": "http.request", "body": body_bytes}
+
+    request._receive = receive
+    return await call_next(request)
+
+
+# =============================================================================
+# Harness
+# =============================================================================
+
+def create_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        body = await request.json()
+        return {"data": {"echo": len(body["query"])}}
+
+    if stack == "legacy":
+        app.middleware("http")(legacy_introspection_check)
+        app.add_middleware(LegacyAudit)
+        app.add_middleware(LegacyLogging)
+        app.add_middleware(LegacyRateLimiting)
+        app.add_middleware(LegacySecurityHeaders)
+    else:
+        setup_security_middleware(app)
+    return app
+
+
+async def call(app, index: int, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/graphql",
+        "raw_path": b"/graphql",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"x-forwarded-for", f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("benchmark", 80),
+    }
+    request_sent = False
+    disconnected = asyncio.Event()
+    status = 0
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return status
+
+
+async def measure(stack: str, requests: int, concurrency: int) -> float:
+    app = create_app(stack)
+    body = json.dumps(QUERY).encode()
+    await app.router.startup()
+
+    for index in range(200):  # warm up
+        await call(app, index, body)
+
+    started = time.perf_counter()
+    for batch in range(0, requests, concurrency):
+        statuses = await asyncio.gather(*(
+            call(app, 1000 + batch + offset, body) for offset in range(min(concurrency, requests - batch))
+        ))
+        assert all(status == 200 for status in statuses), statuses
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # Measure the middleware, not log handlers
+    logging.disable(logging.WARNING)
+    settings.rate_limiting_enabled = True
+    settings.rate_limit_shared_enabled = False
+
+    print(f"{args.requests} POST /graphql requests, concurrency {args.concurrency}, best of {args.rounds}")
+    results = {}
+    for stack in ("legacy", "asgi"):
+        results[stack] = max(
+            asyncio.run(measure(stack, args.requests, args.concurrency)) for _ in range(args.rounds)
+        )
+        print(f"  {stack:<7} {results[stack]:>9,.0f} req/s")
+    print(f"  speedup {results['asgi'] / results['legacy']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
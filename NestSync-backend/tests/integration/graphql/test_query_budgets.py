@@ -0,0 +1,247 @@
+"""
+Integration Tests for GraphQL Query Budgets
+Runs the DataLoader-backed resolvers and the dashboards against the local test
+database and fails on repeated statements (N+1s)
+"""
+
+import uuid
+import pytest
+import pytest_asyncio
+from datetime import datetime, timezone, timedelta, date
+from decimal import Decimal
+
+import strawberry
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from app.config import database
+from app.config.database import SerializedAsyncSession
+from app.graphql.context import NestSyncGraphQLContext
+from app.graphql.extensions import OperationMetricsExtension, QueryStatsExtension, RequestSessionExtension
+from app.graphql.schema import Query, schema as application_schema
+from app.models import (
+    User, Child, InventoryItem, UsageLog, Family, FamilyMember, FamilyChildAccess,
+    FamilyType, MemberRole, MemberStatus
+)
+
+# QueryStatsExtension is left out: its own tracking block would hide the
+# operation's statements from the test's query_budget. Its placement in the
+# application schema is checked below.
+schema = strawberry.Schema(query=Query, extensions=[RequestSessionExtension])
+
+CHILDREN = 3
+
+
+class AuthenticatedContext(NestSyncGraphQLContext):
+    """Request context with the user already authenticated"""
+
+    def __init__(self, user: User):
+        super().__init__(Request({
+            "type": "http",
+            "method": "POST",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/graphql",
+            "root_path": "",
+            "query_string": b"",
+            "headers": []
+        }))
+        self._user = user
+
+    async def get_user(self):
+        return self._user
+
+
+@pytest_asyncio.fixture
+async def seeded(test_engine, monkeypatch):
+    """A parent with several children, inventory, usage and two families"""
+    factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(
+        database, "RequestSessionLocal",
+        async_sessionmaker(test_engine, class_=SerializedAsyncSession, expire_on_commit=False)
+    )
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+
+    now = datetime.now(timezone.utc)
+    user = User(
+        id=uuid.uuid4(),
+        supabase_user_id=uuid.uuid4(),
+        email=f"budget-{uuid.uuid4().hex[:8]}@nestsync.com",
+        first_name="Budget",
+        last_name="Parent",
+        province="ON",
+        email_verified=True
+    )
+    children = [
+        Child(
+            id=uuid.uuid4(),
+            parent_id=user.id,
+            name=f"Baby {index}",
+            date_of_birth=date(2024, 1, 1),
+            current_diaper_size="Size 2",
+            weight_kg=Decimal("8.5"),
+            daily_usage_count=8,
+            created_at=now - timedelta(minutes=index)
+        )
+        for index in range(CHILDREN)
+    ]
+    families = [
+        Family(
+            id=uuid.uuid4(),
+            name=f"Budget Family {index}",
+            family_type=FamilyType.PERSONAL,
+            created_by=user.id,
+            settings={}
+        )
+        for index in range(2)
+    ]
+
+    async with factory() as session:
+        session.add(user)
+        session.add_all(children)
+        session.add_all(families)
+        await session.flush()
+        for family in families:
+            session.add(FamilyMember(
+                user_id=user.id,
+                family_id=family.id,
+                role=MemberRole.FAMILY_CORE,
+                status=MemberStatus.ACTIVE,
+                permissions={},
+                joined_at=now
+            ))
+        for child in children:
+            session.add(FamilyChildAccess(family_id=families[0].id, child_id=child.id))
+            for size in ("Size 2", "Size 3"):
+                session.add(InventoryItem(
+                    child_id=child.id,
+                    product_type="diaper",
+                    brand="Huggies",
+                    size=size,
+                    quantity_total=40,
+                    quantity_remaining=30
+                ))
+            for hours in range(1, 6):
+                session.add(UsageLog(
+                    child_id=child.id,
+                    usage_type="diaper_change",
+                    logged_at=now - timedelta(hours=hours * 7),
+                    quantity_used=1,
+                    was_wet=True,
+                    was_soiled=hours % 2 == 0
+                ))
+        await session.commit()
+
+    yield user, children, families
+
+    child_ids = [child.id for child in children]
+    family_ids = [family.id for family in families]
+    async with factory() as session:
+        await session.execute(delete(UsageLog).where(UsageLog.child_id.in_(child_ids)))
+        await session.execute(delete(InventoryItem).where(InventoryItem.child_id.in_(child_ids)))
+        await session.execute(delete(FamilyChildAccess).where(FamilyChildAccess.family_id.in_(family_ids)))
+        await session.execute(delete(FamilyMember).where(FamilyMember.family_id.in_(family_ids)))
+        await session.execute(delete(Family).where(Family.id.in_(family_ids)))
+        await session.execute(delete(Child).where(Child.id.in_(child_ids)))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+def _statements_on(stats, table: str):
+    """Per-fingerprint counts of the recorded statements reading from a table"""
+    return [
+        stats.fingerprints[fingerprint]
+        for fingerprint, statement in stats.statements.items()
+        if f"FROM {table}" in statement
+    ]
+
+
+@pytest.mark.integration
+@pytest.mark.graphql
+class TestQueryBudgets:
+    """Test suite for per-operation statement budgets"""
+
+    def test_application_schema_commits_before_recording_stats(self):
+        """on_operation exits run in list order; the commit must land inside the stats and timings"""
+        order = list(application_schema.extensions)
+
+        assert order.index(RequestSessionExtension) < order.index(QueryStatsExtension)
+        assert order.index(RequestSessionExtension) < order.index(OperationMetricsExtension)
+
+    async def test_my_children_and_child_lookups_are_batched(self, seeded, query_budget):
+        """myChildren reads each relationship once; child(...) fields share one query"""
+        user, children, _ = seeded
+        lookups = " ".join(
+            f'c{index}: child(childId: "{child.id}") {{ id name }}'
+            for index, child in enumerate(children)
+        )
+
+        with query_budget(max_repeats=1):
+            listed = await schema.execute(
+                "{ myChildren { edges { node { id } } } }", context_value=AuthenticatedContext(user)
+            )
+        assert listed.errors is None
+        assert len(listed.data["myChildren"]["edges"]) == CHILDREN
+
+        with query_budget(max_repeats=1, max_queries=1):
+            looked_up = await schema.execute(f"{{ {lookups} }}", context_value=AuthenticatedContext(user))
+        assert looked_up.errors is None
+        assert {looked_up.data[f"c{index}"]["name"] for index in range(CHILDREN)} == {
+            child.name for child in children
+        }
+
+    async def test_dashboard_stats_batch_inventory_and_usage_across_children(self, seeded, query_budget):
+        """One inventory read for every child and one usage count per time window"""
+        user, children, _ = seeded
+        fields = " ".join(
+            f'd{index}: getDashboardStats(childId: "{child.id}") {{ diapersLeft todayChanges daysRemaining }}'
+            for index, child in enumerate(children)
+        )
+
+        # The timezone and last-change lookups are still per child
+        with query_budget(max_repeats=CHILDREN) as stats:
+            result = await schema.execute(f"{{ {fields} }}", context_value=AuthenticatedContext(user))
+
+        assert result.errors is None
+        assert all(result.data[f"d{index}"]["diapersLeft"] == 60 for index in range(CHILDREN))
+        assert _statements_on(stats, "inventory_items") == [1]
+        # today's window and the trailing week: one batched count each
+        assert sum(_statements_on(stats, "usage_logs")) == 2 + CHILDREN
+
+    async def test_single_child_dashboard_stays_within_budget(self, seeded, query_budget):
+        user, children, _ = seeded
+
+        with query_budget(max_repeats=2, max_queries=8):
+            result = await schema.execute(
+                f'{{ getDashboardStats(childId: "{children[0].id}") {{ diapersLeft lastChange }} }}',
+                context_value=AuthenticatedContext(user)
+            )
+
+        assert result.errors is None
+        assert result.data["getDashboardStats"]["lastChange"] is not None
+
+    async def test_my_families_loads_members_and_children_in_batches(self, seeded, query_budget):
+        """Memberships, families and their eager-loaded relations: one statement each"""
+        user, _, families = seeded
+
+        with query_budget(max_repeats=1) as stats:
+            result = await schema.execute(
+                "{ myFamilies { totalCount nodes { id name } } }", context_value=AuthenticatedContext(user)
+            )
+
+        assert result.errors is None
+        assert result.data["myFamilies"]["totalCount"] == len(families)
+        assert _statements_on(stats, "families") == [1]
+
+    async def test_analytics_dashboard_reads_usage_once(self, seeded, query_budget):
+        user, children, _ = seeded
+
+        with query_budget(max_repeats=1, max_queries=10) as stats:
+            result = await schema.execute(
+                f'{{ getAnalyticsDashboard(childId: "{children[0].id}") {{ __typename }} }}',
+                context_value=AuthenticatedContext(user)
+            )
+
+        assert result.errors is None
+        assert sum(_statements_on(stats, "usage_logs")) == 1
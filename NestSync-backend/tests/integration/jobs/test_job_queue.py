@@ -0,0 +1,218 @@
+"""
+Integration Tests for the Postgres Job Queue
+Runs against the local test database (SKIP LOCKED needs real Postgres)
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.jobs.queue import (
+    BackgroundJob, JobKind, JobStatus,
+    enqueue_job, claim_jobs, mark_job_succeeded, mark_job_failed, renew_job_lease, requeue_stale_jobs
+)
+from app.jobs.worker import JobWorker
+
+
+@pytest_asyncio.fixture
+async def job_sessions(test_engine):
+    """Session factory on the test engine with an empty job table"""
+    factory = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        await session.execute(delete(BackgroundJob))
+        await session.commit()
+    yield factory
+    async with factory() as session:
+        await session.execute(delete(BackgroundJob))
+        await session.commit()
+
+
+def _payload(child="c1"):
+    return {"child_id": child, "date": "2025-01-01"}
+
+
+@pytest.mark.integration
+class TestJobQueue:
+    """Test suite for the background job queue"""
+
+    async def test_dedup_key_allows_one_pending_job(self, job_sessions):
+        """Enqueueing a pending dedup key again is a no-op"""
+        async with job_sessions() as session:
+            first = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), dedup_key="daily_summary:c1:2025-01-01")
+            second = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), dedup_key="daily_summary:c1:2025-01-01")
+            await session.commit()
+
+        assert first is not None
+        assert second is None
+
+    async def test_concurrent_workers_never_claim_the_same_job(self, job_sessions):
+        """Two open claim transactions skip each other's locked rows"""
+        async with job_sessions() as session:
+            for index in range(10):
+                await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(f"c{index}"))
+            await session.commit()
+
+        async with job_sessions() as first, job_sessions() as second:
+            claimed_a = await claim_jobs(first, "worker-a", 6)
+            claimed_b = await claim_jobs(second, "worker-b", 6)
+            await first.commit()
+            await second.commit()
+
+        ids_a = {job.id for job in claimed_a}
+        ids_b = {job.id for job in claimed_b}
+        assert len(ids_a) == 6
+        assert len(ids_b) == 4
+        assert not ids_a & ids_b
+
+    async def test_running_dedup_key_blocks_pending_sibling(self, job_sessions):
+        """A pending job waits while a job with the same key is running"""
+        key = "daily_summary:c1:2025-01-01"
+        async with job_sessions() as session:
+            await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), dedup_key=key)
+            await session.commit()
+            assert len(await claim_jobs(session, "worker-a", 10)) == 1
+            await session.commit()
+
+            assert await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), dedup_key=key) is not None
+            await session.commit()
+            assert await claim_jobs(session, "worker-b", 10) == []
+
+    async def test_failures_back_off_then_dead_letter(self, job_sessions):
+        """Failed jobs are rescheduled until max_attempts, then marked failed"""
+        async with job_sessions() as session:
+            job_id = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), max_attempts=2)
+            await session.commit()
+
+            status = await mark_job_failed(session, job_id, attempts=1, max_attempts=2, error="boom")
+            await session.commit()
+            job = await session.get(BackgroundJob, job_id, populate_existing=True)
+            assert status == JobStatus.PENDING
+            assert job.run_at > datetime.now(timezone.utc)
+
+            status = await mark_job_failed(session, job_id, attempts=2, max_attempts=2, error="boom")
+            await session.commit()
+            job = await session.get(BackgroundJob, job_id, populate_existing=True)
+            assert status == JobStatus.FAILED
+            assert job.last_error == "boom"
+
+    async def test_worker_that_lost_its_lease_cannot_record_the_result(self, job_sessions):
+        """Only the worker currently holding a job may mark it succeeded or failed"""
+        async with job_sessions() as session:
+            job_id = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload())
+            await session.commit()
+            await claim_jobs(session, "worker-a", 1)
+            await session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id)
+                .values(locked_at=datetime.now(timezone.utc) - timedelta(hours=1))
+            )
+            await session.commit()
+            await requeue_stale_jobs(session, lease_seconds=60)
+            await session.execute(
+                update(BackgroundJob).where(BackgroundJob.id == job_id).values(run_at=datetime.now(timezone.utc))
+            )
+            await session.commit()
+            assert len(await claim_jobs(session, "worker-b", 1)) == 1
+            await session.commit()
+
+            assert not await mark_job_succeeded(session, job_id, "worker-a")
+            assert await mark_job_failed(session, job_id, 2, 5, "late", worker_id="worker-a") is None
+            await session.commit()
+            job = await session.get(BackgroundJob, job_id, populate_existing=True)
+            assert job.status == JobStatus.RUNNING.value and job.locked_by == "worker-b"
+
+            assert await mark_job_succeeded(session, job_id, "worker-b")
+            await session.commit()
+            job = await session.get(BackgroundJob, job_id, populate_existing=True)
+            assert job.status == JobStatus.SUCCEEDED.value
+
+    async def test_retry_racing_a_new_pending_job_is_superseded(self, job_sessions):
+        """A retry that collides with a concurrently enqueued job fails instead of erroring"""
+        key = "daily_summary:c1:2025-01-01"
+        async with job_sessions() as session:
+            job_id = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), dedup_key=key)
+            await session.commit()
+            await claim_jobs(session, "worker-a", 1)
+            await session.commit()
+
+        async with job_sessions() as enqueuer, job_sessions() as worker:
+            # The new pending row is not yet visible, so the retry's NOT EXISTS check passes
+            await enqueue_job(enqueuer, JobKind.ANALYTICS_DAILY_SUMMARY, _payload(), dedup_key=key)
+            retry = asyncio.create_task(
+                mark_job_failed(worker, job_id, 1, 5, "boom", worker_id="worker-a")
+            )
+            await asyncio.sleep(0.2)
+            await enqueuer.commit()
+            status = await retry
+            await worker.commit()
+
+        assert status == JobStatus.FAILED
+        async with job_sessions() as session:
+            job = await session.get(BackgroundJob, job_id)
+            assert job.last_error == "boom (superseded by pending job)"
+
+    async def test_stale_running_jobs_are_requeued(self, job_sessions):
+        """Jobs whose worker lease expired go back to pending"""
+        async with job_sessions() as session:
+            job_id = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload())
+            await session.commit()
+            await claim_jobs(session, "worker-a", 1)
+            await session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id)
+                .values(locked_at=datetime.now(timezone.utc) - timedelta(hours=1))
+            )
+            await session.commit()
+
+            assert await requeue_stale_jobs(session, lease_seconds=60) == 1
+            await session.commit()
+            job = await session.get(BackgroundJob, job_id, populate_existing=True)
+            assert job.status == JobStatus.PENDING.value
+
+    async def test_renewed_lease_keeps_long_jobs_running(self, job_sessions):
+        """A heartbeat from the owning worker stops the reaper requeueing its job"""
+        async with job_sessions() as session:
+            job_id = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload())
+            await session.commit()
+            await claim_jobs(session, "worker-a", 1)
+            await session.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == job_id)
+                .values(locked_at=datetime.now(timezone.utc) - timedelta(hours=1))
+            )
+            await session.commit()
+
+            assert not await renew_job_lease(session, job_id, "worker-b")
+            assert await renew_job_lease(session, job_id, "worker-a")
+            await session.commit()
+
+            assert await requeue_stale_jobs(session, lease_seconds=60) == 0
+            await session.commit()
+            job = await session.get(BackgroundJob, job_id, populate_existing=True)
+            assert job.status == JobStatus.RUNNING.value
+
+    async def test_worker_runs_handler_and_marks_success(self, job_sessions):
+        """JobWorker dispatches claimed jobs to their registered handler"""
+        async with job_sessions() as session:
+            job_id = await enqueue_job(session, JobKind.ANALYTICS_DAILY_SUMMARY, _payload())
+            await session.commit()
+
+        async def get_session():
+            async with job_sessions() as session:
+                yield session
+
+        handler = AsyncMock()
+        with patch("app.jobs.worker.get_async_session", get_session), \
+             patch("app.jobs.worker.get_job_handler", return_value=handler):
+            assert await JobWorker(worker_id="test").run_once() == 1
+
+        handler.assert_awaited_once_with(_payload())
+        async with job_sessions() as session:
+            job = await session.get(BackgroundJob, job_id)
+            assert job.status == JobStatus.SUCCEEDED.value
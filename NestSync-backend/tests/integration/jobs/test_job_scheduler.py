@@ -0,0 +1,154 @@
+"""
+Integration Tests for the Periodic Job Scheduler
+Leader election and occurrence claims run against the local test database
+(advisory locks and ON CONFLICT need real Postgres)
+"""
+
+import asyncio
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.jobs.scheduler import (
+    CronSchedule, JobScheduler, ScheduledJob, ScheduledJobRun, ScheduledRunStatus
+)
+
+TORONTO = ZoneInfo("America/Toronto")
+
+
+@pytest_asyncio.fixture
+async def run_sessions(test_engine):
+    """Session factory on the test engine with an empty run history"""
+    factory = sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        await session.execute(delete(ScheduledJobRun))
+        await session.commit()
+
+    async def get_session():
+        async with factory() as session:
+            yield session
+
+    with patch("app.jobs.scheduler.get_async_session", get_session):
+        yield factory
+
+    async with factory() as session:
+        await session.execute(delete(ScheduledJobRun))
+        await session.commit()
+
+
+def _daily_job(calls, fail_times=0):
+    async def run(scheduled_for):
+        calls.append(scheduled_for)
+        if len(calls) <= fail_times:
+            raise RuntimeError("boom")
+        return 7
+
+    return ScheduledJob(name="test.daily", schedule=CronSchedule("0 1 * * *", TORONTO), run=run)
+
+
+def _at(clock_time):
+    return lambda: clock_time
+
+
+@pytest.mark.unit
+class TestCronSchedule:
+    """Test suite for cron expression matching"""
+
+    def test_daily_occurrences_in_local_time(self):
+        """A daily schedule fires once per local day at the given time"""
+        schedule = CronSchedule("15 0 * * *", TORONTO)
+        start = datetime(2025, 1, 1, tzinfo=TORONTO)
+
+        fired = list(schedule.occurrences(start, start + timedelta(days=3)))
+
+        assert [moment.day for moment in fired] == [1, 2, 3]
+        assert all((moment.hour, moment.minute) == (0, 15) for moment in fired)
+
+    def test_day_and_weekday_match_either(self):
+        """With both restricted, the 1st of the month or any Sunday matches"""
+        schedule = CronSchedule("0 9 1 * 0", TORONTO)
+        start = datetime(2025, 6, 1, tzinfo=TORONTO)
+
+        fired = list(schedule.occurrences(start - timedelta(seconds=1), start + timedelta(days=15)))
+
+        assert [moment.day for moment in fired] == [1, 8, 15]
+
+    def test_ranges_steps_and_lists(self):
+        """Ranges, steps and lists expand as in cron"""
+        schedule = CronSchedule("*/20 8-9 * * 1,3-5", TORONTO)
+
+        assert schedule.minutes == [0, 20, 40]
+        assert schedule.hours == [8, 9]
+        assert schedule.weekdays == {1, 3, 4, 5}
+        with pytest.raises(ValueError):
+            CronSchedule("0 24 * * *", TORONTO)
+
+    def test_jitter_is_stable_per_occurrence(self):
+        """Every replica computes the same delay for one occurrence"""
+        job = ScheduledJob(name="a", schedule=CronSchedule("0 0 * * *", TORONTO), run=None, jitter_seconds=300)
+        moment = datetime(2025, 1, 1, tzinfo=TORONTO)
+
+        assert job.jitter_for(moment) == job.jitter_for(moment)
+        assert timedelta(0) <= job.jitter_for(moment) <= timedelta(seconds=300)
+
+
+@pytest.mark.integration
+class TestJobScheduler:
+    """Test suite for leader election and scheduled runs"""
+
+    async def test_only_one_replica_becomes_leader(self, test_engine, run_sessions):
+        """The advisory lock admits one leader; it is released on stop"""
+        first = JobScheduler(scheduler_id="a", jobs=[], poll_interval=0.05, engine=test_engine)
+        second = JobScheduler(scheduler_id="b", jobs=[], poll_interval=0.05, engine=test_engine)
+        tasks = [asyncio.create_task(first.run()), asyncio.create_task(second.run())]
+        await asyncio.sleep(0.2)
+
+        assert [first.is_leader, second.is_leader].count(True) == 1
+
+        leader, follower = (first, second) if first.is_leader else (second, first)
+        leader.stop()
+        await asyncio.sleep(0.3)
+        assert follower.is_leader
+
+        follower.stop()
+        await asyncio.gather(*tasks)
+
+    async def test_occurrence_runs_once_across_schedulers(self, test_engine, run_sessions):
+        """Two schedulers polling at the same moment claim each occurrence once"""
+        calls = []
+        now = _at(datetime(2025, 3, 10, 1, 5, tzinfo=TORONTO))
+        schedulers = [
+            JobScheduler(scheduler_id=name, jobs=[_daily_job(calls)], engine=test_engine, clock=now)
+            for name in ("a", "b")
+        ]
+
+        ran = await asyncio.gather(*(scheduler.run_due_jobs() for scheduler in schedulers))
+
+        # Three days of catch-up (SCHEDULER_CATCH_UP_HOURS=72), each run exactly once
+        assert sum(ran) == 3 == len(calls) == len(set(calls))
+        async with run_sessions() as session:
+            runs = (await session.execute(select(ScheduledJobRun))).scalars().all()
+        assert {run.status for run in runs} == {ScheduledRunStatus.SUCCEEDED}
+        assert {run.rows_affected for run in runs} == {7}
+
+    async def test_failed_occurrence_retries_after_backoff(self, test_engine, run_sessions):
+        """A failure is recorded with a retry time and rerun once it is due"""
+        calls = []
+        moment = datetime(2025, 3, 10, 1, 5, tzinfo=TORONTO)
+        job = _daily_job(calls, fail_times=1)
+
+        with patch("app.jobs.scheduler.settings.scheduler_catch_up_hours", 1):
+            assert await JobScheduler(jobs=[job], engine=test_engine, clock=_at(moment)).run_due_jobs() == 1
+            assert await JobScheduler(jobs=[job], engine=test_engine, clock=_at(moment)).run_due_jobs() == 0
+            later = _at(moment + timedelta(minutes=30))
+            assert await JobScheduler(jobs=[job], engine=test_engine, clock=later).run_due_jobs() == 1
+
+        async with run_sessions() as session:
+            run = (await session.execute(select(ScheduledJobRun))).scalar_one()
+        assert (run.status, run.attempts, run.error) == (ScheduledRunStatus.SUCCEEDED, 2, None)
@@ -0,0 +1,205 @@
+"""
+Integration Tests for Daily Analytics Summaries
+Runs the nightly rollup, the per-change delta upsert and the per-child repair
+path against the local test database and checks that they agree
+"""
+
+import uuid
+import pytest
+import pytest_asyncio
+from datetime import datetime, timezone, date
+from decimal import Decimal
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import database
+from app.config.settings import settings
+from app.jobs.queue import BackgroundJob, JobKind
+from app.models import User, Child, UsageLog
+from app.models.analytics import AnalyticsDailySummary
+from app.services.analytics_scheduler import AnalyticsScheduler
+from app.services.enhanced_analytics_service import AnalyticsBackgroundProcessor
+
+# 2025-01-15 in America/Toronto (UTC-5) runs from 05:00 UTC to 05:00 UTC the next day
+SUMMARY_DATE = date(2025, 1, 15)
+
+
+def _utc(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2025, 1, day, hour, minute, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def summary_sessions(test_engine, monkeypatch):
+    """Session factory on the test engine, also used by the services under test"""
+    monkeypatch.setattr(settings, "timezone", "America/Toronto")
+    factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(database, "AsyncSessionLocal", factory)
+    return factory
+
+
+@pytest_asyncio.fixture
+async def child(summary_sessions):
+    """A child with no usage logs or summaries yet"""
+    user = User(
+        id=uuid.uuid4(),
+        supabase_user_id=uuid.uuid4(),
+        email=f"summary-{uuid.uuid4().hex[:8]}@nestsync.com",
+        first_name="Summary",
+        last_name="Parent",
+        province="ON",
+        email_verified=True
+    )
+    child = Child(
+        id=uuid.uuid4(),
+        parent_id=user.id,
+        name="Summary Baby",
+        date_of_birth=date(2024, 6, 1),
+        current_diaper_size="Size 2",
+        weight_kg=Decimal("7.5")
+    )
+    async with summary_sessions() as session:
+        session.add(user)
+        session.add(child)
+        await session.commit()
+
+    yield child
+
+    async with summary_sessions() as session:
+        await session.execute(
+            delete(BackgroundJob).where(BackgroundJob.dedup_key.like(f"daily_summary:{child.id}:%"))
+        )
+        await session.execute(delete(AnalyticsDailySummary).where(AnalyticsDailySummary.child_id == child.id))
+        await session.execute(delete(UsageLog).where(UsageLog.child_id == child.id))
+        await session.execute(delete(Child).where(Child.id == child.id))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+async def _log_changes(sessions, child: Child, *created_at: datetime) -> None:
+    async with sessions() as session:
+        for timestamp in created_at:
+            session.add(UsageLog(
+                child_id=child.id,
+                usage_type="diaper_change",
+                logged_at=timestamp,
+                created_at=timestamp,
+                quantity_used=1,
+                was_wet=True
+            ))
+        await session.commit()
+
+
+async def _summary(sessions, child: Child, summary_date: date = SUMMARY_DATE):
+    async with sessions() as session:
+        return (await session.execute(
+            select(AnalyticsDailySummary).where(
+                AnalyticsDailySummary.child_id == child.id,
+                AnalyticsDailySummary.date == summary_date
+            )
+        )).scalar_one_or_none()
+
+
+async def _queued_recomputes(sessions, child: Child):
+    async with sessions() as session:
+        return list((await session.execute(
+            select(BackgroundJob.kind, BackgroundJob.payload).where(
+                BackgroundJob.dedup_key.like(f"daily_summary:{child.id}:%")
+            )
+        )).all())
+
+
+def _snapshot(summary):
+    return (
+        summary.total_changes,
+        list(summary.change_times),
+        {str(hour): count for hour, count in summary.hourly_distribution.items()},
+        summary.time_between_changes_avg,
+        summary.longest_gap,
+        summary.shortest_gap,
+        summary.estimated_cost_cad
+    )
+
+
+@pytest.mark.integration
+class TestDailySummaryDayBoundaries:
+    """Test suite for the local day shared by the rollup and the repair path"""
+
+    async def test_rollup_and_repair_select_the_same_local_day(self, summary_sessions, child):
+        """Changes between 00:00 and 05:00 UTC belong to the previous Toronto day on both paths"""
+        await _log_changes(
+            summary_sessions, child,
+            _utc(15, 4, 59),   # 2025-01-14 23:59 local
+            _utc(15, 5, 0),    # first minute of the summary day
+            _utc(15, 14, 30),
+            _utc(16, 4, 30),   # 23:30 local, still the summary day
+            _utc(16, 5, 0)     # 2025-01-16 00:00 local
+        )
+
+        await AnalyticsScheduler(chunk_size=10).rollup_daily_summaries(SUMMARY_DATE)
+        rolled_up = await _summary(summary_sessions, child)
+
+        assert rolled_up.total_changes == 3
+        assert list(rolled_up.change_times) == [_utc(15, 5, 0), _utc(15, 14, 30), _utc(16, 4, 30)]
+
+        await AnalyticsBackgroundProcessor().process_daily_analytics(child.id, SUMMARY_DATE)
+        repaired = await _summary(summary_sessions, child)
+
+        assert _snapshot(repaired) == _snapshot(rolled_up)
+
+
+@pytest.mark.integration
+class TestChangeEventDeltas:
+    """Test suite for the guarded DAILY_SUMMARY_DELTA_UPSERT"""
+
+    async def test_in_order_events_build_the_repair_path_summary(self, summary_sessions, child):
+        """Each in-order change is one upsert; the result equals a full recompute"""
+        changes = [_utc(15, 5, 0), _utc(15, 9, 0), _utc(15, 10, 30), _utc(16, 4, 30)]
+        processor = AnalyticsBackgroundProcessor()
+        await _log_changes(summary_sessions, child, *changes)
+
+        for changed_at in changes:
+            await processor.apply_change_event(str(child.id), changed_at)
+        applied = await _summary(summary_sessions, child)
+
+        assert applied.total_changes == 4
+        assert list(applied.change_times) == changes
+        assert await _queued_recomputes(summary_sessions, child) == []
+
+        await processor.process_daily_analytics(child.id, SUMMARY_DATE)
+        assert _snapshot(await _summary(summary_sessions, child)) == _snapshot(applied)
+
+    async def test_back_dated_event_leaves_the_row_and_queues_a_recompute(self, summary_sessions, child):
+        """The ordering guard skips the update, so the gap stats are not corrupted"""
+        processor = AnalyticsBackgroundProcessor()
+        await _log_changes(summary_sessions, child, _utc(15, 8, 0), _utc(15, 12, 0), _utc(15, 10, 0))
+        await processor.apply_change_event(str(child.id), _utc(15, 8, 0))
+        await processor.apply_change_event(str(child.id), _utc(15, 12, 0))
+        before = _snapshot(await _summary(summary_sessions, child))
+
+        await processor.apply_change_event(str(child.id), _utc(15, 10, 0))
+
+        assert _snapshot(await _summary(summary_sessions, child)) == before
+        assert await _queued_recomputes(summary_sessions, child) == [
+            (JobKind.ANALYTICS_DAILY_SUMMARY.value, {"child_id": str(child.id), "date": "2025-01-15"})
+        ]
+
+    async def test_replayed_event_is_not_counted_twice(self, summary_sessions, child):
+        """A job retry of the latest change takes the recompute path"""
+        processor = AnalyticsBackgroundProcessor()
+        await _log_changes(summary_sessions, child, _utc(15, 8, 0))
+
+        await processor.apply_change_event(str(child.id), _utc(15, 8, 0))
+        await processor.apply_change_event(str(child.id), _utc(15, 8, 0))
+
+        assert (await _summary(summary_sessions, child)).total_changes == 1
+        assert len(await _queued_recomputes(summary_sessions, child)) == 1
+
+    async def test_early_utc_event_lands_on_the_previous_local_day(self, summary_sessions, child):
+        processor = AnalyticsBackgroundProcessor()
+        await _log_changes(summary_sessions, child, _utc(16, 4, 30))
+
+        await processor.apply_change_event(str(child.id), _utc(16, 4, 30))
+
+        assert (await _summary(summary_sessions, child)).total_changes == 1
+        assert await _summary(summary_sessions, child, date(2025, 1, 16)) is None
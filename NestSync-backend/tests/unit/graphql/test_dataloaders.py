@@ -0,0 +1,75 @@
+"""
+Unit Tests for GraphQL DataLoaders
+Tests that request-scoped loaders batch lookups into single queries
+"""
+
+import asyncio
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timezone
+
+from app.graphql.dataloaders import DataLoaderRegistry, UsageCountKey
+
+
+def _mock_session(execute_result):
+    """Build a mocked request session and the provider that returns it"""
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=execute_result)
+    return session, AsyncMock(return_value=session)
+
+
+@pytest.mark.unit
+@pytest.mark.graphql
+class TestDataLoaderRegistry:
+    """Test suite for DataLoaderRegistry"""
+
+    async def test_children_loader_batches_and_preserves_key_order(self):
+        """Concurrent child loads resolve with one query, missing ids map to None"""
+        child_a = MagicMock(id=uuid.uuid4())
+        child_b = MagicMock(id=uuid.uuid4())
+        missing_id = uuid.uuid4()
+
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [child_b, child_a]
+        session, session_provider = _mock_session(result)
+
+        registry = DataLoaderRegistry(session_provider=session_provider)
+        loaded = await asyncio.gather(
+            registry.children_by_id.load(child_a.id),
+            registry.children_by_id.load(str(missing_id)),
+            registry.children_by_id.load(child_b.id)
+        )
+
+        assert loaded == [child_a, None, child_b]
+        assert session.execute.await_count == 1
+
+    async def test_primed_children_skip_database(self):
+        """Children primed from a list query are served from the loader cache"""
+        child = MagicMock(id=uuid.uuid4())
+        session, session_provider = _mock_session(MagicMock())
+
+        registry = DataLoaderRegistry(session_provider=session_provider)
+        registry.prime_children([child])
+        loaded = await registry.children_by_id.load(child.id)
+
+        assert loaded is child
+        session.execute.assert_not_awaited()
+
+    async def test_usage_counts_group_by_window(self):
+        """Keys sharing a window are answered by one GROUP BY query with zero defaults"""
+        child_a, child_b = uuid.uuid4(), uuid.uuid4()
+        since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        result = MagicMock()
+        result.all.return_value = [(child_a, 7)]
+        session, session_provider = _mock_session(result)
+
+        registry = DataLoaderRegistry(session_provider=session_provider)
+        counts = await registry.usage_counts_by_child.load_many([
+            UsageCountKey(child_a, since),
+            UsageCountKey(child_b, since)
+        ])
+
+        assert counts == [7, 0]
+        assert session.execute.await_count == 1
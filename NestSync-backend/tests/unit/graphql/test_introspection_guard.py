@@ -0,0 +1,52 @@
+"""
+Unit Tests for the Introspection Guard
+Tests that client operations cannot introspect the schema in production
+"""
+
+import pytest
+import strawberry
+
+from app.config.settings import settings
+from app.graphql.extensions import IntrospectionGuardExtension
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    def ping(self) -> str:
+        return "pong"
+
+
+schema = strawberry.Schema(query=Query, extensions=[IntrospectionGuardExtension])
+
+
+@pytest.mark.unit
+@pytest.mark.graphql
+class TestIntrospectionGuard:
+    """Test suite for IntrospectionGuardExtension"""
+
+    @pytest.fixture
+    def production(self, monkeypatch):
+        monkeypatch.setattr(settings, "environment", "production")
+
+    async def test_client_introspection_is_rejected(self, production):
+        for query in ("{ __schema { types { name } } }", '{ __type(name: "Query") { name } }'):
+            result = await schema.execute(query, context_value={"request": None})
+
+            assert result.data is None
+            assert result.errors[0].extensions["code"] == "INTROSPECTION_DISABLED"
+
+    async def test_typename_and_in_process_checks_are_allowed(self, production):
+        """__typename is used for caching; in-process callers have no request context"""
+        typename = await schema.execute("{ __typename ping }", context_value={"request": None})
+        internal = await schema.execute("{ __schema { queryType { name } } }")
+
+        assert typename.errors is None
+        assert internal.errors is None
+
+    async def test_development_allows_introspection(self, monkeypatch):
+        monkeypatch.setattr(settings, "environment", "development")
+
+        result = await schema.execute("{ __schema { queryType { name } } }", context_value={"request": None})
+
+        assert result.errors is None
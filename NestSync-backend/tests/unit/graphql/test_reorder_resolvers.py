@@ -13,6 +13,7 @@ from app.graphql.reorder_types import (
     CreateSubscriptionInput, SubscriptionTierType,
     CreateReorderPreferencesInput, RetailerTypeEnum
 )
+from app.jobs.queue import JobKind
 from app.models import SubscriptionTier, RetailerType
 
 
@@ -223,37 +224,36 @@ class TestReorderMutations:
         test_user,
         test_child
     ):
-        """Test trigger prediction update mutation"""
+        """Test trigger prediction update mutation queues a prediction job"""
 
         mutations = ReorderMutations()
 
         # Mock info context
         mock_info = MagicMock()
-        mock_info.context = {"user": test_user, "session": test_session}
-
-        with patch('app.services.ReorderService') as mock_service_class:
-            mock_service = AsyncMock()
-            mock_service_class.return_value = mock_service
+        mock_info.context.get_user = AsyncMock(return_value=test_user)
 
-            # Mock prediction generation
-            mock_prediction = MagicMock()
-            mock_prediction.id = "pred_test_123"
-            mock_prediction.child_id = test_child.id
-            mock_prediction.confidence_level = "high"
-
-            mock_service.generate_consumption_prediction.return_value = mock_prediction
+        async def get_session():
+            yield test_session
 
+        with patch('app.graphql.reorder_resolvers.get_async_session', get_session), \
+             patch('app.graphql.reorder_resolvers.enqueue_job', AsyncMock()) as enqueue, \
+             patch.object(test_session, 'commit', AsyncMock()):
             # Execute mutation
             result = await mutations.trigger_prediction_update(
                 info=mock_info,
                 child_id=test_child.id
             )
 
-            # Assertions
-            assert result.success is True
-            assert result.prediction == mock_prediction
+        # Assertions
+        assert result.success is True
+        assert result.prediction is None
 
-            mock_service.generate_consumption_prediction.assert_called_once()
+        enqueue.assert_awaited_once_with(
+            test_session,
+            JobKind.CONSUMPTION_PREDICTION,
+            {"child_id": str(test_child.id)},
+            dedup_key=f"consumption_prediction:{test_child.id}"
+        )
 
     async def test_create_manual_order_mutation(
         self,
@@ -0,0 +1,324 @@
+"""
+Unit Tests for the Request-Scoped Session
+Tests that one GraphQL operation shares, serializes and finishes one session
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+import pytest_asyncio
+import strawberry
+from sqlalchemy import Column, Integer, String, event, insert, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from prometheus_client import REGISTRY
+
+from app.config import database
+from app.config.database import RequestSessionScope, SerializedAsyncSession, get_async_session
+from app.config.query_instrumentation import instrument_engine
+from app.config.settings import settings
+from app.graphql.extensions import OperationMetricsExtension, QueryStatsExtension, RequestSessionExtension
+
+TestBase = declarative_base()
+
+
+class Item(TestBase):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+
+
+class Context:
+    def __init__(self):
+        self.session_scope = RequestSessionScope()
+
+
+sessions: List[AsyncSession] = []
+
+
+async def add_item(name: str) -> str:
+    async for session in get_async_session():
+        sessions.append(session)
+        session.add(Item(name=name))
+        await session.flush()
+    return name
+
+
+async def insert_item(name: str) -> str:
+    async for session in get_async_session():
+        sessions.append(session)
+        await session.execute(insert(Item).values(name=name))
+    return name
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def first(self) -> str:
+        return await add_item("first")
+
+    @strawberry.field
+    async def second(self) -> str:
+        return await add_item("second")
+
+    @strawberry.field
+    async def broken(self) -> str:
+        await add_item("broken")
+        raise ValueError("resolver failed")
+
+
+@strawberry.type
+class Mutation:
+    @strawberry.mutation
+    async def invalid(self) -> str:
+        """Swallows a failed statement, as many resolvers do"""
+        try:
+            return await insert_item(None)
+        except Exception:
+            return "error"
+
+    @strawberry.mutation
+    async def invalid_flush(self) -> str:
+        """Swallows a failed flush of an object added before the operation began"""
+        try:
+            return await add_item(None)
+        except Exception:
+            return "error"
+
+    @strawberry.mutation
+    async def valid(self) -> str:
+        return await add_item("valid")
+
+    @strawberry.mutation
+    async def pending(self) -> str:
+        """Leaves its insert for the final commit to flush"""
+        async for session in get_async_session():
+            sessions.append(session)
+            session.add(Item(name="pending"))
+        return "pending"
+
+
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[RequestSessionExtension])
+# Same order as the application schema
+instrumented_schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[RequestSessionExtension, OperationMetricsExtension, QueryStatsExtension]
+)
+
+
+@pytest.mark.unit
+@pytest.mark.graphql
+class TestRequestSession:
+    """Test suite for RequestSessionScope and RequestSessionExtension"""
+
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path, monkeypatch):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'request_session.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(TestBase.metadata.create_all)
+        monkeypatch.setattr(
+            database, "RequestSessionLocal",
+            async_sessionmaker(engine, class_=SerializedAsyncSession, expire_on_commit=False)
+        )
+        sessions.clear()
+        yield engine
+        await engine.dispose()
+
+    @pytest.fixture
+    def commits(self, monkeypatch):
+        calls = []
+        commit = SerializedAsyncSession.commit
+
+        async def counting_commit(session):
+            calls.append(session)
+            await commit(session)
+
+        monkeypatch.setattr(SerializedAsyncSession, "commit", counting_commit)
+        return calls
+
+    async def stored_names(self, engine) -> List[str]:
+        async with engine.connect() as connection:
+            result = await connection.execute(select(Item.name).order_by(Item.name))
+            return list(result.scalars())
+
+    async def test_resolvers_share_one_session_committed_once(self, engine, commits):
+        result = await schema.execute("{ first second }", context_value=Context())
+
+        assert result.errors is None
+        assert len(sessions) == 2 and sessions[0] is sessions[1]
+        assert commits == [sessions[0]]
+        assert await self.stored_names(engine) == ["first", "second"]
+
+    async def test_operation_errors_roll_back(self, engine, commits):
+        result = await schema.execute("{ first broken }", context_value=Context())
+
+        assert result.errors[0].message == "resolver failed"
+        assert commits == []
+        assert await self.stored_names(engine) == []
+
+    async def test_swallowed_statement_error_rolls_back_only_that_statement(self, engine):
+        """Writes before and after the failed statement are committed"""
+        result = await schema.execute("mutation { valid invalid again: valid }", context_value=Context())
+
+        assert result.errors is None
+        assert result.data == {"valid": "valid", "invalid": "error", "again": "valid"}
+        assert await self.stored_names(engine) == ["valid", "valid"]
+
+    async def test_failed_savepoint_keeps_loaded_instances(self, engine):
+        scope = RequestSessionScope()
+        session = await scope.get_session()
+        session.add(Item(name="a"))
+        await session.flush()
+        item = (await session.execute(select(Item))).scalar_one()
+
+        with pytest.raises(Exception):
+            await session.execute(insert(Item).values(name=None))
+
+        assert not inspect(item).expired and item.name == "a"
+        await scope.finish()
+        assert not scope.failed
+        assert await self.stored_names(engine) == ["a"]
+
+    async def test_lost_transaction_is_rolled_back_and_reported(self, engine):
+        """A failed flush outside any savepoint loses the transaction, so the response errors"""
+        result = await schema.execute("mutation { valid invalidFlush }", context_value=Context())
+
+        assert result.data == {"valid": "valid", "invalidFlush": "error"}
+        assert [error.message for error in result.errors] == [
+            "The operation's changes could not be saved and were rolled back"
+        ]
+        assert await self.stored_names(engine) == []
+
+    async def test_commit_is_inside_the_operation_stats(self, engine, monkeypatch):
+        """Statements flushed by the final commit are counted for the operation"""
+        monkeypatch.setattr(settings, "environment", "development")
+        instrument_engine(engine)
+
+        result = await instrumented_schema.execute("mutation { pending }", context_value=Context())
+
+        assert result.errors is None
+        statements = [entry["statement"] for entry in result.extensions["sqlQueries"]["fingerprints"]]
+        assert any(statement.startswith("INSERT INTO items") for statement in statements)
+        assert await self.stored_names(engine) == ["pending"]
+
+    async def test_failed_commit_counts_as_operation_error(self, engine):
+        def errors() -> float:
+            return REGISTRY.get_sample_value(
+                "graphql_operation_errors_total", {"operation": "SaveFailed"}
+            ) or 0.0
+
+        before = errors()
+        result = await instrumented_schema.execute(
+            "mutation SaveFailed { valid invalidFlush }", context_value=Context()
+        )
+
+        assert result.errors is not None
+        assert errors() == before + 1
+
+    async def test_reads_run_without_savepoints(self, engine):
+        statements = []
+        scope = RequestSessionScope()
+        session = await scope.get_session()
+        connection = await session.connection()
+        event.listen(
+            connection.sync_connection, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement)
+        )
+
+        await session.execute(select(Item))
+        await session.execute(insert(Item).values(name="a"))
+
+        assert not any("SAVEPOINT" in statement for statement in statements[:1])
+        assert any("SAVEPOINT" in statement for statement in statements[1:])
+        await scope.finish(commit=False)
+
+    async def test_failed_read_rolls_back_the_whole_operation(self, engine):
+        scope = RequestSessionScope()
+        session = await scope.get_session()
+        session.add(Item(name="a"))
+        await session.flush()
+
+        with pytest.raises(Exception):
+            await session.execute(text("SELECT missing_column FROM items"))
+
+        assert session.failed
+        await scope.finish()
+        assert scope.failed
+        assert await self.stored_names(engine) == []
+
+    async def test_concurrent_resolvers_are_serialized(self, engine, monkeypatch):
+        active, overlaps = 0, []
+        execute = AsyncSession.execute
+
+        async def slow_execute(session, *args, **kwargs):
+            nonlocal active
+            active += 1
+            overlaps.append(active)
+            await asyncio.sleep(0.01)
+            try:
+                return await execute(session, *args, **kwargs)
+            finally:
+                active -= 1
+
+        monkeypatch.setattr(AsyncSession, "execute", slow_execute)
+        scope = RequestSessionScope()
+        token = scope.bind()
+        try:
+            async def query():
+                async for session in get_async_session():
+                    return (await session.execute(text("SELECT 1"))).scalar()
+
+            assert await asyncio.gather(*(query() for _ in range(5))) == [1] * 5
+        finally:
+            await scope.finish()
+            scope.unbind(token)
+
+        assert max(overlaps) == 1
+
+    async def test_stream_holds_lock_until_consumed(self, engine):
+        scope = RequestSessionScope()
+        session = await scope.get_session()
+        session.add_all([Item(name="a"), Item(name="b")])
+        await session.flush()
+
+        result = await session.stream(select(Item.name))
+        waiting = asyncio.create_task(session.execute(text("SELECT 1")))
+        await asyncio.sleep(0.01)
+        assert session._operation_lock.locked() and not waiting.done()
+
+        assert sorted([row.name async for row in result]) == ["a", "b"]
+        assert (await waiting).scalar() == 1
+
+        result = await session.stream(select(Item.name))
+        await result.close()
+        assert not session._operation_lock.locked()
+
+        assert await (await session.stream_scalars(select(Item.name).order_by(Item.name))).first() == "a"
+        assert not session._operation_lock.locked()
+
+        result = await session.stream(select(Item.name))
+        del result
+        assert not session._operation_lock.locked()
+
+        await scope.finish(commit=False)
+
+    async def test_get_one_and_run_sync_are_serialized(self, engine):
+        scope = RequestSessionScope()
+        session = await scope.get_session()
+        session.add(Item(id=1, name="a"))
+        await session.flush()
+
+        await session._operation_lock.acquire()
+        pending = [
+            asyncio.create_task(session.get_one(Item, 1)),
+            asyncio.create_task(session.run_sync(lambda sync_session: sync_session.query(Item).count()))
+        ]
+        await asyncio.sleep(0.01)
+        assert not any(task.done() for task in pending)
+
+        session._operation_lock.release()
+        item, count = await asyncio.gather(*pending)
+        assert item.name == "a" and count == 1
+        await scope.finish(commit=False)
@@ -0,0 +1,74 @@
+"""
+Unit Tests for Analytics Background Processor
+Tests incremental daily summary maintenance and the queued recompute fallback
+"""
+
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import datetime, timezone, date
+
+from app.jobs.queue import JobKind
+from app.services.enhanced_analytics_service import (
+    AnalyticsBackgroundProcessor, DAILY_SUMMARY_DELTA_UPSERT
+)
+
+
+def _session_returning(row):
+    """Mocked session whose single UPSERT returns the given row"""
+    session = MagicMock()
+    result = MagicMock()
+    result.first.return_value = row
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+
+    async def get_session():
+        yield session
+
+    return session, get_session
+
+
+@pytest.mark.unit
+class TestAnalyticsBackgroundProcessor:
+    """Test suite for AnalyticsBackgroundProcessor"""
+
+    async def test_change_event_is_single_upsert(self):
+        """An in-order change costs one statement and no full recompute"""
+        session, get_session = _session_returning((5,))
+        processor = AnalyticsBackgroundProcessor()
+        changed_at = datetime(2025, 3, 4, 15, 30, tzinfo=timezone.utc)
+
+        with patch("app.services.enhanced_analytics_service.get_async_session", get_session), \
+             patch("app.services.enhanced_analytics_service.enqueue_job", AsyncMock()) as enqueue, \
+             patch.object(processor, "process_daily_analytics", AsyncMock()) as recompute:
+            await processor.apply_change_event(str(uuid.uuid4()), changed_at)
+
+        assert session.execute.await_count == 1
+        statement, params = session.execute.await_args.args
+        assert statement is DAILY_SUMMARY_DELTA_UPSERT
+        assert params["hour"] == "15"
+        assert params["summary_date"] == date(2025, 3, 4)
+        session.commit.assert_awaited_once()
+        recompute.assert_not_awaited()
+        enqueue.assert_not_awaited()
+
+    async def test_out_of_order_change_queues_recompute(self):
+        """A back-dated change that the guard rejects queues the repair job"""
+        session, get_session = _session_returning(None)
+        processor = AnalyticsBackgroundProcessor()
+        child_id = str(uuid.uuid4())
+        changed_at = datetime(2025, 3, 4, 15, 30, tzinfo=timezone.utc)
+
+        with patch("app.services.enhanced_analytics_service.get_async_session", get_session), \
+             patch("app.services.enhanced_analytics_service.enqueue_job", AsyncMock()) as enqueue, \
+             patch.object(processor, "process_daily_analytics", AsyncMock()) as recompute:
+            await processor.apply_change_event(child_id, changed_at)
+
+        recompute.assert_not_awaited()
+        enqueue.assert_awaited_once_with(
+            session,
+            JobKind.ANALYTICS_DAILY_SUMMARY,
+            {"child_id": child_id, "date": "2025-03-04"},
+            dedup_key=f"daily_summary:{child_id}:2025-03-04"
+        )
+        session.commit.assert_awaited_once()
@@ -0,0 +1,96 @@
+"""
+Unit Tests for Analytics Cache
+Tests LRU ordering, TTL expiry, exact invalidation and counters
+"""
+
+import pytest
+import uuid
+from datetime import date
+
+from app.services.analytics_cache import AnalyticsCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _key(cache: AnalyticsCache, user_id, child_id=None, query_type="usage_analytics"):
+    return cache.create_cache_key(
+        user_id=user_id,
+        query_type=query_type,
+        child_id=child_id,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 31),
+        filters={"period": "daily"}
+    )
+
+
+@pytest.mark.unit
+class TestAnalyticsCache:
+    """Test suite for AnalyticsCache"""
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """A read refreshes recency, so the untouched entry goes first"""
+        cache = AnalyticsCache(max_size=2)
+        user = uuid.uuid4()
+        first, second, third = (_key(cache, user, query_type=name) for name in ("a", "b", "c"))
+
+        cache.set(first, 1)
+        cache.set(second, 2)
+        assert cache.get(first) == 1
+        cache.set(third, 3)
+
+        assert cache.get(second) is None
+        assert cache.get(first) == 1
+        assert cache.get(third) == 3
+        assert cache.evictions == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Expired entries miss and are dropped on the next write"""
+        clock = _Clock()
+        cache = AnalyticsCache(clock=clock)
+        user = uuid.uuid4()
+        short, long = _key(cache, user, query_type="short"), _key(cache, user, query_type="long")
+
+        cache.set(short, "s", ttl_minutes=1)
+        cache.set(long, "l", ttl_minutes=10)
+        clock.now = 120
+
+        assert cache.get(short) is None
+        assert cache.get(long) == "l"
+        assert cache.get_cache_stats()["expirations"] == 1
+
+    def test_invalidation_is_exact(self):
+        """Invalidating a child or user removes exactly their entries"""
+        cache = AnalyticsCache()
+        parent, caregiver, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        child = uuid.uuid4()
+
+        cache.set(_key(cache, parent), "parent-all")
+        cache.set(_key(cache, parent, child), "parent-child")
+        cache.set(_key(cache, caregiver, child), "caregiver-child")
+        cache.set(_key(cache, other), "other")
+
+        assert cache.invalidate_child_cache(child) == 2
+        assert cache.invalidate_user_cache(parent) == 1
+        assert cache.get(_key(cache, other)) == "other"
+        assert len(cache.cache) == 1
+        assert cache.invalidations == 3
+
+    def test_stats_track_hits_and_misses(self):
+        """Hit rate reflects every lookup"""
+        cache = AnalyticsCache()
+        key = _key(cache, uuid.uuid4())
+
+        cache.get(key)
+        cache.set(key, "value")
+        cache.get(key)
+        cache.get(key)
+
+        stats = cache.get_cache_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        assert stats["hit_rate"] == pytest.approx(66.67)
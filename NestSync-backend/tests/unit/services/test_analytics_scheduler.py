@@ -0,0 +1,116 @@
+"""
+Unit Tests for Analytics Scheduler
+Tests that rollups walk children in id-range chunks, one commit per chunk
+"""
+
+import pytest
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.config.settings import settings
+from app.services import analytics_scheduler as scheduler_module
+from app.services.analytics_scheduler import (
+    CHILD_CHUNK_END, MONTHLY_COST_ROLLUP_UPSERT, AnalyticsScheduler
+)
+from app.services.enhanced_analytics_service import summary_date_for, summary_day_bounds
+
+
+class FakeSession:
+    """Returns chunk boundaries from a sorted list of child ids"""
+
+    def __init__(self, child_ids, chunk_rows=2):
+        self.child_ids = sorted(child_ids)
+        self.chunk_rows = chunk_rows
+        self.rollups = []
+        self.commits = 0
+
+    async def execute(self, statement, params):
+        if statement is CHILD_CHUNK_END:
+            chunk = [cid for cid in self.child_ids if cid > params["after_child_id"]][:params["chunk_size"]]
+            return SimpleNamespace(scalar=lambda: chunk[-1] if chunk else None)
+        self.rollups.append((statement, params))
+        return SimpleNamespace(rowcount=self.chunk_rows)
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = FakeSession([uuid.uuid4() for _ in range(5)])
+
+    @asynccontextmanager
+    async def isolated_session():
+        yield session
+
+    monkeypatch.setattr(scheduler_module, "get_isolated_session", isolated_session)
+    return session
+
+
+@pytest.mark.unit
+class TestAnalyticsScheduler:
+    """Test suite for set-based analytics rollups"""
+
+    async def test_rollup_covers_every_child_in_chunks(self, fake_session):
+        """Five children with a chunk size of two run as three contiguous ranges"""
+        rows = await AnalyticsScheduler(chunk_size=2).rollup_monthly_costs(date(2025, 2, 1))
+
+        ranges = [(params["after_child_id"], params["last_child_id"]) for _, params in fake_session.rollups]
+        ids = fake_session.child_ids
+        assert ranges == [(uuid.UUID(int=0), ids[1]), (ids[1], ids[3]), (ids[3], ids[4])]
+        assert fake_session.commits == 3
+        assert rows == 6
+
+    async def test_monthly_rollup_bounds_the_month(self, fake_session):
+        """Month bounds are half-open and roll over the year"""
+        await AnalyticsScheduler(chunk_size=10).rollup_monthly_costs(date(2024, 12, 1))
+
+        statement, params = fake_session.rollups[0]
+        assert statement is MONTHLY_COST_ROLLUP_UPSERT
+        assert (params["month_start"], params["next_month_start"]) == (date(2024, 12, 1), date(2025, 1, 1))
+        assert params["month_year"] == "2024-12"
+
+    async def test_daily_rollup_spans_the_local_day(self, fake_session):
+        """Day bounds are local midnights, 24 hours apart outside DST changes"""
+        await AnalyticsScheduler(chunk_size=10).rollup_daily_summaries(date(2025, 1, 15))
+
+        _, params = fake_session.rollups[0]
+        assert params["day_start"].date() == date(2025, 1, 15)
+        assert (params["day_end"] - params["day_start"]).total_seconds() == 24 * 3600
+
+    async def test_daily_rollup_uses_the_shared_summary_day(self, fake_session, monkeypatch):
+        """Early-morning UTC changes belong to the previous local day on every path"""
+        monkeypatch.setattr(settings, "timezone", "America/Toronto")
+        await AnalyticsScheduler(chunk_size=10).rollup_daily_summaries(date(2025, 1, 15))
+
+        _, params = fake_session.rollups[0]
+        start = datetime(2025, 1, 15, 5, 0, tzinfo=timezone.utc)
+        assert (params["day_start"], params["day_end"]) == summary_day_bounds(date(2025, 1, 15))
+        assert (params["day_start"], params["day_end"]) == (start, start + timedelta(days=1))
+        assert summary_date_for(datetime(2025, 1, 16, 4, 59, tzinfo=timezone.utc)) == date(2025, 1, 15)
+        assert summary_date_for(datetime(2025, 1, 16, 5, 0, tzinfo=timezone.utc)) == date(2025, 1, 16)
+
+    async def test_weekly_rollup_failure_is_raised(self, monkeypatch):
+        """A failed weekly rollup is not reported as zero rows written"""
+        @asynccontextmanager
+        async def broken_session():
+            raise RuntimeError("database unavailable")
+            yield
+
+        monkeypatch.setattr(scheduler_module, "get_isolated_session", broken_session)
+
+        with pytest.raises(RuntimeError):
+            await AnalyticsScheduler()._run_weekly_pattern_calculations(date(2025, 1, 6))
+
+    async def test_weekly_pattern_failure_fails_the_daily_run(self, fake_session, monkeypatch):
+        """The Sunday run raises so the job scheduler records it as failed and retries"""
+        async def failing_weekly(week_start):
+            raise RuntimeError("weekly rollup failed")
+
+        scheduler = AnalyticsScheduler(chunk_size=10)
+        monkeypatch.setattr(scheduler, "_run_weekly_pattern_calculations", failing_weekly)
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run_daily_analytics_processing(datetime(2025, 1, 13, 12, 0, tzinfo=timezone.utc))
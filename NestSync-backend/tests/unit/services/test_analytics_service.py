@@ -0,0 +1,146 @@
+"""
+Unit Tests for Analytics Service
+Tests the columnar UsageSeries kernel and the SQL aggregate path against
+hand-computed results
+"""
+
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.analytics_service import AnalyticsService, UsageAggregates, UsageDataPoint, UsageSeries
+
+
+def _point(timestamp, was_wet=True, was_soiled=False, interval=None, item_id=None, quantity=1):
+    return UsageDataPoint(
+        timestamp=timestamp,
+        quantity=quantity,
+        was_wet=was_wet,
+        was_soiled=was_soiled,
+        time_since_last=interval,
+        usage_type="diaper_change",
+        hour_of_day=timestamp.hour,
+        day_of_week=timestamp.weekday(),
+        inventory_item_id=item_id
+    )
+
+
+@pytest.fixture
+def data_points():
+    # Monday 2025-01-06 and Tuesday 2025-01-07
+    monday = datetime(2025, 1, 6, tzinfo=timezone.utc)
+    return [
+        _point(monday + timedelta(hours=7), interval=None),
+        _point(monday + timedelta(hours=7, minutes=30), was_soiled=True, interval=30),
+        _point(monday + timedelta(hours=11), was_wet=None, interval=210),
+        _point(monday + timedelta(days=1, hours=7), was_wet=False, was_soiled=True, interval=0, quantity=2),
+    ]
+
+
+@pytest.mark.unit
+class TestAnalyticsService:
+    """Test suite for AnalyticsService calculations"""
+
+    def test_basic_stats(self, data_points):
+        """Conditions treat None as False; zero and missing intervals are skipped"""
+        stats = AnalyticsService().calculate_basic_stats(data_points)
+
+        assert stats == {
+            'total_changes': 4,
+            'total_quantity': 5,
+            'daily_average': 2.0,
+            'wet_only_count': 1,
+            'soiled_only_count': 1,
+            'wet_and_soiled_count': 1,
+            'dry_changes_count': 1,
+            'average_interval_minutes': 120.0
+        }
+
+    def test_daily_summaries_group_by_date(self, data_points):
+        """One summary per calendar day, in date order"""
+        summaries = AnalyticsService().calculate_daily_summaries(data_points)
+
+        assert [summary.date.isoformat() for summary in summaries] == ["2025-01-06", "2025-01-07"]
+        assert (summaries[0].total_changes, summaries[0].average_interval) == (3, 120.0)
+        assert (summaries[1].soiled_only, summaries[1].total_quantity, summaries[1].average_interval) == (1, 2, None)
+
+    def test_peak_hours_break_ties_by_first_seen(self, data_points):
+        """Hour 7 is busiest; hour 11 is ranked after it"""
+        service = AnalyticsService()
+
+        patterns = service.analyze_usage_patterns(data_points)
+        distribution = service.calculate_hourly_distribution(data_points)
+
+        assert patterns.peak_hours == [7, 11]
+        assert patterns.low_hours == []
+        assert [row['hour'] for row in distribution if row['is_peak_hour']] == []
+        assert distribution[7] == {'hour': 7, 'count': 3, 'percentage': 75.0, 'is_peak_hour': False}
+
+    def test_series_is_a_sequence_of_data_points(self, data_points):
+        """Callers that iterate, index, slice or count still work"""
+        series = UsageSeries.from_data_points(data_points)
+
+        assert len(series) == 4
+        assert series[0] == data_points[0]
+        assert len(series[:2]) == 2
+        assert series.changes_on(data_points[-1].timestamp.date()) == 1
+        assert AnalyticsService().calculate_weekly_trends(series)['current_week_changes'] == 4
+
+    async def test_inventory_insights_use_per_item_totals(self, data_points):
+        """Consumption is summed per linked inventory item"""
+        item_id = uuid.uuid4()
+        for dp in data_points[1:]:
+            dp.inventory_item_id = item_id
+        item = type("Item", (), dict(
+            id=item_id, product_type="diaper", size="2", brand="Test",
+            quantity_remaining=8, cost_per_unit_calculated=None
+        ))()
+
+        insights = await AnalyticsService().calculate_inventory_insights(None, [item], data_points)
+
+        assert insights[0]['daily_consumption_rate'] == 2.0
+        assert insights[0]['days_remaining'] == 4.0
+
+    def test_sql_bucket_rows_match_series_aggregates(self, data_points):
+        """GROUPING SETS rows (day=1, hour=2, item=3) give the same results as the rows themselves"""
+        monday, tuesday = data_points[0].timestamp.date(), data_points[-1].timestamp.date()
+        rows = [
+            SimpleNamespace(
+                grouping_set=1, day=monday, hour=None, inventory_item_id=None, changes=3, diaper_changes=3, quantity=3,
+                dry=1, wet_only=1, soiled_only=0, wet_and_soiled=1, interval_count=2, interval_total=240,
+                interval_total_squares=45000, first_logged_at=data_points[0].timestamp,
+                first_day=monday, last_day=monday
+            ),
+            SimpleNamespace(
+                grouping_set=1, day=tuesday, hour=None, inventory_item_id=None, changes=1, diaper_changes=1, quantity=2,
+                dry=0, wet_only=0, soiled_only=1, wet_and_soiled=0, interval_count=0, interval_total=None,
+                interval_total_squares=None, first_logged_at=data_points[3].timestamp,
+                first_day=tuesday, last_day=tuesday
+            ),
+            SimpleNamespace(
+                grouping_set=2, day=None, hour=11, inventory_item_id=None, changes=1, quantity=1,
+                first_logged_at=data_points[2].timestamp
+            ),
+            SimpleNamespace(
+                grouping_set=2, day=None, hour=7, inventory_item_id=None, changes=3, quantity=4,
+                first_logged_at=data_points[0].timestamp
+            ),
+            SimpleNamespace(
+                grouping_set=3, day=None, hour=None, inventory_item_id=None, changes=4, quantity=5,
+                first_logged_at=data_points[0].timestamp, first_day=monday, last_day=tuesday
+            ),
+        ]
+        service = AnalyticsService()
+
+        aggregates = service._build_usage_aggregates(rows)
+        series = UsageSeries.from_data_points(data_points)
+
+        assert isinstance(aggregates, UsageAggregates)
+        assert len(aggregates) == 4
+        assert service.calculate_basic_stats(aggregates) == service.calculate_basic_stats(series)
+        assert service.calculate_hourly_distribution(aggregates) == service.calculate_hourly_distribution(series)
+        assert vars(service.analyze_usage_patterns(aggregates)) == vars(service.analyze_usage_patterns(series))
+        assert aggregates.ranked_weekdays() == [(0, 3), (1, 1)]
+        assert aggregates.changes_on(tuesday) == 1
+        assert aggregates.changes_between(monday, tuesday, diaper_changes_only=True) == 4
@@ -0,0 +1,220 @@
+"""
+Unit Tests for Authentication Caches
+Tests the verified token LRU and the authenticated user cache
+"""
+
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import jwt
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.auth import token_cache
+from app.auth.token_cache import VerifiedTokenCache, decode_verified_token
+from app.auth.user_cache import AuthenticatedUserCache
+from app.services.analytics_cache_backends import InMemoryCacheBackend
+from app.config.settings import settings
+from app.models import User
+
+
+def make_token(sub: str = "user-1", expires_in: int = 3600) -> str:
+    return jwt.encode(
+        {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + expires_in},
+        settings.supabase_jwt_secret,
+        algorithm="HS256"
+    )
+
+
+def make_user(**values) -> User:
+    user = User()
+    for attr in inspect(User).column_attrs:
+        setattr(user, attr.key, values.get(attr.key))
+    user.id = values.get("id", uuid.uuid4())
+    user.supabase_user_id = values.get("supabase_user_id", uuid.uuid4())
+    return user
+
+
+@pytest.mark.unit
+class TestVerifiedTokenCache:
+    """Test suite for the process-wide verified token LRU"""
+
+    @pytest.fixture(autouse=True)
+    def cache(self, monkeypatch):
+        cache = VerifiedTokenCache(max_entries=2)
+        monkeypatch.setattr(token_cache, "verified_tokens", cache)
+        return cache
+
+    def test_repeat_tokens_skip_verification(self, monkeypatch):
+        calls = []
+        decode = jwt.decode
+        monkeypatch.setattr(token_cache.jwt, "decode", lambda *a, **k: calls.append(1) or decode(*a, **k))
+        token = make_token()
+
+        first = decode_verified_token(token)
+        second = decode_verified_token(token)
+
+        assert first["user_id"] == second["user_id"] == "user-1"
+        assert len(calls) == 1
+
+    def test_invalid_and_expired_tokens_are_rejected(self, cache):
+        with pytest.raises(jwt.InvalidTokenError):
+            decode_verified_token("forged")
+        with pytest.raises(jwt.ExpiredSignatureError):
+            decode_verified_token(make_token(expires_in=-10))
+
+        assert not cache.entries
+
+    def test_entries_end_at_exp_and_are_bounded(self, cache):
+        token = make_token()
+        claims = decode_verified_token(token)
+        cache.put(token, {**claims, "exp": time.time() - 1})
+
+        assert cache.get(token) is None
+
+        tokens = [make_token(sub=f"user-{index}") for index in range(3)]
+        for token in tokens:
+            decode_verified_token(token)
+
+        assert len(cache.entries) == 2
+        assert cache.get(tokens[0]) is None
+
+
+@pytest.mark.unit
+class TestAuthenticatedUserCache:
+    """Test suite for the short-TTL user cache and its ORM invalidation"""
+
+    def test_hits_are_fresh_detached_copies(self):
+        cache = AuthenticatedUserCache(ttl_seconds=30)
+        user = make_user(email="parent@example.ca", status="active")
+        cache.put(user, cache.generation)
+
+        first = cache.get(str(user.supabase_user_id))
+        second = cache.get(str(user.supabase_user_id))
+
+        assert first is not second
+        assert first.id == user.id and first.email == "parent@example.ca"
+        assert inspect(first).detached
+        assert cache.get(str(uuid.uuid4())) is None
+
+    def test_ttl_and_generation(self):
+        disabled = AuthenticatedUserCache(ttl_seconds=0)
+        disabled.put(make_user(), disabled.generation)
+        assert not disabled.entries
+
+        cache = AuthenticatedUserCache(ttl_seconds=30)
+        user = make_user()
+        generation = cache.generation
+        cache.invalidate(str(uuid.uuid4()))  # a commit landed while this user was loading
+        cache.put(user, generation)
+        assert not cache.entries
+
+        cache.put(user, cache.generation)
+        key = str(user.supabase_user_id)
+        cache.entries[key] = (time.monotonic() - 1, cache.entries[key][1])
+        assert cache.get(key) is None
+
+    def test_committed_user_changes_invalidate(self, monkeypatch):
+        from app.auth import user_cache
+
+        cache = AuthenticatedUserCache(ttl_seconds=30)
+        monkeypatch.setattr(user_cache, "authenticated_users", cache)
+        user = make_user(status="active")
+        cache.put(user, cache.generation)
+        key = str(user.supabase_user_id)
+
+        session = Session()
+        make_transient_to_detached(user)
+        session.add(user)
+        user.status = "suspended"
+
+        session.dispatch.after_flush(session, None)
+        session.dispatch.after_rollback(session)
+        assert cache.get(key) is not None
+
+        session.dispatch.after_flush(session, None)
+        session.dispatch.after_commit(session)
+        assert cache.get(key) is None
+
+    async def test_invalidations_reach_other_processes(self):
+        """A commit in one replica drops the user from every replica's cache"""
+        redis = InMemoryCacheBackend()
+        here = AuthenticatedUserCache(ttl_seconds=30, backend=redis)
+        there = AuthenticatedUserCache(ttl_seconds=30, backend=redis)
+        user = make_user()
+        there.put(user, there.generation)
+        listener = there.start_invalidation_listener()
+        await asyncio.sleep(0)
+
+        here.invalidate_everywhere([str(user.supabase_user_id)])
+        await asyncio.sleep(0.01)
+
+        assert there.get(str(user.supabase_user_id)) is None
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+
+    def test_local_only_without_a_backend(self):
+        cache = AuthenticatedUserCache(ttl_seconds=30)
+        user = make_user()
+        cache.put(user, cache.generation)
+
+        cache.invalidate_everywhere(["*"])
+
+        assert not cache.entries and cache.start_invalidation_listener() is None
+
+
+@pytest.mark.unit
+class TestContextUserCache:
+    """Test suite for the user cache in NestSyncGraphQLContext.get_user"""
+
+    @pytest.fixture
+    def auth(self, monkeypatch):
+        from app.graphql import context as context_module
+
+        cache = AuthenticatedUserCache(ttl_seconds=30)
+        session = MagicMock()
+        session.execute = AsyncMock()
+        opened = []
+
+        async def get_session():
+            opened.append(session)
+            yield session
+
+        monkeypatch.setattr(context_module, "authenticated_users", cache)
+        monkeypatch.setattr(context_module, "get_async_session", get_session)
+        request = MagicMock()
+        request.headers = {"Authorization": "Bearer token"}
+
+        def login_as(user):
+            monkeypatch.setattr(
+                context_module.supabase_auth, "verify_jwt_token",
+                lambda token: {"user_id": str(user.supabase_user_id)}
+            )
+            return context_module.NestSyncGraphQLContext(request)
+
+        return SimpleNamespace(cache=cache, session=session, opened=opened, login_as=login_as)
+
+    async def test_cached_user_skips_the_session(self, auth):
+        """A hit returns the detached copy without checking out a connection"""
+        user = make_user(status="active", is_deleted=False)
+        auth.cache.put(user, auth.cache.generation)
+
+        cached = await auth.login_as(user).get_user()
+
+        assert cached.id == user.id and inspect(cached).detached
+        assert auth.opened == []
+        auth.session.execute.assert_not_awaited()
+
+    async def test_cached_user_that_cannot_login_is_rechecked(self, auth):
+        """A cached row that fails can_login is dropped and the database decides"""
+        user = make_user(status="suspended", is_deleted=False)
+        auth.cache.put(user, auth.cache.generation)
+        auth.session.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+
+        assert await auth.login_as(user).get_user() is None
+        auth.session.execute.assert_awaited_once()
+        assert not auth.cache.entries
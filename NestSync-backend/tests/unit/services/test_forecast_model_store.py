@@ -0,0 +1,82 @@
+"""
+Unit Tests for Forecast Model Store
+Tests cache hits, warm-started refits and result ordering
+"""
+
+import pytest
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.forecast_model_store import ForecastModelRecord, ForecastModelStore, history_digest
+from app.services.forecasting_engine import HOLT_WINTERS_MODEL_VERSION, build_forecast_request
+
+
+def _request(child_id: str, days: int = 21):
+    start = date(2025, 1, 1)
+    history = [
+        {"date": start + timedelta(days=offset), "daily_usage": 6 + offset % 3}
+        for offset in range(days)
+    ]
+    return build_forecast_request(child_id, history, date(2024, 6, 1))
+
+
+def _record(request, parameters=None):
+    return ForecastModelRecord(
+        child_id=request["child_id"],
+        model_version=HOLT_WINTERS_MODEL_VERSION,
+        last_usage_date=date.fromisoformat(request["dates"][-1]),
+        history_digest=history_digest(request),
+        parameters=parameters,
+        result={"child_id": request["child_id"], "predicted_consumption": 180, "error": None}
+    )
+
+
+def _engine():
+    engine = MagicMock()
+    engine.model_version = HOLT_WINTERS_MODEL_VERSION
+    engine.forecast_many = AsyncMock(side_effect=lambda requests: [
+        {"child_id": request["child_id"], "model_version": HOLT_WINTERS_MODEL_VERSION,
+         "last_usage_date": request["dates"][-1], "predicted_consumption": 200, "error": None}
+        for request in requests
+    ])
+    return engine
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestForecastModelStore:
+    """Test suite for ForecastModelStore"""
+
+    async def test_unchanged_history_skips_the_fit(self):
+        """A child with no new usage is served from its stored result"""
+        request = _request("a")
+        store = ForecastModelStore(MagicMock())
+        engine = _engine()
+
+        with patch.object(store, "get_many", AsyncMock(return_value={"a": _record(request)})), \
+             patch.object(store, "save_many", AsyncMock()) as save_many:
+            results = await store.forecast_many(engine, [request])
+
+        assert results[0]["predicted_consumption"] == 180
+        engine.forecast_many.assert_not_awaited()
+        save_many.assert_not_awaited()
+
+    async def test_new_usage_refits_with_warm_start(self):
+        """New usage refits from the stored parameters and keeps request order"""
+        stale = _record(_request("a", days=20), parameters={"alpha": 0.3, "gamma": 0.2})
+        fresh = _record(_request("b"))
+        store = ForecastModelStore(MagicMock())
+        engine = _engine()
+
+        with patch.object(store, "get_many", AsyncMock(return_value={"a": stale, "b": fresh})), \
+             patch.object(store, "save_many", AsyncMock()) as save_many:
+            results = await store.forecast_many(engine, [_request("a"), _request("b"), _request("c")])
+
+        assert [result["child_id"] for result in results] == ["a", "b", "c"]
+        assert [result["predicted_consumption"] for result in results] == [200, 180, 200]
+
+        fitted = engine.forecast_many.await_args.args[0]
+        assert [request["child_id"] for request in fitted] == ["a", "c"]
+        assert fitted[0]["warm_start"] == {"alpha": 0.3, "gamma": 0.2}
+        assert "warm_start" not in fitted[1]
+        save_many.assert_awaited_once()
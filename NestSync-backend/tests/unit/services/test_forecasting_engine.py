@@ -0,0 +1,122 @@
+"""
+Unit Tests for Forecasting Engine
+Tests request building, batching, per-child failure isolation and warm starts
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services import forecasting_engine
+from app.services.forecasting_engine import (
+    ForecastingEngine, build_forecast_request, run_forecast_batch
+)
+
+
+def _request(child_id: str, days: int = 21):
+    start = date(2025, 1, 1)
+    history = [
+        {"date": start + timedelta(days=offset), "daily_usage": 6 + offset % 3}
+        for offset in range(days)
+    ]
+    return build_forecast_request(child_id, history, date(2024, 6, 1))
+
+
+class FakeProphet:
+    """Stands in for Prophet: 3 changepoints, 2 features, optionally failing warm fits"""
+    models = []
+
+    def __init__(self, fail_warm=False):
+        self.fail_warm = fail_warm
+        self.init = None
+        FakeProphet.models.append(self)
+
+    def preprocess(self, frame):
+        return SimpleNamespace(S=3, K=2)
+
+    def fit(self, frame, init=None):
+        if init is not None and self.fail_warm:
+            raise RuntimeError("bad init")
+        self.init = init
+
+
+WARM_START = {"k": 0.1, "m": 0.5, "sigma_obs": 0.05, "delta": [0.0, 0.1, 0.0], "beta": [0.2, 0.3]}
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestForecastingEngine:
+    """Test suite for ForecastingEngine"""
+
+    def test_request_is_plain_data(self):
+        """Requests carry only JSON-compatible values for cheap pickling"""
+        request = _request("child-1")
+
+        assert request["dates"][0] == "2025-01-01"
+        assert request["counts"][:3] == [6.0, 7.0, 8.0]
+        assert request["date_of_birth"] == "2024-06-01"
+        assert request["horizon_days"] == 30
+
+    def test_batch_isolates_failing_children(self):
+        """One child's fit error does not fail the rest of its batch"""
+        def fit(request):
+            if request["child_id"] == "bad":
+                raise ValueError("singular matrix")
+            return {"child_id": request["child_id"], "error": None}
+
+        with patch.object(forecasting_engine, "fit_prophet_forecast", side_effect=fit):
+            results = run_forecast_batch([_request("a"), _request("bad"), _request("b")])
+
+        assert [result["child_id"] for result in results] == ["a", "bad", "b"]
+        assert results[1]["error"] == "ValueError: singular matrix"
+        assert results[0]["error"] is None
+
+    async def test_forecast_many_batches_and_preserves_order(self):
+        """Children are split into batch_size chunks and results keep request order"""
+        batches = []
+
+        def fake_batch(requests, model):
+            batches.append([request["child_id"] for request in requests])
+            return [{"child_id": request["child_id"], "error": None} for request in requests]
+
+        engine = ForecastingEngine(max_workers=2, batch_size=3, model="prophet")
+        engine._executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            with patch.object(forecasting_engine, "run_forecast_batch", fake_batch):
+                results = await engine.forecast_many([_request(str(index)) for index in range(7)])
+        finally:
+            engine.shutdown()
+
+        assert [result["child_id"] for result in results] == [str(index) for index in range(7)]
+        assert sorted(len(batch) for batch in batches) == [1, 3, 3]
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestProphetWarmStart:
+    """Test suite for warm-started Prophet fits"""
+
+    def fit(self, warm_start, fail_warm=False):
+        FakeProphet.models = []
+        with patch.object(forecasting_engine, "_new_prophet", lambda full_seasonality: FakeProphet(fail_warm)):
+            return forecasting_engine._fit_prophet(None, warm_start, "child-1")
+
+    def test_matching_parameters_warm_start(self):
+        model = self.fit(WARM_START)
+
+        assert list(model.init["delta"]) == [0.0, 0.1, 0.0]
+        assert model.init["k"] == 0.1
+
+    def test_changed_shapes_fit_cold(self):
+        """A different changepoint count from a new history window is not reused"""
+        model = self.fit({**WARM_START, "delta": [0.0] * 25})
+
+        assert model.init is None
+
+    def test_failed_warm_fit_falls_back_to_a_new_cold_model(self):
+        model = self.fit(WARM_START, fail_warm=True)
+
+        assert model.init is None
+        assert model is FakeProphet.models[-1] and len(FakeProphet.models) == 3
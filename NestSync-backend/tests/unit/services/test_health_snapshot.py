@@ -0,0 +1,128 @@
+"""
+Unit Tests for the Health Snapshot Service
+Tests cached results, coalesced refreshes, timeouts and staleness
+"""
+
+import asyncio
+import pytest
+
+from app.health import snapshot as snapshot_module
+from app.health.snapshot import HealthSnapshotService
+
+
+@pytest.mark.unit
+class TestHealthSnapshotService:
+    """Test suite for background-refreshed health checks"""
+
+    @pytest.fixture
+    def counted_check(self):
+        calls = []
+
+        async def check():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"status": "healthy", "response_time_ms": 1.0}
+
+        return check, calls
+
+    async def test_endpoints_read_the_cached_result(self, counted_check):
+        """Reading a result never runs the check"""
+        check, calls = counted_check
+        service = HealthSnapshotService()
+        service.register("database", check, interval_seconds=10)
+        await service.refresh("database")
+
+        for _ in range(5):
+            result = service.result("database")
+
+        assert len(calls) == 1
+        assert result["status"] == "healthy"
+        assert result["snapshot"]["stale"] is False
+        assert result["snapshot"]["age_seconds"] < 1
+        assert service.age_seconds(["database"]) is not None
+
+    async def test_concurrent_refreshes_share_one_run(self, counted_check):
+        """Callers waiting on a running refresh reuse its result"""
+        check, calls = counted_check
+        service = HealthSnapshotService()
+        service.register("database", check, interval_seconds=10)
+
+        await asyncio.gather(*(service.refresh("database") for _ in range(5)))
+
+        assert len(calls) == 1
+
+    async def test_hung_check_times_out(self):
+        """A check that does not answer is recorded as an error"""
+        async def hung():
+            await asyncio.sleep(10)
+
+        service = HealthSnapshotService()
+        service.register("redis", hung, interval_seconds=10, timeout_seconds=0.01)
+        await service.refresh("redis")
+
+        result = service.result("redis")
+        assert result["status"] == "error"
+        assert "timed out" in result["error"]
+
+    async def test_old_and_missing_results_are_not_healthy(self, counted_check):
+        """Readiness fails when a result is outdated or was never produced"""
+        check, _ = counted_check
+        service = HealthSnapshotService()
+        service.register("database", check, interval_seconds=10, timeout_seconds=5.0)
+        service.register("auth", check, interval_seconds=10)
+        entry = await service.refresh("database")
+        entry.refreshed_monotonic -= 10 * snapshot_module.STALE_AFTER_INTERVALS + 6
+
+        stale = service.result("database")
+        assert stale["status"] == "stale"
+        assert stale["last_status"] == "healthy"
+        assert service.result("auth")["status"] == "unknown"
+        assert service.age_seconds(["database", "auth"]) is None
+
+    async def test_background_tasks_refresh_and_stop(self, counted_check):
+        """Each check runs on its own cadence until stopped"""
+        check, calls = counted_check
+        service = HealthSnapshotService()
+        service.register("system", check, interval_seconds=0.01)
+
+        service.start()
+        await asyncio.sleep(0.1)
+        await service.stop()
+        refreshes = len(calls)
+        await asyncio.sleep(0.05)
+
+        assert refreshes >= 2
+        assert len(calls) == refreshes
+
+    async def test_warm_up_fills_the_snapshot_before_traffic(self, counted_check):
+        """Startup waits for first results, so /health is not 503 on an empty snapshot"""
+        check, calls = counted_check
+        service = HealthSnapshotService()
+        service.register("database", check, interval_seconds=10)
+        service.register("system", check, interval_seconds=10)
+
+        await service.warm_up(timeout_seconds=1.0)
+
+        assert len(calls) == 2
+        assert service.result("database")["status"] == "healthy"
+        assert service.age_seconds(["database", "system"]) is not None
+
+    async def test_slow_first_check_reports_starting(self):
+        """A check still running at the warm-up timeout is starting, then reports normally"""
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return {"status": "healthy"}
+
+        service = HealthSnapshotService()
+        service.register("auth", slow, interval_seconds=10)
+        await service.warm_up(timeout_seconds=0.01)
+
+        assert service.result("auth")["status"] == "starting"
+
+        service.start()
+        release.set()
+        await asyncio.sleep(0.01)
+        assert service.result("auth")["status"] == "healthy"
+        await service.stop()
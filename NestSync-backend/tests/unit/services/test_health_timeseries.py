@@ -0,0 +1,111 @@
+"""
+Unit Tests for the Health Metric Time Series Store
+Tests bounded ring buffers, rollups, range queries and trend detection
+"""
+
+import sys
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.services import health_timeseries as timeseries_module
+from app.services.health_timeseries import HOUR, MINUTE, HealthTimeSeriesStore
+from app.services.observability_service import HealthCheck, HealthMetric, ObservabilityService
+
+START = 1_700_000_000.0 - 1_700_000_000.0 % HOUR  # an hour boundary
+
+
+@pytest.mark.unit
+class TestHealthTimeSeriesStore:
+    """Test suite for the ring-buffer time series store"""
+
+    def test_raw_points_are_bounded(self, monkeypatch):
+        """The raw buffer keeps the newest points; rollups keep the rest"""
+        monkeypatch.setattr(timeseries_module, "RAW_CAPACITY", 10)
+        store = HealthTimeSeriesStore()
+        for second in range(0, 600, 20):
+            store.record("db.connection_time_ms", second, "ms", START + second)
+
+        series = store.get("db.connection_time_ms")
+        assert len(series.points) == 10
+        assert series.points[0].value == 400
+        assert [bucket.count for bucket in series.rollups[MINUTE].buckets] == [3] * 10
+        assert series.rollups[HOUR].buckets[0].count == 30
+
+    def test_rollups_aggregate_per_bucket(self):
+        """Minute buckets hold count, mean, min and max of their points"""
+        store = HealthTimeSeriesStore()
+        for offset, value in ((0, 10), (30, 30), (59, 20), (60, 100)):
+            store.record("auth.response_time_ms", value, "ms", START + offset)
+
+        first, second = store.query("auth.response_time_ms", START, START + 120, resolution=MINUTE)
+
+        assert (first.count, first.mean, first.minimum, first.maximum) == (3, 20, 10, 30)
+        assert (second.start, second.count) == (START + 60, 1)
+
+    def test_query_picks_finest_covering_resolution(self, monkeypatch):
+        """Raw points while they reach back far enough, then rollups"""
+        monkeypatch.setattr(timeseries_module, "RAW_CAPACITY", 5)
+        store = HealthTimeSeriesStore()
+        for minute in range(10):
+            store.record("cpu", minute, "ratio", START + minute * MINUTE)
+        series = store.get("cpu")
+
+        assert store.resolution_for(series, START + 6 * MINUTE) == 0
+        assert store.resolution_for(series, START) == MINUTE
+        assert [point.value for point in store.query("cpu", START + 7 * MINUTE, START + 8 * MINUTE)] == [7, 8]
+        assert store.stats("cpu", START, START + 9 * MINUTE).count == 10
+
+    def test_only_numeric_values_are_stored(self):
+        """Strings are skipped, booleans become 0/1, and the series count is capped"""
+        store = HealthTimeSeriesStore(max_series=2)
+
+        assert not store.record("checks.most_failing_category", "Compliance", "category")
+        assert store.record("db.status", True, "boolean", START)
+        assert store.record("auth.status", False, "boolean", START)
+        assert not store.record("third", 1, "count", START)
+        assert store.query("auth.status", START, START, resolution=0)[0].value == 0.0
+
+
+@pytest.mark.unit
+class TestPerformanceTrends:
+    """Test suite for trend detection on the time series"""
+
+    @pytest.fixture(autouse=True)
+    def idle_machine(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "psutil", SimpleNamespace(
+            virtual_memory=lambda: SimpleNamespace(percent=40.0),
+            cpu_percent=lambda interval=None: 10.0
+        ))
+
+    def _service_with(self, baseline_ms, recent_ms):
+        service = ObservabilityService()
+        now = datetime.utcnow()
+        for minutes_ago in range(70, 0, -5):
+            value = recent_ms if minutes_ago <= 10 else baseline_ms
+            measured_at = now - timedelta(minutes=minutes_ago)
+            service.record_metrics([HealthCheck(
+                check_id="database_health",
+                check_name="Database Health",
+                category="Infrastructure",
+                status=True,
+                metrics=[HealthMetric(
+                    name="connection_time_ms", value=value, unit="ms", healthy=True, measured_at=measured_at
+                )],
+                checked_at=measured_at
+            )])
+        return service
+
+    async def test_degradation_against_baseline_fails(self):
+        """Recent mean more than 20% above the previous hour flags the metric"""
+        check = await self._service_with(baseline_ms=100, recent_ms=180)._check_performance_trends()
+
+        assert check.status is False
+        assert "database_health.connection_time_ms 180ms vs 100ms" in check.error_message
+
+    async def test_stable_metrics_pass(self):
+        """Small fluctuations stay healthy"""
+        check = await self._service_with(baseline_ms=100, recent_ms=110)._check_performance_trends()
+
+        assert check.status is True
+        assert {metric.name for metric in check.metrics} >= {"performance_trend_stable", "average_response_time"}
@@ -0,0 +1,79 @@
+"""
+Unit Tests for Vectorized Holt-Winters Forecaster
+Tests batch fitting, weekly pattern recovery and holdout metrics
+"""
+
+import numpy as np
+import pytest
+from datetime import date, timedelta
+
+from app.services.holt_winters_forecaster import HOLT_WINTERS_MODEL_VERSION, fit_holt_winters_batch
+
+
+def _request(child_id: str, days: int, seed: int, skip_every: int = 0, weekend_boost: float = 2.0):
+    """Synthetic child: ~7 changes a day, more on weekends, light noise"""
+    rng = np.random.default_rng(seed)
+    start = date(2025, 3, 1)
+    dates, counts = [], []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if skip_every and offset % skip_every == 0 and offset:
+            continue  # a day nobody logged
+        base = 7 + (weekend_boost if day.weekday() >= 5 else 0)
+        dates.append(day.isoformat())
+        counts.append(float(max(0, round(base + rng.normal(0, 0.5)))))
+    return {
+        "child_id": child_id,
+        "dates": dates,
+        "counts": counts,
+        "date_of_birth": "2024-09-01",
+        "horizon_days": 28
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestHoltWintersForecaster:
+    """Test suite for fit_holt_winters_batch"""
+
+    def test_batch_matches_individual_fits(self):
+        """Children of different lengths give the same result alone or batched"""
+        requests = [_request("a", 90, 1), _request("b", 20, 2), _request("c", 45, 3, skip_every=6)]
+
+        batched = fit_holt_winters_batch(requests)
+        single = [fit_holt_winters_batch([request])[0] for request in requests]
+
+        for batch_result, single_result in zip(batched, single):
+            assert batch_result["predicted_consumption"] == single_result["predicted_consumption"]
+            assert batch_result["mae"] == pytest.approx(single_result["mae"])
+        assert [result["child_id"] for result in batched] == ["a", "b", "c"]
+
+    def test_forecast_tracks_weekly_volume(self):
+        """Four forecast weeks land near four weeks of the observed pattern"""
+        result = fit_holt_winters_batch([_request("a", 90, 4)])[0]
+
+        # 5 weekdays x 7 + 2 weekend days x 9 = 53 per week
+        assert result["model_version"] == HOLT_WINTERS_MODEL_VERSION
+        assert result["predicted_consumption"] == pytest.approx(4 * 53, rel=0.1)
+        assert result["mae"] < 1.0
+        assert result["r2"] > 0.3  # weekly swing explains most of the variance
+
+    def test_short_history_uses_conservative_metrics(self):
+        """Fewer than 21 observed days reports the same 0.5 / 0.5 as Prophet"""
+        result = fit_holt_winters_batch([_request("a", 15, 5)])[0]
+
+        assert result["mae"] == 0.5
+        assert result["r2"] == 0.5
+        assert result["training_data_points"] == 15
+        assert result["last_usage_date"] == "2025-03-15"
+
+    def test_warm_start_reuses_smoothing_parameters(self):
+        """Fixing the previously chosen parameters reproduces the grid-searched fit"""
+        request = _request("a", 60, 6)
+        searched = fit_holt_winters_batch([request])[0]
+
+        warm = fit_holt_winters_batch([{**request, "warm_start": searched["parameters"]}, _request("b", 60, 7)])
+
+        assert warm[0]["predicted_consumption"] == searched["predicted_consumption"]
+        assert warm[0]["parameters"] == searched["parameters"]
+        assert warm[1]["child_id"] == "b"
@@ -0,0 +1,120 @@
+"""
+Unit Tests for Metrics
+Tests bucket quantiles, label limits, merging across worker processes and /metrics access
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+from fastapi import HTTPException
+from prometheus_client import CollectorRegistry, Histogram
+
+from app.api.metrics import get_metrics
+from app.config.settings import settings
+from app.services.metrics import (
+    OVERFLOW_LABEL, LabelValueLimit, bucket_quantile, collect_families, histogram_stats, render_latest,
+    sample_values
+)
+
+WORKER = """
+from prometheus_client import Counter, Histogram
+Counter("events_total", "Events", ["kind"]).labels(kind="a").inc(5)
+Histogram("latency_seconds", "Latency", buckets=(0.1, 0.5, 1.0)).observe(0.4)
+"""
+
+
+@pytest.mark.unit
+class TestHistogramStats:
+    """Test suite for summaries computed from histogram buckets"""
+
+    def test_quantiles_interpolate_within_buckets(self):
+        """Same estimate as Prometheus' histogram_quantile()"""
+        buckets = [(0.1, 50), (0.5, 90), (1.0, 100), (float("inf"), 100)]
+
+        assert bucket_quantile(0.5, buckets) == pytest.approx(0.1)
+        assert bucket_quantile(0.7, buckets) == pytest.approx(0.3)
+        assert bucket_quantile(0.95, buckets) == pytest.approx(0.75)
+        assert bucket_quantile(0.5, [(0.1, 0), (float("inf"), 0)]) is None
+
+    def test_overflow_bucket_reports_highest_bound(self):
+        assert bucket_quantile(0.99, [(0.1, 1), (1.0, 2), (float("inf"), 10)]) == 1.0
+
+    def test_stats_per_label_set(self):
+        registry = CollectorRegistry()
+        latency = Histogram(
+            "query_seconds", "Latency", labelnames=("query_type",), buckets=(0.1, 1.0), registry=registry
+        )
+        for value in (0.05, 0.05, 0.5, 5.0):
+            latency.labels(query_type="usage").observe(value)
+
+        stats = histogram_stats(next(iter(registry.collect())), ("query_type",))[("usage",)]
+
+        assert stats["count"] == 4
+        assert stats["mean"] == pytest.approx(5.6 / 4)
+        assert stats["p50"] == pytest.approx(0.1)
+        assert stats["p99"] == 1.0
+
+
+@pytest.mark.unit
+class TestLabelValueLimit:
+    """Test suite for capping client-controlled label values"""
+
+    def test_values_past_the_cap_share_one_series(self):
+        limit = LabelValueLimit(max_values=2)
+
+        labels = [limit(operation) for operation in ("a", "b", "c", "a", "d")]
+
+        assert labels == ["a", "b", OVERFLOW_LABEL, "a", OVERFLOW_LABEL]
+
+
+@pytest.mark.unit
+class TestMultiprocessMetrics:
+    """Test suite for merging worker processes through PROMETHEUS_MULTIPROC_DIR"""
+
+    def test_counters_and_histograms_add_up_across_workers(self, tmp_path, monkeypatch):
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", WORKER], env=env, check=True)
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        families = collect_families(["events", "latency_seconds"])
+
+        assert sample_values(families["events"], ("kind",), suffix="_total") == {("a",): 10}
+        assert histogram_stats(families["latency_seconds"], ())[()]["count"] == 2
+        assert b'events_total{kind="a"} 10.0' in render_latest()
+
+
+@pytest.mark.unit
+class TestMetricsEndpoint:
+    """Test suite for /metrics access control"""
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "metrics_enabled", True)
+
+    async def test_requires_token_outside_development(self, monkeypatch):
+        monkeypatch.setattr(settings, "environment", "production")
+        monkeypatch.setattr(settings, "metrics_bearer_token", None)
+
+        with pytest.raises(HTTPException) as error:
+            await get_metrics(authorization=None)
+
+        assert error.value.status_code == 401
+
+    async def test_checks_configured_token(self, monkeypatch):
+        monkeypatch.setattr(settings, "environment", "production")
+        monkeypatch.setattr(settings, "metrics_bearer_token", "scrape-secret")
+
+        with pytest.raises(HTTPException):
+            await get_metrics(authorization="Bearer wrong")
+        response = await get_metrics(authorization="Bearer scrape-secret")
+
+        assert response.status_code == 200
+        assert b"db_pool_connections_in_use" in response.body
+
+    async def test_open_in_development_without_token(self, monkeypatch):
+        monkeypatch.setattr(settings, "environment", "development")
+        monkeypatch.setattr(settings, "metrics_bearer_token", None)
+
+        assert (await get_metrics(authorization=None)).status_code == 200
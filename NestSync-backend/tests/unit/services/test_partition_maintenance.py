@@ -0,0 +1,107 @@
+"""
+Unit Tests for Partition Maintenance
+Tests partition naming, creation ahead of time and retention by dropping months
+"""
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.services import partition_maintenance as maintenance_module
+from app.services.partition_maintenance import (
+    ANALYTICS_DAILY_SUMMARIES, LIST_PARTITIONS, USAGE_LOGS, PartitionMaintenance, add_months
+)
+
+
+class FakeSession:
+    """Lists the given partitions and records DDL; stranded months have rows in the default partition"""
+
+    def __init__(self, partitions, stranded=()):
+        self.partitions = partitions
+        self.stranded = stranded
+        self.ddl = []
+
+    async def execute(self, statement, params=None):
+        if statement is LIST_PARTITIONS:
+            return [(name,) for name in self.partitions.get(params["table"], [])]
+        if statement.text.startswith("SELECT EXISTS"):
+            return MagicMock(scalar=MagicMock(return_value=any(bound in statement.text for bound in self.stranded)))
+        if not statement.text.startswith("SET LOCAL"):
+            self.ddl.append(statement.text)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = FakeSession({
+        "usage_logs": ["usage_logs_p2024_11", "usage_logs_p2024_12", "usage_logs_p2025_01", "usage_logs_default"],
+        "analytics_daily_summaries": ["analytics_daily_summaries_p2024_12"],
+    })
+
+    @asynccontextmanager
+    async def isolated_session():
+        yield session
+
+    monkeypatch.setattr(maintenance_module, "get_isolated_session", isolated_session)
+    return session
+
+
+@pytest.mark.unit
+class TestPartitionMaintenance:
+    """Test suite for monthly partition maintenance"""
+
+    def test_partition_names_and_bounds(self):
+        """Timestamp partitions use UTC month bounds; months roll over the year"""
+        december = date(2024, 12, 1)
+
+        assert add_months(december, 1) == date(2025, 1, 1)
+        assert USAGE_LOGS.partition_name(december) == "usage_logs_p2024_12"
+        assert USAGE_LOGS.bounds(december) == ("2024-12-01 00:00:00+00", "2025-01-01 00:00:00+00")
+        assert ANALYTICS_DAILY_SUMMARIES.bounds(december) == ("2024-12-01", "2025-01-01")
+        assert USAGE_LOGS.partition_month("usage_logs_default") is None
+
+    async def test_creates_only_missing_months_ahead(self, fake_session):
+        """This month plus months_ahead exist afterwards; existing ones are left alone"""
+        created = await PartitionMaintenance(months_ahead=2).ensure_future_partitions(date(2024, 12, 15))
+
+        assert created == 3
+        assert [statement.split()[5] for statement in fake_session.ddl] == [
+            "usage_logs_p2025_02",
+            "analytics_daily_summaries_p2025_01",
+            "analytics_daily_summaries_p2025_02",
+        ]
+        assert fake_session.ddl[0].endswith(
+            "PARTITION OF usage_logs FOR VALUES FROM ('2025-02-01 00:00:00+00') TO ('2025-03-01 00:00:00+00')"
+        )
+
+    async def test_retention_drops_only_fully_expired_months(self, fake_session):
+        """The month containing the cutoff and the default partition stay"""
+        dropped = await PartitionMaintenance().drop_partitions_before(USAGE_LOGS, date(2025, 1, 10))
+
+        assert dropped == ["usage_logs_p2024_11", "usage_logs_p2024_12"]
+        assert fake_session.ddl == [
+            "ALTER TABLE usage_logs DETACH PARTITION usage_logs_p2024_11",
+            "DROP TABLE usage_logs_p2024_11",
+            "ALTER TABLE usage_logs DETACH PARTITION usage_logs_p2024_12",
+            "DROP TABLE usage_logs_p2024_12",
+        ]
+
+    async def test_rows_in_the_default_partition_are_moved_before_creating(self, fake_session):
+        """A month with rows in the default partition is built standalone and attached"""
+        fake_session.stranded = ["'2025-02-01 00:00:00+00'"]
+
+        created = await PartitionMaintenance(months_ahead=2).ensure_future_partitions(date(2024, 12, 15))
+
+        assert created == 3
+        assert fake_session.ddl[:4] == [
+            "LOCK TABLE usage_logs_default IN ACCESS EXCLUSIVE MODE",
+            "CREATE TABLE usage_logs_p2025_02 (LIKE usage_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+            "WITH moved AS (DELETE FROM usage_logs_default WHERE logged_at >= '2025-02-01 00:00:00+00' "
+            "AND logged_at < '2025-03-01 00:00:00+00' RETURNING *) INSERT INTO usage_logs_p2025_02 SELECT * FROM moved",
+            "ALTER TABLE usage_logs ATTACH PARTITION usage_logs_p2025_02 "
+            "FOR VALUES FROM ('2025-02-01 00:00:00+00') TO ('2025-03-01 00:00:00+00')",
+        ]
+        assert fake_session.ddl[4].startswith("CREATE TABLE IF NOT EXISTS analytics_daily_summaries_p2025_01")
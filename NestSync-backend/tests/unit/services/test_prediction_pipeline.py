@@ -0,0 +1,134 @@
+"""
+Unit Tests for Nightly Prediction Pipeline
+Tests streamed chunking, bulk writes and run checkpoints
+"""
+
+import pytest
+import uuid
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.dialects import postgresql
+
+from app.config.settings import settings
+from app.services.forecast_model_store import ForecastModelStore
+from app.services.prediction_pipeline import HISTORY_DAYS, PredictionPipeline, PredictionRun
+from app.services.reorder_service import ReorderService
+
+
+def _usage_rows(child_ids, days):
+    """Rows as the grouped query returns them: ordered by child, then date"""
+    start = date(2025, 1, 1)
+    for child_id in child_ids:
+        for offset in range(days[child_id]):
+            yield SimpleNamespace(
+                child_id=child_id,
+                date_of_birth=date(2024, 6, 1),
+                current_diaper_size="Size 2",
+                date=start + timedelta(days=offset),
+                daily_usage=7
+            )
+
+
+class _Stream:
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield row
+
+
+def _forecast(request):
+    return {
+        "child_id": request["child_id"],
+        "model_version": "holt_winters_v1.0",
+        "horizon_days": 30,
+        "current_rate": 7.0,
+        "predicted_consumption": 210,
+        "mae": 0.8,
+        "r2": 0.7,
+        "training_data_points": len(request["counts"]),
+        "training_period_days": len(request["counts"]) - 1,
+        "last_usage_date": request["dates"][-1],
+        "error": None
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.ml
+class TestPredictionPipeline:
+    """Test suite for PredictionPipeline"""
+
+    async def test_stream_groups_rows_into_child_chunks(self):
+        """Consecutive rows per child become one history; chunks hold chunk_size children"""
+        child_ids = [uuid.UUID(int=index) for index in range(1, 6)]
+        session = MagicMock()
+        session.stream = AsyncMock(return_value=_Stream(_usage_rows(child_ids, {c: 3 for c in child_ids})))
+
+        pipeline = PredictionPipeline(forecasting_engine=MagicMock(), chunk_size=2)
+        chunks = [chunk async for chunk in pipeline._stream_children(session, date(2025, 3, 1), None)]
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [child["child_id"] for chunk in chunks for child in chunk] == child_ids
+        assert all(len(child["history"]) == 3 for chunk in chunks for child in chunk)
+        session.stream.assert_awaited_once()
+
+    async def test_history_queries_filter_a_logged_at_range(self):
+        """Both history queries compile against UsageLog: same local day, half-open logged_at window"""
+        session = MagicMock()
+        session.stream = AsyncMock(return_value=_Stream([]))
+        session.execute = AsyncMock(return_value=[])
+        run_date = datetime.now(ZoneInfo(settings.timezone)).date()
+
+        pipeline = PredictionPipeline(forecasting_engine=MagicMock())
+        assert [chunk async for chunk in pipeline._stream_children(session, run_date, None)] == []
+        await ReorderService(session, forecasting_engine=MagicMock())._get_usage_history(uuid.uuid4(), days=HISTORY_DAYS)
+
+        zone = ZoneInfo(settings.timezone)
+        window = [
+            datetime.combine(run_date - timedelta(days=HISTORY_DAYS), time.min, tzinfo=zone),
+            datetime.combine(run_date + timedelta(days=1), time.min, tzinfo=zone),
+        ]
+        for statement in (session.stream.await_args.args[0], session.execute.await_args.args[0]):
+            compiled = statement.compile(dialect=postgresql.dialect())
+            sql = " ".join(str(compiled).split())
+            assert "usage_logs.logged_at >= %(logged_at_1)s AND usage_logs.logged_at < %(logged_at_2)s" in sql
+            assert "GROUP BY" in sql and "CAST(timezone(%(timezone_1)s, usage_logs.logged_at) AS DATE)" in sql
+            assert [compiled.params["logged_at_1"], compiled.params["logged_at_2"]] == window
+            assert compiled.params["timezone_1"] == settings.timezone
+
+    async def test_chunk_is_bulk_inserted_with_checkpoint(self):
+        """One INSERT per chunk, and the checkpoint moves past skipped children too"""
+        eligible, short = uuid.UUID(int=1), uuid.UUID(int=2)
+        chunk = [
+            {"child_id": eligible, "date_of_birth": date(2024, 6, 1), "current_diaper_size": "Size 2",
+             "history": [{"date": date(2025, 1, 1) + timedelta(days=d), "daily_usage": 7} for d in range(20)]},
+            {"child_id": short, "date_of_birth": date(2024, 6, 1), "current_diaper_size": "Size 2",
+             "history": [{"date": date(2025, 1, 1), "daily_usage": 7}]}
+        ]
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        run = PredictionRun(
+            run_date=date(2025, 1, 21), children_processed=0, predictions_written=0,
+            children_skipped=0, children_failed=0
+        )
+
+        pipeline = PredictionPipeline(forecasting_engine=MagicMock(), chunk_size=10)
+        with patch.object(ForecastModelStore, "forecast_many", AsyncMock(
+                side_effect=lambda engine, requests: [_forecast(request) for request in requests])), \
+             patch.object(pipeline, "_current_stock", AsyncMock(return_value={eligible: 70})):
+            await pipeline._process_chunk(session, run, chunk)
+
+        rows = session.execute.await_args.args[1]
+        assert [row["child_id"] for row in rows] == [eligible]
+        assert rows[0]["predicted_consumption_30d"] == 210
+        assert run.last_child_id == short
+        assert (run.children_processed, run.predictions_written, run.children_skipped) == (2, 1, 1)
+        session.commit.assert_awaited_once()
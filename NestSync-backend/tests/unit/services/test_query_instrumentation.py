@@ -0,0 +1,109 @@
+"""
+Unit Tests for SQL Query Instrumentation
+Tests statement fingerprints, per-context counting and the query_budget fixture
+"""
+
+import asyncio
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.config.query_instrumentation import (
+    fingerprint_statement, instrument_engine, normalize_statement, track_queries
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # attaching twice must not double count
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+class TestStatementFingerprints:
+    """Test suite for statement normalization"""
+
+    def test_literals_and_parameters_are_removed(self):
+        """Only the shape of the statement is kept"""
+        statement = "SELECT * FROM children WHERE id = $1::UUID AND name = 'Emma' LIMIT 10 -- note"
+
+        assert normalize_statement(statement) == "SELECT * FROM children WHERE id = ? AND name = ? LIMIT ?"
+
+    def test_list_sizes_share_a_fingerprint(self):
+        """Batches of different sizes are one query shape; casts and identifiers survive"""
+        two = "SELECT id FROM usage_logs_p2025_01 WHERE child_id IN ($1::UUID, $2::UUID)"
+        three = "SELECT id FROM usage_logs_p2025_01 WHERE child_id IN ($1::UUID, $2::UUID, $3::UUID)"
+
+        assert fingerprint_statement(two) == fingerprint_statement(three)
+        assert normalize_statement(two) == "SELECT id FROM usage_logs_p2025_01 WHERE child_id IN (...)"
+        assert normalize_statement("SELECT now()::date") == "SELECT now()::date"
+        assert fingerprint_statement(two) != fingerprint_statement("SELECT id FROM children")
+
+
+@pytest.mark.unit
+class TestQueryTracking:
+    """Test suite for per-context query statistics"""
+
+    def test_counts_statements_by_fingerprint(self, engine):
+        """Every statement is counted once and grouped by shape"""
+        with track_queries() as stats, engine.connect() as connection:
+            for child in range(3):
+                connection.execute(text("SELECT :child"), {"child": child})
+            connection.execute(text("SELECT 1, 2"))
+
+        assert stats.count == 4
+        assert stats.repeated(max_repeats=2) == [("SELECT ?", 3)]
+        summary = stats.summary()
+        assert (summary["count"], summary["distinct"]) == (4, 2)
+        assert summary["fingerprints"][0]["count"] == 3
+
+    def test_savepoints_are_not_counted_as_queries(self, engine):
+        """Savepoints around writes are tallied apart and never trip the budget"""
+        with track_queries() as stats, engine.connect() as connection:
+            for child in range(3):
+                savepoint = connection.begin_nested()
+                connection.execute(text("SELECT :child"), {"child": child})
+                savepoint.commit()
+
+        assert stats.count == 3
+        assert stats.savepoints == 6
+        assert stats.repeated(max_repeats=2) == [("SELECT ?", 3)]
+        assert stats.summary()["savepoints"] == 6
+
+    def test_nothing_is_recorded_outside_tracking(self, engine):
+        """Statements outside a block, or in a nested block, do not leak into it"""
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with track_queries() as outer:
+                with track_queries() as inner:
+                    connection.execute(text("SELECT 2"))
+                connection.execute(text("SELECT 3"))
+
+        assert (outer.count, inner.count) == (1, 1)
+
+    async def test_tasks_record_into_the_spawning_context(self, engine):
+        """Resolvers run as tasks; their statements count toward the operation"""
+        def run_query():
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        async def resolver():
+            run_query()
+
+        with track_queries() as stats:
+            await asyncio.gather(resolver(), resolver())
+
+        assert stats.count == 2
+
+    def test_query_budget_fails_on_repeated_statement(self, engine, query_budget):
+        """The fixture turns an N+1 into a test failure"""
+        with query_budget(max_repeats=2), engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+        with pytest.raises(pytest.fail.Exception, match="more than 1 times"):
+            with query_budget(max_repeats=1), engine.connect() as connection:
+                for child in range(2):
+                    connection.execute(text("SELECT :child"), {"child": child})
@@ -0,0 +1,142 @@
+"""
+Unit Tests for GCRA Rate Limiting
+Tests the limiter arithmetic, stores, route policies and middleware headers
+"""
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config.settings import settings
+from app.middleware.rate_limit import (
+    InMemoryRateLimitStore, RateLimitPolicy, RedisRateLimitStore, gcra, policy_for_path
+)
+from app.middleware.security import RateLimitingMiddleware
+
+
+@pytest.mark.unit
+class TestGCRA:
+    """Test suite for the limiter arithmetic and stores"""
+
+    def test_burst_then_steady_rate(self):
+        """A full bucket allows `limit` requests at once, then one per interval"""
+        policy = RateLimitPolicy("test", limit=3, period_seconds=3)
+        tat, now, allowed = None, 100.0, []
+        for _ in range(4):
+            new_tat, retry_after, _ = gcra(tat, now, policy)
+            allowed.append(new_tat is not None)
+            tat = new_tat or tat
+
+        assert allowed == [True, True, True, False]
+        assert retry_after == pytest.approx(1.0)
+        assert gcra(tat, now + 1.0, policy)[0] is not None
+
+    async def test_memory_store_reports_remaining(self):
+        policy = RateLimitPolicy("test", limit=5, period_seconds=60)
+        store = InMemoryRateLimitStore()
+
+        results = [await store.check("ip:1", policy) for _ in range(6)]
+
+        assert [result.remaining for result in results[:5]] == [4, 3, 2, 1, 0]
+        assert not results[5].allowed
+        assert results[5].retry_after == pytest.approx(12, abs=0.1)
+        assert (await store.check("ip:2", policy)).allowed
+
+    async def test_memory_store_is_bounded(self):
+        store = InMemoryRateLimitStore(max_keys=3)
+        policy = RateLimitPolicy("test", limit=5, period_seconds=60)
+        for index in range(10):
+            await store.check(f"ip:{index}", policy)
+
+        assert list(store.tats) == ["test:ip:7", "test:ip:8", "test:ip:9"]
+
+    async def test_memory_store_keeps_policies_apart(self):
+        """Exhausting one policy leaves the same client's other policies untouched"""
+        store = InMemoryRateLimitStore()
+        graphql = RateLimitPolicy("graphql", limit=3, period_seconds=900)
+        auth = RateLimitPolicy("auth", limit=3, period_seconds=300)
+        for _ in range(3):
+            await store.check("ip:1", graphql)
+
+        assert not (await store.check("ip:1", graphql)).allowed
+        result = await store.check("ip:1", auth)
+        assert result.allowed
+        assert result.remaining == 2
+
+    async def test_redis_failure_falls_back_to_local_limits(self):
+        """An unreachable Redis limits per process instead of failing requests"""
+        class BrokenRedis:
+            def register_script(self, script):
+                async def run(keys, args):
+                    raise ConnectionError("redis down")
+                return run
+
+        store = RedisRateLimitStore(client=BrokenRedis())
+        policy = RateLimitPolicy("test", limit=1, period_seconds=60)
+
+        assert (await store.check("ip:1", policy)).allowed
+        assert not (await store.check("ip:1", policy)).allowed
+        assert store.unavailable_until > 0
+
+    def test_route_policies(self):
+        assert policy_for_path("/health/live") is None
+        assert policy_for_path("/graphql").name == "graphql"
+        assert policy_for_path("/webhooks/stripe/subscription-events").name == "webhooks"
+        assert policy_for_path("/auth/me").name == "auth"
+        assert policy_for_path("/api/stripe/config").name == "default"
+
+    def test_auth_session_paths_are_not_limited(self):
+        """Signing in, up, out and refreshing must never be blocked by a shared IP"""
+        for path in ("/auth/signin", "/auth/signup", "/auth/refresh", "/auth/signout"):
+            assert policy_for_path(path) is None
+
+
+@pytest.mark.unit
+class TestRateLimitingMiddleware:
+    """Test suite for keys and RateLimit headers on responses"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setattr(settings, "rate_limiting_enabled", True)
+        monkeypatch.setattr(settings, "rate_limit_requests", 10)
+        monkeypatch.setattr(settings, "rate_limit_window", 60)
+        app = FastAPI()
+        app.add_middleware(RateLimitingMiddleware, store=InMemoryRateLimitStore())
+
+        @app.get("/items")
+        async def items():
+            return {"ok": True}
+
+        @app.post("/auth/signin")
+        async def signin():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_headers_and_429(self, client):
+        responses = [client.get("/items") for _ in range(11)]
+
+        assert responses[0].headers["RateLimit-Limit"] == "10"
+        assert responses[0].headers["RateLimit-Remaining"] == "9"
+        assert responses[0].headers["RateLimit-Policy"] == "10;w=60"
+        assert responses[10].status_code == 429
+        assert int(responses[10].headers["Retry-After"]) >= 1
+
+    def test_users_get_their_own_bucket(self, client):
+        """A valid token keys by user, so users behind one IP do not share limits"""
+        token = jwt.encode(
+            {"sub": "user-1", "aud": "authenticated"}, settings.supabase_jwt_secret, algorithm="HS256"
+        )
+        for _ in range(10):
+            client.get("/items")
+
+        assert client.get("/items").status_code == 429
+        assert client.get("/items", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+        assert client.get("/items", headers={"Authorization": "Bearer forged"}).status_code == 429
+
+    def test_sign_in_is_never_rate_limited(self, client):
+        responses = [client.post("/auth/signin") for _ in range(50)]
+
+        assert all(response.status_code == 200 for response in responses)
+        assert "RateLimit-Limit" not in responses[0].headers
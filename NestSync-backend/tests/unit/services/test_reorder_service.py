@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 
+from app.services.forecasting_engine import growth_factor, seasonal_factor
 from app.services.reorder_service import ReorderService
 from app.models import SubscriptionTier, PredictionConfidence
 
@@ -83,25 +84,27 @@ class TestReorderService:
             for i in range(30)
         ]
 
+        mock_forecast = {
+            "child_id": str(test_child.id),
+            "model_version": "prophet_v1.0",
+            "horizon_days": 30,
+            "current_rate": 7.0,
+            "predicted_consumption": 180,
+            "mae": 1.2,
+            "r2": 0.85,
+            "training_data_points": 30,
+            "training_period_days": 29,
+            "last_usage_date": datetime.now().date().isoformat(),
+            "error": None
+        }
+
         with patch.object(reorder_service, '_get_usage_history') as mock_usage, \
-             patch('pandas.DataFrame') as mock_df, \
-             patch('prophet.Prophet') as mock_prophet:
+             patch.object(reorder_service.forecasting_engine, 'forecast_many', AsyncMock(return_value=[mock_forecast])) as mock_engine:
 
             mock_usage.return_value = mock_usage_data
 
-            # Mock Prophet model
-            mock_model = MagicMock()
-            mock_prophet.return_value = mock_model
-
-            mock_forecast = MagicMock()
-            mock_forecast.__getitem__.return_value.tail.return_value.sum.return_value = 180
-            mock_model.predict.return_value = mock_forecast
-
-            # Mock performance metrics
-            with patch.object(reorder_service, '_calculate_model_performance') as mock_perf, \
-                 patch.object(reorder_service, '_determine_confidence_level') as mock_conf:
+            with patch.object(reorder_service, '_determine_confidence_level') as mock_conf:
 
-                mock_perf.return_value = (1.2, 0.85)  # MAE, R²
                 mock_conf.return_value = PredictionConfidence.HIGH
 
                 # Test prediction generation
@@ -117,6 +120,7 @@ class TestReorderService:
                 assert prediction.prediction_horizon_days == 30
                 assert prediction.mean_absolute_error == Decimal("1.2")
                 assert prediction.r_squared_score == Decimal("0.85")
+                mock_engine.assert_awaited_once()
 
     async def test_canadian_tax_calculation(
         self,
@@ -235,32 +239,25 @@ class TestReorderService:
 class TestMLPredictionPipeline:
     """Test suite for ML prediction pipeline components"""
 
-    async def test_growth_factor_calculation(
-        self,
-        reorder_service: ReorderService,
-        test_child
-    ):
+    async def test_growth_factor_calculation(self, test_child):
         """Test growth factor calculation for age progression"""
 
         # Test growth factors for future periods
-        growth_factors = await reorder_service._calculate_future_growth_factors(
-            child=test_child,
-            horizon_days=30
-        )
+        today = datetime.now().date()
+        growth_factors = [
+            growth_factor(today + timedelta(days=day), test_child.date_of_birth)
+            for day in range(30)
+        ]
 
         assert len(growth_factors) == 30
         assert all(factor >= 1.0 for factor in growth_factors)
         assert growth_factors[-1] > growth_factors[0]  # Should increase over time
 
-    async def test_seasonal_adjustment_factors(
-        self,
-        reorder_service: ReorderService
-    ):
+    async def test_seasonal_adjustment_factors(self):
         """Test seasonal adjustment factor calculation"""
 
-        seasonal_factors = await reorder_service._calculate_future_seasonal_factors(
-            horizon_days=30
-        )
+        today = datetime.now().date()
+        seasonal_factors = [seasonal_factor(today + timedelta(days=day)) for day in range(30)]
 
         assert len(seasonal_factors) == 30
         assert all(0.5 <= factor <= 1.5 for factor in seasonal_factors)
@@ -290,6 +287,34 @@ class TestMLPredictionPipeline:
 
             assert abs(actual_days - expected_days) <= 1  # Allow 1 day variance
 
+    async def test_user_predictions_load_history_in_one_query(
+        self,
+        reorder_service: ReorderService,
+        test_user
+    ):
+        """All children's usage history comes from one grouped query, not one per child"""
+        children = [MagicMock(id=f"child-{index}", date_of_birth=test_user.created_at.date()) for index in range(3)]
+        start = datetime.now().date() - timedelta(days=20)
+        history_rows = [
+            MagicMock(child_id=child.id, date=start + timedelta(days=day), daily_usage=6)
+            for child in children[:2] for day in range(20)
+        ]
+        children_result = MagicMock()
+        children_result.scalars.return_value.all.return_value = children
+        forecast = {"error": None}
+
+        with patch.object(reorder_service.session, 'execute', AsyncMock(side_effect=[children_result, history_rows])) as mock_execute, \
+             patch.object(reorder_service.session, 'add'), \
+             patch.object(reorder_service.session, 'commit', AsyncMock()), \
+             patch.object(reorder_service.model_store, 'forecast_many', AsyncMock(return_value=[forecast, forecast])) as mock_forecast, \
+             patch.object(reorder_service, 'prediction_values', AsyncMock(return_value={})):
+
+            predictions = await reorder_service.update_predictions_for_user(test_user)
+
+        assert mock_execute.await_count == 2
+        requests = mock_forecast.await_args.args[1]
+        assert len(requests) == 2 and len(predictions) == 2
+
 
 @pytest.mark.unit
 @pytest.mark.canadian
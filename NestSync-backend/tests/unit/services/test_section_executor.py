@@ -0,0 +1,106 @@
+"""
+Unit Tests for Parallel Section Executor
+Tests per-section sessions, timeouts and partial results
+"""
+
+import asyncio
+import time
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+from app.services.section_executor import (
+    SECTION_ERROR_MESSAGE,
+    ParallelSectionExecutor,
+    SectionFailureReason
+)
+
+
+def _session_factory(opened):
+    """Session factory that hands out a fresh mock session per section"""
+    @asynccontextmanager
+    async def factory():
+        session = MagicMock()
+        opened.append(session)
+        yield session
+    return factory
+
+
+@pytest.mark.unit
+class TestParallelSectionExecutor:
+    """Test suite for ParallelSectionExecutor"""
+
+    async def test_sections_run_in_parallel_on_own_sessions(self):
+        """Latency tracks the slowest section and no session is shared"""
+        opened = []
+        seen = []
+
+        async def section(session):
+            seen.append(session)
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        executor = ParallelSectionExecutor(
+            session_factory=_session_factory(opened), default_timeout=1, max_concurrency=5
+        )
+        started = time.perf_counter()
+        outcomes = await executor.run({f"section_{i}": section for i in range(5)})
+        elapsed = time.perf_counter() - started
+
+        assert all(outcome.ok and outcome.value == "ok" for outcome in outcomes.values())
+        assert len({id(session) for session in seen}) == 5
+        assert elapsed < 0.3
+
+    async def test_failures_are_typed_and_isolated(self):
+        """A slow and a failing section do not affect their siblings"""
+        async def ok(session):
+            return 42
+
+        async def slow(session):
+            await asyncio.sleep(1)
+
+        async def broken(session):
+            raise ValueError('relation "usage_logs" does not exist')
+
+        executor = ParallelSectionExecutor(session_factory=_session_factory([]), default_timeout=1)
+        outcomes = await executor.run(
+            {"ok": ok, "slow": slow, "broken": broken},
+            timeouts={"slow": 0.05}
+        )
+
+        assert outcomes["ok"].value == 42
+        assert outcomes["slow"].failure.reason == SectionFailureReason.TIMEOUT
+        assert outcomes["broken"].failure.reason == SectionFailureReason.ERROR
+        assert outcomes["broken"].failure.message == SECTION_ERROR_MESSAGE
+        assert outcomes["broken"].value is None
+
+    async def test_concurrent_sessions_are_bounded(self):
+        """Neither one run nor all runs together exceed their session limits"""
+        opened = []
+        active, peak = 0, 0
+
+        async def section(session):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return "ok"
+
+        shared = asyncio.Semaphore(3)
+        executor = ParallelSectionExecutor(
+            session_factory=_session_factory(opened), default_timeout=1,
+            max_concurrency=2, shared_slots=shared
+        )
+
+        outcomes = await executor.run({f"section_{i}": section for i in range(6)})
+        assert all(outcome.ok for outcome in outcomes.values())
+        assert peak == 2
+
+        peak = 0
+        runs = await asyncio.gather(*[
+            executor.run({f"section_{i}": section for i in range(4)}) for _ in range(3)
+        ])
+        assert all(outcome.ok for run in runs for outcome in run.values())
+        assert peak == 3
+        assert len(opened) == 18
@@ -0,0 +1,170 @@
+"""
+Unit Tests for Tiered Analytics Cache
+Tests the response codec, L2 promotion and cross-replica invalidation
+"""
+
+import asyncio
+import pytest
+import uuid
+from datetime import date
+
+from app.graphql.analytics_types import (
+    AnalyticsPeriodType, InsightLevelType, TrendDataPoint, UsageAnalyticsResponse
+)
+from app.services.analytics_cache import AnalyticsCache, CacheOutcome, TieredAnalyticsCache
+from app.services.analytics_cache_backends import InMemoryCacheBackend, decode_response, encode_response
+
+
+def _response(points: int = 3) -> UsageAnalyticsResponse:
+    return UsageAnalyticsResponse(
+        success=True,
+        message="ok",
+        insight_level=InsightLevelType.PREMIUM,
+        data_points_analyzed=points,
+        cache_hit=False
+    )
+
+
+def _key(cache: TieredAnalyticsCache, user_id, child_id=None):
+    return cache.create_cache_key(
+        user_id=user_id,
+        query_type="usage_analytics",
+        child_id=child_id,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 31),
+        filters={"period": AnalyticsPeriodType.DAILY.value}
+    )
+
+
+@pytest.mark.unit
+class TestTieredAnalyticsCache:
+    """Test suite for TieredAnalyticsCache"""
+
+    def test_codec_round_trips_response_types(self):
+        """Nested Strawberry types, enums and dates survive serialization"""
+        point = TrendDataPoint(date=date(2025, 1, 2), value=7.0, count=7, label="2025-01-02")
+        response = _response()
+
+        assert decode_response(encode_response(point)) == point
+        decoded = decode_response(encode_response(response))
+        assert decoded.insight_level is InsightLevelType.PREMIUM
+        assert decoded.data_points_analyzed == 3
+
+    def test_codec_refuses_types_outside_graphql(self):
+        """A tampered entry cannot name an arbitrary class"""
+        blob = b'j{"~t":"os:system","f":{}}'
+        with pytest.raises(ValueError):
+            decode_response(blob)
+
+    async def test_second_replica_reads_through_shared_tier(self):
+        """A miss in one process's L1 is served from L2 and promoted"""
+        shared = InMemoryCacheBackend()
+        first = TieredAnalyticsCache(AnalyticsCache(), shared)
+        second = TieredAnalyticsCache(AnalyticsCache(), shared)
+        key = _key(first, uuid.uuid4())
+
+        await first.set(key, _response())
+        value = await second.get(key)
+
+        assert value.data_points_analyzed == 3
+        assert second.l2_hits == 1
+        assert second.l1.get(key) is not None
+
+    async def test_invalidation_reaches_other_replicas(self):
+        """Invalidating on one replica clears L2 and the other replica's L1"""
+        shared = InMemoryCacheBackend()
+        first = TieredAnalyticsCache(AnalyticsCache(), shared)
+        second = TieredAnalyticsCache(AnalyticsCache(), shared)
+        listener = asyncio.create_task(second.listen_for_invalidations())
+        await asyncio.sleep(0)
+
+        child_id = uuid.uuid4()
+        key = _key(first, uuid.uuid4(), child_id)
+        await first.set(key, _response())
+        await second.get(key)
+
+        await first.invalidate(child_ids=[child_id])
+        await asyncio.sleep(0)
+        listener.cancel()
+
+        assert second.l1.get(key) is None
+        assert await first.get(key) is None
+
+    async def test_concurrent_misses_share_one_computation(self):
+        """Callers racing on a cold key all await the same compute call"""
+        cache = TieredAnalyticsCache(AnalyticsCache())
+        key = _key(cache, uuid.uuid4())
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return _response()
+
+        outcomes = []
+        results = await asyncio.gather(*(
+            cache.get_or_compute(key, compute, on_outcome=outcomes.append) for _ in range(10)
+        ))
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert cache.coalesced == 9
+        assert outcomes.count(CacheOutcome.MISS) == 1
+        assert outcomes.count(CacheOutcome.COALESCED) == 9
+
+        await cache.get_or_compute(key, compute, on_outcome=outcomes.append)
+        assert outcomes[-1] == CacheOutcome.HIT
+
+    async def test_stale_value_is_served_while_refreshing(self):
+        """Past the soft TTL the old value is returned and refreshed in the background"""
+        now = [1_000_000.0]
+        cache = TieredAnalyticsCache(AnalyticsCache(), stale_minutes=30, clock=lambda: now[0])
+        key = _key(cache, uuid.uuid4())
+        await cache.set(key, _response(points=1), ttl_minutes=5)
+        now[0] += 10 * 60
+
+        async def compute():
+            return _response(points=2)
+
+        outcomes = []
+        stale = await cache.get_or_compute(key, compute, ttl_minutes=5, on_outcome=outcomes.append)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert stale.data_points_analyzed == 1
+        assert cache.stale_hits == 1
+        assert outcomes == [CacheOutcome.STALE]
+        assert (await cache.get(key)).data_points_analyzed == 2
+
+    async def test_results_rejected_by_cache_if_are_not_stored(self):
+        """Error responses are returned but not cached"""
+        cache = TieredAnalyticsCache(AnalyticsCache())
+        key = _key(cache, uuid.uuid4())
+
+        async def compute():
+            return _response(points=0)
+
+        result = await cache.get_or_compute(key, compute, cache_if=lambda r: r.data_points_analyzed > 0)
+
+        assert result.data_points_analyzed == 0
+        assert await cache.get(key) is None
+
+    async def test_invalidation_discards_in_flight_result(self):
+        """A computation that overlaps an invalidation is not cached"""
+        cache = TieredAnalyticsCache(AnalyticsCache())
+        child_id = uuid.uuid4()
+        key = _key(cache, uuid.uuid4(), child_id)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return _response()
+
+        pending = asyncio.create_task(cache.get_or_compute(key, compute))
+        await asyncio.sleep(0)
+        await cache.invalidate(child_ids=[child_id])
+        release.set()
+
+        assert (await pending).data_points_analyzed == 3
+        assert await cache.get(key) is None